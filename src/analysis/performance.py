@@ -8,6 +8,8 @@ import math
 import statistics
 from typing import Mapping, Sequence
 
+import numpy as np
+
 from src.analysis.performance_errors import PerformanceAnalysisError
 from src.analysis.performance_trade import _compute_trade_metrics
 
@@ -104,6 +106,16 @@ def analyze_performance(
 def _normalize_series(
     series: Mapping[object, float] | Sequence[tuple[object, float]]
 ) -> list[tuple[float, float]]:
+    timestamps = getattr(series, "timestamps", None)
+    values = getattr(series, "values", None)
+    if isinstance(timestamps, np.ndarray) and isinstance(values, np.ndarray):
+        # Columnar series (``TimeSeries``): convert whole columns, no per-point parsing.
+        if not len(values):
+            raise PerformanceAnalysisError("series must not be empty")
+        seconds = timestamps.astype("datetime64[us]").astype(np.int64) / 1e6
+        order = np.argsort(seconds, kind="stable")
+        return list(zip(seconds[order].tolist(), values.astype(np.float64)[order].tolist()))
+
     if isinstance(series, Mapping):
         items = list(series.items())
     else:
@@ -8,6 +8,7 @@ from pathlib import Path
 from typing import Mapping, Sequence
 
 import matplotlib
+import numpy as np
 
 # Use non-interactive backend for headless test/runtime environments.
 matplotlib.use("Agg")
@@ -36,10 +37,16 @@ class PerformanceVisualizer:
     def export_all(
         self,
         *,
-        equity_curve: Mapping[object, float] | Sequence[tuple[object, float]],
+        equity_curve: Mapping[object, float] | Sequence[tuple[object, float]] | object,
         trade_log: Sequence[Mapping[str, object]] | Sequence[object] | None = None,
         prefix: str = "",
     ) -> VisualizationArtifacts:
+        """Render the four charts; ``equity_curve`` may also be a columnar series.
+
+        Columnar series are objects with ``timestamps`` (``datetime64``) and
+        ``values`` (``float64``) arrays, e.g. ``TimeSeries``; they are plotted
+        without per-point conversion.
+        """
         normalized_equity = _normalize_equity_series(equity_curve)
         suffix = f"_{prefix}" if prefix else ""
 
@@ -62,11 +69,10 @@ class PerformanceVisualizer:
 
     def _plot_equity_curve(
         self,
-        equity_series: Sequence[tuple[float, float]],
+        equity_series: tuple[np.ndarray, np.ndarray],
         output_path: Path,
     ) -> None:
-        timestamps = [datetime.fromtimestamp(ts, tz=timezone.utc) for ts, _ in equity_series]
-        values = [equity for _, equity in equity_series]
+        timestamps, values = equity_series
 
         fig, ax = plt.subplots(figsize=(10, 4))
         ax.plot(timestamps, values, color="tab:blue", linewidth=1.8)
@@ -79,11 +85,11 @@ class PerformanceVisualizer:
 
     def _plot_drawdown_curve(
         self,
-        equity_series: Sequence[tuple[float, float]],
+        equity_series: tuple[np.ndarray, np.ndarray],
         output_path: Path,
     ) -> None:
-        timestamps = [datetime.fromtimestamp(ts, tz=timezone.utc) for ts, _ in equity_series]
-        drawdown_values = _compute_drawdown_series(equity_series)
+        timestamps, values = equity_series
+        drawdown_values = _drawdown_array(values)
 
         fig, ax = plt.subplots(figsize=(10, 4))
         ax.plot(timestamps, drawdown_values, color="tab:red", linewidth=1.8)
@@ -167,24 +173,43 @@ class PerformanceVisualizer:
 
 
 def _normalize_equity_series(
-    series: Mapping[object, float] | Sequence[tuple[object, float]],
-) -> list[tuple[float, float]]:
-    if isinstance(series, Mapping):
-        items = list(series.items())
-    else:
-        items = list(series)
-
-    if len(items) < 2:
+    series: Mapping[object, float] | Sequence[tuple[object, float]] | object,
+) -> tuple[np.ndarray, np.ndarray]:
+    """Chronologically sorted ``(datetime64[us] UTC, float64 equity)`` arrays."""
+    columns = _columnar_equity(series)
+    if columns is None:
+        if isinstance(series, Mapping):
+            items = list(series.items())
+        else:
+            items = list(series)  # type: ignore[call-overload]
+        seconds = []
+        equity = []
+        for raw_ts, raw_equity in items:
+            if not isinstance(raw_equity, (int, float)) or isinstance(raw_equity, bool):
+                raise VisualizationError("equity value must be numeric")
+            seconds.append(_parse_timestamp(raw_ts))
+            equity.append(float(raw_equity))
+        timestamps = (np.asarray(seconds, dtype=np.float64) * 1e6).round().astype("datetime64[us]")
+        columns = (timestamps, np.asarray(equity, dtype=np.float64))
+
+    timestamps, values = columns
+    if len(values) < 2:
         raise VisualizationError("equity_curve must contain at least two points")
+    order = np.argsort(timestamps, kind="stable")
+    return timestamps[order], values[order]
 
-    normalized: list[tuple[float, float]] = []
-    for raw_ts, raw_equity in items:
-        if not isinstance(raw_equity, (int, float)) or isinstance(raw_equity, bool):
-            raise VisualizationError("equity value must be numeric")
-        normalized.append((_parse_timestamp(raw_ts), float(raw_equity)))
 
-    normalized.sort(key=lambda item: item[0])
-    return normalized
+def _columnar_equity(series: object) -> tuple[np.ndarray, np.ndarray] | None:
+    timestamps = getattr(series, "timestamps", None)
+    values = getattr(series, "values", None)
+    if not isinstance(timestamps, np.ndarray) or not isinstance(values, np.ndarray):
+        return None
+    if not np.issubdtype(timestamps.dtype, np.datetime64) or timestamps.shape != values.shape:
+        raise VisualizationError("columnar equity_curve needs equal-length datetime64 timestamps and values")
+    try:
+        return timestamps.astype("datetime64[us]"), values.astype(np.float64)
+    except (TypeError, ValueError) as exc:
+        raise VisualizationError("equity value must be numeric") from exc
 
 
 def _parse_timestamp(raw_value: object) -> float:
@@ -211,18 +236,14 @@ def _parse_timestamp(raw_value: object) -> float:
 
 
 def _compute_drawdown_series(equity_series: Sequence[tuple[float, float]]) -> list[float]:
-    peak = equity_series[0][1]
-    drawdown_values: list[float] = []
-
-    for _, equity in equity_series:
-        if equity > peak:
-            peak = equity
-        if peak <= 0:
-            drawdown_values.append(0.0)
-        else:
-            drawdown_values.append((peak - equity) / peak)
+    return _drawdown_array(np.asarray([equity for _, equity in equity_series], dtype=np.float64)).tolist()
+
 
-    return drawdown_values
+def _drawdown_array(equity: np.ndarray) -> np.ndarray:
+    peaks = np.maximum.accumulate(equity)
+    drawdowns = np.zeros_like(equity)
+    np.divide(peaks - equity, peaks, out=drawdowns, where=peaks > 0)
+    return drawdowns
 
 
 def _extract_trade_pnls(trade_log: Sequence[Mapping[str, object]] | Sequence[object]) -> list[float]:
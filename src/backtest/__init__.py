@@ -9,6 +9,8 @@ from src.backtest.result_models import (
     BacktestRunResult,
     ReturnsAnalysis,
     RiskMetrics,
+    SymbolBreakdown,
+    TimeSeries,
     TradeRecord,
     TradeStatistics,
 )
@@ -24,6 +26,8 @@ __all__ = [
     "BacktestRunResult",
     "ReturnsAnalysis",
     "RiskMetrics",
+    "SymbolBreakdown",
+    "TimeSeries",
     "TradeRecord",
     "TradeStatistics",
 ]
@@ -2,30 +2,94 @@
 
 from __future__ import annotations
 
-from typing import Any
+from array import array
+from typing import Any, Sequence
 
 import backtrader as bt
+import numpy as np
+
+from src.backtest.value_metrics import trade_analysis, value_curve_analysis
+from src.data.feed import EPOCH_DATENUM, MS_PER_DAY
+
+
+class SymbolTradeAnalyzer(bt.analyzers.TradeAnalyzer):
+    """TradeAnalyzer restricted to trades of one named data feed (portfolio runs)."""
+
+    params = (("feed_name", ""),)
+
+    def notify_trade(self, trade: bt.Trade) -> None:
+        if trade.data._name == self.p.feed_name:
+            super().notify_trade(trade)
+
+
+class ValueRecorder(bt.Analyzer):
+    """Broker value and bar time after every bar, appended to flat ``array`` buffers.
+
+    The only per-bar work of the ``standard`` and ``minimal`` analyzer profiles:
+    the value comes from the broker notification backtrader already sends, and
+    all metrics are computed from the arrays once the run is over.
+    """
+
+    def start(self) -> None:
+        self._value = self.strategy.broker.getvalue()
+        self._values = array("d")
+        self._bar_times = array("d")
+
+    def notify_cashvalue(self, cash: float, value: float) -> None:
+        self._value = value
+
+    def next(self) -> None:
+        self._values.append(self._value)
+        self._bar_times.append(self.strategy.datetime[0])
+
+    def get_analysis(self) -> dict[str, np.ndarray]:
+        """``values`` (float64) and naive-UTC ``bar_times`` (int64 ns).
+
+        Float date numbers only resolve a few microseconds, so bar times are
+        rounded to the millisecond of the candle timestamps.
+        """
+        days = np.frombuffer(self._bar_times, dtype=np.float64) - EPOCH_DATENUM
+        return {
+            "values": np.frombuffer(self._values, dtype=np.float64).copy(),
+            "bar_times": np.rint(days * MS_PER_DAY).astype(np.int64) * 1_000_000,
+        }
 
 
 class AnalyzerMount:
     """Mounts standard analyzers to Cerebro and extracts results."""
 
     @staticmethod
-    def attach_analyzers(cerebro: bt.Cerebro) -> None:
-        """Attach all standard analyzers to Cerebro instance.
+    def attach_analyzers(
+        cerebro: bt.Cerebro,
+        *,
+        time_return_timeframe: int | None = None,
+        profile: str = "full",
+    ) -> None:
+        """Attach the analyzers of ``profile`` to Cerebro instance.
 
-        Mounted analyzers:
+        ``standard`` and ``minimal`` only mount :class:`ValueRecorder`; see
+        :meth:`extract_value_results`. ``full`` mounts:
         - SharpeRatio: Risk-adjusted returns
         - DrawDown: Maximum drawdown and duration
         - TradeAnalyzer: Trade statistics (win rate, profit factor, etc.)
         - Returns: Period returns analysis
         - TimeReturn: Time series of returns for visualization
+
+        All but TimeReturn keep running aggregates only. TimeReturn stores one
+        entry per period of the data's timeframe unless ``time_return_timeframe``
+        (a ``bt.TimeFrame`` value) buckets it coarser, e.g. per day.
         """
+        if profile != "full":
+            cerebro.addanalyzer(ValueRecorder, _name="values")
+            return
         cerebro.addanalyzer(bt.analyzers.SharpeRatio, _name="sharpe")
         cerebro.addanalyzer(bt.analyzers.DrawDown, _name="drawdown")
         cerebro.addanalyzer(bt.analyzers.TradeAnalyzer, _name="trades")
         cerebro.addanalyzer(bt.analyzers.Returns, _name="returns")
-        cerebro.addanalyzer(bt.analyzers.TimeReturn, _name="timereturns")
+        if time_return_timeframe is None:
+            cerebro.addanalyzer(bt.analyzers.TimeReturn, _name="timereturns")
+        else:
+            cerebro.addanalyzer(bt.analyzers.TimeReturn, _name="timereturns", timeframe=time_return_timeframe)
 
     @staticmethod
     def extract_results(strategies: list[bt.Strategy]) -> dict[str, Any]:
@@ -50,3 +114,57 @@ class AnalyzerMount:
             "returns": strategy.analyzers.returns.get_analysis(),
             "timereturns": strategy.analyzers.timereturns.get_analysis(),
         }
+
+    @staticmethod
+    def extract_value_results(
+        strategies: list[bt.Strategy],
+        *,
+        profile: str,
+        timeframe: str,
+        initial_capital: float,
+        closed_pnls: Sequence[float],
+        time_return_timeframe: str | None = None,
+        skip_bars: int = 0,
+    ) -> dict[str, Any]:
+        """Analyzer-shaped results computed from the :class:`ValueRecorder` arrays.
+
+        ``timeframe`` is the feed's, ``time_return_timeframe`` optionally buckets
+        the time series coarser (see :meth:`attach_analyzers`) and
+        ``closed_pnls`` are the net PnLs of closed trades. Positions still open
+        count as trades, as with TradeAnalyzer. ``minimal`` skips the Sharpe
+        ratio and the time series. The first ``skip_bars`` recorded bars
+        (warm-up without trading) are left out of every metric.
+        """
+        if not strategies:
+            raise ValueError("No strategies returned from cerebro.run()")
+        strategy = strategies[0]
+        recorded = strategy.analyzers.values.get_analysis()
+        results = value_curve_analysis(
+            recorded["values"][skip_bars:],
+            recorded["bar_times"][skip_bars:],
+            timeframe,
+            initial_capital,
+            time_return_timeframe=time_return_timeframe,
+            with_sharpe=profile != "minimal",
+            with_time_returns=profile != "minimal",
+        )
+        open_trades = sum(1 for data in strategy.datas if strategy.getposition(data).size)
+        results["trades"] = trade_analysis(closed_pnls, open_trades=open_trades)
+        return results
+
+    @staticmethod
+    def attach_symbol_analyzers(cerebro: bt.Cerebro, feed_names: Sequence[str]) -> None:
+        """Attach one :class:`SymbolTradeAnalyzer` per data feed of a portfolio run."""
+        for feed_name in feed_names:
+            cerebro.addanalyzer(SymbolTradeAnalyzer, _name=f"trades@{feed_name}", feed_name=feed_name)
+
+    @staticmethod
+    def extract_symbol_results(strategies: list[bt.Strategy], feed_names: Sequence[str]) -> dict[str, Any]:
+        """Return feed name -> per-symbol TradeAnalyzer output."""
+        if not strategies:
+            raise ValueError("No strategies returned from cerebro.run()")
+        strategy = strategies[0]
+        return {
+            feed_name: strategy.analyzers.getbyname(f"trades@{feed_name}").get_analysis()
+            for feed_name in feed_names
+        }
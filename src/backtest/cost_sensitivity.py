@@ -0,0 +1,274 @@
+"""Re-price a backtest's closed trades under other fee and slippage assumptions.
+
+Each ``TradeRecord`` keeps the average slipped entry/exit prices and the size,
+which is enough to back out the reference (pre-slippage) prices with the rate
+the backtest ran with and to apply any other rate. All scenarios are priced
+as one scenarios x trades NumPy matrix: net PnL, closed-trade equity and the
+``PerformanceSummary`` metrics come out without replaying a single bar.
+
+The re-pricing is first-order: fills, sizes and timing are those of the
+recorded run. Strategies that size positions from available cash, or whose
+signals depend on equity, would trade differently under other costs, and
+backtrader caps slipped prices at the bar's high/low, which is not modelled.
+Sharpe, Sortino and drawdown are measured on closed-trade equity (one point
+per trade exit), like the Monte Carlo check, rather than on bar-level equity.
+"""
+
+from __future__ import annotations
+
+import time
+from collections.abc import Iterable, Sequence
+from dataclasses import dataclass
+from itertools import product
+from typing import Any
+
+import numpy as np
+import pandas as pd
+
+from src.analysis.performance import PerformanceSummary
+from src.backtest.result_models import BacktestRunResult
+from src.core.execution_cost import ExecutionCostProfile, LiquidityRole
+
+_YEAR_SECONDS = 365.0 * 24.0 * 3600.0
+
+
+class CostSensitivityError(RuntimeError):
+    """Raised when a trade log cannot be re-priced under the given cost assumptions."""
+
+
+@dataclass(frozen=True)
+class CostScenario:
+    """Fee rate per fill side plus a symmetric adverse slippage rate."""
+
+    entry_fee_rate: float
+    exit_fee_rate: float
+    slippage_rate: float
+
+    def __post_init__(self) -> None:
+        for name in ("entry_fee_rate", "exit_fee_rate", "slippage_rate"):
+            value = getattr(self, name)
+            if isinstance(value, bool) or not isinstance(value, (int, float)) or not 0.0 <= value < 1.0:
+                raise CostSensitivityError(f"{name} must be within [0, 1)")
+
+    @classmethod
+    def from_rates(cls, commission_rate: float, slippage_rate: float) -> "CostScenario":
+        """Same fee on both fills, as ``BacktestEngine`` charges ``commission_rate``."""
+        return cls(commission_rate, commission_rate, slippage_rate)
+
+    @classmethod
+    def from_profile(
+        cls,
+        profile: ExecutionCostProfile,
+        *,
+        entry_role: LiquidityRole = LiquidityRole.TAKER,
+        exit_role: LiquidityRole = LiquidityRole.TAKER,
+    ) -> "CostScenario":
+        """Maker/taker tier of ``profile`` picked per fill by its liquidity role."""
+        return cls(
+            _fee_rate(profile, entry_role),
+            _fee_rate(profile, exit_role),
+            profile.slippage_rate,
+        )
+
+
+def cost_grid(commission_rates: Iterable[float], slippage_rates: Iterable[float]) -> tuple[CostScenario, ...]:
+    """Cartesian product of commission and slippage rates, commission-major."""
+    return tuple(
+        CostScenario.from_rates(commission, slippage)
+        for commission, slippage in product(commission_rates, slippage_rates)
+    )
+
+
+@dataclass(frozen=True, eq=False)
+class CostSensitivitySurface:
+    """Re-priced trades and metrics, one row per scenario.
+
+    ``net_pnl`` is scenarios x trades and ``equity`` scenarios x (trades + 1),
+    both with trades ordered by exit time; ``equity[:, 0]`` is the initial
+    capital at ``timestamps[0]`` (the first entry).
+    """
+
+    scenarios: tuple[CostScenario, ...]
+    initial_capital: float
+    timestamps: np.ndarray  # datetime64[us], first entry then each exit
+    net_pnl: np.ndarray
+    equity: np.ndarray
+    summaries: tuple[PerformanceSummary, ...]
+    elapsed_seconds: float
+
+    @property
+    def final_equity(self) -> np.ndarray:
+        return self.equity[:, -1]
+
+    def to_rows(self) -> list[dict[str, Any]]:
+        """One flat dict per scenario (rates, total fees-inclusive PnL and the summary)."""
+        return [
+            {
+                "entry_fee_rate": scenario.entry_fee_rate,
+                "exit_fee_rate": scenario.exit_fee_rate,
+                "slippage_rate": scenario.slippage_rate,
+                "net_pnl": float(pnl),
+                "final_equity": float(final),
+                "total_return": summary.total_return,
+                "annualized_return": summary.annualized_return,
+                "max_drawdown": summary.max_drawdown,
+                "sharpe_ratio": summary.sharpe_ratio,
+                "sortino_ratio": summary.sortino_ratio,
+                "win_rate": summary.win_rate,
+                "profit_factor": summary.profit_factor,
+                "total_trades": summary.total_trades,
+                "winning_trades": summary.winning_trades,
+                "losing_trades": summary.losing_trades,
+            }
+            for scenario, pnl, final, summary in zip(
+                self.scenarios, self.net_pnl.sum(axis=1), self.final_equity, self.summaries
+            )
+        ]
+
+
+def reprice_trades(
+    result: BacktestRunResult,
+    scenarios: Sequence[CostScenario],
+    *,
+    commission_rate: float,
+    slippage_rate: float,
+    risk_free_rate: float = 0.0,
+) -> CostSensitivitySurface:
+    """Re-price ``result.trade_log`` under every scenario in one vectorized pass.
+
+    ``commission_rate`` and ``slippage_rate`` are the rates the backtest ran
+    with; they are only used to recover the reference prices.
+    """
+    if not scenarios:
+        raise CostSensitivityError("at least one cost scenario is required")
+    recorded = CostScenario.from_rates(commission_rate, slippage_rate)
+    trades = result.trade_log
+    if not trades:
+        raise CostSensitivityError("cost re-pricing needs at least 1 closed trade")
+
+    started = time.perf_counter()
+    exits = _datetimes([record.exit_time for record in trades])
+    order = np.argsort(exits, kind="stable")
+    trades = [trades[index] for index in order.tolist()]
+    direction = np.fromiter((1.0 if record.side == "long" else -1.0 for record in trades), dtype=np.float64)
+    size = np.abs(np.fromiter((record.size for record in trades), dtype=np.float64))
+    entry = np.fromiter((record.entry_price for record in trades), dtype=np.float64)
+    exit_ = np.fromiter((record.exit_price for record in trades), dtype=np.float64)
+    reference_entry = entry / (1.0 + direction * recorded.slippage_rate)
+    reference_exit = exit_ / (1.0 - direction * recorded.slippage_rate)
+
+    rates = np.array(
+        [(scenario.entry_fee_rate, scenario.exit_fee_rate, scenario.slippage_rate) for scenario in scenarios],
+        dtype=np.float64,
+    )
+    entry_fee, exit_fee, slippage = (rates[:, column : column + 1] for column in range(3))
+    entry_prices = reference_entry * (1.0 + direction * slippage)
+    exit_prices = reference_exit * (1.0 - direction * slippage)
+    net_pnl = direction * size * (exit_prices - entry_prices) - size * (entry_prices * entry_fee + exit_prices * exit_fee)
+
+    initial_capital = float(result.initial_capital)
+    equity = np.empty((len(scenarios), len(trades) + 1), dtype=np.float64)
+    equity[:, 0] = initial_capital
+    np.cumsum(net_pnl, axis=1, out=equity[:, 1:])
+    equity[:, 1:] += initial_capital
+    first_entry = _datetimes([record.entry_time for record in trades]).min()
+    timestamps = np.concatenate(([first_entry], exits[order]))
+    seconds = timestamps.astype(np.int64) / 1e6
+
+    summaries = _summaries(equity, net_pnl, seconds, risk_free_rate)
+    return CostSensitivitySurface(
+        scenarios=tuple(scenarios),
+        initial_capital=initial_capital,
+        timestamps=timestamps,
+        net_pnl=net_pnl,
+        equity=equity,
+        summaries=summaries,
+        elapsed_seconds=time.perf_counter() - started,
+    )
+
+
+def _summaries(
+    equity: np.ndarray,
+    net_pnl: np.ndarray,
+    seconds: np.ndarray,
+    risk_free_rate: float,
+) -> tuple[PerformanceSummary, ...]:
+    """``analyze_performance`` formulas, evaluated for every row at once.
+
+    Rows whose equity reaches zero have no defined returns; their Sharpe,
+    Sortino and annualized return are ``None`` instead of an error.
+    """
+    initial = equity[:, :1]
+    total_return = equity[:, -1] / initial[:, 0] - 1.0
+    peak = np.maximum.accumulate(equity, axis=1)
+    drawdown = np.divide(peak - equity, peak, out=np.zeros_like(equity), where=peak > 0).max(axis=1)
+
+    solvent = (equity[:, :-1] > 0).all(axis=1)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        returns = equity[:, 1:] / equity[:, :-1] - 1.0
+    excess = returns - risk_free_rate
+    elapsed = seconds[-1] - seconds[0]
+    periods = _YEAR_SECONDS / (elapsed / (seconds.size - 1)) if elapsed > 0 else None
+    mean = excess.mean(axis=1)
+    stdev = excess.std(axis=1)
+    downside = excess < 0
+    downside_count = downside.sum(axis=1)
+    downside_mean = np.where(downside, excess, 0.0).sum(axis=1) / np.maximum(downside_count, 1)
+    downside_dev = np.sqrt(
+        np.where(downside, (excess - downside_mean[:, None]) ** 2, 0.0).sum(axis=1) / np.maximum(downside_count, 1)
+    )
+    with np.errstate(divide="ignore", invalid="ignore", over="ignore"):
+        growth = equity[:, -1] / initial[:, 0]
+        annualized = growth ** (_YEAR_SECONDS / elapsed) - 1.0 if elapsed > 0 else np.full(growth.shape, np.nan)
+        sharpe = mean / stdev * np.sqrt(periods) if periods else np.full(mean.shape, np.nan)
+        sortino = mean / downside_dev * np.sqrt(periods) if periods else np.full(mean.shape, np.nan)
+    enough_returns = excess.shape[1] >= 2
+
+    winning = (net_pnl > 0).sum(axis=1)
+    losing = (net_pnl < 0).sum(axis=1)
+    gross_profit = np.where(net_pnl > 0, net_pnl, 0.0).sum(axis=1)
+    gross_loss = -np.where(net_pnl < 0, net_pnl, 0.0).sum(axis=1)
+    trades = net_pnl.shape[1]
+
+    summaries = []
+    for row in range(equity.shape[0]):
+        if gross_loss[row] > 0:
+            profit_factor: float | None = float(gross_profit[row] / gross_loss[row])
+        elif gross_profit[row] > 0:
+            profit_factor = None
+        else:
+            profit_factor = 0.0
+        defined = bool(solvent[row]) and enough_returns
+        summaries.append(
+            PerformanceSummary(
+                total_return=float(total_return[row]),
+                annualized_return=_finite(annualized[row]) if growth[row] >= 0 else None,
+                max_drawdown=float(drawdown[row]),
+                sharpe_ratio=_finite(sharpe[row]) if defined and stdev[row] > 0 else None,
+                sortino_ratio=(
+                    _finite(sortino[row]) if defined and downside_count[row] >= 2 and downside_dev[row] > 0 else None
+                ),
+                win_rate=float(winning[row] / trades),
+                profit_factor=profit_factor,
+                total_trades=trades,
+                winning_trades=int(winning[row]),
+                losing_trades=int(losing[row]),
+            )
+        )
+    return tuple(summaries)
+
+
+def _datetimes(values: Sequence[str]) -> np.ndarray:
+    try:
+        parsed = pd.to_datetime(list(values), utc=True, format="ISO8601")
+    except (TypeError, ValueError) as exc:
+        raise CostSensitivityError(f"trade times must be ISO datetimes: {exc}") from exc
+    return parsed.tz_convert(None).to_numpy(dtype="datetime64[us]")
+
+
+def _fee_rate(profile: ExecutionCostProfile, role: LiquidityRole) -> float:
+    return profile.maker_fee_rate if role == LiquidityRole.MAKER else profile.taker_fee_rate
+
+
+def _finite(value: float) -> float | None:
+    return float(value) if np.isfinite(value) else None
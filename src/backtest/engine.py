@@ -2,21 +2,56 @@
 
 from __future__ import annotations
 
+from dataclasses import replace
+from pathlib import Path
 from typing import Any, Mapping
 
 import backtrader as bt
+import pandas as pd
 
 from src.backtest.analyzers import AnalyzerMount
+from src.backtest.instrumentation import ProfilingOptions, RunRecorder, timed_stage
+from src.backtest.result_cache import (
+    DEFAULT_RESULT_CACHE_BYTES,
+    BacktestResultCache,
+    ResultCacheStats,
+    result_cache_key,
+)
 from src.backtest.result_builder import AnalyzerResultBuilder
 from src.backtest.result_models import (
     BacktestRunRequest,
     BacktestRunResult,
+    SymbolBreakdown,
     TradeRecord,
 )
+from src.backtest.vectorized import VectorizedBacktestError, run_vectorized
 from src.core.database import SQLiteDatabase
-from src.data.feed import BacktestDataSlice, SQLiteFeedError, SQLitePandasFeedFactory
+from src.data.feed import (
+    DEFAULT_STREAM_CHUNK_ROWS,
+    BacktestDataSlice,
+    ColumnarPandasFeedFactory,
+    RollupPandasFeedFactory,
+    SQLiteFeedError,
+    SQLitePandasFeedFactory,
+    align_symbol_frames,
+)
+from src.data.frame_cache import (
+    DEFAULT_FRAME_CACHE_BYTES,
+    DataFrameLRUCache,
+    FrameCacheStats,
+    shared_frame_cache,
+)
+from src.data.timeframe_metrics import parse_timeframe
 from src.strategies.param_resolver import StrategyParamResolver
 from src.strategies.registry import StrategyRegistry
+from src.utils.config_defaults import (
+    ALLOWED_ANALYZER_PROFILES,
+    ALLOWED_BACKTEST_ENGINES,
+    ALLOWED_DATA_READ_SOURCES,
+    ALLOWED_MEMORY_MODES,
+)
+
+DEFAULT_COLUMNAR_DIR = "data/columnar"
 
 
 class BacktestEngineError(RuntimeError):
@@ -24,7 +59,7 @@ class BacktestEngineError(RuntimeError):
 
 
 class BacktestEngine:
-    """Run Backtrader backtests using SQLite candles and PandasData feed."""
+    """Run Backtrader backtests using SQLite (or columnar mirror) candles and PandasData feed."""
 
     def __init__(
         self,
@@ -36,6 +71,14 @@ class BacktestEngine:
         data_read_source: str = "sqlite",
         strategies_config: Mapping[str, Any] | None = None,
         strategy_registry: StrategyRegistry | None = None,
+        columnar_dir: str | Path = DEFAULT_COLUMNAR_DIR,
+        frame_cache: DataFrameLRUCache | None = None,
+        engine_mode: str = "backtrader",
+        result_cache: BacktestResultCache | None = None,
+        memory_mode: str = "full",
+        stream_chunk_rows: int = DEFAULT_STREAM_CHUNK_ROWS,
+        profiling: ProfilingOptions | None = None,
+        analyzer_profile: str = "full",
     ) -> None:
         self._database = database
         self._initial_capital = self._validate_positive_number(
@@ -51,7 +94,29 @@ class BacktestEngine:
             "slippage_rate",
         )
         self._data_read_source = self._validate_data_source(data_read_source)
-        self._feed_factory = SQLitePandasFeedFactory(database)
+        self._engine_mode = self._validate_engine_mode(engine_mode)
+        self._memory_mode = self._validate_memory_mode(memory_mode)
+        if self._memory_mode == "bounded" and self._engine_mode == "vectorized":
+            raise BacktestEngineError("memory_mode=bounded streams bars through backtrader; use engine=backtrader")
+        if not isinstance(stream_chunk_rows, int) or isinstance(stream_chunk_rows, bool) or stream_chunk_rows <= 0:
+            raise BacktestEngineError("stream_chunk_rows must be a positive integer")
+        self._stream_chunk_rows = stream_chunk_rows
+        self._analyzer_profile = self._validate_analyzer_profile(analyzer_profile)
+        if profiling is not None and not isinstance(profiling, ProfilingOptions):
+            raise BacktestEngineError("profiling must be a ProfilingOptions instance")
+        self._profiling = profiling
+        self._columnar_dir = str(columnar_dir)
+        self._strategies_config = strategies_config
+        self._result_cache = result_cache
+        if self._data_read_source == "columnar":
+            self._feed_factory: SQLitePandasFeedFactory = ColumnarPandasFeedFactory(
+                database,
+                columnar_dir,
+            )
+        elif self._data_read_source == "rollup":
+            self._feed_factory = RollupPandasFeedFactory(database, frame_cache=frame_cache)
+        else:
+            self._feed_factory = SQLitePandasFeedFactory(database, frame_cache=frame_cache)
         self._strategy_registry = strategy_registry or StrategyRegistry.default()
         self._param_resolver = (
             StrategyParamResolver(strategies_config, self._strategy_registry)
@@ -61,9 +126,24 @@ class BacktestEngine:
 
     @classmethod
     def from_config(
-        cls, database: SQLiteDatabase, config: Mapping[str, Any]
+        cls,
+        database: SQLiteDatabase,
+        config: Mapping[str, Any],
+        *,
+        strategies_config: Mapping[str, Any] | None = None,
+        strategy_registry: StrategyRegistry | None = None,
+        engine_mode: str | None = None,
+        memory_mode: str | None = None,
+        analyzer_profile: str | None = None,
+        use_cache: bool = True,
+        profiling: ProfilingOptions | None = None,
     ) -> "BacktestEngine":
-        """Create backtest engine from runtime config."""
+        """Create backtest engine from runtime config.
+
+        ``engine_mode`` / ``memory_mode`` / ``analyzer_profile`` override the
+        ``backtest`` section when given (CLI flags); ``use_cache=False`` turns the
+        result cache off for this engine. The dataframe cache is shared per process.
+        """
         initial_capital = cls._read_number(config, ("account", "initial_capital"))
         commission_rate = cls._read_number(config, ("trading", "commission", "taker"))
         slippage_rate = cls._read_number(config, ("trading", "slippage"))
@@ -72,17 +152,191 @@ class BacktestEngine:
             ("backtest", "data_read_source"),
             default="sqlite",
         )
+        columnar_dir = cls._read_optional_string(
+            config,
+            ("backtest", "columnar_dir"),
+            default=DEFAULT_COLUMNAR_DIR,
+        )
+        frame_cache_mb = cls._read_optional_int(
+            config,
+            ("backtest", "frame_cache_mb"),
+            default=DEFAULT_FRAME_CACHE_BYTES // (1024 * 1024),
+        )
+        engine_mode = engine_mode or cls._read_optional_string(
+            config,
+            ("backtest", "engine"),
+            default="backtrader",
+        )
+        memory_mode = memory_mode or cls._read_optional_string(
+            config,
+            ("backtest", "memory_mode"),
+            default="full",
+        )
+        analyzer_profile = analyzer_profile or cls._read_optional_string(
+            config,
+            ("backtest", "analyzer_profile"),
+            default="full",
+        )
+        result_cache_mb = cls._read_optional_int(
+            config,
+            ("backtest", "result_cache_mb"),
+            default=DEFAULT_RESULT_CACHE_BYTES // (1024 * 1024),
+        )
         return cls(
             database=database,
             initial_capital=initial_capital,
             commission_rate=commission_rate,
             slippage_rate=slippage_rate,
             data_read_source=data_read_source,
+            strategies_config=strategies_config,
+            strategy_registry=strategy_registry,
+            columnar_dir=columnar_dir,
+            frame_cache=shared_frame_cache(frame_cache_mb * 1024 * 1024) if frame_cache_mb > 0 else None,
+            engine_mode=engine_mode,
+            result_cache=(
+                BacktestResultCache(database, result_cache_mb * 1024 * 1024)
+                if use_cache and result_cache_mb > 0
+                else None
+            ),
+            memory_mode=memory_mode,
+            profiling=profiling,
+            analyzer_profile=analyzer_profile,
         )
 
+    @property
+    def frame_cache_stats(self) -> FrameCacheStats | None:
+        """Hit/miss counters of the dataframe cache, or ``None`` when caching is off."""
+        cache = self._feed_factory.frame_cache
+        return cache.stats() if cache is not None else None
+
+    @property
+    def result_cache(self) -> BacktestResultCache | None:
+        return self._result_cache
+
+    @property
+    def result_cache_stats(self) -> ResultCacheStats | None:
+        """Hit/miss counters of the result cache, or ``None`` when caching is off."""
+        return self._result_cache.stats() if self._result_cache is not None else None
+
+    @property
+    def initial_capital(self) -> float:
+        return self._initial_capital
+
+    @property
+    def commission_rate(self) -> float:
+        return self._commission_rate
+
+    @property
+    def slippage_rate(self) -> float:
+        return self._slippage_rate
+
+    def portable_settings(self) -> dict[str, Any]:
+        """Picklable constructor kwargs for rebuilding an equivalent engine in a worker process.
+
+        The frame cache, the result cache and a custom strategy registry are bound to this
+        process (or its database) and are not carried over.
+        """
+        return {
+            "initial_capital": self._initial_capital,
+            "commission_rate": self._commission_rate,
+            "slippage_rate": self._slippage_rate,
+            "data_read_source": self._data_read_source,
+            "strategies_config": self._strategies_config,
+            "columnar_dir": self._columnar_dir,
+            "engine_mode": self._engine_mode,
+            "memory_mode": self._memory_mode,
+            "analyzer_profile": self._analyzer_profile,
+        }
+
     def run(self, request: BacktestRunRequest) -> BacktestRunResult:
-        """Execute one backtest run and return comprehensive performance stats."""
-        strategy_class = self._validate_strategy_class(request.strategy_class)
+        """Execute one backtest run and return comprehensive performance stats.
+
+        With ``profiling`` set, the run bypasses the result cache and the
+        result carries a :class:`~src.backtest.instrumentation.BacktestProfile`.
+        """
+        self._validate_strategy_class(request.strategy_class)
+        if self._profiling is not None:
+            return self._run_profiled(request, self._profiling)
+        if len(request.portfolio_symbols) > 1:
+            if self._memory_mode == "bounded":
+                raise BacktestEngineError("memory_mode=bounded only runs single-symbol requests")
+            return self.run_portfolio(request, self.load_symbol_dataframes(request))
+        if self._memory_mode == "bounded":
+            return self.run_streaming(request)
+        return self.run_on_dataframe(request, self.load_dataframe(request))
+
+    def _run_profiled(self, request: BacktestRunRequest, options: ProfilingOptions) -> BacktestRunResult:
+        recorder = RunRecorder(options, engine=self._engine_mode)
+        with recorder.profiling():
+            if len(request.portfolio_symbols) > 1:
+                if self._memory_mode == "bounded":
+                    raise BacktestEngineError("memory_mode=bounded only runs single-symbol requests")
+                with recorder.stage("load_dataframe"):
+                    frames = self.load_symbol_dataframes(request)
+                strategy_class, params = self._resolve_strategy(request)
+                result = self._run_portfolio(request, frames, strategy_class, params, recorder=recorder)
+            elif self._memory_mode == "bounded":
+                result = self._run_streaming(request, recorder=recorder)
+            else:
+                with recorder.stage("load_dataframe"):
+                    dataframe = self.load_dataframe(request)
+                strategy_class, params = self._resolve_strategy(request)
+                result = self._run_single(request, dataframe, strategy_class, params, recorder=recorder)
+        return replace(
+            result,
+            profile=recorder.finish(bars=result.bars_processed, trades=len(result.trade_log)),
+        )
+
+    def run_streaming(self, request: BacktestRunRequest) -> BacktestRunResult:
+        """Run a single-symbol request without materializing its candles (``memory_mode="bounded"``).
+
+        Candles are pulled from storage ``stream_chunk_rows`` at a time while
+        Cerebro runs with ``preload``/``runonce`` off and ``exactbars=1``, so line
+        buffers only keep what indicators need. Finished orders and closed trades
+        are dropped from backtrader's archives once recorded, and intraday
+        ``time_series_returns`` are bucketed per day. The result cache is not
+        consulted, since keying would need a full data pass.
+        """
+        return self._run_streaming(request)
+
+    def _run_streaming(self, request: BacktestRunRequest, *, recorder: RunRecorder | None = None) -> BacktestRunResult:
+        self._require_single_symbol(request)
+        strategy_class, params = self._resolve_strategy(request)
+        feed_slice = BacktestDataSlice(
+            symbol=request.symbol,
+            timeframe=request.timeframe,
+            start_timestamp=request.start_timestamp,
+            end_timestamp=request.end_timestamp,
+        )
+        try:
+            with timed_stage(recorder, "build_feed"):
+                feed = self._feed_factory.build_streaming_feed(feed_slice, chunk_rows=self._stream_chunk_rows)
+            with timed_stage(recorder, "build_cerebro"):
+                cerebro, trade_records = self._build_cerebro(
+                    strategy_class,
+                    params,
+                    {f"{request.symbol}:{request.timeframe}": feed},
+                    bounded=True,
+                    recorder=recorder,
+                )
+            with timed_stage(recorder, "cerebro_run"):
+                strategies = cerebro.run()
+        except SQLiteFeedError as exc:
+            raise BacktestEngineError(str(exc)) from exc
+        with timed_stage(recorder, "extract_results"):
+            analyzer_results = self._extract_results(strategies, trade_records, request.timeframe, bounded=True)
+        with timed_stage(recorder, "build_result"):
+            return self._build_result(
+                request,
+                feed.rows_loaded,
+                analyzer_results,
+                float(cerebro.broker.getvalue()),
+                tuple(trade_records),
+            )
+
+    def load_dataframe(self, request: BacktestRunRequest) -> pd.DataFrame:
+        """Load the candle slice a request covers; raises when it is empty."""
+        self._require_single_symbol(request)
         feed_request = BacktestDataSlice(
             symbol=request.symbol,
             timeframe=request.timeframe,
@@ -98,10 +352,261 @@ class BacktestEngine:
             raise BacktestEngineError(
                 "No candle data found in SQLite for the requested symbol/timeframe/time range"
             )
+        return dataframe
+
+    def load_symbol_dataframes(self, request: BacktestRunRequest) -> dict[str, pd.DataFrame]:
+        """Load every symbol of a portfolio request at once (one SQL query on the ``sqlite`` source)."""
+        try:
+            return self._feed_factory.load_symbol_dataframes(
+                request.portfolio_symbols,
+                request.timeframe,
+                request.start_timestamp,
+                request.end_timestamp,
+            )
+        except SQLiteFeedError as exc:
+            raise BacktestEngineError(str(exc)) from exc
+
+    def run_on_dataframe(
+        self, request: BacktestRunRequest, dataframe: pd.DataFrame, *, warmup_bars: int = 0
+    ) -> BacktestRunResult:
+        """Run a request against an already-loaded candle frame (see :meth:`load_dataframe`).
+
+        The first ``warmup_bars`` rows only warm up indicators: the strategy
+        places no orders on them, and returns, drawdown, Sharpe ratio and bar
+        count cover the remaining rows only.
+        """
+        self._require_single_symbol(request)
+        self._validate_warmup_bars(warmup_bars, len(dataframe))
+        strategy_class, params = self._resolve_strategy(request)
+        key = self._cache_key(request, strategy_class, params, {request.symbol: dataframe}, warmup_bars=warmup_bars)
+        cached = self._cached_result(key)
+        if cached is not None:
+            return cached
+        result = self._run_single(request, dataframe, strategy_class, params, warmup_bars=warmup_bars)
+        self._store_result(key, result)
+        return result
+
+    def result_cache_key(
+        self, request: BacktestRunRequest, frames: Mapping[str, pd.DataFrame], *, warmup_bars: int = 0
+    ) -> str | None:
+        """Cache key of running ``request`` on ``frames`` (symbol -> candles); ``None`` when caching is off."""
+        if self._result_cache is None:
+            return None
+        strategy_class, params = self._resolve_strategy(request)
+        return self._cache_key(request, strategy_class, params, frames, warmup_bars=warmup_bars)
+
+    def _run_single(
+        self,
+        request: BacktestRunRequest,
+        dataframe: pd.DataFrame,
+        strategy_class: type[bt.Strategy],
+        params: Mapping[str, Any],
+        *,
+        recorder: RunRecorder | None = None,
+        warmup_bars: int = 0,
+    ) -> BacktestRunResult:
+        if self._engine_mode == "vectorized":
+            try:
+                with timed_stage(recorder, "vectorized"):
+                    outcome = run_vectorized(
+                        dataframe,
+                        request.timeframe.strip(),
+                        strategy_class,
+                        params,
+                        initial_capital=self._initial_capital,
+                        commission_rate=self._commission_rate,
+                        slippage_rate=self._slippage_rate,
+                        warmup_bars=warmup_bars,
+                    )
+            except VectorizedBacktestError as exc:
+                raise BacktestEngineError(str(exc)) from exc
+            with timed_stage(recorder, "build_result"):
+                return self._build_result(
+                    request,
+                    len(dataframe) - warmup_bars,
+                    outcome.analyzer_results,
+                    outcome.final_value,
+                    outcome.trade_log,
+                )
+
+        with timed_stage(recorder, "build_feed"):
+            feed = self._feed_factory.build_feed(dataframe, request.timeframe)
+        with timed_stage(recorder, "build_cerebro"):
+            cerebro, trade_records = self._build_cerebro(
+                strategy_class,
+                params,
+                {f"{request.symbol}:{request.timeframe}": feed},
+                recorder=recorder,
+                warmup_bars=warmup_bars,
+            )
+        with timed_stage(recorder, "cerebro_run"):
+            strategies = cerebro.run()
+
+        # Extract analyzer results (step 27)
+        with timed_stage(recorder, "extract_results"):
+            analyzer_results = self._extract_results(
+                strategies, trade_records, request.timeframe, warmup_bars=warmup_bars
+            )
+        with timed_stage(recorder, "build_result"):
+            return self._build_result(
+                request,
+                len(dataframe) - warmup_bars,
+                analyzer_results,
+                float(cerebro.broker.getvalue()),
+                tuple(trade_records),
+            )
+
+    def run_portfolio(
+        self, request: BacktestRunRequest, frames: Mapping[str, pd.DataFrame]
+    ) -> BacktestRunResult:
+        """Run one strategy over several symbols in a single Cerebro whose broker shares cash.
+
+        ``frames`` maps symbol -> candles (see :meth:`load_symbol_dataframes`); they
+        are aligned onto one timeline and added in order, so ``datas[0]`` is the
+        primary symbol and every feed is named ``<symbol>:<timeframe>``.
+        """
+        strategy_class, params = self._resolve_strategy(request)
+        key = self._cache_key(request, strategy_class, params, frames)
+        cached = self._cached_result(key)
+        if cached is not None:
+            return cached
+        result = self._run_portfolio(request, frames, strategy_class, params)
+        self._store_result(key, result)
+        return result
+
+    def _run_portfolio(
+        self,
+        request: BacktestRunRequest,
+        frames: Mapping[str, pd.DataFrame],
+        strategy_class: type[bt.Strategy],
+        params: Mapping[str, Any],
+        *,
+        recorder: RunRecorder | None = None,
+    ) -> BacktestRunResult:
+        if self._engine_mode == "vectorized":
+            raise BacktestEngineError("the vectorized engine only runs single-symbol requests")
+        with timed_stage(recorder, "build_feed"):
+            try:
+                aligned = align_symbol_frames(frames)
+            except SQLiteFeedError as exc:
+                raise BacktestEngineError(str(exc)) from exc
+            feed_symbols = {f"{symbol}:{request.timeframe}": symbol for symbol in aligned}
+            feeds = {
+                name: self._feed_factory.build_feed(aligned[symbol], request.timeframe)
+                for name, symbol in feed_symbols.items()
+            }
+
+        with timed_stage(recorder, "build_cerebro"):
+            cerebro, trade_records = self._build_cerebro(
+                strategy_class,
+                params,
+                feeds,
+                feed_symbols=feed_symbols,
+                recorder=recorder,
+            )
+            AnalyzerMount.attach_symbol_analyzers(cerebro, list(feed_symbols))
+        with timed_stage(recorder, "cerebro_run"):
+            strategies = cerebro.run()
+
+        with timed_stage(recorder, "extract_results"):
+            analyzer_results = self._extract_results(strategies, trade_records, request.timeframe)
+            symbol_results = AnalyzerMount.extract_symbol_results(strategies, list(feed_symbols))
+        strategy = strategies[0]
+        builder = AnalyzerResultBuilder()
+        breakdown = []
+        for name, symbol in feed_symbols.items():
+            position_size = float(strategy.getpositionbyname(name).size)
+            breakdown.append(
+                SymbolBreakdown(
+                    symbol=symbol,
+                    bars_loaded=len(frames[symbol]),
+                    trade_stats=builder.build_trade_stats(symbol_results[name]),
+                    pnl_net=sum(record.pnl_net for record in trade_records if record.symbol == symbol),
+                    final_position_size=position_size,
+                    final_position_value=position_size * float(strategy.getdatabyname(name).close[0]),
+                )
+            )
+        return self._build_result(
+            request,
+            len(next(iter(aligned.values()))),
+            analyzer_results,
+            float(cerebro.broker.getvalue()),
+            tuple(trade_records),
+            symbol_breakdown=tuple(breakdown),
+        )
+
+    def _cache_key(
+        self,
+        request: BacktestRunRequest,
+        strategy_class: type[bt.Strategy],
+        params: Mapping[str, Any],
+        frames: Mapping[str, pd.DataFrame],
+        *,
+        warmup_bars: int = 0,
+    ) -> str | None:
+        if self._result_cache is None:
+            return None
+        settings: dict[str, Any] = {
+            "engine": self._engine_mode,
+            "data_read_source": self._data_read_source,
+            "initial_capital": self._initial_capital,
+            "commission_rate": self._commission_rate,
+            "slippage_rate": self._slippage_rate,
+            "analyzer_profile": self._analyzer_profile,
+        }
+        if warmup_bars:
+            settings["warmup_bars"] = warmup_bars
+        return result_cache_key(
+            strategy_class=strategy_class,
+            params=params,
+            timeframe=request.timeframe.strip(),
+            frames={symbol.strip().upper(): frame for symbol, frame in frames.items()},
+            settings=settings,
+        )
 
-        cerebro = bt.Cerebro(stdstats=False, tradehistory=True)
-        feed = self._feed_factory.build_feed(dataframe, request.timeframe)
-        cerebro.adddata(feed, name=f"{request.symbol}:{request.timeframe}")
+    def _cached_result(self, key: str | None) -> BacktestRunResult | None:
+        if key is None or self._result_cache is None:
+            return None
+        return self._result_cache.get(key)
+
+    def _store_result(self, key: str | None, result: BacktestRunResult) -> None:
+        if key is not None and self._result_cache is not None:
+            self._result_cache.put(key, result)
+
+    def _resolve_strategy(
+        self, request: BacktestRunRequest
+    ) -> tuple[type[bt.Strategy], dict[str, Any]]:
+        strategy_class = self._validate_strategy_class(request.strategy_class)
+        params = dict(request.strategy_params)
+        if self._param_resolver is not None:
+            params = self._param_resolver.resolve_for_class(strategy_class, params)
+        return strategy_class, params
+
+    def _build_cerebro(
+        self,
+        strategy_class: type[bt.Strategy],
+        params: Mapping[str, Any],
+        feeds: Mapping[str, bt.feed.DataBase],
+        *,
+        feed_symbols: Mapping[str, str] | None = None,
+        bounded: bool = False,
+        recorder: RunRecorder | None = None,
+        warmup_bars: int = 0,
+    ) -> tuple[bt.Cerebro, list[TradeRecord]]:
+        """Cerebro with the named feeds, the configured broker and standard analyzers.
+
+        Closed trades are appended to the returned list while the run progresses;
+        with ``feed_symbols`` (feed name -> symbol) each record carries its symbol.
+        ``bounded`` switches to the streaming setup of :meth:`run_streaming`;
+        ``recorder`` times the feeds, broker, strategy and analyzers. The
+        strategy's ``next`` is skipped on the first ``warmup_bars`` bars.
+        """
+        if bounded:
+            cerebro = bt.Cerebro(stdstats=False, tradehistory=True, preload=False, runonce=False, exactbars=1)
+        else:
+            cerebro = bt.Cerebro(stdstats=False, tradehistory=True)
+        for name, feed in feeds.items():
+            cerebro.adddata(feed, name=name)
         trade_records: list[TradeRecord] = []
 
         def _make_wrapper(base_class: type[bt.Strategy]) -> type[bt.Strategy]:
@@ -110,14 +615,44 @@ class BacktestEngine:
                     super().notify_trade(trade)
                     if not trade.isclosed:
                         return
-                    trade_records.append(BacktestEngine._build_trade_record(trade))
+                    symbol = feed_symbols.get(trade.data._name, "") if feed_symbols else ""
+                    trade_records.append(BacktestEngine._build_trade_record(trade, symbol))
+                    if bounded:
+                        # Backtrader keeps every Trade (and its history) for the whole run;
+                        # once recorded only the latest one per data/tradeid is still needed.
+                        _release_closed_trades(self, trade)
+
+                def clear(self) -> None:
+                    super().clear()
+                    if bounded:
+                        _release_finished_orders(self)
+
+                def next(self) -> None:
+                    # Indicators still update on warm-up bars; only the trading logic waits.
+                    if len(self) > warmup_bars:
+                        super().next()
+
+            if recorder is None:
+                return _TradeRecordWrapper
+
+            class _InstrumentedWrapper(_TradeRecordWrapper):
+                def start(self) -> None:
+                    super().start()
+                    recorder.instrument_analyzers(self.analyzers)
+
+                def _once(self) -> None:
+                    recorder.time_indicators(super()._once)
+
+                def next(self) -> None:
+                    recorder.time_next(super().next)
+
+                def notify_order(self, order: bt.Order) -> None:
+                    super().notify_order(order)
+                    recorder.count_order(order)
 
-            return _TradeRecordWrapper
+            return _InstrumentedWrapper
 
         wrapped_strategy = _make_wrapper(strategy_class)
-        params = dict(request.strategy_params)
-        if self._param_resolver is not None:
-            params = self._param_resolver.resolve_for_class(strategy_class, params)
         cerebro.addstrategy(wrapped_strategy, **params)
 
         cerebro.broker.setcash(self._initial_capital)
@@ -125,27 +660,72 @@ class BacktestEngine:
         if self._slippage_rate > 0:
             cerebro.broker.set_slippage_perc(perc=self._slippage_rate)
 
-        AnalyzerMount.attach_analyzers(cerebro)
+        intraday = any(feed.p.timeframe < bt.TimeFrame.Days for feed in feeds.values())
+        AnalyzerMount.attach_analyzers(
+            cerebro,
+            time_return_timeframe=bt.TimeFrame.Days if bounded and intraday else None,
+            profile=self._run_analyzer_profile(warmup_bars),
+        )
+        if recorder is not None:
+            recorder.instrument_cerebro(cerebro, feeds.values())
+        return cerebro, trade_records
 
-        strategies = cerebro.run()
+    def _extract_results(
+        self,
+        strategies: list[bt.Strategy],
+        trade_records: list[TradeRecord],
+        timeframe: str,
+        *,
+        bounded: bool = False,
+        warmup_bars: int = 0,
+    ) -> dict[str, Any]:
+        """Read the mounted analyzers, or compute their results from the recorded values."""
+        profile = self._run_analyzer_profile(warmup_bars)
+        if profile == "full":
+            return AnalyzerMount.extract_results(strategies)
+        timeframe = timeframe.strip()
+        intraday = parse_timeframe(timeframe)[1] in {"m", "h"}
+        return AnalyzerMount.extract_value_results(
+            strategies,
+            profile=profile,
+            timeframe=timeframe,
+            initial_capital=self._initial_capital,
+            closed_pnls=[record.pnl_net for record in trade_records],
+            time_return_timeframe="1d" if bounded and intraday else None,
+            skip_bars=warmup_bars,
+        )
 
-        # Extract analyzer results (step 27)
-        analyzer_results = AnalyzerMount.extract_results(strategies)
+    def _run_analyzer_profile(self, warmup_bars: int) -> str:
+        # Backtrader's analyzers cannot leave out warm-up bars, so ``full``
+        # falls back to the equivalent post-hoc metrics of ``standard``.
+        if warmup_bars and self._analyzer_profile == "full":
+            return "standard"
+        return self._analyzer_profile
 
+    def _build_result(
+        self,
+        request: BacktestRunRequest,
+        bars_processed: int,
+        analyzer_results: Mapping[str, Any],
+        final_value: float,
+        trade_log: tuple[TradeRecord, ...],
+        *,
+        symbol_breakdown: tuple[SymbolBreakdown, ...] = (),
+    ) -> BacktestRunResult:
         # Build unified result structure
-        final_value = float(cerebro.broker.getvalue())
         pnl = final_value - self._initial_capital
         total_return_pct = (pnl / self._initial_capital) * 100.0
 
         # Use AnalyzerResultBuilder to transform raw analyzer outputs
         builder = AnalyzerResultBuilder()
         trade_stats = builder.build_trade_stats(analyzer_results["trades"])
+        returns_analysis = builder.build_returns_analysis(analyzer_results["returns"])
+        time_series_returns = builder.build_time_series(analyzer_results["timereturns"])
         risk_metrics = builder.build_risk_metrics(
             analyzer_results["sharpe"],
             analyzer_results["drawdown"],
+            returns=time_series_returns,
         )
-        returns_analysis = builder.build_returns_analysis(analyzer_results["returns"])
-        time_series_returns = builder.build_time_series(analyzer_results["timereturns"])
 
         return BacktestRunResult(
             symbol=request.symbol.strip().upper(),
@@ -155,16 +735,17 @@ class BacktestEngine:
             final_value=final_value,
             pnl=pnl,
             total_return_pct=total_return_pct,
-            bars_processed=len(dataframe),
+            bars_processed=bars_processed,
             trade_stats=trade_stats,
             risk_metrics=risk_metrics,
             returns_analysis=returns_analysis,
             time_series_returns=time_series_returns,
-            trade_log=tuple(trade_records),
+            trade_log=trade_log,
+            symbol_breakdown=symbol_breakdown,
         )
 
     @staticmethod
-    def _build_trade_record(trade: bt.Trade) -> TradeRecord:
+    def _build_trade_record(trade: bt.Trade, symbol: str = "") -> TradeRecord:
         entry_dt = bt.num2date(trade.dtopen)
         exit_dt = bt.num2date(trade.dtclose)
         entry_price, exit_price, total_size = (
@@ -179,6 +760,7 @@ class BacktestEngine:
             exit_price=exit_price,
             pnl_gross=float(trade.pnl),
             pnl_net=float(trade.pnlcomm),
+            symbol=symbol,
         )
 
     @staticmethod
@@ -229,6 +811,13 @@ class BacktestEngine:
         total_size = open_size if open_size > 0 else close_size
         return entry_price, exit_price, total_size
 
+    @staticmethod
+    def _require_single_symbol(request: BacktestRunRequest) -> None:
+        if len(request.portfolio_symbols) > 1:
+            raise BacktestEngineError(
+                "multi-symbol requests run through run() / run_portfolio(), not a single candle frame"
+            )
+
     @staticmethod
     def _validate_strategy_class(
         strategy_class: type[bt.Strategy],
@@ -246,13 +835,51 @@ class BacktestEngine:
         if not isinstance(data_read_source, str) or not data_read_source.strip():
             raise BacktestEngineError("data_read_source must not be empty")
         normalized = data_read_source.strip().lower()
-        if normalized != "sqlite":
+        if normalized not in ALLOWED_DATA_READ_SOURCES:
             raise BacktestEngineError(
-                "backtest.data_read_source must be 'sqlite' "
+                f"backtest.data_read_source must be one of {sorted(ALLOWED_DATA_READ_SOURCES)} "
                 "(CSV/Parquet runtime reads are not allowed)"
             )
         return normalized
 
+    @staticmethod
+    def _validate_memory_mode(memory_mode: str) -> str:
+        if not isinstance(memory_mode, str) or not memory_mode.strip():
+            raise BacktestEngineError("memory_mode must not be empty")
+        normalized = memory_mode.strip().lower()
+        if normalized not in ALLOWED_MEMORY_MODES:
+            raise BacktestEngineError(
+                f"backtest.memory_mode must be one of {sorted(ALLOWED_MEMORY_MODES)}"
+            )
+        return normalized
+
+    @staticmethod
+    def _validate_warmup_bars(warmup_bars: int, bars: int) -> None:
+        if isinstance(warmup_bars, bool) or not isinstance(warmup_bars, int) or not 0 <= warmup_bars < max(bars, 1):
+            raise BacktestEngineError(f"warmup_bars must be an integer within [0, {bars})")
+
+    @staticmethod
+    def _validate_analyzer_profile(analyzer_profile: str) -> str:
+        if not isinstance(analyzer_profile, str) or not analyzer_profile.strip():
+            raise BacktestEngineError("analyzer_profile must not be empty")
+        normalized = analyzer_profile.strip().lower()
+        if normalized not in ALLOWED_ANALYZER_PROFILES:
+            raise BacktestEngineError(
+                f"backtest.analyzer_profile must be one of {sorted(ALLOWED_ANALYZER_PROFILES)}"
+            )
+        return normalized
+
+    @staticmethod
+    def _validate_engine_mode(engine_mode: str) -> str:
+        if not isinstance(engine_mode, str) or not engine_mode.strip():
+            raise BacktestEngineError("engine_mode must not be empty")
+        normalized = engine_mode.strip().lower()
+        if normalized not in ALLOWED_BACKTEST_ENGINES:
+            raise BacktestEngineError(
+                f"backtest.engine must be one of {sorted(ALLOWED_BACKTEST_ENGINES)}"
+            )
+        return normalized
+
     @staticmethod
     def _validate_positive_number(value: float, label: str) -> float:
         if not isinstance(value, (int, float)) or isinstance(value, bool):
@@ -282,6 +909,22 @@ class BacktestEngine:
             raise BacktestEngineError(f"{'.'.join(path)} must be a number")
         return float(current)
 
+    @staticmethod
+    def _read_optional_int(
+        config: Mapping[str, Any],
+        path: tuple[str, ...],
+        *,
+        default: int,
+    ) -> int:
+        current: Any = config
+        for key in path:
+            if not isinstance(current, Mapping) or key not in current:
+                return default
+            current = current[key]
+        if not isinstance(current, int) or isinstance(current, bool) or current < 0:
+            raise BacktestEngineError(f"{'.'.join(path)} must be an integer >= 0")
+        return current
+
     @staticmethod
     def _read_optional_string(
         config: Mapping[str, Any],
@@ -297,3 +940,41 @@ class BacktestEngine:
         if not isinstance(current, str):
             raise BacktestEngineError(f"{'.'.join(path)} must be a string")
         return current
+
+
+def _release_finished_orders(strategy: bt.Strategy) -> None:
+    """Drop finished orders from the lists backtrader archives every order in.
+
+    Used in bounded memory mode after each bar's notifications have been
+    archived. The strategy keeps one clone per status change, so its archive is
+    filtered by the ``ref`` of the orders the broker still works on. Only
+    ``BackBroker``'s layout is touched: when an attribute is missing or has
+    another shape (a different broker or backtrader version) it is left alone.
+    """
+    broker = strategy.broker
+    orders = getattr(broker, "orders", None)
+    archive = getattr(strategy, "_orders", None)
+    if not isinstance(orders, list) or not isinstance(archive, list):
+        return
+    broker.orders = [order for order in orders if order.alive()]
+    children = getattr(broker, "_pchildren", None)
+    if isinstance(children, dict):
+        # A bracket's entry goes once none of its parent/children can still fill.
+        for ref in [ref for ref, group in children.items() if not any(item.alive() for item in group)]:
+            del children[ref]
+    open_refs = {order.ref for order in broker.orders}
+    strategy._orders = [item for item in archive if item.ref in open_refs]
+
+
+def _release_closed_trades(strategy: bt.Strategy, trade: bt.Trade) -> None:
+    """Keep only the latest trade per data/tradeid in the strategy's trade archive.
+
+    A no-op when backtrader's ``_trades`` layout is not the expected
+    data -> tradeid -> list mapping.
+    """
+    trades = getattr(strategy, "_trades", None)
+    if not isinstance(trades, dict):
+        return
+    history = trades.get(trade.data, {}).get(trade.tradeid)
+    if isinstance(history, list):
+        del history[:-1]
@@ -8,6 +8,8 @@ from dataclasses import asdict
 from pathlib import Path
 from typing import Any
 
+from src.backtest.instrumentation import BacktestProfile
+from src.backtest.monte_carlo import MonteCarloSummary
 from src.backtest.result_models import BacktestRunResult, TradeRecord  # noqa: F401
 
 
@@ -73,7 +75,7 @@ class BacktestResultExporter:
             "symbol": result.symbol,
             "timeframe": result.timeframe,
             "initial_capital": result.initial_capital,
-            "time_series": result.time_series_returns,
+            "time_series": result.time_series_returns.to_dict(),
         }
         
         try:
@@ -96,8 +98,7 @@ class BacktestResultExporter:
             with open(output_path, "w", encoding="utf-8", newline="") as f:
                 writer = csv.writer(f)
                 writer.writerow(["Timestamp", "Return"])
-                for timestamp, return_value in sorted(result.time_series_returns.items()):
-                    writer.writerow([timestamp, return_value])
+                writer.writerows(result.time_series_returns.items())
         except (OSError, TypeError) as exc:
             raise BacktestExporterError(f"Failed to export equity curve CSV: {exc}") from exc
         
@@ -137,9 +138,42 @@ class BacktestResultExporter:
                 f"trade_log{suffix}.csv",
             ),
         }
+        if result.profile is not None:
+            paths.update(self.export_profile(result.profile, prefix))
 
         return paths
 
+    def export_profile(self, profile: BacktestProfile, prefix: str = "") -> dict[str, Path]:
+        """Export stage timings (JSON) and, when cProfile ran, the hotspot table and collapsed stacks."""
+        suffix = f"_{prefix}" if prefix else ""
+        paths = {"profile_json": self._output_dir / f"backtest_profile{suffix}.json"}
+        if profile.hotspots:
+            paths["hotspots_txt"] = self._output_dir / f"backtest_hotspots{suffix}.txt"
+            paths["collapsed_stacks"] = self._output_dir / f"backtest_profile{suffix}.collapsed"
+        try:
+            with open(paths["profile_json"], "w", encoding="utf-8") as f:
+                json.dump(profile.to_dict(), f, indent=2, ensure_ascii=False)
+            if profile.hotspots:
+                paths["hotspots_txt"].write_text(profile.hotspot_table(), encoding="utf-8")
+                paths["collapsed_stacks"].write_text(profile.collapsed_text(), encoding="utf-8")
+        except (OSError, TypeError) as exc:
+            raise BacktestExporterError(f"Failed to export backtest profile: {exc}") from exc
+        return paths
+
+    def export_monte_carlo_json(
+        self,
+        summary: MonteCarloSummary,
+        filename: str = "monte_carlo.json",
+    ) -> Path:
+        """Export a Monte Carlo trade-sequence summary to JSON."""
+        output_path = self._output_dir / filename
+        try:
+            with open(output_path, "w", encoding="utf-8") as f:
+                json.dump(summary.to_dict(), f, indent=2, ensure_ascii=False)
+        except (OSError, TypeError) as exc:
+            raise BacktestExporterError(f"Failed to export Monte Carlo JSON: {exc}") from exc
+        return output_path
+
     def export_trade_log_json(
         self,
         result: BacktestRunResult,
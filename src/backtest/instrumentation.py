@@ -0,0 +1,354 @@
+"""Optional per-stage timing and cProfile hooks for ``BacktestEngine`` runs.
+
+A :class:`RunRecorder` accumulates wall-clock seconds per stage of one run:
+loading the candle frame, building the feed and Cerebro, then, inside
+``cerebro.run()``, the feed's bar loading, ``once()`` indicator passes, the
+strategy's ``next()``, ``broker.next()`` and every mounted analyzer. What
+is left of ``cerebro.run()`` (line bookkeeping, notifications) is reported
+as ``cerebro_other``. Every ``next()`` call is timed and every
+``next_sample_every``-th duration kept for percentiles.
+
+The hooks wrap instance methods of the run's own objects, so they cost
+nothing when profiling is off. With ``cprofile`` on, the whole run executes
+under ``cProfile``; stage timings then include its overhead, and only their
+proportions should be compared.
+"""
+
+from __future__ import annotations
+
+import cProfile
+import pstats
+import time
+from array import array
+from collections import defaultdict
+from collections.abc import Callable, Iterable, Iterator
+from contextlib import contextmanager, nullcontext
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any, ContextManager
+
+import numpy as np
+
+_CEREBRO_RUN = "cerebro_run"
+# Stages measured inside ``cerebro.run()``; the remainder becomes ``cerebro_other``.
+_INNER_STAGES = ("feed_load", "indicators", "strategy_next", "broker", "analyzers")
+_STAGE_ORDER = (
+    "load_dataframe",
+    "build_feed",
+    "build_cerebro",
+    *_INNER_STAGES,
+    "cerebro_other",
+    "vectorized",
+    "extract_results",
+    "build_result",
+)
+_ANALYZER_HOOKS = (
+    "_prenext",
+    "_nextstart",
+    "_next",
+    "_notify_cashvalue",
+    "_notify_fund",
+    "_notify_order",
+    "_notify_trade",
+)
+_NEXT_PERCENTILES = (50.0, 95.0, 99.0)
+# Collapsed-stack branches below this share of the profiled time are dropped.
+_MIN_STACK_SHARE = 1e-4
+
+
+class InstrumentationError(RuntimeError):
+    """Raised when profiling options are invalid."""
+
+
+@dataclass(frozen=True)
+class ProfilingOptions:
+    """What an instrumented ``BacktestEngine`` run records."""
+
+    cprofile: bool = False
+    top_n: int = 25
+    next_sample_every: int = 10
+
+    def __post_init__(self) -> None:
+        for name in ("top_n", "next_sample_every"):
+            value = getattr(self, name)
+            if isinstance(value, bool) or not isinstance(value, int) or value <= 0:
+                raise InstrumentationError(f"{name} must be a positive integer")
+
+
+@dataclass(frozen=True)
+class Hotspot:
+    """One function of the cProfile table, ordered by own (``tottime``) seconds."""
+
+    function: str
+    calls: int
+    primitive_calls: int
+    total_seconds: float
+    cumulative_seconds: float
+
+
+@dataclass(frozen=True)
+class BacktestProfile:
+    """Stage timings, counters and optional cProfile output of one run."""
+
+    engine: str
+    total_seconds: float
+    stage_seconds: dict[str, float]
+    analyzer_seconds: dict[str, float]
+    bars: int
+    trades: int
+    orders_completed: int
+    orders_rejected: int  # canceled, margin, rejected or expired
+    next_calls: int
+    next_sample_every: int
+    next_latency_us: dict[str, float]  # mean / p50 / p95 / p99 / max of sampled calls
+    hotspots: tuple[Hotspot, ...] = ()
+    collapsed_stacks: tuple[str, ...] = ()  # "frame;frame;frame microseconds"
+
+    def to_dict(self) -> dict[str, Any]:
+        """JSON-serializable form; collapsed stacks are left to :meth:`collapsed_text`."""
+        return {
+            "engine": self.engine,
+            "total_seconds": self.total_seconds,
+            "stage_seconds": dict(self.stage_seconds),
+            "analyzer_seconds": dict(self.analyzer_seconds),
+            "bars": self.bars,
+            "trades": self.trades,
+            "orders_completed": self.orders_completed,
+            "orders_rejected": self.orders_rejected,
+            "next_calls": self.next_calls,
+            "next_sample_every": self.next_sample_every,
+            "next_latency_us": dict(self.next_latency_us),
+            "hotspots": [
+                {
+                    "function": hotspot.function,
+                    "calls": hotspot.calls,
+                    "primitive_calls": hotspot.primitive_calls,
+                    "total_seconds": hotspot.total_seconds,
+                    "cumulative_seconds": hotspot.cumulative_seconds,
+                }
+                for hotspot in self.hotspots
+            ],
+        }
+
+    def hotspot_table(self) -> str:
+        """Fixed-width top-N table in the spirit of ``pstats.print_stats``."""
+        lines = [f"{'ncalls':>12} {'tottime':>10} {'cumtime':>10}  function"]
+        for hotspot in self.hotspots:
+            calls = (
+                str(hotspot.calls)
+                if hotspot.calls == hotspot.primitive_calls
+                else f"{hotspot.calls}/{hotspot.primitive_calls}"
+            )
+            lines.append(
+                f"{calls:>12} {hotspot.total_seconds:>10.4f} {hotspot.cumulative_seconds:>10.4f}  {hotspot.function}"
+            )
+        return "\n".join(lines) + "\n"
+
+    def collapsed_text(self) -> str:
+        """Collapsed stacks, one per line, as consumed by ``flamegraph.pl`` or speedscope."""
+        return "".join(f"{line}\n" for line in self.collapsed_stacks)
+
+
+class RunRecorder:
+    """Collects the measurements of one run; see the module docstring."""
+
+    def __init__(
+        self,
+        options: ProfilingOptions,
+        *,
+        engine: str,
+        clock: Callable[[], float] = time.perf_counter,
+    ) -> None:
+        self._options = options
+        self._engine = engine
+        self._clock = clock
+        self._stages: dict[str, float] = defaultdict(float)
+        self._analyzers: dict[str, float] = defaultdict(float)
+        self._next_calls = 0
+        self._next_samples = array("d")
+        self._orders_completed = 0
+        self._orders_rejected = 0
+        self._profiler: cProfile.Profile | None = None
+        self._started = clock()
+
+    @contextmanager
+    def stage(self, name: str) -> Iterator[None]:
+        started = self._clock()
+        try:
+            yield
+        finally:
+            self._stages[name] += self._clock() - started
+
+    @contextmanager
+    def profiling(self) -> Iterator[None]:
+        """Run the enclosed block under cProfile when ``options.cprofile`` is set."""
+        if not self._options.cprofile:
+            yield
+            return
+        self._profiler = cProfile.Profile()
+        self._profiler.enable()
+        try:
+            yield
+        finally:
+            self._profiler.disable()
+
+    def wrap(self, owner: object, method: str, stage: str, *, bucket: dict[str, float] | None = None) -> None:
+        """Replace ``owner.method`` by a version that adds its duration to ``stage``."""
+        original = getattr(owner, method)
+        clock = self._clock
+        totals = self._stages if bucket is None else bucket
+
+        def timed(*args: Any, **kwargs: Any) -> Any:
+            started = clock()
+            try:
+                return original(*args, **kwargs)
+            finally:
+                totals[stage] += clock() - started
+
+        setattr(owner, method, timed)
+
+    def instrument_cerebro(self, cerebro: Any, feeds: Iterable[Any]) -> None:
+        """Time bar loading of every feed and the broker's per-bar step."""
+        for feed in feeds:
+            self.wrap(feed, "load", "feed_load")
+        self.wrap(cerebro.broker, "next", "broker")
+
+    def instrument_analyzers(self, analyzers: Any) -> None:
+        """Time every hook backtrader calls on each named analyzer (``strategy.analyzers``)."""
+        for name, analyzer in zip(analyzers.getnames(), analyzers):
+            for hook in _ANALYZER_HOOKS:
+                if hasattr(analyzer, hook):
+                    self.wrap(analyzer, hook, name, bucket=self._analyzers)
+
+    def time_indicators(self, call: Callable[[], Any]) -> Any:
+        with self.stage("indicators"):
+            return call()
+
+    def time_next(self, call: Callable[[], Any]) -> Any:
+        started = self._clock()
+        try:
+            return call()
+        finally:
+            elapsed = self._clock() - started
+            self._stages["strategy_next"] += elapsed
+            if self._next_calls % self._options.next_sample_every == 0:
+                self._next_samples.append(elapsed)
+            self._next_calls += 1
+
+    def count_order(self, order: Any) -> None:
+        if order.status == order.Completed:
+            self._orders_completed += 1
+        elif order.status in (order.Canceled, order.Margin, order.Rejected, order.Expired):
+            self._orders_rejected += 1
+
+    def finish(self, *, bars: int, trades: int) -> BacktestProfile:
+        total = self._clock() - self._started
+        stages = dict(self._stages)
+        stages["analyzers"] = sum(self._analyzers.values())
+        if _CEREBRO_RUN in stages:
+            inner = sum(stages.get(name, 0.0) for name in _INNER_STAGES)
+            stages["cerebro_other"] = max(stages.pop(_CEREBRO_RUN) - inner, 0.0)
+        ordered = {name: stages[name] for name in _STAGE_ORDER if stages.get(name)}
+        hotspots: tuple[Hotspot, ...] = ()
+        stacks: tuple[str, ...] = ()
+        if self._profiler is not None:
+            raw = pstats.Stats(self._profiler).stats  # type: ignore[attr-defined]
+            hotspots = _hotspots(raw, self._options.top_n)
+            stacks = _collapsed_stacks(raw)
+        return BacktestProfile(
+            engine=self._engine,
+            total_seconds=total,
+            stage_seconds=ordered,
+            analyzer_seconds=dict(self._analyzers),
+            bars=bars,
+            trades=trades,
+            orders_completed=self._orders_completed,
+            orders_rejected=self._orders_rejected,
+            next_calls=self._next_calls,
+            next_sample_every=self._options.next_sample_every,
+            next_latency_us=_latency_summary(self._next_samples),
+            hotspots=hotspots,
+            collapsed_stacks=stacks,
+        )
+
+
+def timed_stage(recorder: RunRecorder | None, name: str) -> ContextManager[None]:
+    """``recorder.stage(name)``, or a no-op when the run is not instrumented."""
+    return nullcontext() if recorder is None else recorder.stage(name)
+
+
+def _latency_summary(samples: array) -> dict[str, float]:
+    if not samples:
+        return {}
+    values = np.frombuffer(samples, dtype=np.float64) * 1e6
+    summary = {"mean": float(values.mean())}
+    for percentile, value in zip(_NEXT_PERCENTILES, np.percentile(values, _NEXT_PERCENTILES).tolist()):
+        summary[f"p{percentile:g}"] = value
+    summary["max"] = float(values.max())
+    return summary
+
+
+_FunctionKey = tuple[str, int, str]
+
+
+def _label(function: _FunctionKey) -> str:
+    filename, lineno, name = function
+    if filename == "~":  # built-ins
+        return name.replace(";", ",")
+    return f"{Path(filename).stem}:{name}:{lineno}".replace(";", ",")
+
+
+def _hotspots(raw: dict[_FunctionKey, tuple], top_n: int) -> tuple[Hotspot, ...]:
+    ranked = sorted(raw.items(), key=lambda item: item[1][2], reverse=True)[:top_n]
+    return tuple(
+        Hotspot(
+            function=_label(function),
+            calls=int(calls),
+            primitive_calls=int(primitive),
+            total_seconds=float(own),
+            cumulative_seconds=float(cumulative),
+        )
+        for function, (primitive, calls, own, cumulative, _callers) in ranked
+    )
+
+
+def _collapsed_stacks(raw: dict[_FunctionKey, tuple]) -> tuple[str, ...]:
+    """Rebuild approximate stacks from cProfile's caller -> callee edges.
+
+    cProfile keeps one level of call context, so a function's time under a
+    given caller is split among its own callees in proportion to their
+    cumulative time from it. Recursion is cut at the first repeated frame.
+    """
+    callees: dict[_FunctionKey, list[tuple[_FunctionKey, float]]] = defaultdict(list)
+    for function, (*_counts, callers) in raw.items():
+        for caller, edge in callers.items():
+            callees[caller].append((function, float(edge[3])))
+    roots = [(function, float(stats[3])) for function, stats in raw.items() if not stats[4]]
+    floor = sum(seconds for _, seconds in roots) * _MIN_STACK_SHARE
+    totals: dict[str, float] = defaultdict(float)
+
+    def walk(function: _FunctionKey, seconds: float, path: tuple[_FunctionKey, ...], labels: str) -> None:
+        cumulative = float(raw[function][3])
+        scale = seconds / cumulative if cumulative > 0 else 0.0
+        children = [
+            (child, edge_seconds * scale)
+            for child, edge_seconds in callees.get(function, ())
+            if child not in path and child in raw
+        ]
+        own = seconds - sum(child_seconds for _, child_seconds in children)
+        if own > 0:
+            totals[labels] += own
+        for child, child_seconds in children:
+            if child_seconds >= floor:
+                walk(child, child_seconds, (*path, child), f"{labels};{_label(child)}")
+            elif child_seconds > 0:
+                totals[labels] += child_seconds
+
+    for root, seconds in roots:
+        if seconds >= floor:
+            walk(root, seconds, (root,), _label(root))
+    return tuple(
+        f"{stack} {round(seconds * 1e6)}"
+        for stack, seconds in sorted(totals.items())
+        if round(seconds * 1e6) > 0
+    )
@@ -0,0 +1,210 @@
+"""Monte Carlo robustness check over a backtest's closed-trade PnL sequence.
+
+Every path replays the ``TradeRecord.pnl_net`` values from the initial
+capital, either reordered (``shuffle``) or drawn with replacement
+(``bootstrap``). Paths are simulated as NumPy matrices in chunks that fit a
+fixed memory budget; with several workers the chunks run in a process pool.
+Each chunk draws from its own child of one ``SeedSequence``, so the outcome
+depends on the seed and chunk size but not on the worker count.
+
+Drawdowns are measured on closed-trade equity, which is coarser than the
+bar-level ``RiskMetrics.max_drawdown_pct``; the observed trade order is
+measured the same way for comparison.
+"""
+
+from __future__ import annotations
+
+import multiprocessing
+import time
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass
+from typing import Any, Callable
+
+import numpy as np
+
+from src.backtest.result_models import BacktestRunResult, RiskMetrics
+from src.backtest.sweep import ParameterSweepError, resolve_worker_count
+
+MONTE_CARLO_METHODS = ("bootstrap", "shuffle")
+PERCENTILES = (5.0, 25.0, 50.0, 75.0, 95.0)
+DEFAULT_RUIN_DRAWDOWN_PCT = 50.0
+# paths x trades cells simulated per chunk (~32 MB per float64 matrix)
+DEFAULT_CHUNK_CELLS = 4_000_000
+
+
+class MonteCarloError(RuntimeError):
+    """Raised when a Monte Carlo simulation cannot run for the given result or settings."""
+
+
+@dataclass(frozen=True)
+class MonteCarloSummary:
+    """Distribution of total return and max drawdown over all simulated paths."""
+
+    method: str
+    paths: int
+    trades: int
+    seed: int
+    initial_capital: float
+    ruin_drawdown_pct: float
+    return_percentiles: dict[float, float]  # percentile -> total return %
+    drawdown_percentiles: dict[float, float]  # percentile -> max drawdown %
+    mean_return_pct: float
+    probability_of_loss: float
+    probability_of_ruin: float  # share of paths whose drawdown reached ruin_drawdown_pct
+    observed_return_pct: float  # closed-trade equity, original order
+    observed_drawdown_pct: float
+    risk_metrics: RiskMetrics  # bar-level metrics of the backtest itself
+    workers: int
+    chunks: int
+    elapsed_seconds: float
+
+    @property
+    def paths_per_second(self) -> float:
+        return self.paths / self.elapsed_seconds if self.elapsed_seconds > 0 else 0.0
+
+    def to_dict(self) -> dict[str, Any]:
+        """Return a JSON-serializable dict (percentile keys become ``p5``/``p50``/...)."""
+        return {
+            "method": self.method,
+            "paths": self.paths,
+            "trades": self.trades,
+            "seed": self.seed,
+            "initial_capital": self.initial_capital,
+            "ruin_drawdown_pct": self.ruin_drawdown_pct,
+            "total_return_pct": {_percentile_key(key): value for key, value in self.return_percentiles.items()},
+            "max_drawdown_pct": {_percentile_key(key): value for key, value in self.drawdown_percentiles.items()},
+            "mean_return_pct": self.mean_return_pct,
+            "probability_of_loss": self.probability_of_loss,
+            "probability_of_ruin": self.probability_of_ruin,
+            "observed": {
+                "total_return_pct": self.observed_return_pct,
+                "max_drawdown_pct": self.observed_drawdown_pct,
+            },
+            "risk_metrics": {
+                "sharpe_ratio": self.risk_metrics.sharpe_ratio,
+                "max_drawdown_pct": self.risk_metrics.max_drawdown_pct,
+                "max_drawdown_duration_days": self.risk_metrics.max_drawdown_duration_days,
+                "sortino_ratio": self.risk_metrics.sortino_ratio,
+            },
+            "workers": self.workers,
+            "chunks": self.chunks,
+            "elapsed_seconds": self.elapsed_seconds,
+        }
+
+
+def simulate_paths(
+    pnl: np.ndarray,
+    initial_capital: float,
+    *,
+    paths: int,
+    method: str,
+    seed: np.random.SeedSequence | int,
+) -> tuple[np.ndarray, np.ndarray]:
+    """Simulate ``paths`` trade sequences; return per-path total return % and max drawdown %."""
+    rng = np.random.default_rng(seed)
+    if method == "bootstrap":
+        sampled = pnl[rng.integers(0, pnl.size, size=(paths, pnl.size))]
+    else:
+        sampled = np.tile(pnl, (paths, 1))
+        rng.permuted(sampled, axis=1, out=sampled)
+    return _equity_stats(sampled, initial_capital)
+
+
+class MonteCarloSimulator:
+    """Resample a result's trade PnL thousands of times, chunked across processes."""
+
+    def __init__(
+        self,
+        *,
+        workers: int | None = None,
+        chunk_cells: int = DEFAULT_CHUNK_CELLS,
+        mp_start_method: str = "spawn",
+        clock: Callable[[], float] = time.perf_counter,
+    ) -> None:
+        try:
+            resolve_worker_count(workers, 1)
+        except ParameterSweepError as exc:
+            raise MonteCarloError(str(exc)) from exc
+        if chunk_cells <= 0:
+            raise MonteCarloError("chunk_cells must be > 0")
+        self._workers = workers
+        self._chunk_cells = chunk_cells
+        self._mp_start_method = mp_start_method
+        self._clock = clock
+
+    def run(
+        self,
+        result: BacktestRunResult,
+        *,
+        paths: int,
+        method: str = "bootstrap",
+        seed: int = 0,
+        ruin_drawdown_pct: float = DEFAULT_RUIN_DRAWDOWN_PCT,
+    ) -> MonteCarloSummary:
+        if method not in MONTE_CARLO_METHODS:
+            raise MonteCarloError(f"method must be one of {list(MONTE_CARLO_METHODS)}")
+        if isinstance(paths, bool) or not isinstance(paths, int) or paths <= 0:
+            raise MonteCarloError("paths must be a positive integer")
+        if not 0.0 < ruin_drawdown_pct <= 100.0:
+            raise MonteCarloError("ruin_drawdown_pct must be within (0, 100]")
+        pnl = np.fromiter((record.pnl_net for record in result.trade_log), dtype=np.float64)
+        if pnl.size < 2:
+            raise MonteCarloError("Monte Carlo needs at least 2 closed trades")
+
+        started = self._clock()
+        chunk_paths = max(1, self._chunk_cells // pnl.size)
+        sizes = [min(chunk_paths, paths - offset) for offset in range(0, paths, chunk_paths)]
+        seeds = np.random.SeedSequence(seed).spawn(len(sizes))
+        tasks = [(pnl, result.initial_capital, size, method, child) for size, child in zip(sizes, seeds)]
+        workers = resolve_worker_count(self._workers, len(tasks))
+        if workers == 1:
+            outcomes = [_simulate_task(task) for task in tasks]
+        else:
+            with ProcessPoolExecutor(
+                max_workers=workers,
+                mp_context=multiprocessing.get_context(self._mp_start_method),
+            ) as pool:
+                outcomes = list(pool.map(_simulate_task, tasks))
+        returns_pct = np.concatenate([outcome[0] for outcome in outcomes])
+        drawdowns_pct = np.concatenate([outcome[1] for outcome in outcomes])
+        observed_return, observed_drawdown = _equity_stats(pnl[np.newaxis, :], result.initial_capital)
+
+        return MonteCarloSummary(
+            method=method,
+            paths=paths,
+            trades=int(pnl.size),
+            seed=seed,
+            initial_capital=result.initial_capital,
+            ruin_drawdown_pct=float(ruin_drawdown_pct),
+            return_percentiles=dict(zip(PERCENTILES, np.percentile(returns_pct, PERCENTILES).tolist())),
+            drawdown_percentiles=dict(zip(PERCENTILES, np.percentile(drawdowns_pct, PERCENTILES).tolist())),
+            mean_return_pct=float(returns_pct.mean()),
+            probability_of_loss=float(np.mean(returns_pct < 0.0)),
+            probability_of_ruin=float(np.mean(drawdowns_pct >= ruin_drawdown_pct)),
+            observed_return_pct=float(observed_return[0]),
+            observed_drawdown_pct=float(observed_drawdown[0]),
+            risk_metrics=result.risk_metrics,
+            workers=workers,
+            chunks=len(tasks),
+            elapsed_seconds=self._clock() - started,
+        )
+
+
+def _simulate_task(
+    task: tuple[np.ndarray, float, int, str, np.random.SeedSequence],
+) -> tuple[np.ndarray, np.ndarray]:
+    pnl, initial_capital, paths, method, seed = task
+    return simulate_paths(pnl, initial_capital, paths=paths, method=method, seed=seed)
+
+
+def _equity_stats(pnl_paths: np.ndarray, initial_capital: float) -> tuple[np.ndarray, np.ndarray]:
+    """Total return % and max drawdown % (capped at 100) of each row of trade PnL."""
+    equity = initial_capital + np.cumsum(pnl_paths, axis=1)
+    peak = np.maximum.accumulate(equity, axis=1)
+    np.maximum(peak, initial_capital, out=peak)
+    drawdowns = np.minimum(((peak - equity) / peak).max(axis=1) * 100.0, 100.0)
+    return (equity[:, -1] / initial_capital - 1.0) * 100.0, drawdowns
+
+
+def _percentile_key(value: float) -> str:
+    return f"p{value:g}"
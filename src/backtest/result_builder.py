@@ -2,9 +2,10 @@
 
 from __future__ import annotations
 
-from typing import Any
+from typing import Any, Mapping
 
-from src.backtest.result_models import ReturnsAnalysis, RiskMetrics, TradeStatistics
+from src.backtest.result_models import ReturnsAnalysis, RiskMetrics, TimeSeries, TradeStatistics
+from src.backtest.value_metrics import sortino_ratio
 
 
 class AnalyzerResultBuilder:
@@ -70,15 +71,19 @@ class AnalyzerResultBuilder:
     def build_risk_metrics(
         sharpe_analysis: dict[str, Any],
         drawdown_analysis: dict[str, Any],
+        *,
+        returns: TimeSeries | None = None,
     ) -> RiskMetrics:
         """Transform Sharpe and DrawDown analyzer outputs into RiskMetrics (step 27).
 
         Args:
             sharpe_analysis: Raw output from bt.analyzers.SharpeRatio
             drawdown_analysis: Raw output from bt.analyzers.DrawDown
+            returns: Period returns the Sortino ratio is computed from, if any
 
         Returns:
-            RiskMetrics with sharpe_ratio (may be None), max_drawdown, and duration
+            RiskMetrics with sharpe_ratio and sortino_ratio (may be None),
+            max_drawdown, and duration
         """
         # Sharpe ratio may be None if insufficient data or zero variance
         sharpe_ratio = sharpe_analysis.get("sharperatio", None)
@@ -90,6 +95,7 @@ class AnalyzerResultBuilder:
             sharpe_ratio=sharpe_ratio,
             max_drawdown_pct=max_dd_pct,
             max_drawdown_duration_days=max_dd_len,
+            sortino_ratio=sortino_ratio(returns) if returns is not None else None,
         )
 
     @staticmethod
@@ -111,19 +117,17 @@ class AnalyzerResultBuilder:
         )
 
     @staticmethod
-    def build_time_series(timereturns_analysis: dict[Any, Any]) -> dict[str, float]:
-        """Transform TimeReturn analyzer output into ISO date -> return dict (step 27).
+    def build_time_series(timereturns_analysis: Mapping[Any, Any] | TimeSeries) -> TimeSeries:
+        """Transform TimeReturn analyzer output into columnar returns (step 27).
 
         Args:
             timereturns_analysis: Raw output from bt.analyzers.TimeReturn
-                                  (datetime keys -> return values)
+                                  (datetime keys -> return values), or a
+                                  ready :class:`TimeSeries` (vectorized engine)
 
         Returns:
-            Dictionary with ISO string keys and float values for JSON serialization
+            TimeSeries with ``datetime64[us]`` timestamps and ``float64`` returns
         """
-        # TimeReturn returns {datetime: return_value}
-        # Convert datetime keys to ISO strings for JSON serialization
-        return {
-            dt.isoformat(): float(ret_val)
-            for dt, ret_val in timereturns_analysis.items()
-        }
+        if isinstance(timereturns_analysis, TimeSeries):
+            return timereturns_analysis
+        return TimeSeries.from_mapping(timereturns_analysis)
@@ -0,0 +1,314 @@
+"""Content-addressed cache of backtest results, persisted in the runtime SQLite database.
+
+A run is keyed by what determines its outcome: a checksum of every candle it
+sees, the source of the strategy's modules and of the engine modules that
+produce results, the Backtrader version, the resolved parameters and the
+broker settings. Because the key hashes the candles themselves, any change to
+the slice - through the CLI writers or an external ``UPDATE`` - simply
+produces a new key; stale entries age out under the byte budget (LRU).
+Results are stored as JSON built from the result dataclasses.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import importlib
+import json
+import sqlite3
+import sys
+import time
+from collections.abc import Mapping, Sequence
+from dataclasses import asdict, dataclass
+from functools import lru_cache
+from typing import Any
+
+import backtrader as bt
+import numpy as np
+import pandas as pd
+
+from src.backtest.result_models import (
+    BacktestRunResult,
+    ReturnsAnalysis,
+    RiskMetrics,
+    SymbolBreakdown,
+    TimeSeries,
+    TradeRecord,
+    TradeStatistics,
+)
+from src.core.database import SQLiteDatabase
+
+DEFAULT_RESULT_CACHE_BYTES = 64 * 1024 * 1024
+# Bump when the stored JSON layout changes shape.
+RESULT_CACHE_FORMAT = 5
+_FRAME_COLUMNS = ("open", "high", "low", "close", "volume")
+# Modules whose code turns candles and parameters into a result.
+_ENGINE_MODULES = (
+    "src.backtest.engine",
+    "src.backtest.analyzers",
+    "src.backtest.result_builder",
+    "src.backtest.value_metrics",
+    "src.backtest.vectorized",
+    "src.data.feed",
+)
+
+
+@dataclass(frozen=True)
+class ResultCacheStats:
+    """Lookup counters of this cache instance plus the current size of the table."""
+
+    hits: int
+    misses: int
+    stores: int
+    evictions: int
+    entries: int
+    current_bytes: int
+    max_bytes: int
+
+    @property
+    def hit_ratio(self) -> float:
+        lookups = self.hits + self.misses
+        return self.hits / lookups if lookups else 0.0
+
+    def to_dict(self) -> dict[str, float | int]:
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "stores": self.stores,
+            "evictions": self.evictions,
+            "entries": self.entries,
+            "current_bytes": self.current_bytes,
+            "max_bytes": self.max_bytes,
+            "hit_ratio": self.hit_ratio,
+        }
+
+
+def frame_digest(frame: pd.DataFrame) -> str:
+    """Checksum of a candle frame's timestamps and OHLCV columns."""
+    digest = hashlib.blake2b(digest_size=16)
+    index = frame.index
+    digest.update(str(index.dtype).encode())
+    # ``asi8`` also covers tz-aware indexes, whose ``to_numpy()`` is an object array.
+    values = index.asi8 if isinstance(index, pd.DatetimeIndex) else index.to_numpy(dtype=np.int64)
+    digest.update(np.ascontiguousarray(values).tobytes())
+    for column in _FRAME_COLUMNS:
+        digest.update(np.ascontiguousarray(frame[column].to_numpy(dtype=np.float64)).tobytes())
+    return digest.hexdigest()
+
+
+def result_cache_key(
+    *,
+    strategy_class: type[bt.Strategy],
+    params: Mapping[str, Any],
+    timeframe: str,
+    frames: Mapping[str, pd.DataFrame],
+    settings: Mapping[str, Any],
+) -> str:
+    """Fingerprint of one run; ``frames`` maps symbol -> candles in feed order."""
+    payload = {
+        "format": RESULT_CACHE_FORMAT,
+        "strategy": _strategy_fingerprint(strategy_class),
+        "engine": _engine_fingerprint(),
+        "params": dict(params),
+        "timeframe": timeframe,
+        "data": [[symbol, frame_digest(frame)] for symbol, frame in frames.items()],
+        "settings": dict(settings),
+    }
+    encoded = json.dumps(payload, sort_keys=True, default=repr, separators=(",", ":"))
+    return hashlib.sha256(encoded.encode()).hexdigest()
+
+
+class BacktestResultCache:
+    """LRU of JSON-encoded ``BacktestRunResult`` rows bounded by a byte budget."""
+
+    def __init__(
+        self,
+        database: SQLiteDatabase,
+        max_bytes: int = DEFAULT_RESULT_CACHE_BYTES,
+    ) -> None:
+        if not isinstance(max_bytes, int) or isinstance(max_bytes, bool) or max_bytes <= 0:
+            raise ValueError("max_bytes must be a positive integer")
+        self._database = database
+        self._max_bytes = max_bytes
+        self._hits = 0
+        self._misses = 0
+        self._stores = 0
+        self._evictions = 0
+
+    @property
+    def max_bytes(self) -> int:
+        return self._max_bytes
+
+    def get(self, key: str) -> BacktestRunResult | None:
+        """Look ``key`` up on a reader, then refresh its recency as a separate best-effort write."""
+        with self._database.read() as conn:
+            row = conn.execute(
+                "SELECT payload FROM backtest_result_cache WHERE cache_key = ?;",
+                (key,),
+            ).fetchone()
+        result = self._decode(row[0]) if row is not None else None
+        if result is None:
+            if row is not None:
+                # Written by an incompatible version; drop it and recompute.
+                self._best_effort_write("DELETE FROM backtest_result_cache WHERE cache_key = ?;", (key,))
+            self._misses += 1
+            return None
+        self._best_effort_write(
+            "UPDATE backtest_result_cache SET last_used_at = ? WHERE cache_key = ?;",
+            (time.time_ns(), key),
+        )
+        self._hits += 1
+        return result
+
+    def put(self, key: str, result: BacktestRunResult) -> None:
+        payload = self._encode(result)
+        if len(payload) > self._max_bytes:
+            return
+        with self._database.transaction() as tx:
+            tx.execute(
+                """
+                INSERT OR REPLACE INTO backtest_result_cache(cache_key, payload, size_bytes, last_used_at)
+                VALUES (?, ?, ?, ?);
+                """,
+                (key, payload, len(payload), time.time_ns()),
+            )
+            self._evict_over_budget(tx)
+        self._stores += 1
+
+    def clear(self) -> int:
+        """Delete every cached result; returns the number of rows removed."""
+        with self._database.transaction() as tx:
+            removed = tx.execute("DELETE FROM backtest_result_cache;").rowcount
+        self._hits = self._misses = self._stores = self._evictions = 0
+        return removed
+
+    def stats(self) -> ResultCacheStats:
+        with self._database.read() as conn:
+            entries, current_bytes = conn.execute(
+                "SELECT COUNT(*), COALESCE(SUM(size_bytes), 0) FROM backtest_result_cache;"
+            ).fetchone()
+        return ResultCacheStats(
+            hits=self._hits,
+            misses=self._misses,
+            stores=self._stores,
+            evictions=self._evictions,
+            entries=int(entries),
+            current_bytes=int(current_bytes),
+            max_bytes=self._max_bytes,
+        )
+
+    def _evict_over_budget(self, tx: sqlite3.Connection) -> None:
+        total = int(tx.execute("SELECT COALESCE(SUM(size_bytes), 0) FROM backtest_result_cache;").fetchone()[0])
+        if total <= self._max_bytes:
+            return
+        stale: list[tuple[str]] = []
+        for key, size in tx.execute(
+            "SELECT cache_key, size_bytes FROM backtest_result_cache ORDER BY last_used_at;"
+        ).fetchall():
+            if total <= self._max_bytes:
+                break
+            stale.append((key,))
+            total -= int(size)
+        tx.executemany("DELETE FROM backtest_result_cache WHERE cache_key = ?;", stale)
+        self._evictions += len(stale)
+
+    def _best_effort_write(self, sql: str, params: Sequence[Any]) -> None:
+        # Recency and cleanup are housekeeping: a busy writer must not fail a hit.
+        try:
+            with self._database.transaction() as tx:
+                tx.execute(sql, params)
+        except sqlite3.OperationalError:
+            pass
+
+    @staticmethod
+    def _encode(result: BacktestRunResult) -> bytes:
+        """JSON of the result dataclasses; series as integer microseconds plus floats.
+
+        The profile is not stored: profiled runs bypass the cache.
+        """
+        series = result.time_series_returns
+        payload = {
+            "format": RESULT_CACHE_FORMAT,
+            "symbol": result.symbol,
+            "timeframe": result.timeframe,
+            "data_source": result.data_source,
+            "initial_capital": result.initial_capital,
+            "final_value": result.final_value,
+            "pnl": result.pnl,
+            "total_return_pct": result.total_return_pct,
+            "bars_processed": result.bars_processed,
+            "trade_stats": asdict(result.trade_stats),
+            "risk_metrics": asdict(result.risk_metrics),
+            "returns_analysis": asdict(result.returns_analysis),
+            "time_series_returns": {
+                "timestamps_us": series.timestamps.astype("datetime64[us]").astype(np.int64).tolist(),
+                "values": series.values.tolist(),
+            },
+            "trade_log": [asdict(record) for record in result.trade_log],
+            "symbol_breakdown": [asdict(entry) for entry in result.symbol_breakdown],
+        }
+        return json.dumps(payload, separators=(",", ":")).encode("utf-8")
+
+    @staticmethod
+    def _decode(payload: bytes) -> BacktestRunResult | None:
+        try:
+            data = json.loads(payload)
+            if data["format"] != RESULT_CACHE_FORMAT:
+                return None
+            series = data["time_series_returns"]
+            return BacktestRunResult(
+                symbol=data["symbol"],
+                timeframe=data["timeframe"],
+                data_source=data["data_source"],
+                initial_capital=data["initial_capital"],
+                final_value=data["final_value"],
+                pnl=data["pnl"],
+                total_return_pct=data["total_return_pct"],
+                bars_processed=data["bars_processed"],
+                trade_stats=TradeStatistics(**data["trade_stats"]),
+                risk_metrics=RiskMetrics(**data["risk_metrics"]),
+                returns_analysis=ReturnsAnalysis(**data["returns_analysis"]),
+                time_series_returns=TimeSeries.from_arrays(
+                    np.asarray(series["timestamps_us"], dtype=np.int64).astype("datetime64[us]"),
+                    series["values"],
+                ),
+                trade_log=tuple(TradeRecord(**record) for record in data["trade_log"]),
+                symbol_breakdown=tuple(
+                    SymbolBreakdown(**{**entry, "trade_stats": TradeStatistics(**entry["trade_stats"])})
+                    for entry in data["symbol_breakdown"]
+                ),
+            )
+        except (ValueError, TypeError, KeyError):
+            return None
+
+
+def _strategy_fingerprint(strategy_class: type[bt.Strategy]) -> list[str]:
+    """Qualified name of every user-defined class in the strategy's MRO plus its module's source hash.
+
+    Hashing whole modules also covers helpers the strategy calls at module level.
+    """
+    parts = []
+    for cls in strategy_class.__mro__:
+        if cls.__module__.startswith("backtrader") or cls.__module__ == "builtins":
+            continue
+        parts.append(f"{cls.__module__}.{cls.__qualname__}:{_module_digest(cls.__module__)}")
+    return parts
+
+
+@lru_cache(maxsize=1)
+def _engine_fingerprint() -> list[str]:
+    """Backtrader version and the source hash of every result-producing engine module."""
+    for name in _ENGINE_MODULES:
+        importlib.import_module(name)
+    return [f"backtrader:{bt.__version__}", *(f"{name}:{_module_digest(name)}" for name in _ENGINE_MODULES)]
+
+
+@lru_cache(maxsize=None)
+def _module_digest(module_name: str) -> str:
+    module = sys.modules.get(module_name)
+    path = getattr(module, "__file__", None)
+    try:
+        with open(path, "rb") as handle:  # type: ignore[arg-type]
+            source = handle.read()
+    except (OSError, TypeError):
+        source = b""
+    return hashlib.sha256(source).hexdigest()
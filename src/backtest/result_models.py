@@ -3,9 +3,13 @@
 from __future__ import annotations
 
 from dataclasses import dataclass, field
-from typing import Any, Mapping
+from datetime import datetime
+from typing import Any, Iterable, Iterator, Mapping
 
 import backtrader as bt
+import numpy as np
+
+from src.backtest.instrumentation import BacktestProfile
 
 
 @dataclass(frozen=True)
@@ -18,6 +22,14 @@ class BacktestRunRequest:
     end_timestamp: int
     strategy_class: type[bt.Strategy]
     strategy_params: Mapping[str, Any] = field(default_factory=dict)
+    # Extra symbols traded alongside ``symbol`` in one shared-cash portfolio run;
+    # ``symbol`` stays the primary feed (``datas[0]``).
+    symbols: tuple[str, ...] = ()
+
+    @property
+    def portfolio_symbols(self) -> tuple[str, ...]:
+        """Every traded symbol, primary first, duplicates dropped."""
+        return tuple(dict.fromkeys((self.symbol, *self.symbols)))
 
 
 @dataclass(frozen=True)
@@ -47,6 +59,7 @@ class TradeRecord:
     exit_price: float
     pnl_gross: float  # gross profit/loss before commission
     pnl_net: float    # net profit/loss after commission
+    symbol: str = ""  # set on portfolio runs only
 
 
 @dataclass(frozen=True)
@@ -56,6 +69,7 @@ class RiskMetrics:
     sharpe_ratio: float | None  # None if insufficient data
     max_drawdown_pct: float
     max_drawdown_duration_days: int
+    sortino_ratio: float | None = None  # annualized, from time_series_returns periods
 
 
 @dataclass(frozen=True)
@@ -66,6 +80,88 @@ class ReturnsAnalysis:
     avg_return: float
 
 
+@dataclass(frozen=True, eq=False)
+class TimeSeries:
+    """Timestamped values as parallel columns: naive-UTC ``datetime64[us]`` and ``float64``.
+
+    Results keep series in this form end to end; ISO strings are only produced
+    by :meth:`to_dict` / :meth:`items` when exporting.
+    """
+
+    timestamps: np.ndarray
+    values: np.ndarray
+
+    @classmethod
+    def empty(cls) -> "TimeSeries":
+        return cls(np.empty(0, dtype="datetime64[us]"), np.empty(0, dtype=np.float64))
+
+    @classmethod
+    def from_arrays(cls, timestamps: Any, values: Any) -> "TimeSeries":
+        stamps = np.asarray(timestamps, dtype="datetime64[us]")
+        numbers = np.asarray(values, dtype=np.float64)
+        if stamps.ndim != 1 or stamps.shape != numbers.shape:
+            raise ValueError("timestamps and values must be 1-D arrays of equal length")
+        return cls(stamps, numbers)
+
+    @classmethod
+    def from_mapping(cls, mapping: Mapping[datetime | str, float]) -> "TimeSeries":
+        """Build from ``{datetime or ISO string: value}`` (TimeReturn output, legacy payloads)."""
+        if not mapping:
+            return cls.empty()
+        return cls.from_arrays(list(mapping.keys()), list(mapping.values()))
+
+    @classmethod
+    def concat(cls, parts: Iterable["TimeSeries"]) -> "TimeSeries":
+        """Join series in order; a timestamp repeated by a later part keeps the later value."""
+        chunks = [part for part in parts if len(part)]
+        if not chunks:
+            return cls.empty()
+        stamps = np.concatenate([part.timestamps for part in chunks])
+        values = np.concatenate([part.values for part in chunks])
+        # Last occurrence wins, as successive ``dict.update`` calls would.
+        _, last_rows = np.unique(stamps[::-1], return_index=True)
+        keep = np.sort(len(stamps) - 1 - last_rows)
+        return cls(stamps[keep], values[keep])
+
+    def __len__(self) -> int:
+        return int(self.values.shape[0])
+
+    def __eq__(self, other: object) -> bool:
+        if not isinstance(other, TimeSeries):
+            return NotImplemented
+        return np.array_equal(self.timestamps, other.timestamps) and np.array_equal(self.values, other.values)
+
+    __hash__ = None  # type: ignore[assignment]
+
+    def compound(self, initial_capital: float) -> "TimeSeries":
+        """Equity curve obtained by compounding these period returns from ``initial_capital``."""
+        return TimeSeries(self.timestamps, initial_capital * np.cumprod(1.0 + self.values))
+
+    def iso_timestamps(self) -> list[str]:
+        # Whole-second stamps render like ``datetime.isoformat()`` (no fraction).
+        has_fraction = bool((self.timestamps.astype(np.int64) % 1_000_000).any())
+        return np.datetime_as_string(self.timestamps, unit="us" if has_fraction else "s").tolist()
+
+    def items(self) -> Iterator[tuple[str, float]]:
+        return zip(self.iso_timestamps(), self.values.tolist())
+
+    def to_dict(self) -> dict[str, float]:
+        """``{ISO timestamp: value}`` for JSON export."""
+        return dict(self.items())
+
+
+@dataclass(frozen=True)
+class SymbolBreakdown:
+    """Per-symbol slice of a portfolio run; portfolio-level metrics stay on the result."""
+
+    symbol: str
+    bars_loaded: int  # stored candles before alignment onto the shared timeline
+    trade_stats: TradeStatistics
+    pnl_net: float  # net profit/loss of the symbol's closed trades
+    final_position_size: float
+    final_position_value: float
+
+
 @dataclass(frozen=True)
 class BacktestRunResult:
     """Extended backtest result with standard analyzers (step 27)."""
@@ -84,7 +180,13 @@ class BacktestRunResult:
     trade_stats: TradeStatistics
     risk_metrics: RiskMetrics
     returns_analysis: ReturnsAnalysis
-    time_series_returns: dict[str, float]  # ISO date -> return value
+    time_series_returns: TimeSeries  # per-period returns (TimeReturn)
 
     # Trade log (step 28): individual closed trade records from notify_trade()
     trade_log: tuple[TradeRecord, ...] = field(default_factory=tuple)
+
+    # Portfolio runs: one entry per symbol, in request order (empty for single-symbol runs)
+    symbol_breakdown: tuple[SymbolBreakdown, ...] = field(default_factory=tuple)
+
+    # Stage timings / cProfile output, set only when the engine runs with ``profiling``
+    profile: BacktestProfile | None = None
@@ -0,0 +1,100 @@
+"""Publish a candle DataFrame once in ``multiprocessing.shared_memory`` for worker processes.
+
+The datetime index (as int64 ticks) and every float64 column are laid out
+back to back in one shared block. Workers attach by name and wrap the block in
+read-only NumPy views, so N workers share one copy of the candles instead of
+each reloading them from SQLite.
+"""
+
+from __future__ import annotations
+
+from dataclasses import dataclass
+from multiprocessing import shared_memory
+
+import numpy as np
+import pandas as pd
+
+_ITEM_BYTES = 8
+
+
+class SharedFrameError(RuntimeError):
+    """Raised when a frame cannot be published to or read from shared memory."""
+
+
+@dataclass(frozen=True)
+class SharedFrameHandle:
+    """Picklable descriptor workers use to attach to a published frame."""
+
+    name: str
+    rows: int
+    columns: tuple[str, ...]
+    index_name: str | None
+    index_unit: str
+    index_tz: str | None
+
+    @property
+    def nbytes(self) -> int:
+        return (len(self.columns) + 1) * self.rows * _ITEM_BYTES
+
+
+class SharedFramePublisher:
+    """Own the shared block for a frame; use as a context manager to unlink it afterwards."""
+
+    def __init__(self, frame: pd.DataFrame) -> None:
+        if not isinstance(frame.index, pd.DatetimeIndex):
+            raise SharedFrameError("frame index must be a DatetimeIndex")
+        columns = tuple(str(name) for name in frame.columns)
+        rows = len(frame)
+        handle_size = max((len(columns) + 1) * rows * _ITEM_BYTES, 1)
+        self._shm = shared_memory.SharedMemory(create=True, size=handle_size)
+        self.handle = SharedFrameHandle(
+            name=self._shm.name,
+            rows=rows,
+            columns=columns,
+            index_name=frame.index.name,
+            index_unit=frame.index.unit,
+            index_tz=None if frame.index.tz is None else str(frame.index.tz),
+        )
+        block = _block(self._shm, self.handle)
+        block[0] = frame.index.asi8.view(np.float64)
+        for position, name in enumerate(columns, start=1):
+            block[position] = frame[name].to_numpy(dtype=np.float64)
+
+    def close(self) -> None:
+        self._shm.close()
+        self._shm.unlink()
+
+    def __enter__(self) -> "SharedFramePublisher":
+        return self
+
+    def __exit__(self, exc_type, exc, traceback) -> None:
+        self.close()
+
+
+def attach_shared_frame(handle: SharedFrameHandle) -> tuple[shared_memory.SharedMemory, pd.DataFrame]:
+    """Attach to a published frame; keep the returned block open while the frame is in use."""
+    try:
+        shm = shared_memory.SharedMemory(name=handle.name)
+    except FileNotFoundError as exc:
+        raise SharedFrameError(f"shared frame {handle.name} is gone") from exc
+    # Pool workers share the publisher's resource tracker, so attaching only
+    # re-registers the same name; unlinking stays with the publisher.
+    block = _block(shm, handle)
+    block.setflags(write=False)
+    index = pd.DatetimeIndex(block[0].view(np.int64).view(f"M8[{handle.index_unit}]"), name=handle.index_name)
+    if handle.index_tz is not None:
+        index = index.tz_localize(handle.index_tz)
+    frame = pd.DataFrame(
+        {name: block[position] for position, name in enumerate(handle.columns, start=1)},
+        index=index,
+        copy=False,
+    )
+    return shm, frame
+
+
+def _block(shm: shared_memory.SharedMemory, handle: SharedFrameHandle) -> np.ndarray:
+    return np.ndarray(
+        (len(handle.columns) + 1, handle.rows),
+        dtype=np.float64,
+        buffer=shm.buf,
+    )
@@ -0,0 +1,417 @@
+"""Grid parameter sweeps over one candle slice, fanned out to a process pool.
+
+The candles are loaded once in the parent, published through
+:mod:`src.backtest.shared_frame`, and every worker process attaches to that
+block once in its initializer. Each task then only ships a parameter dict in
+and a :class:`SweepRunSummary` back.
+
+When the engine has a result cache, the parent answers cached grid points
+itself and only dispatches the misses; workers ship those full results back so
+the parent can store them.
+"""
+
+from __future__ import annotations
+
+import itertools
+import math
+import multiprocessing
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass, field, replace
+from typing import Any, Callable, Iterable, Mapping, Sequence
+
+import pandas as pd
+
+from src.backtest.engine import BacktestEngine
+from src.backtest.result_models import BacktestRunRequest, BacktestRunResult, TimeSeries
+from src.backtest.shared_frame import SharedFrameHandle, SharedFramePublisher, attach_shared_frame
+from src.core.database import SQLiteDatabase
+
+# Metric name -> True when larger is better.
+RANK_METRICS: dict[str, bool] = {
+    "total_return_pct": True,
+    "sharpe_ratio": True,
+    "max_drawdown_pct": False,
+    "profit_factor": True,
+    "win_rate": True,
+    "final_value": True,
+}
+DEFAULT_RANK_METRIC = "total_return_pct"
+MAX_GRID_RUNS = 100_000
+
+
+class ParameterSweepError(RuntimeError):
+    """Raised when a sweep grid is malformed or the sweep cannot start."""
+
+
+@dataclass(frozen=True)
+class SweepRunSummary:
+    """Headline metrics of one grid point, or the error that stopped it."""
+
+    params: Mapping[str, Any]
+    total_return_pct: float | None = None
+    sharpe_ratio: float | None = None
+    max_drawdown_pct: float | None = None
+    profit_factor: float | None = None
+    win_rate: float | None = None
+    total_trades: int = 0
+    final_value: float | None = None
+    elapsed_seconds: float = 0.0
+    error: str | None = None
+    # Per-period returns, only kept when the task asks for them (see SweepTask.keep_series).
+    time_series_returns: TimeSeries = field(default_factory=TimeSeries.empty)
+
+    @classmethod
+    def from_result(
+        cls, params: Mapping[str, Any], result: BacktestRunResult, elapsed_seconds: float
+    ) -> "SweepRunSummary":
+        return cls(
+            params=dict(params),
+            total_return_pct=result.total_return_pct,
+            sharpe_ratio=result.risk_metrics.sharpe_ratio,
+            max_drawdown_pct=result.risk_metrics.max_drawdown_pct,
+            profit_factor=result.trade_stats.profit_factor,
+            win_rate=result.trade_stats.win_rate,
+            total_trades=result.trade_stats.total_trades,
+            final_value=result.final_value,
+            elapsed_seconds=elapsed_seconds,
+        )
+
+    @property
+    def ok(self) -> bool:
+        return self.error is None
+
+    def metric(self, name: str) -> float | None:
+        if name not in RANK_METRICS:
+            raise ParameterSweepError(f"rank metric must be one of {sorted(RANK_METRICS)}")
+        value = getattr(self, name)
+        return None if value is None or (isinstance(value, float) and math.isnan(value)) else float(value)
+
+
+@dataclass(frozen=True)
+class SweepResult:
+    """Ranked outcome of a sweep: best run first, failed runs last."""
+
+    runs: tuple[SweepRunSummary, ...]
+    rank_by: str
+    workers: int
+    bars: int
+    shared_bytes: int
+    elapsed_seconds: float
+    param_names: tuple[str, ...] = field(default_factory=tuple)
+
+    @property
+    def failed(self) -> int:
+        return sum(1 for run in self.runs if not run.ok)
+
+    @property
+    def runs_per_second(self) -> float:
+        return len(self.runs) / self.elapsed_seconds if self.elapsed_seconds > 0 else 0.0
+
+
+def parse_grid_spec(spec: str) -> tuple[str, tuple[Any, ...]]:
+    """Parse ``name=start:stop:step`` (inclusive), ``name=a,b,c`` or ``name=value``."""
+    if "=" not in spec:
+        raise ParameterSweepError(f"grid axis must look like name=start:stop:step, got {spec!r}")
+    name, raw = (part.strip() for part in spec.split("=", 1))
+    if not name or not raw:
+        raise ParameterSweepError(f"grid axis must look like name=start:stop:step, got {spec!r}")
+    if ":" in raw:
+        values = _parse_range(name, raw)
+    else:
+        values = tuple(_parse_scalar(item.strip()) for item in raw.split(",") if item.strip())
+    if not values:
+        raise ParameterSweepError(f"grid axis {name} has no values")
+    return name, values
+
+
+def expand_grid(axes: Mapping[str, Sequence[Any]]) -> list[dict[str, Any]]:
+    """Cartesian product of the axes, in axis order (last axis varies fastest)."""
+    names = list(axes)
+    combos = [dict(zip(names, values)) for values in itertools.product(*(axes[name] for name in names))]
+    if len(combos) > MAX_GRID_RUNS:
+        raise ParameterSweepError(f"grid expands to {len(combos)} runs (limit {MAX_GRID_RUNS})")
+    return combos
+
+
+def rank_runs(runs: Iterable[SweepRunSummary], rank_by: str = DEFAULT_RANK_METRIC) -> tuple[SweepRunSummary, ...]:
+    """Order runs best-first by ``rank_by``; runs without the metric sort last, keeping grid order."""
+    if rank_by not in RANK_METRICS:
+        raise ParameterSweepError(f"rank metric must be one of {sorted(RANK_METRICS)}")
+    descending = RANK_METRICS[rank_by]
+
+    def _key(run: SweepRunSummary) -> tuple[int, float]:
+        value = run.metric(rank_by)
+        if value is None:
+            return (1, 0.0)
+        return (0, -value if descending else value)
+
+    return tuple(sorted(runs, key=_key))
+
+
+@dataclass(frozen=True)
+class SweepTask:
+    """One grid point, optionally restricted to rows ``[start_row, end_row)`` of the shared frame.
+
+    ``warmup_rows`` more rows before ``start_row`` are fed first to warm up
+    indicators; nothing is traded or measured on them.
+    """
+
+    params: Mapping[str, Any]
+    start_row: int = 0
+    end_row: int | None = None
+    warmup_rows: int = 0
+    keep_series: bool = False
+    # Ship the full result back with the summary (used to fill the parent's result cache).
+    keep_result: bool = False
+
+
+class SweepPool:
+    """Process pool whose workers attach once to a published candle frame.
+
+    With one worker the tasks run inline against the frame itself, without
+    shared memory or child processes.
+    """
+
+    def __init__(
+        self,
+        engine: BacktestEngine,
+        request: BacktestRunRequest,
+        dataframe: pd.DataFrame,
+        *,
+        workers: int,
+        mp_start_method: str = "spawn",
+    ) -> None:
+        self._engine = engine
+        self._request = request
+        self._dataframe = dataframe
+        self.workers = workers
+        self._mp_start_method = mp_start_method
+        self._publisher: SharedFramePublisher | None = None
+        self._pool: ProcessPoolExecutor | None = None
+
+    @property
+    def shared_bytes(self) -> int:
+        return self._publisher.handle.nbytes if self._publisher is not None else 0
+
+    def __enter__(self) -> "SweepPool":
+        if self.workers > 1:
+            self._publisher = SharedFramePublisher(self._dataframe)
+            try:
+                self._pool = ProcessPoolExecutor(
+                    max_workers=self.workers,
+                    mp_context=multiprocessing.get_context(self._mp_start_method),
+                    initializer=_init_worker,
+                    initargs=(self._publisher.handle, self._engine.portable_settings(), self._request),
+                )
+            except BaseException:
+                self._publisher.close()
+                raise
+        return self
+
+    def __exit__(self, exc_type, exc, traceback) -> None:
+        try:
+            if self._pool is not None:
+                self._pool.shutdown()
+        finally:
+            if self._publisher is not None:
+                self._publisher.close()
+            self._pool = None
+            self._publisher = None
+
+    def map(self, tasks: Sequence[SweepTask]) -> list[SweepRunSummary]:
+        """Run tasks and return their summaries in task order."""
+        if self._pool is None:
+            # The engine consults its own result cache on this path.
+            return [_run_one(self._engine, self._request, self._dataframe, task)[0] for task in tasks]
+        cache = self._engine.result_cache
+        if cache is None:
+            return [summary for summary, _ in self._dispatch(tasks)]
+
+        keys = [self._task_key(task) for task in tasks]
+        summaries: list[SweepRunSummary | None] = []
+        for task, key in zip(tasks, keys):
+            started = time.perf_counter()
+            cached = cache.get(key) if key is not None else None
+            summaries.append(
+                None if cached is None else _summarize(task, cached, time.perf_counter() - started)
+            )
+        pending = [index for index, summary in enumerate(summaries) if summary is None]
+        outcomes = self._dispatch([replace(tasks[index], keep_result=True) for index in pending])
+        for index, (summary, result) in zip(pending, outcomes):
+            key = keys[index]
+            if key is not None and result is not None:
+                cache.put(key, result)
+            summaries[index] = summary
+        return [summary for summary in summaries if summary is not None]
+
+    def _dispatch(
+        self, tasks: Sequence[SweepTask]
+    ) -> list[tuple[SweepRunSummary, BacktestRunResult | None]]:
+        if not tasks or self._pool is None:
+            return []
+        chunksize = max(1, len(tasks) // (self.workers * 4))
+        return list(self._pool.map(_run_task, tasks, chunksize=chunksize))
+
+    def _task_key(self, task: SweepTask) -> str | None:
+        dataframe = self._dataframe.iloc[task.start_row - task.warmup_rows : task.end_row]
+        if len(dataframe) <= task.warmup_rows:
+            return None
+        run_request = replace(self._request, strategy_params={**self._request.strategy_params, **task.params})
+        try:
+            return self._engine.result_cache_key(
+                run_request, {run_request.symbol: dataframe}, warmup_bars=task.warmup_rows
+            )
+        except Exception:  # Let the worker run the task and report the error.
+            return None
+
+
+def resolve_worker_count(workers: int | None, tasks: int) -> int:
+    if workers is not None and (isinstance(workers, bool) or not isinstance(workers, int) or workers <= 0):
+        raise ParameterSweepError("workers must be a positive integer")
+    return max(1, min(workers or os.cpu_count() or 1, tasks))
+
+
+class ParameterSweepRunner:
+    """Evaluate a parameter grid for one request, sharing the candle frame across workers."""
+
+    def __init__(
+        self,
+        engine: BacktestEngine,
+        *,
+        workers: int | None = None,
+        mp_start_method: str = "spawn",
+        clock: Callable[[], float] = time.perf_counter,
+    ) -> None:
+        resolve_worker_count(workers, 1)
+        self._engine = engine
+        self._workers = workers
+        self._mp_start_method = mp_start_method
+        self._clock = clock
+
+    def run(
+        self,
+        request: BacktestRunRequest,
+        grid: Mapping[str, Sequence[Any]],
+        *,
+        rank_by: str = DEFAULT_RANK_METRIC,
+    ) -> SweepResult:
+        """Run every grid point (merged over ``request.strategy_params``) and rank the results."""
+        if rank_by not in RANK_METRICS:
+            raise ParameterSweepError(f"rank metric must be one of {sorted(RANK_METRICS)}")
+        combos = expand_grid(grid)
+        if not combos:
+            raise ParameterSweepError("grid must contain at least one axis")
+        started = self._clock()
+        dataframe = self._engine.load_dataframe(request)
+        workers = resolve_worker_count(self._workers, len(combos))
+
+        with SweepPool(
+            self._engine,
+            request,
+            dataframe,
+            workers=workers,
+            mp_start_method=self._mp_start_method,
+        ) as pool:
+            runs = pool.map([SweepTask(params) for params in combos])
+            shared_bytes = pool.shared_bytes
+
+        return SweepResult(
+            runs=rank_runs(runs, rank_by),
+            rank_by=rank_by,
+            workers=workers,
+            bars=len(dataframe),
+            shared_bytes=shared_bytes,
+            elapsed_seconds=self._clock() - started,
+            param_names=tuple(grid),
+        )
+
+
+def _run_one(
+    engine: BacktestEngine,
+    request: BacktestRunRequest,
+    dataframe: pd.DataFrame,
+    task: SweepTask,
+) -> tuple[SweepRunSummary, BacktestRunResult | None]:
+    started = time.perf_counter()
+    run_request = replace(request, strategy_params={**request.strategy_params, **task.params})
+    if task.start_row != 0 or task.end_row is not None:
+        dataframe = dataframe.iloc[task.start_row - task.warmup_rows : task.end_row]
+    try:
+        if len(dataframe) <= task.warmup_rows:
+            raise ParameterSweepError("task row range selects no candles")
+        result = engine.run_on_dataframe(run_request, dataframe, warmup_bars=task.warmup_rows)
+    except Exception as exc:  # One bad grid point must not sink the whole sweep.
+        summary = SweepRunSummary(
+            params=dict(task.params),
+            elapsed_seconds=time.perf_counter() - started,
+            error=f"{type(exc).__name__}: {exc}",
+        )
+        return summary, None
+    summary = _summarize(task, result, time.perf_counter() - started)
+    return summary, result if task.keep_result else None
+
+
+def _summarize(task: SweepTask, result: BacktestRunResult, elapsed_seconds: float) -> SweepRunSummary:
+    summary = SweepRunSummary.from_result(task.params, result, elapsed_seconds)
+    if task.keep_series:
+        summary = replace(summary, time_series_returns=result.time_series_returns)
+    return summary
+
+
+# Per-process state populated once by the pool initializer.
+_WORKER_STATE: dict[str, Any] = {}
+
+
+def _init_worker(handle: SharedFrameHandle, settings: Mapping[str, Any], request: BacktestRunRequest) -> None:
+    shm, dataframe = attach_shared_frame(handle)
+    # Workers never touch SQLite: the frame is already loaded, so the engine's
+    # database is an unopened placeholder.
+    engine = BacktestEngine(SQLiteDatabase(":memory:"), **settings)
+    _WORKER_STATE.update(shm=shm, dataframe=dataframe, engine=engine, request=request)
+
+
+def _run_task(task: SweepTask) -> tuple[SweepRunSummary, BacktestRunResult | None]:
+    return _run_one(
+        _WORKER_STATE["engine"],
+        _WORKER_STATE["request"],
+        _WORKER_STATE["dataframe"],
+        task,
+    )
+
+
+def _parse_range(name: str, raw: str) -> tuple[Any, ...]:
+    parts = [part.strip() for part in raw.split(":")]
+    if len(parts) not in {2, 3}:
+        raise ParameterSweepError(f"grid axis {name} range must be start:stop[:step]")
+    start, stop, step = (_parse_number(name, part) for part in (*parts, "1")[:3])
+    if step <= 0:
+        raise ParameterSweepError(f"grid axis {name} step must be > 0")
+    if stop < start:
+        raise ParameterSweepError(f"grid axis {name} stop must be >= start")
+    count = int(math.floor((stop - start) / step + 1e-9)) + 1
+    if count > MAX_GRID_RUNS:
+        raise ParameterSweepError(f"grid axis {name} has {count} values (limit {MAX_GRID_RUNS})")
+    if all(isinstance(value, int) for value in (start, stop, step)):
+        return tuple(start + idx * step for idx in range(count))
+    return tuple(round(start + idx * step, 10) for idx in range(count))
+
+
+def _parse_number(name: str, raw: str) -> int | float:
+    value = _parse_scalar(raw)
+    if isinstance(value, bool) or not isinstance(value, (int, float)):
+        raise ParameterSweepError(f"grid axis {name} range bounds must be numbers, got {raw!r}")
+    return value
+
+
+def _parse_scalar(raw: str) -> Any:
+    lowered = raw.lower()
+    if lowered in {"true", "false"}:
+        return lowered == "true"
+    for cast in (int, float):
+        try:
+            return cast(raw)
+        except ValueError:
+            continue
+    return raw
@@ -0,0 +1,176 @@
+"""Analyzer-shaped metrics computed after a run from the recorded broker value array.
+
+The helpers mirror Backtrader's ``SharpeRatio``, ``DrawDown``, ``Returns``,
+``TimeReturn`` and ``TradeAnalyzer`` outputs, using the same period buckets
+(``TimeFrameAnalyzerBase`` keys), so their dicts feed
+:class:`~src.backtest.result_builder.AnalyzerResultBuilder` unchanged. Both
+the vectorized engine and the ``standard``/``minimal`` analyzer profiles use
+them in place of per-bar Python analyzers.
+"""
+
+from __future__ import annotations
+
+import math
+from collections.abc import Sequence
+from typing import Any
+
+import numpy as np
+import pandas as pd
+
+from src.backtest.result_models import TimeSeries
+from src.data.timeframe_metrics import parse_timeframe
+
+# Backtrader SharpeRatio defaults: yearly returns against a 1% risk-free rate.
+SHARPE_RISK_FREE_RATE = 0.01
+
+_NS_PER_MINUTE = 60_000_000_000
+_NS_PER_DAY = 86_400_000_000_000
+_NS_PER_YEAR = 365 * _NS_PER_DAY
+
+
+def value_curve_analysis(
+    values: np.ndarray,
+    bar_times: np.ndarray,
+    timeframe: str,
+    initial_capital: float,
+    *,
+    time_return_timeframe: str | None = None,
+    with_sharpe: bool = True,
+    with_time_returns: bool = True,
+) -> dict[str, Any]:
+    """``sharpe``/``drawdown``/``returns``/``timereturns`` entries of an analyzer result dict.
+
+    ``values`` holds the broker value after every bar and ``bar_times`` the
+    naive-UTC nanosecond bar times. ``timeframe`` is the feed's and selects the
+    period buckets of returns; ``time_return_timeframe`` (e.g. ``"1d"``) buckets
+    the time series coarser. Skipped entries come back empty: no Sharpe ratio
+    and no time series.
+    """
+    series_timeframe = time_return_timeframe or timeframe
+    return {
+        "sharpe": {"sharperatio": sharpe_ratio(values, bar_times, initial_capital) if with_sharpe else None},
+        "drawdown": drawdown(values),
+        "returns": period_returns(values, bar_times, timeframe, initial_capital),
+        "timereturns": (
+            time_returns(values, bar_times, series_timeframe, initial_capital)
+            if with_time_returns
+            else TimeSeries.empty()
+        ),
+    }
+
+
+def naive_utc_ns(index: pd.Index) -> np.ndarray:
+    times = pd.DatetimeIndex(index)
+    if times.tz is not None:
+        times = times.tz_convert("UTC").tz_localize(None)
+    return times.as_unit("ns").asi8
+
+
+def period_keys(bar_times: np.ndarray, timeframe: str) -> np.ndarray:
+    """Backtrader ``TimeFrameAnalyzerBase`` bucket keys for a feed of ``timeframe``."""
+    amount, unit = parse_timeframe(timeframe)
+    day_start = bar_times - bar_times % _NS_PER_DAY
+    if unit in {"m", "h"}:
+        compression = amount * (60 if unit == "h" else 1)
+        minute_of_day = (bar_times - day_start) // _NS_PER_MINUTE
+        bucket_end = (minute_of_day // compression + 1) * compression
+        return day_start + (bucket_end - 1) * _NS_PER_MINUTE
+    if unit == "d":
+        return day_start
+    # Weeks are keyed by the Sunday that closes the ISO week.
+    weekday = ((day_start // _NS_PER_DAY) + 3) % 7  # 1970-01-01 was a Thursday (Mon=0)
+    return day_start + (6 - weekday) * _NS_PER_DAY
+
+
+def period_last_rows(keys: np.ndarray) -> np.ndarray:
+    if len(keys) == 0:
+        return np.zeros(0, dtype=np.int64)
+    return np.flatnonzero(np.append(keys[1:] != keys[:-1], True))
+
+
+def time_returns(values: np.ndarray, bar_times: np.ndarray, timeframe: str, initial_capital: float) -> TimeSeries:
+    keys = period_keys(bar_times, timeframe)
+    last_rows = period_last_rows(keys)
+    period_values = values[last_rows]
+    starts = np.concatenate(([initial_capital], period_values[:-1]))
+    returns = period_values / starts - 1.0
+    return TimeSeries.from_arrays(keys[last_rows].astype("datetime64[ns]"), returns)
+
+
+def period_returns(
+    values: np.ndarray, bar_times: np.ndarray, timeframe: str, initial_capital: float
+) -> dict[str, float]:
+    final_value = float(values[-1]) if len(values) else initial_capital
+    ratio = final_value / initial_capital
+    total = math.log(ratio) if ratio > 0.0 else float("-inf")
+    periods = len(period_last_rows(period_keys(bar_times, timeframe)))
+    return {"rtot": total, "ravg": total / periods if periods else 0.0}
+
+
+def sharpe_ratio(values: np.ndarray, bar_times: np.ndarray, initial_capital: float) -> float | None:
+    years = pd.DatetimeIndex(bar_times).year.to_numpy()
+    last_rows = period_last_rows(years)
+    period_values = values[last_rows].tolist()
+    if not period_values:
+        return None
+    starts = [initial_capital, *period_values[:-1]]
+    excess = [value / start - 1.0 - SHARPE_RISK_FREE_RATE for value, start in zip(period_values, starts)]
+    mean = math.fsum(excess) / len(excess)
+    deviation = math.sqrt(math.fsum((item - mean) ** 2 for item in excess) / len(excess))
+    try:
+        return mean / deviation
+    except ZeroDivisionError:
+        return None
+
+
+def sortino_ratio(returns: TimeSeries) -> float | None:
+    """Annualized Sortino ratio of period returns, as ``analyze_performance`` computes it.
+
+    The risk-free rate is 0 and the periods per year come from the mean spacing
+    of the return timestamps. ``None`` with fewer than two losing periods.
+    """
+    values = returns.values
+    if len(values) < 2:
+        return None
+    downside = values[values < 0.0]
+    if len(downside) < 2:
+        return None
+    deviation = float(downside.std())
+    stamps = returns.timestamps.astype("datetime64[ns]").astype(np.int64)
+    elapsed_ns = int(stamps[-1] - stamps[0])
+    if deviation == 0.0 or elapsed_ns <= 0:
+        return None
+    periods_per_year = _NS_PER_YEAR * (len(values) - 1) / elapsed_ns
+    return float(values.mean()) / deviation * math.sqrt(periods_per_year)
+
+
+def drawdown(values: np.ndarray) -> dict[str, Any]:
+    if len(values) == 0:
+        return {"max": {"drawdown": 0.0, "len": 0}}
+    peaks = np.maximum.accumulate(values)
+    drawdowns = 100.0 * (peaks - values) / peaks
+    underwater = drawdowns != 0.0
+    # Length of the current underwater streak at every bar.
+    streak_ids = np.cumsum(~underwater)
+    streaks = np.bincount(streak_ids[underwater]) if underwater.any() else np.zeros(1, dtype=np.int64)
+    return {"max": {"drawdown": float(drawdowns.max()), "len": int(streaks.max())}}
+
+
+def trade_analysis(closed_pnls: Sequence[float], *, open_trades: int) -> dict[str, Any]:
+    """TradeAnalyzer-shaped dict from net PnLs of closed trades; open trades only count in the total."""
+    total = len(closed_pnls) + open_trades
+    if not closed_pnls:
+        return {"total": {"total": total}}
+    won = [pnl for pnl in closed_pnls if pnl >= 0.0]
+    lost = [pnl for pnl in closed_pnls if pnl < 0.0]
+    return {
+        "total": {"total": total},
+        "won": {
+            "total": len(won),
+            "pnl": {"total": math.fsum(won), "average": math.fsum(won) / (len(won) or 1), "max": max([0.0, *won])},
+        },
+        "lost": {
+            "total": len(lost),
+            "pnl": {"total": math.fsum(lost), "average": math.fsum(lost) / (len(lost) or 1), "max": min([0.0, *lost])},
+        },
+    }
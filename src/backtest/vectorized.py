@@ -0,0 +1,288 @@
+"""NumPy fast path for signal-based strategies (``backtest.engine: vectorized``).
+
+Indicators and signals are computed on whole arrays. Order planning only walks
+the sparse bars where a signal can fire, and the equity curve is rebuilt from
+the fills with cumulative sums. The results mirror Backtrader's broker and the
+analyzers mounted by :class:`~src.backtest.analyzers.AnalyzerMount`:
+
+- market orders fill at the next bar's open, with percentage slippage capped
+  by that bar's high/low, and pay ``commission_rate`` on the filled notional;
+- an entry is rejected (margin) when cash does not cover it at the signal
+  close or at the fill price;
+- returns, drawdown and Sharpe come from :mod:`src.backtest.value_metrics`,
+  which uses the same period buckets as Backtrader's
+  ``TimeReturn``/``Returns``/``DrawDown``/``SharpeRatio`` analyzers.
+
+Only strategies registered in :data:`VECTORIZED_STRATEGIES` are supported.
+Subclasses are not, because they may override ``next``.
+"""
+
+from __future__ import annotations
+
+from dataclasses import dataclass
+from typing import Any, Callable, Mapping
+
+import backtrader as bt
+import numpy as np
+import pandas as pd
+
+from src.backtest.result_models import TradeRecord
+from src.backtest.value_metrics import naive_utc_ns, trade_analysis, value_curve_analysis
+from src.strategies.bollinger_strategy import BollingerStrategy
+from src.strategies.sma_strategy import SMAStrategy
+
+
+class VectorizedBacktestError(RuntimeError):
+    """Raised when a strategy or request cannot run on the vectorized path."""
+
+
+@dataclass(frozen=True)
+class VectorizedOutcome:
+    """Analyzer-shaped results of one vectorized run."""
+
+    analyzer_results: dict[str, Any]
+    final_value: float
+    trade_log: tuple[TradeRecord, ...]
+
+
+@dataclass(frozen=True)
+class _Bars:
+    open: np.ndarray
+    high: np.ndarray
+    low: np.ndarray
+    close: np.ndarray
+
+
+class _LongOnlyBook:
+    """Sequential order book for long-only, one-position-at-a-time strategies."""
+
+    def __init__(
+        self,
+        bars: _Bars,
+        *,
+        cash: float,
+        commission_rate: float,
+        slippage_rate: float,
+        first_signal_bar: int = 0,
+    ) -> None:
+        self._bars = bars
+        # Signals before this bar fall in the warm-up window and place no orders.
+        self.first_signal_bar = first_signal_bar
+        self._cash = cash
+        self._commission_rate = commission_rate
+        self._slippage_rate = slippage_rate
+        self.size = 0.0
+        self.fills: list[tuple[int, float, float, float]] = []  # (bar, signed size, price, commission)
+
+    def buy(self, signal_bar: int, size: float) -> None:
+        fill_bar = signal_bar + 1
+        if signal_bar < self.first_signal_bar or fill_bar >= len(self._bars.open) or size <= 0:
+            return
+        check_cost = size * self._bars.close[signal_bar] * (1.0 + self._commission_rate)
+        if self._cash - check_cost < 0.0:
+            return
+        price = float(self._bars.open[fill_bar])
+        if self._slippage_rate > 0:
+            price = min(price * (1.0 + self._slippage_rate), float(self._bars.high[fill_bar]))
+        commission = size * price * self._commission_rate
+        if self._cash - size * price - commission < 0.0:
+            return
+        self._cash -= size * price + commission
+        self.size = size
+        self.fills.append((fill_bar, size, price, commission))
+
+    def close(self, signal_bar: int) -> None:
+        fill_bar = signal_bar + 1
+        if fill_bar >= len(self._bars.open) or self.size <= 0:
+            return
+        price = float(self._bars.open[fill_bar])
+        if self._slippage_rate > 0:
+            price = max(price * (1.0 - self._slippage_rate), float(self._bars.low[fill_bar]))
+        commission = self.size * price * self._commission_rate
+        self._cash += self.size * price - commission
+        self.fills.append((fill_bar, -self.size, price, commission))
+        self.size = 0.0
+
+
+def _plan_sma(bars: _Bars, params: Mapping[str, Any], book: _LongOnlyBook) -> None:
+    fast_period = int(params["fast_period"])
+    slow_period = int(params["slow_period"])
+    first = max(fast_period, slow_period)
+    diff = _sma(bars.close, fast_period) - _sma(bars.close, slow_period)
+    if first >= len(diff):
+        return
+    # CrossOver compares against the last non-zero difference, seeded at the
+    # first bar where both averages exist.
+    nonzero = np.where(diff != 0.0, diff, np.nan)
+    nonzero[first - 1] = diff[first - 1]
+    nzd = pd.Series(nonzero).ffill().to_numpy()
+    previous = nzd[first - 1 : -1]
+    current = diff[first:]
+    up = (previous < 0.0) & (current > 0.0)
+    down = (previous > 0.0) & (current < 0.0)
+    position_size = float(params["position_size"])
+    for offset in np.flatnonzero(up | down):
+        bar = first + int(offset)
+        if book.size <= 0 and up[offset]:
+            book.buy(bar, position_size)
+        elif book.size > 0 and down[offset]:
+            book.close(bar)
+
+
+def _plan_bollinger(bars: _Bars, params: Mapping[str, Any], book: _LongOnlyBook) -> None:
+    period = int(params["period"])
+    close = bars.close
+    if period < 2 or period > len(close):
+        return
+    mid = _sma(close, period)
+    # Backtrader's StdDev: sqrt(mean(x^2) - mean(x)^2) over the window.
+    deviation = np.sqrt(np.maximum(_sma(close * close, period) - mid * mid, 0.0))
+    top = mid + float(params["dev"]) * deviation
+    bottom = mid - float(params["dev"]) * deviation
+
+    previous_close = np.concatenate(([np.nan], close[:-1]))
+    below = close < bottom
+    above = close > top
+    rebound = (close >= bottom) & (close > previous_close)
+    pullback = (close <= top) & (close < previous_close)
+    at_mid = close >= mid
+    position_size = float(params["position_size"])
+
+    was_below_lower = False
+    was_above_upper = False
+    candidates = np.flatnonzero(below | above | rebound | pullback | at_mid)
+    for bar in candidates[candidates >= max(period - 1, book.first_signal_bar)].tolist():
+        if below[bar]:
+            was_below_lower = True
+        if above[bar]:
+            was_above_upper = True
+        if book.size <= 0:
+            if was_below_lower and rebound[bar]:
+                book.buy(bar, position_size)
+                was_below_lower = False
+        elif was_above_upper and pullback[bar]:
+            book.close(bar)
+            was_above_upper = False
+        elif at_mid[bar]:
+            book.close(bar)
+
+
+_Planner = Callable[[_Bars, Mapping[str, Any], _LongOnlyBook], None]
+
+VECTORIZED_STRATEGIES: dict[type[bt.Strategy], _Planner] = {
+    SMAStrategy: _plan_sma,
+    BollingerStrategy: _plan_bollinger,
+}
+
+
+def supports_vectorized(strategy_class: type[bt.Strategy]) -> bool:
+    return strategy_class in VECTORIZED_STRATEGIES
+
+
+def run_vectorized(
+    dataframe: pd.DataFrame,
+    timeframe: str,
+    strategy_class: type[bt.Strategy],
+    params: Mapping[str, Any],
+    *,
+    initial_capital: float,
+    commission_rate: float,
+    slippage_rate: float,
+    warmup_bars: int = 0,
+) -> VectorizedOutcome:
+    """Evaluate one run on whole arrays; ``params`` override the strategy defaults.
+
+    The first ``warmup_bars`` rows only feed the indicators, as in the
+    Backtrader path: no signal fires on them and the metrics leave them out.
+    """
+    planner = VECTORIZED_STRATEGIES.get(strategy_class)
+    if planner is None:
+        raise VectorizedBacktestError(
+            f"{strategy_class.__name__} has no vectorized implementation; "
+            f"supported: {sorted(cls.__name__ for cls in VECTORIZED_STRATEGIES)}"
+        )
+    resolved = dict(strategy_class.params._getitems())
+    unknown = sorted(set(params) - set(resolved))
+    if unknown:
+        raise VectorizedBacktestError(f"unknown parameter(s) for {strategy_class.__name__}: {unknown}")
+    resolved.update(params)
+
+    bars = _Bars(
+        open=dataframe["open"].to_numpy(dtype=np.float64),
+        high=dataframe["high"].to_numpy(dtype=np.float64),
+        low=dataframe["low"].to_numpy(dtype=np.float64),
+        close=dataframe["close"].to_numpy(dtype=np.float64),
+    )
+    book = _LongOnlyBook(
+        bars,
+        cash=initial_capital,
+        commission_rate=commission_rate,
+        slippage_rate=slippage_rate,
+        first_signal_bar=warmup_bars,
+    )
+    planner(bars, resolved, book)
+
+    values = _equity_curve(bars.close, book.fills, initial_capital)
+    bar_times = naive_utc_ns(dataframe.index)
+    analyzer_results = value_curve_analysis(
+        values[warmup_bars:], bar_times[warmup_bars:], timeframe, initial_capital
+    )
+    analyzer_results["trades"] = _trade_analysis(book.fills, bars_open=len(book.fills) % 2 == 1)
+    return VectorizedOutcome(
+        analyzer_results=analyzer_results,
+        final_value=float(values[-1]) if len(values) else initial_capital,
+        trade_log=_trade_log(book.fills, bar_times),
+    )
+
+
+def _sma(values: np.ndarray, period: int) -> np.ndarray:
+    """Simple moving average in O(n): differences of one running sum."""
+    result = np.full(len(values), np.nan)
+    if period <= 0 or period > len(values):
+        return result
+    # Summing deviations from the mean keeps the running sum small, so the
+    # difference of two prefix sums loses little precision on long series.
+    offset = float(values.mean())
+    sums = np.concatenate(([0.0], np.cumsum(values - offset)))
+    result[period - 1 :] = (sums[period:] - sums[:-period]) / period + offset
+    return result
+
+
+def _equity_curve(close: np.ndarray, fills: list[tuple[int, float, float, float]], initial_capital: float) -> np.ndarray:
+    size_delta = np.zeros(len(close))
+    cash_delta = np.zeros(len(close))
+    for bar, size, price, commission in fills:
+        size_delta[bar] += size
+        cash_delta[bar] -= size * price + commission
+    return initial_capital + np.cumsum(cash_delta) + np.cumsum(size_delta) * close
+
+
+def _trade_analysis(fills: list[tuple[int, float, float, float]], *, bars_open: bool) -> dict[str, Any]:
+    closed_pnls = [
+        size_in * (price_out - price_in) - commission_in - commission_out
+        for (_bar_in, size_in, price_in, commission_in), (_bar_out, _size_out, price_out, commission_out) in zip(
+            fills[0::2], fills[1::2]
+        )
+    ]
+    return trade_analysis(closed_pnls, open_trades=int(bars_open))
+
+
+def _trade_log(fills: list[tuple[int, float, float, float]], bar_times: np.ndarray) -> tuple[TradeRecord, ...]:
+    records = []
+    for (bar_in, size, price_in, commission_in), (bar_out, _size_out, price_out, commission_out) in zip(
+        fills[0::2], fills[1::2]
+    ):
+        gross = size * (price_out - price_in)
+        records.append(
+            TradeRecord(
+                entry_time=pd.Timestamp(int(bar_times[bar_in])).isoformat(),
+                exit_time=pd.Timestamp(int(bar_times[bar_out])).isoformat(),
+                side="long",
+                size=size,
+                entry_price=price_in,
+                exit_price=price_out,
+                pnl_gross=gross,
+                pnl_net=gross - commission_in - commission_out,
+            )
+        )
+    return tuple(records)
@@ -0,0 +1,273 @@
+"""Walk-forward optimization: in-sample grid sweeps validated on the following out-of-sample window.
+
+The candle slice is loaded once and every fold is a row range of that frame.
+With several workers the frame is published once in shared memory (see
+:class:`~src.backtest.sweep.SweepPool`), so the in-sample sweeps of all folds
+run in one parallel batch. The out-of-sample runs follow as a second batch.
+Each out-of-sample run first replays up to ``warmup_bars`` preceding rows so
+indicators are warm at the fold boundary, then trades from a fresh account;
+their per-period returns are compounded into one stitched equity curve.
+"""
+
+from __future__ import annotations
+
+import time
+from dataclasses import dataclass
+from typing import Any, Callable, Mapping, Sequence
+
+import numpy as np
+
+from src.backtest.engine import BacktestEngine
+from src.backtest.result_models import BacktestRunRequest, TimeSeries
+from src.backtest.sweep import (
+    DEFAULT_RANK_METRIC,
+    RANK_METRICS,
+    SweepPool,
+    SweepRunSummary,
+    SweepTask,
+    expand_grid,
+    rank_runs,
+    resolve_worker_count,
+)
+
+WALK_FORWARD_MODES = ("rolling", "anchored")
+DEFAULT_IN_SAMPLE_RATIO = 0.7
+
+
+class WalkForwardError(RuntimeError):
+    """Raised when folds cannot be planned or the walk-forward run cannot start."""
+
+
+@dataclass(frozen=True)
+class WalkForwardFold:
+    """Row ranges (end-exclusive) of one fold inside the loaded frame."""
+
+    index: int
+    in_sample_start: int
+    in_sample_end: int
+    out_sample_start: int
+    out_sample_end: int
+
+    @property
+    def in_sample_bars(self) -> int:
+        return self.in_sample_end - self.in_sample_start
+
+    @property
+    def out_sample_bars(self) -> int:
+        return self.out_sample_end - self.out_sample_start
+
+
+@dataclass(frozen=True)
+class WalkForwardFoldResult:
+    """Winning in-sample run of a fold and how it held up out of sample."""
+
+    fold: WalkForwardFold
+    in_sample_start_time: str
+    out_sample_start_time: str
+    out_sample_end_time: str
+    in_sample_runs: int
+    in_sample_failed: int
+    best_in_sample: SweepRunSummary | None
+    out_of_sample: SweepRunSummary | None
+
+    @property
+    def best_params(self) -> Mapping[str, Any] | None:
+        return self.best_in_sample.params if self.best_in_sample is not None else None
+
+
+@dataclass(frozen=True)
+class WalkForwardResult:
+    """Per-fold outcomes plus the stitched out-of-sample equity curve."""
+
+    folds: tuple[WalkForwardFoldResult, ...]
+    mode: str
+    rank_by: str
+    workers: int
+    bars: int
+    initial_capital: float
+    equity_curve: TimeSeries
+    elapsed_seconds: float
+    param_names: tuple[str, ...] = ()
+
+    @property
+    def final_equity(self) -> float:
+        return float(self.equity_curve.values[-1]) if len(self.equity_curve) else self.initial_capital
+
+    @property
+    def total_return_pct(self) -> float:
+        return (self.final_equity / self.initial_capital - 1.0) * 100.0
+
+    @property
+    def max_drawdown_pct(self) -> float:
+        values = self.equity_curve.values
+        if not len(values):
+            return 0.0
+        peaks = np.maximum.accumulate(np.maximum(values, self.initial_capital))
+        return float((100.0 * (peaks - values) / peaks).max())
+
+
+def plan_folds(
+    bar_count: int,
+    *,
+    folds: int,
+    in_sample_ratio: float = DEFAULT_IN_SAMPLE_RATIO,
+    mode: str = "rolling",
+) -> list[WalkForwardFold]:
+    """Split ``bar_count`` rows into ``folds`` consecutive out-of-sample windows.
+
+    Every in-sample window is ``in_sample_ratio / (1 - in_sample_ratio)`` times
+    the out-of-sample length. ``rolling`` slides it forward with the
+    out-of-sample window, while ``anchored`` keeps it starting at row 0.
+    """
+    if mode not in WALK_FORWARD_MODES:
+        raise WalkForwardError(f"mode must be one of {list(WALK_FORWARD_MODES)}")
+    if isinstance(folds, bool) or not isinstance(folds, int) or folds <= 0:
+        raise WalkForwardError("folds must be a positive integer")
+    if not 0.0 < in_sample_ratio < 1.0:
+        raise WalkForwardError("in_sample_ratio must be within (0, 1)")
+    in_sample_units = in_sample_ratio / (1.0 - in_sample_ratio)
+    out_sample_bars = int(bar_count / (folds + in_sample_units))
+    in_sample_bars = int(out_sample_bars * in_sample_units)
+    if out_sample_bars < 2 or in_sample_bars < 2:
+        raise WalkForwardError(
+            f"{bar_count} bars are too few for {folds} folds at in_sample_ratio={in_sample_ratio}"
+        )
+    # Any remainder goes to the first in-sample window so the last fold ends on the last bar.
+    first_out_sample = bar_count - folds * out_sample_bars
+    planned = []
+    for index in range(folds):
+        out_start = first_out_sample + index * out_sample_bars
+        planned.append(
+            WalkForwardFold(
+                index=index,
+                in_sample_start=0 if mode == "anchored" else out_start - in_sample_bars,
+                in_sample_end=out_start,
+                out_sample_start=out_start,
+                out_sample_end=out_start + out_sample_bars,
+            )
+        )
+    return planned
+
+
+class WalkForwardOptimizer:
+    """Optimize on each in-sample window, then trade the winner on the next window."""
+
+    def __init__(
+        self,
+        engine: BacktestEngine,
+        *,
+        workers: int | None = None,
+        mp_start_method: str = "spawn",
+        clock: Callable[[], float] = time.perf_counter,
+    ) -> None:
+        resolve_worker_count(workers, 1)
+        self._engine = engine
+        self._workers = workers
+        self._mp_start_method = mp_start_method
+        self._clock = clock
+
+    def run(
+        self,
+        request: BacktestRunRequest,
+        grid: Mapping[str, Sequence[Any]],
+        *,
+        folds: int,
+        in_sample_ratio: float = DEFAULT_IN_SAMPLE_RATIO,
+        mode: str = "rolling",
+        rank_by: str = DEFAULT_RANK_METRIC,
+        warmup_bars: int | None = None,
+    ) -> WalkForwardResult:
+        """Run every fold; ``warmup_bars`` defaults to each fold's in-sample length."""
+        if rank_by not in RANK_METRICS:
+            raise WalkForwardError(f"rank metric must be one of {sorted(RANK_METRICS)}")
+        if warmup_bars is not None and (
+            isinstance(warmup_bars, bool) or not isinstance(warmup_bars, int) or warmup_bars < 0
+        ):
+            raise WalkForwardError("warmup_bars must be a non-negative integer")
+        combos = expand_grid(grid)
+        if not combos:
+            raise WalkForwardError("grid must contain at least one axis")
+        started = self._clock()
+        dataframe = self._engine.load_dataframe(request)
+        plan = plan_folds(len(dataframe), folds=folds, in_sample_ratio=in_sample_ratio, mode=mode)
+        in_sample_tasks = [
+            SweepTask(params, fold.in_sample_start, fold.in_sample_end) for fold in plan for params in combos
+        ]
+        workers = resolve_worker_count(self._workers, len(in_sample_tasks))
+
+        with SweepPool(
+            self._engine,
+            request,
+            dataframe,
+            workers=workers,
+            mp_start_method=self._mp_start_method,
+        ) as pool:
+            in_sample_runs = pool.map(in_sample_tasks)
+            per_fold = [
+                in_sample_runs[index * len(combos) : (index + 1) * len(combos)] for index in range(len(plan))
+            ]
+            winners = [_best_run(runs, rank_by) for runs in per_fold]
+            out_sample_tasks = [
+                SweepTask(
+                    winner.params,
+                    fold.out_sample_start,
+                    fold.out_sample_end,
+                    warmup_rows=_warmup_rows(fold, warmup_bars),
+                    keep_series=True,
+                )
+                for fold, winner in zip(plan, winners)
+                if winner is not None
+            ]
+            out_sample_runs = iter(pool.map(out_sample_tasks))
+
+        times = dataframe.index
+        results = []
+        for fold, runs, winner in zip(plan, per_fold, winners):
+            results.append(
+                WalkForwardFoldResult(
+                    fold=fold,
+                    in_sample_start_time=times[fold.in_sample_start].isoformat(),
+                    out_sample_start_time=times[fold.out_sample_start].isoformat(),
+                    out_sample_end_time=times[fold.out_sample_end - 1].isoformat(),
+                    in_sample_runs=len(runs),
+                    in_sample_failed=sum(1 for run in runs if not run.ok),
+                    best_in_sample=winner,
+                    out_of_sample=next(out_sample_runs) if winner is not None else None,
+                )
+            )
+
+        initial_capital = self._engine.initial_capital
+        return WalkForwardResult(
+            folds=tuple(results),
+            mode=mode,
+            rank_by=rank_by,
+            workers=workers,
+            bars=len(dataframe),
+            initial_capital=initial_capital,
+            equity_curve=stitch_equity_curve(results, initial_capital),
+            elapsed_seconds=self._clock() - started,
+            param_names=tuple(grid),
+        )
+
+
+def stitch_equity_curve(folds: Sequence[WalkForwardFoldResult], initial_capital: float) -> TimeSeries:
+    """Compound every fold's out-of-sample period returns into one equity curve."""
+    returns = TimeSeries.concat(
+        fold.out_of_sample.time_series_returns
+        for fold in folds
+        if fold.out_of_sample is not None and fold.out_of_sample.ok
+    )
+    return returns.compound(initial_capital)
+
+
+def _warmup_rows(fold: WalkForwardFold, warmup_bars: int | None) -> int:
+    """Rows replayed before the out-of-sample window: ``max(0, start - warmup)`` onwards."""
+    wanted = fold.in_sample_bars if warmup_bars is None else warmup_bars
+    return min(wanted, fold.out_sample_start)
+
+
+def _best_run(runs: Sequence[SweepRunSummary], rank_by: str) -> SweepRunSummary | None:
+    ranked = rank_runs(runs, rank_by)
+    if not ranked or ranked[0].metric(rank_by) is None:
+        return None
+    return ranked[0]
@@ -1,7 +1,15 @@
 """Benchmarking package exports."""
 
-from src.benchmarking.models import BenchmarkReport
-from src.benchmarking.reporter import save_benchmark_report
+from src.benchmarking.models import BenchmarkReport, StorageBenchmarkReport
+from src.benchmarking.reporter import save_benchmark_report, save_storage_benchmark_report
 from src.benchmarking.runner import run_benchmark
+from src.benchmarking.storage_benchmarks import run_storage_benchmark
 
-__all__ = ["BenchmarkReport", "run_benchmark", "save_benchmark_report"]
+__all__ = [
+    "BenchmarkReport",
+    "StorageBenchmarkReport",
+    "run_benchmark",
+    "run_storage_benchmark",
+    "save_benchmark_report",
+    "save_storage_benchmark_report",
+]
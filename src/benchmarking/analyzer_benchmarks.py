@@ -0,0 +1,108 @@
+"""Per-bar cost of the backtrader analyzers vs the recorded value array (analyzer profiles)."""
+
+from __future__ import annotations
+
+import gc
+import time
+from collections.abc import Sequence
+from pathlib import Path
+
+from src.backtest.engine import BacktestEngine, BacktestEngineError
+from src.backtest.result_models import BacktestRunRequest, BacktestRunResult
+from src.benchmarking.executors import BenchmarkExecutionError, _new_database, _suppress_io
+from src.benchmarking.models import AnalyzerBenchmarkReport, AnalyzerProfileResult, BenchmarkMeta
+from src.benchmarking.scenarios import generate_minute_candles, seed_candles
+from src.strategies.registry import StrategyRegistry
+
+_BENCHMARK_SYMBOL = "BTC/USDT"
+_BENCHMARK_TIMEFRAME = "1m"
+_BENCHMARK_STRATEGY = "sma_strategy"
+_STRATEGY_PARAMS = {"fast_period": 10, "slow_period": 30}
+_PROFILES = ("full", "standard", "minimal")
+DEFAULT_ANALYZER_BAR_COUNTS = (20_000,)
+DEFAULT_ANALYZER_REPEATS = 3
+
+
+def run_analyzer_benchmark(
+    *,
+    output_dir: Path,
+    bar_counts: Sequence[int] = DEFAULT_ANALYZER_BAR_COUNTS,
+    repeats: int = DEFAULT_ANALYZER_REPEATS,
+    seed: int = 42,
+) -> AnalyzerBenchmarkReport:
+    """Time 1m SMA backtests under every analyzer profile over growing bar counts.
+
+    Each profile keeps its fastest of ``repeats`` runs. Data loading, the
+    strategy and the broker are identical across profiles, so the difference
+    to ``full`` divided by the bar count is the per-bar analyzer overhead the
+    recorded value array saves.
+    """
+    if not bar_counts or any(count <= 1 for count in bar_counts):
+        raise BenchmarkExecutionError("bar_counts must be integers > 1")
+    if repeats <= 0:
+        raise BenchmarkExecutionError("repeats must be a positive integer")
+
+    output_dir.mkdir(parents=True, exist_ok=True)
+    candles = generate_minute_candles(symbol=_BENCHMARK_SYMBOL, bars=max(bar_counts), seed=seed)
+    strategy_class = StrategyRegistry.default().get_by_name(_BENCHMARK_STRATEGY).strategy_class
+    db = _new_database(output_dir / "analyzer_benchmark.db")
+    try:
+        seed_candles(db, candles)
+        runs = []
+        for count in bar_counts:
+            request = BacktestRunRequest(
+                symbol=_BENCHMARK_SYMBOL,
+                timeframe=_BENCHMARK_TIMEFRAME,
+                start_timestamp=candles[0][2],
+                end_timestamp=candles[count - 1][2],
+                strategy_class=strategy_class,
+                strategy_params=dict(_STRATEGY_PARAMS),
+            )
+            timings: dict[str, tuple[float, BacktestRunResult]] = {}
+            for profile in _PROFILES:
+                engine = BacktestEngine(
+                    db,
+                    initial_capital=10_000.0,
+                    commission_rate=0.001,
+                    slippage_rate=0.0,
+                    analyzer_profile=profile,
+                )
+                # Load once: the timed runs exclude the SQLite read.
+                dataframe = engine.load_dataframe(request)
+                best = float("inf")
+                for _ in range(repeats):
+                    gc.collect()
+                    with _suppress_io():
+                        started_at = time.perf_counter()
+                        result = engine.run_on_dataframe(request, dataframe)
+                        best = min(best, time.perf_counter() - started_at)
+                timings[profile] = (best, result)
+            full_seconds = timings["full"][0]
+            for profile, (run_seconds, result) in timings.items():
+                runs.append(
+                    AnalyzerProfileResult(
+                        analyzer_profile=profile,
+                        bars=result.bars_processed,
+                        run_seconds=run_seconds,
+                        saved_us_per_bar=(full_seconds - run_seconds) * 1e6 / result.bars_processed,
+                        final_value=result.final_value,
+                        max_drawdown_pct=result.risk_metrics.max_drawdown_pct,
+                        time_series_points=len(result.time_series_returns),
+                    )
+                )
+    except BacktestEngineError as exc:
+        raise BenchmarkExecutionError(str(exc)) from exc
+    finally:
+        db.close()
+
+    return AnalyzerBenchmarkReport(
+        meta=BenchmarkMeta(
+            generated_at_utc=time.strftime("%Y-%m-%dT%H:%M:%SZ", time.gmtime()),
+            benchmark_version="analyzers-v1",
+        ),
+        timeframe=_BENCHMARK_TIMEFRAME,
+        seed=seed,
+        strategy=_BENCHMARK_STRATEGY,
+        repeats=repeats,
+        runs=tuple(runs),
+    )
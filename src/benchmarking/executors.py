@@ -64,6 +64,8 @@ def run_backtest_benchmark(
         initial_capital = _read_nested_float(runtime_config, ("account", "initial_capital"), 10_000.0)
         commission_rate = _read_nested_float(runtime_config, ("trading", "commission", "taker"), 0.001)
         slippage_rate = _read_nested_float(runtime_config, ("trading", "slippage"), 0.0)
+        backtest_cfg = runtime_config.get("backtest", {})
+        engine_mode = backtest_cfg.get("engine", "backtrader") if isinstance(backtest_cfg, Mapping) else "backtrader"
 
         engine = BacktestEngine(
             database=db,
@@ -73,6 +75,7 @@ def run_backtest_benchmark(
             data_read_source="sqlite",
             strategies_config=strategies_config,
             strategy_registry=registry,
+            engine_mode=str(engine_mode),
         )
 
         with _suppress_io():
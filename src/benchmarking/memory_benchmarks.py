@@ -0,0 +1,111 @@
+"""Peak memory of full vs bounded (streaming) backtests over growing bar counts."""
+
+from __future__ import annotations
+
+import gc
+import time
+import tracemalloc
+from collections.abc import Sequence
+from pathlib import Path
+
+from src.backtest.engine import BacktestEngine, BacktestEngineError
+from src.backtest.result_models import BacktestRunRequest
+from src.benchmarking.executors import BenchmarkExecutionError, _new_database, _suppress_io
+from src.benchmarking.models import BenchmarkMeta, MemoryBenchmarkReport, MemoryModeResult
+from src.benchmarking.scenarios import generate_minute_candles, seed_candles
+from src.strategies.registry import StrategyRegistry
+
+_BENCHMARK_SYMBOL = "BTC/USDT"
+_BENCHMARK_TIMEFRAME = "1m"
+_BENCHMARK_STRATEGY = "sma_strategy"
+_STRATEGY_PARAMS = {"fast_period": 10, "slow_period": 30}
+DEFAULT_MEMORY_BAR_COUNTS = (10_000, 40_000)
+DEFAULT_MEMORY_CHUNK_ROWS = 5_000
+# Documented ceiling for a bounded run's tracemalloc peak at the default chunk
+# size, whatever the bar count (measured ~3 MB from 10k to 40k 1m bars).
+BOUNDED_PEAK_TARGET_BYTES = 8 * 1024 * 1024
+
+
+def run_memory_benchmark(
+    *,
+    output_dir: Path,
+    bar_counts: Sequence[int] = DEFAULT_MEMORY_BAR_COUNTS,
+    chunk_rows: int = DEFAULT_MEMORY_CHUNK_ROWS,
+    seed: int = 42,
+) -> MemoryBenchmarkReport:
+    """Measure the traced Python-heap peak of 1m SMA backtests in both memory modes.
+
+    One database holds the largest slice; each size runs over its first N bars.
+    ``tracemalloc`` covers NumPy/pandas buffers as well as backtrader's Python
+    objects, but not the SQLite page cache, so the numbers are a heap profile
+    rather than process RSS. Bounded peaks should stay flat as bars grow and
+    below :data:`BOUNDED_PEAK_TARGET_BYTES`; the report lists runs that do not.
+    """
+    if not bar_counts or any(count <= 1 for count in bar_counts):
+        raise BenchmarkExecutionError("bar_counts must be integers > 1")
+    if chunk_rows <= 0:
+        raise BenchmarkExecutionError("chunk_rows must be a positive integer")
+
+    output_dir.mkdir(parents=True, exist_ok=True)
+    candles = generate_minute_candles(symbol=_BENCHMARK_SYMBOL, bars=max(bar_counts), seed=seed)
+    strategy_class = StrategyRegistry.default().get_by_name(_BENCHMARK_STRATEGY).strategy_class
+    db = _new_database(output_dir / "memory_benchmark.db")
+    try:
+        seed_candles(db, candles)
+        runs = []
+        for count in bar_counts:
+            request = BacktestRunRequest(
+                symbol=_BENCHMARK_SYMBOL,
+                timeframe=_BENCHMARK_TIMEFRAME,
+                start_timestamp=candles[0][2],
+                end_timestamp=candles[count - 1][2],
+                strategy_class=strategy_class,
+                strategy_params=dict(_STRATEGY_PARAMS),
+            )
+            for memory_mode in ("full", "bounded"):
+                engine = BacktestEngine(
+                    db,
+                    initial_capital=10_000.0,
+                    commission_rate=0.001,
+                    slippage_rate=0.0,
+                    memory_mode=memory_mode,
+                    stream_chunk_rows=chunk_rows,
+                )
+                gc.collect()
+                with _suppress_io():
+                    tracemalloc.start()
+                    try:
+                        started_at = time.perf_counter()
+                        result = engine.run(request)
+                        run_seconds = time.perf_counter() - started_at
+                        _, peak_bytes = tracemalloc.get_traced_memory()
+                    finally:
+                        tracemalloc.stop()
+                runs.append(
+                    MemoryModeResult(
+                        memory_mode=memory_mode,
+                        bars=result.bars_processed,
+                        peak_bytes=peak_bytes,
+                        run_seconds=run_seconds,
+                        total_trades=result.trade_stats.total_trades,
+                        final_value=result.final_value,
+                        time_series_points=len(result.time_series_returns),
+                    )
+                )
+    except BacktestEngineError as exc:
+        raise BenchmarkExecutionError(str(exc)) from exc
+    finally:
+        db.close()
+
+    return MemoryBenchmarkReport(
+        meta=BenchmarkMeta(
+            generated_at_utc=time.strftime("%Y-%m-%dT%H:%M:%SZ", time.gmtime()),
+            benchmark_version="memory-v1",
+        ),
+        timeframe=_BENCHMARK_TIMEFRAME,
+        seed=seed,
+        strategy=_BENCHMARK_STRATEGY,
+        chunk_rows=chunk_rows,
+        runs=tuple(runs),
+        bounded_peak_target_bytes=BOUNDED_PEAK_TARGET_BYTES,
+    )
@@ -116,3 +116,243 @@ class BenchmarkReport:
             },
             "improvement_items": list(self.improvement_items),
         }
+
+
+@dataclass(frozen=True)
+class StorageProfileResult:
+    """Storage-layer measurements for one SQLite PRAGMA profile."""
+
+    profile: str
+    journal_mode: str
+    rows: int
+    insert_rows_per_second: float
+    read_latency_ms: LatencyStats
+    contended_read_latency_ms: LatencyStats
+    concurrent_rows_written: int
+
+
+@dataclass(frozen=True)
+class IngestValidationResult:
+    """Row-validation throughput of the per-row and vectorized ingest paths."""
+
+    rows: int
+    page_size: int
+    per_row_rows_per_second: float
+    vectorized_rows_per_second: float
+
+    @property
+    def speedup(self) -> float:
+        if self.per_row_rows_per_second <= 0:
+            return 0.0
+        return self.vectorized_rows_per_second / self.per_row_rows_per_second
+
+
+@dataclass(frozen=True)
+class CandleLayoutComparison:
+    """Database size and ``load_dataframe`` latency before/after the compact migration."""
+
+    rows: int
+    datasets: int
+    legacy_size_bytes: int
+    compact_size_bytes: int
+    legacy_load_latency_ms: LatencyStats
+    compact_load_latency_ms: LatencyStats
+
+    @property
+    def size_ratio(self) -> float:
+        if self.legacy_size_bytes <= 0:
+            return 0.0
+        return self.compact_size_bytes / self.legacy_size_bytes
+
+
+@dataclass(frozen=True)
+class StorageBenchmarkReport:
+    """Top-level storage benchmark report payload."""
+
+    meta: BenchmarkMeta
+    symbol: str
+    timeframe: str
+    rows: int
+    read_iterations: int
+    batch_size: int
+    seed: int
+    profiles: tuple[StorageProfileResult, ...]
+    ingest_validation: IngestValidationResult | None = None
+    candle_layout: CandleLayoutComparison | None = None
+
+    def to_dict(self) -> dict[str, Any]:
+        """Return JSON-serializable report dict."""
+        ingest = None
+        if self.ingest_validation is not None:
+            ingest = {**asdict(self.ingest_validation), "speedup": self.ingest_validation.speedup}
+        layout = None
+        if self.candle_layout is not None:
+            layout = {**asdict(self.candle_layout), "size_ratio": self.candle_layout.size_ratio}
+        return {
+            "meta": asdict(self.meta),
+            "conditions": {
+                "symbol": self.symbol,
+                "timeframe": self.timeframe,
+                "rows": self.rows,
+                "read_iterations": self.read_iterations,
+                "batch_size": self.batch_size,
+                "seed": self.seed,
+            },
+            "profiles": [asdict(item) for item in self.profiles],
+            "ingest_validation": ingest,
+            "candle_layout": layout,
+        }
+
+
+@dataclass(frozen=True)
+class PortfolioScaleResult:
+    """Load and run timings of one multi-symbol portfolio backtest size."""
+
+    symbols: int
+    bars: int
+    bulk_load_seconds: float
+    per_symbol_load_seconds: float
+    run_seconds: float
+    total_trades: int
+    final_value: float
+
+    @property
+    def load_speedup(self) -> float:
+        if self.bulk_load_seconds <= 0:
+            return 0.0
+        return self.per_symbol_load_seconds / self.bulk_load_seconds
+
+    @property
+    def bars_per_second(self) -> float:
+        if self.run_seconds <= 0:
+            return 0.0
+        return self.symbols * self.bars / self.run_seconds
+
+
+@dataclass(frozen=True)
+class PortfolioBenchmarkReport:
+    """Top-level portfolio benchmark report payload."""
+
+    meta: BenchmarkMeta
+    timeframe: str
+    bars: int
+    seed: int
+    strategy: str
+    scales: tuple[PortfolioScaleResult, ...]
+
+    def to_dict(self) -> dict[str, Any]:
+        """Return JSON-serializable report dict."""
+        return {
+            "meta": asdict(self.meta),
+            "conditions": {
+                "timeframe": self.timeframe,
+                "bars": self.bars,
+                "seed": self.seed,
+                "strategy": self.strategy,
+            },
+            "scales": [
+                {**asdict(item), "load_speedup": item.load_speedup, "bars_per_second": item.bars_per_second}
+                for item in self.scales
+            ],
+        }
+
+
+@dataclass(frozen=True)
+class MemoryModeResult:
+    """Python-heap peak and run time of one backtest in one ``memory_mode``."""
+
+    memory_mode: str
+    bars: int
+    peak_bytes: int
+    run_seconds: float
+    total_trades: int
+    final_value: float
+    time_series_points: int
+
+    @property
+    def peak_bytes_per_bar(self) -> float:
+        if self.bars <= 0:
+            return 0.0
+        return self.peak_bytes / self.bars
+
+
+@dataclass(frozen=True)
+class MemoryBenchmarkReport:
+    """Top-level full vs bounded memory benchmark report payload."""
+
+    meta: BenchmarkMeta
+    timeframe: str
+    seed: int
+    strategy: str
+    chunk_rows: int
+    runs: tuple[MemoryModeResult, ...]
+    bounded_peak_target_bytes: int
+
+    def over_target(self, item: MemoryModeResult) -> bool:
+        """Whether a bounded run's peak exceeds the documented target."""
+        return item.memory_mode == "bounded" and item.peak_bytes > self.bounded_peak_target_bytes
+
+    @property
+    def bounded_runs_over_target(self) -> tuple[MemoryModeResult, ...]:
+        return tuple(item for item in self.runs if self.over_target(item))
+
+    def to_dict(self) -> dict[str, Any]:
+        """Return JSON-serializable report dict."""
+        return {
+            "meta": asdict(self.meta),
+            "conditions": {
+                "timeframe": self.timeframe,
+                "seed": self.seed,
+                "strategy": self.strategy,
+                "chunk_rows": self.chunk_rows,
+                "bounded_peak_target_bytes": self.bounded_peak_target_bytes,
+            },
+            "runs": [
+                {**asdict(item), "peak_bytes_per_bar": item.peak_bytes_per_bar, "over_target": self.over_target(item)}
+                for item in self.runs
+            ],
+        }
+
+
+@dataclass(frozen=True)
+class AnalyzerProfileResult:
+    """Best-of-``repeats`` run time of one backtest under one ``analyzer_profile``."""
+
+    analyzer_profile: str
+    bars: int
+    run_seconds: float
+    saved_us_per_bar: float  # vs the ``full`` profile over the same bars
+    final_value: float
+    max_drawdown_pct: float
+    time_series_points: int
+
+    @property
+    def us_per_bar(self) -> float:
+        if self.bars <= 0:
+            return 0.0
+        return self.run_seconds * 1e6 / self.bars
+
+
+@dataclass(frozen=True)
+class AnalyzerBenchmarkReport:
+    """Top-level analyzer profile benchmark report payload."""
+
+    meta: BenchmarkMeta
+    timeframe: str
+    seed: int
+    strategy: str
+    repeats: int
+    runs: tuple[AnalyzerProfileResult, ...]
+
+    def to_dict(self) -> dict[str, Any]:
+        """Return JSON-serializable report dict."""
+        return {
+            "meta": asdict(self.meta),
+            "conditions": {
+                "timeframe": self.timeframe,
+                "seed": self.seed,
+                "strategy": self.strategy,
+                "repeats": self.repeats,
+            },
+            "runs": [{**asdict(item), "us_per_bar": item.us_per_bar} for item in self.runs],
+        }
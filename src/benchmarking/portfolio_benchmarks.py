@@ -0,0 +1,109 @@
+"""Multi-symbol portfolio backtest benchmarks (bulk load vs per-symbol queries)."""
+
+from __future__ import annotations
+
+import time
+from collections.abc import Sequence
+from pathlib import Path
+
+from src.backtest.engine import BacktestEngine, BacktestEngineError
+from src.backtest.result_models import BacktestRunRequest
+from src.benchmarking.executors import BenchmarkExecutionError, _new_database, _suppress_io
+from src.benchmarking.models import BenchmarkMeta, PortfolioBenchmarkReport, PortfolioScaleResult
+from src.benchmarking.scenarios import (
+    PortfolioMomentumStrategy,
+    generate_one_year_hourly_candles,
+    seed_candles,
+)
+
+_BENCHMARK_TIMEFRAME = "1h"
+DEFAULT_SYMBOL_COUNTS = (10, 50, 100)
+
+
+def run_portfolio_benchmark(
+    *,
+    output_dir: Path,
+    symbol_counts: Sequence[int] = DEFAULT_SYMBOL_COUNTS,
+    bars: int = 24 * 30,
+    seed: int = 42,
+) -> PortfolioBenchmarkReport:
+    """Time loading and running portfolio backtests over ``symbol_counts`` symbols.
+
+    One database holds the largest universe; each size trades its first N
+    symbols. Loading is measured both as the single bulk query and as one
+    query per symbol, so the report shows what the bulk path saves.
+    """
+    if bars <= 1 or bars > 24 * 365:
+        raise BenchmarkExecutionError("bars must be within [2, 8760]")
+    if not symbol_counts or any(count <= 1 for count in symbol_counts):
+        raise BenchmarkExecutionError("symbol_counts must be integers > 1")
+
+    output_dir.mkdir(parents=True, exist_ok=True)
+    symbols = [f"SYM{idx:03d}/USDT" for idx in range(max(symbol_counts))]
+    db = _new_database(output_dir / "portfolio_benchmark.db")
+    try:
+        for idx, symbol in enumerate(symbols):
+            candles = generate_one_year_hourly_candles(symbol=symbol, timeframe=_BENCHMARK_TIMEFRAME, seed=seed + idx)
+            seed_candles(db, candles[:bars])
+        start_ms = candles[0][2]
+        end_ms = candles[bars - 1][2]
+
+        engine = BacktestEngine(
+            db,
+            initial_capital=100_000.0,
+            commission_rate=0.001,
+            slippage_rate=0.0,
+            data_read_source="sqlite",
+        )
+        scales = []
+        for count in symbol_counts:
+            request = BacktestRunRequest(
+                symbol=symbols[0],
+                timeframe=_BENCHMARK_TIMEFRAME,
+                start_timestamp=start_ms,
+                end_timestamp=end_ms,
+                strategy_class=PortfolioMomentumStrategy,
+                symbols=tuple(symbols[:count]),
+            )
+            with _suppress_io():
+                started_at = time.perf_counter()
+                frames = engine.load_symbol_dataframes(request)
+                bulk_load_seconds = time.perf_counter() - started_at
+
+                started_at = time.perf_counter()
+                for symbol in request.portfolio_symbols:
+                    engine.load_dataframe(
+                        BacktestRunRequest(symbol, _BENCHMARK_TIMEFRAME, start_ms, end_ms, PortfolioMomentumStrategy)
+                    )
+                per_symbol_load_seconds = time.perf_counter() - started_at
+
+                started_at = time.perf_counter()
+                result = engine.run_portfolio(request, frames)
+                run_seconds = time.perf_counter() - started_at
+            scales.append(
+                PortfolioScaleResult(
+                    symbols=count,
+                    bars=bars,
+                    bulk_load_seconds=bulk_load_seconds,
+                    per_symbol_load_seconds=per_symbol_load_seconds,
+                    run_seconds=run_seconds,
+                    total_trades=result.trade_stats.total_trades,
+                    final_value=result.final_value,
+                )
+            )
+    except BacktestEngineError as exc:
+        raise BenchmarkExecutionError(str(exc)) from exc
+    finally:
+        db.close()
+
+    return PortfolioBenchmarkReport(
+        meta=BenchmarkMeta(
+            generated_at_utc=time.strftime("%Y-%m-%dT%H:%M:%SZ", time.gmtime()),
+            benchmark_version="portfolio-v1",
+        ),
+        timeframe=_BENCHMARK_TIMEFRAME,
+        bars=bars,
+        seed=seed,
+        strategy=PortfolioMomentumStrategy.__name__,
+        scales=tuple(scales),
+    )
@@ -5,7 +5,14 @@ from __future__ import annotations
 import json
 from pathlib import Path
 
-from src.benchmarking.models import BenchmarkReport
+from src.benchmarking.models import (
+    AnalyzerBenchmarkReport,
+    BenchmarkReport,
+    MemoryBenchmarkReport,
+    MemoryModeResult,
+    PortfolioBenchmarkReport,
+    StorageBenchmarkReport,
+)
 
 
 def save_benchmark_report(report: BenchmarkReport, output_dir: Path) -> dict[str, Path]:
@@ -24,8 +31,93 @@ def save_benchmark_report(report: BenchmarkReport, output_dir: Path) -> dict[str
     return {"json": json_path, "markdown": md_path}
 
 
-def _resolve_report_paths(*, output_dir: Path, timestamp: str) -> tuple[Path, Path]:
-    base_name = f"benchmark_report_{timestamp}"
+def save_storage_benchmark_report(report: StorageBenchmarkReport, output_dir: Path) -> dict[str, Path]:
+    """Persist storage benchmark report as JSON and Markdown files."""
+    output_dir.mkdir(parents=True, exist_ok=True)
+    timestamp = report.meta.generated_at_utc.replace("-", "").replace(":", "")
+    timestamp = timestamp.replace("T", "_")
+    json_path, md_path = _resolve_report_paths(
+        output_dir=output_dir,
+        timestamp=timestamp,
+        prefix="storage_benchmark_report",
+    )
+
+    json_path.write_text(
+        json.dumps(report.to_dict(), ensure_ascii=False, indent=2),
+        encoding="utf-8",
+    )
+    md_path.write_text(_render_storage_markdown(report), encoding="utf-8")
+
+    return {"json": json_path, "markdown": md_path}
+
+
+def save_portfolio_benchmark_report(report: PortfolioBenchmarkReport, output_dir: Path) -> dict[str, Path]:
+    """Persist portfolio benchmark report as JSON and Markdown files."""
+    output_dir.mkdir(parents=True, exist_ok=True)
+    timestamp = report.meta.generated_at_utc.replace("-", "").replace(":", "")
+    timestamp = timestamp.replace("T", "_")
+    json_path, md_path = _resolve_report_paths(
+        output_dir=output_dir,
+        timestamp=timestamp,
+        prefix="portfolio_benchmark_report",
+    )
+
+    json_path.write_text(
+        json.dumps(report.to_dict(), ensure_ascii=False, indent=2),
+        encoding="utf-8",
+    )
+    md_path.write_text(_render_portfolio_markdown(report), encoding="utf-8")
+
+    return {"json": json_path, "markdown": md_path}
+
+
+def save_memory_benchmark_report(report: MemoryBenchmarkReport, output_dir: Path) -> dict[str, Path]:
+    """Persist memory benchmark report as JSON and Markdown files."""
+    output_dir.mkdir(parents=True, exist_ok=True)
+    timestamp = report.meta.generated_at_utc.replace("-", "").replace(":", "")
+    timestamp = timestamp.replace("T", "_")
+    json_path, md_path = _resolve_report_paths(
+        output_dir=output_dir,
+        timestamp=timestamp,
+        prefix="memory_benchmark_report",
+    )
+
+    json_path.write_text(
+        json.dumps(report.to_dict(), ensure_ascii=False, indent=2),
+        encoding="utf-8",
+    )
+    md_path.write_text(_render_memory_markdown(report), encoding="utf-8")
+
+    return {"json": json_path, "markdown": md_path}
+
+
+def save_analyzer_benchmark_report(report: AnalyzerBenchmarkReport, output_dir: Path) -> dict[str, Path]:
+    """Persist analyzer profile benchmark report as JSON and Markdown files."""
+    output_dir.mkdir(parents=True, exist_ok=True)
+    timestamp = report.meta.generated_at_utc.replace("-", "").replace(":", "")
+    timestamp = timestamp.replace("T", "_")
+    json_path, md_path = _resolve_report_paths(
+        output_dir=output_dir,
+        timestamp=timestamp,
+        prefix="analyzer_benchmark_report",
+    )
+
+    json_path.write_text(
+        json.dumps(report.to_dict(), ensure_ascii=False, indent=2),
+        encoding="utf-8",
+    )
+    md_path.write_text(_render_analyzer_markdown(report), encoding="utf-8")
+
+    return {"json": json_path, "markdown": md_path}
+
+
+def _resolve_report_paths(
+    *,
+    output_dir: Path,
+    timestamp: str,
+    prefix: str = "benchmark_report",
+) -> tuple[Path, Path]:
+    base_name = f"{prefix}_{timestamp}"
     json_path = output_dir / f"{base_name}.json"
     md_path = output_dir / f"{base_name}.md"
     if not json_path.exists() and not md_path.exists():
@@ -105,3 +197,156 @@ def _render_markdown(report: BenchmarkReport) -> str:
     lines.extend([f"- {item}" for item in report.improvement_items])
 
     return "\n".join(lines) + "\n"
+
+
+def _render_storage_markdown(report: StorageBenchmarkReport) -> str:
+    lines: list[str] = [
+        "# 存储层性能基准报告",
+        "",
+        f"- 生成时间(UTC): `{report.meta.generated_at_utc}`",
+        f"- 基准版本: `{report.meta.benchmark_version}`",
+        "",
+        "## 测试条件",
+        f"- symbol: `{report.symbol}`",
+        f"- timeframe: `{report.timeframe}`",
+        f"- rows: `{report.rows}`",
+        f"- batch_size: `{report.batch_size}`",
+        f"- read_iterations: `{report.read_iterations}`",
+        f"- seed: `{report.seed}`",
+        "",
+        "## 结果",
+        "",
+        "| profile | journal_mode | insert rows/s | read p95(ms) | read p95 写入并发(ms) | 并发写入行数 |",
+        "| --- | --- | ---: | ---: | ---: | ---: |",
+    ]
+    for item in report.profiles:
+        lines.append(
+            f"| {item.profile} | {item.journal_mode} | {item.insert_rows_per_second:.1f} "
+            f"| {item.read_latency_ms.p95_ms:.6f} | {item.contended_read_latency_ms.p95_ms:.6f} "
+            f"| {item.concurrent_rows_written} |"
+        )
+    ingest = report.ingest_validation
+    if ingest is not None:
+        lines.extend(
+            [
+                "",
+                "## 入库校验吞吐",
+                "",
+                "| 路径 | rows/s |",
+                "| --- | ---: |",
+                f"| 逐行 Candle.validate | {ingest.per_row_rows_per_second:.1f} |",
+                f"| NumPy 批量校验 (page={ingest.page_size}) | {ingest.vectorized_rows_per_second:.1f} |",
+                "",
+                f"- 加速比: `{ingest.speedup:.2f}x`",
+            ]
+        )
+    layout = report.candle_layout
+    if layout is not None:
+        lines.extend(
+            [
+                "",
+                "## K线表布局对比（legacy → compact）",
+                "",
+                f"- rows: `{layout.rows}`，datasets: `{layout.datasets}`",
+                "",
+                "| 布局 | 文件大小(bytes) | load_dataframe mean(ms) | load_dataframe p95(ms) |",
+                "| --- | ---: | ---: | ---: |",
+                f"| legacy | {layout.legacy_size_bytes} | {layout.legacy_load_latency_ms.mean_ms:.6f} "
+                f"| {layout.legacy_load_latency_ms.p95_ms:.6f} |",
+                f"| compact | {layout.compact_size_bytes} | {layout.compact_load_latency_ms.mean_ms:.6f} "
+                f"| {layout.compact_load_latency_ms.p95_ms:.6f} |",
+                "",
+                f"- 体积比: `{layout.size_ratio:.2%}`",
+            ]
+        )
+    return "\n".join(lines) + "\n"
+
+
+def _render_portfolio_markdown(report: PortfolioBenchmarkReport) -> str:
+    lines: list[str] = [
+        "# 多标的组合回测性能基准报告",
+        "",
+        f"- 生成时间(UTC): `{report.meta.generated_at_utc}`",
+        f"- 基准版本: `{report.meta.benchmark_version}`",
+        "",
+        "## 测试条件",
+        f"- timeframe: `{report.timeframe}`",
+        f"- bars/symbol: `{report.bars}`",
+        f"- strategy: `{report.strategy}`",
+        f"- seed: `{report.seed}`",
+        "",
+        "## 结果",
+        "",
+        "| symbols | 批量加载(s) | 逐标的加载(s) | 加载加速比 | 回测(s) | bars/s | trades | final_value |",
+        "| ---: | ---: | ---: | ---: | ---: | ---: | ---: | ---: |",
+    ]
+    for item in report.scales:
+        lines.append(
+            f"| {item.symbols} | {item.bulk_load_seconds:.6f} | {item.per_symbol_load_seconds:.6f} "
+            f"| {item.load_speedup:.2f}x | {item.run_seconds:.3f} | {item.bars_per_second:.1f} "
+            f"| {item.total_trades} | {item.final_value:.2f} |"
+        )
+    return "\n".join(lines) + "\n"
+
+
+def _render_memory_markdown(report: MemoryBenchmarkReport) -> str:
+    lines: list[str] = [
+        "# 回测内存模式基准报告",
+        "",
+        f"- 生成时间(UTC): `{report.meta.generated_at_utc}`",
+        f"- 基准版本: `{report.meta.benchmark_version}`",
+        "",
+        "## 测试条件",
+        f"- timeframe: `{report.timeframe}`",
+        f"- strategy: `{report.strategy}`",
+        f"- chunk_rows: `{report.chunk_rows}`",
+        f"- seed: `{report.seed}`",
+        "- 峰值为 tracemalloc 统计的 Python 堆峰值（含 NumPy/pandas 缓冲区，不含 SQLite 页缓存），不是进程 RSS",
+        f"- bounded 峰值目标: `< {report.bounded_peak_target_bytes / (1024 * 1024):.0f} MB`（与K线数量无关）",
+        "",
+        "## 结果",
+        "",
+        "| memory_mode | bars | 峰值(MB) | 峰值/bar(B) | 回测(s) | trades | 收益序列点数 | final_value | 目标 |",
+        "| --- | ---: | ---: | ---: | ---: | ---: | ---: | ---: | --- |",
+    ]
+    for item in report.runs:
+        lines.append(
+            f"| {item.memory_mode} | {item.bars} | {item.peak_bytes / (1024 * 1024):.2f} "
+            f"| {item.peak_bytes_per_bar:.1f} | {item.run_seconds:.3f} | {item.total_trades} "
+            f"| {item.time_series_points} | {item.final_value:.2f} | {_memory_target_label(report, item)} |"
+        )
+    return "\n".join(lines) + "\n"
+
+
+def _memory_target_label(report: MemoryBenchmarkReport, item: MemoryModeResult) -> str:
+    if item.memory_mode != "bounded":
+        return "-"
+    return "超出" if report.over_target(item) else "达标"
+
+
+def _render_analyzer_markdown(report: AnalyzerBenchmarkReport) -> str:
+    lines: list[str] = [
+        "# 回测分析器档位基准报告",
+        "",
+        f"- 生成时间(UTC): `{report.meta.generated_at_utc}`",
+        f"- 基准版本: `{report.meta.benchmark_version}`",
+        "",
+        "## 测试条件",
+        f"- timeframe: `{report.timeframe}`",
+        f"- strategy: `{report.strategy}`",
+        f"- repeats: `{report.repeats}`（取最快一次）",
+        f"- seed: `{report.seed}`",
+        "- K线预先载入，耗时只含 Cerebro 运行与结果构建；节省/bar 相对同规模的 full 档位",
+        "",
+        "## 结果",
+        "",
+        "| analyzer_profile | bars | 回测(s) | 每bar(us) | 节省/bar(us) | max_drawdown_pct | 收益序列点数 | final_value |",
+        "| --- | ---: | ---: | ---: | ---: | ---: | ---: | ---: |",
+    ]
+    for item in report.runs:
+        lines.append(
+            f"| {item.analyzer_profile} | {item.bars} | {item.run_seconds:.3f} | {item.us_per_bar:.2f} "
+            f"| {item.saved_us_per_bar:.2f} | {item.max_drawdown_pct:.4f} | {item.time_series_points} "
+            f"| {item.final_value:.2f} |"
+        )
+    return "\n".join(lines) + "\n"
@@ -22,13 +22,49 @@ def generate_one_year_hourly_candles(
     start_timestamp_ms: int = 1_704_067_200_000,  # 2024-01-01 00:00:00 UTC
 ) -> list[tuple[str, str, int, float, float, float, float, float]]:
     """Generate deterministic 1-year 1h candles for backtest benchmark."""
-    hours = 24 * 365
+    return _random_walk_candles(
+        symbol=symbol,
+        timeframe=timeframe,
+        bars=24 * 365,
+        interval_ms=3_600_000,
+        seed=seed,
+        start_timestamp_ms=start_timestamp_ms,
+    )
+
+
+def generate_minute_candles(
+    *,
+    symbol: str,
+    bars: int,
+    seed: int,
+    start_timestamp_ms: int = 1_704_067_200_000,  # 2024-01-01 00:00:00 UTC
+) -> list[tuple[str, str, int, float, float, float, float, float]]:
+    """Generate ``bars`` deterministic 1m candles for the memory benchmark."""
+    return _random_walk_candles(
+        symbol=symbol,
+        timeframe="1m",
+        bars=bars,
+        interval_ms=60_000,
+        seed=seed,
+        start_timestamp_ms=start_timestamp_ms,
+    )
+
+
+def _random_walk_candles(
+    *,
+    symbol: str,
+    timeframe: str,
+    bars: int,
+    interval_ms: int,
+    seed: int,
+    start_timestamp_ms: int,
+) -> list[tuple[str, str, int, float, float, float, float, float]]:
     rng = random.Random(seed)
     price = 100.0
     rows: list[tuple[str, str, int, float, float, float, float, float]] = []
 
-    for idx in range(hours):
-        timestamp = start_timestamp_ms + idx * 3_600_000
+    for idx in range(bars):
+        timestamp = start_timestamp_ms + idx * interval_ms
 
         drift = 0.0002
         shock = rng.uniform(-0.01, 0.01)
@@ -205,3 +241,21 @@ class SilentBacktestStrategy(bt.Strategy):
 
     def next(self) -> None:
         return None
+
+
+class PortfolioMomentumStrategy(bt.Strategy):
+    """Per-symbol momentum over every data feed, sharing one broker's cash (portfolio benchmark)."""
+
+    params = (("lookback", 24),)
+
+    def next(self) -> None:
+        if len(self) <= self.p.lookback:
+            return
+        weight = 1.0 / len(self.datas)
+        for data in self.datas:
+            position = self.getposition(data)
+            rising = data.close[0] > data.close[-self.p.lookback]
+            if not position and rising:
+                self.buy(data=data, size=self.broker.getvalue() * weight * 0.95 / data.close[0])
+            elif position and not rising:
+                self.close(data=data)
@@ -0,0 +1,344 @@
+"""Storage-layer benchmarks comparing SQLite PRAGMA profiles."""
+
+from __future__ import annotations
+
+import random
+import threading
+import time
+from collections.abc import Sequence
+from pathlib import Path
+
+from src.benchmarking.evaluation import compute_latency_stats
+from src.benchmarking.executors import BenchmarkExecutionError
+from src.benchmarking.models import (
+    BenchmarkMeta,
+    CandleLayoutComparison,
+    IngestValidationResult,
+    LatencyStats,
+    StorageBenchmarkReport,
+    StorageProfileResult,
+)
+from src.benchmarking.scenarios import generate_one_year_hourly_candles
+from src.core.candle import Candle
+from src.core.database import PRAGMA_PROFILES, SQLiteDatabase
+from src.data.candle_batch import validate_ohlcv_batch
+from src.data.candle_schema import CompactCandleMigration, database_size_bytes, vacuum_database
+from src.data.feed import BacktestDataSlice, SQLitePandasFeedFactory
+from src.data.storage import HistoricalCandleStorage, OfflineCandleFetcher
+
+_BENCHMARK_TIMEFRAME = "1h"
+_READ_WINDOW_MS = 7 * 24 * 3_600_000
+_WRITER_SYMBOL = "WRITER/USDT"
+_WRITER_BATCH_SIZE = 50
+_LAYOUT_DATASETS = ("BTC/USDT", "ETH/USDT", "SOL/USDT")
+
+
+def run_storage_benchmark(
+    *,
+    output_dir: Path,
+    symbol: str = "BTC/USDT",
+    profiles: Sequence[str] = ("legacy", "wal"),
+    rows: int = 24 * 365,
+    read_iterations: int = 200,
+    batch_size: int = 500,
+    seed: int = 42,
+) -> StorageBenchmarkReport:
+    """Measure ingest throughput and read latency (idle and under write load) per profile."""
+    if rows <= 0:
+        raise BenchmarkExecutionError("rows must be > 0")
+    if read_iterations <= 0:
+        raise BenchmarkExecutionError("read_iterations must be > 0")
+    if batch_size <= 0:
+        raise BenchmarkExecutionError("batch_size must be > 0")
+    unknown = [name for name in profiles if name not in PRAGMA_PROFILES]
+    if unknown or not profiles:
+        raise BenchmarkExecutionError(f"profiles must be a non-empty subset of {sorted(PRAGMA_PROFILES)}")
+
+    output_dir.mkdir(parents=True, exist_ok=True)
+    candles = generate_one_year_hourly_candles(symbol=symbol, timeframe=_BENCHMARK_TIMEFRAME, seed=seed)
+    candles = candles[:rows]
+
+    results = tuple(
+        _run_profile(
+            profile=name,
+            path=output_dir / f"storage_benchmark_{name}.db",
+            candles=candles,
+            read_iterations=read_iterations,
+            batch_size=batch_size,
+            seed=seed,
+        )
+        for name in profiles
+    )
+    return StorageBenchmarkReport(
+        meta=BenchmarkMeta(
+            generated_at_utc=time.strftime("%Y-%m-%dT%H:%M:%SZ", time.gmtime()),
+            benchmark_version="storage-v1",
+        ),
+        symbol=symbol,
+        timeframe=_BENCHMARK_TIMEFRAME,
+        rows=len(candles),
+        read_iterations=read_iterations,
+        batch_size=batch_size,
+        seed=seed,
+        profiles=results,
+        ingest_validation=_measure_ingest_validation(candles, page_size=batch_size),
+        candle_layout=_measure_candle_layout(
+            path=output_dir / "storage_benchmark_layout.db",
+            candles=candles,
+            read_iterations=read_iterations,
+            batch_size=batch_size,
+            seed=seed,
+        ),
+    )
+
+
+def _run_profile(
+    *,
+    profile: str,
+    path: Path,
+    candles: list[tuple[str, str, int, float, float, float, float, float]],
+    read_iterations: int,
+    batch_size: int,
+    seed: int,
+) -> StorageProfileResult:
+    _remove_database_files(path)
+    db = SQLiteDatabase(path, pragma_profile=profile)
+    db.open()
+    try:
+        db.initialize_schema()
+        journal_mode = str(db.connection.execute("PRAGMA journal_mode;").fetchone()[0])
+
+        started_at = time.perf_counter()
+        for offset in range(0, len(candles), batch_size):
+            with db.transaction() as tx:
+                tx.executemany(
+                    """
+                    INSERT INTO candles(symbol, timeframe, timestamp, open, high, low, close, volume)
+                    VALUES (?, ?, ?, ?, ?, ?, ?, ?);
+                    """,
+                    candles[offset : offset + batch_size],
+                )
+        elapsed = max(time.perf_counter() - started_at, 1e-9)
+
+        storage = HistoricalCandleStorage(db, fetcher=OfflineCandleFetcher())
+        first_ts = candles[0][2]
+        last_ts = candles[-1][2]
+        idle_stats = _measure_reads(
+            storage, candles[0][0], first_ts, last_ts, read_iterations, random.Random(seed)
+        )
+
+        stop = threading.Event()
+        writer = _BackgroundWriter(path=path, profile=profile, start_ts=last_ts, stop=stop)
+        writer.start()
+        try:
+            writer.ready.wait(timeout=10.0)
+            contended_stats = _measure_reads(
+                storage, candles[0][0], first_ts, last_ts, read_iterations, random.Random(seed + 1)
+            )
+        finally:
+            stop.set()
+            writer.join()
+        if writer.error is not None:
+            raise BenchmarkExecutionError(f"background writer failed: {writer.error}") from writer.error
+    finally:
+        db.close()
+
+    return StorageProfileResult(
+        profile=profile,
+        journal_mode=journal_mode.upper(),
+        rows=len(candles),
+        insert_rows_per_second=len(candles) / elapsed,
+        read_latency_ms=idle_stats,
+        contended_read_latency_ms=contended_stats,
+        concurrent_rows_written=writer.rows_written,
+    )
+
+
+def _measure_reads(
+    storage: HistoricalCandleStorage,
+    symbol: str,
+    first_ts: int,
+    last_ts: int,
+    iterations: int,
+    rng: random.Random,
+) -> LatencyStats:
+    latest_start = max(first_ts, last_ts - _READ_WINDOW_MS)
+    samples_ms: list[float] = []
+    for _ in range(iterations):
+        start = rng.randint(first_ts, latest_start)
+        started_ns = time.perf_counter_ns()
+        storage.query_candles(symbol, _BENCHMARK_TIMEFRAME, start, start + _READ_WINDOW_MS)
+        samples_ms.append((time.perf_counter_ns() - started_ns) / 1_000_000)
+    return compute_latency_stats(samples_ms)
+
+
+def _measure_ingest_validation(
+    candles: list[tuple[str, str, int, float, float, float, float, float]],
+    *,
+    page_size: int,
+) -> IngestValidationResult:
+    """Time validation + normalization of exchange-shaped pages, without SQLite."""
+    symbol, timeframe = candles[0][0], candles[0][1]
+    pages = [
+        [list(candle[2:]) for candle in candles[offset : offset + page_size]]
+        for offset in range(0, len(candles), page_size)
+    ]
+
+    started_at = time.perf_counter()
+    for page in pages:
+        [
+            (
+                candle.symbol,
+                candle.timeframe,
+                candle.timestamp,
+                candle.open,
+                candle.high,
+                candle.low,
+                candle.close,
+                candle.volume,
+            )
+            for candle in (
+                Candle.validate(
+                    {
+                        "symbol": symbol,
+                        "timeframe": timeframe,
+                        "timestamp": row[0],
+                        "open": row[1],
+                        "high": row[2],
+                        "low": row[3],
+                        "close": row[4],
+                        "volume": row[5],
+                    }
+                )
+                for row in page
+            )
+        ]
+    per_row_elapsed = max(time.perf_counter() - started_at, 1e-9)
+
+    started_at = time.perf_counter()
+    for page in pages:
+        validate_ohlcv_batch(page, symbol=symbol, timeframe=timeframe)
+    vectorized_elapsed = max(time.perf_counter() - started_at, 1e-9)
+
+    return IngestValidationResult(
+        rows=len(candles),
+        page_size=page_size,
+        per_row_rows_per_second=len(candles) / per_row_elapsed,
+        vectorized_rows_per_second=len(candles) / vectorized_elapsed,
+    )
+
+
+def _measure_candle_layout(
+    *,
+    path: Path,
+    candles: list[tuple[str, str, int, float, float, float, float, float]],
+    read_iterations: int,
+    batch_size: int,
+    seed: int,
+) -> CandleLayoutComparison:
+    """Load the same multi-dataset table, then compare size and reads across the migration."""
+    _remove_database_files(path)
+    db = SQLiteDatabase(path, pragma_profile="wal")
+    db.open()
+    try:
+        db.initialize_schema()
+        rows = [(symbol, *candle[1:]) for symbol in _LAYOUT_DATASETS for candle in candles]
+        for offset in range(0, len(rows), batch_size):
+            with db.transaction() as tx:
+                tx.executemany(
+                    """
+                    INSERT INTO candles(symbol, timeframe, timestamp, open, high, low, close, volume)
+                    VALUES (?, ?, ?, ?, ?, ?, ?, ?);
+                    """,
+                    rows[offset : offset + batch_size],
+                )
+        # Repack first so both sides are measured without free pages.
+        vacuum_database(db)
+        legacy_size = database_size_bytes(db)
+        feed = SQLitePandasFeedFactory(db)
+        first_ts = candles[0][2]
+        last_ts = candles[-1][2]
+        legacy_stats = _measure_loads(feed, first_ts, last_ts, read_iterations, random.Random(seed))
+
+        result = CompactCandleMigration(db).run(vacuum=True)
+        compact_stats = _measure_loads(feed, first_ts, last_ts, read_iterations, random.Random(seed))
+    finally:
+        db.close()
+
+    return CandleLayoutComparison(
+        rows=len(rows),
+        datasets=len(_LAYOUT_DATASETS),
+        legacy_size_bytes=legacy_size,
+        compact_size_bytes=result.size_bytes_after,
+        legacy_load_latency_ms=legacy_stats,
+        compact_load_latency_ms=compact_stats,
+    )
+
+
+def _measure_loads(
+    feed: SQLitePandasFeedFactory,
+    first_ts: int,
+    last_ts: int,
+    iterations: int,
+    rng: random.Random,
+) -> LatencyStats:
+    latest_start = max(first_ts, last_ts - _READ_WINDOW_MS)
+    samples_ms: list[float] = []
+    for _ in range(iterations):
+        start = rng.randint(first_ts, latest_start)
+        request = BacktestDataSlice(
+            symbol=rng.choice(_LAYOUT_DATASETS),
+            timeframe=_BENCHMARK_TIMEFRAME,
+            start_timestamp=start,
+            end_timestamp=start + _READ_WINDOW_MS,
+        )
+        started_ns = time.perf_counter_ns()
+        feed.load_dataframe(request)
+        samples_ms.append((time.perf_counter_ns() - started_ns) / 1_000_000)
+    return compute_latency_stats(samples_ms)
+
+
+def _remove_database_files(path: Path) -> None:
+    for suffix in ("", "-wal", "-shm", "-journal"):
+        candidate = path.with_name(path.name + suffix)
+        if candidate.exists():
+            candidate.unlink()
+
+
+class _BackgroundWriter(threading.Thread):
+    """Commit small candle batches on a second connection until stopped."""
+
+    def __init__(self, *, path: Path, profile: str, start_ts: int, stop: threading.Event) -> None:
+        super().__init__(name="storage-benchmark-writer", daemon=True)
+        self._path = path
+        self._profile = profile
+        self._next_ts = start_ts
+        self._stop_event = stop
+        self.ready = threading.Event()
+        self.rows_written = 0
+        self.error: BaseException | None = None
+
+    def run(self) -> None:
+        db = SQLiteDatabase(self._path, pragma_profile=self._profile, read_pool_size=0)
+        try:
+            db.open()
+            self.ready.set()
+            while not self._stop_event.is_set():
+                batch = []
+                for _ in range(_WRITER_BATCH_SIZE):
+                    self._next_ts += 3_600_000
+                    batch.append((_WRITER_SYMBOL, _BENCHMARK_TIMEFRAME, self._next_ts, 1.0, 1.0, 1.0, 1.0, 1.0))
+                with db.transaction() as tx:
+                    tx.executemany(
+                        """
+                        INSERT INTO candles(symbol, timeframe, timestamp, open, high, low, close, volume)
+                        VALUES (?, ?, ?, ?, ?, ?, ?, ?);
+                        """,
+                        batch,
+                    )
+                self.rows_written += len(batch)
+        except BaseException as exc:  # pragma: no cover - surfaced by caller
+            self.error = exc
+        finally:
+            self.ready.set()
+            db.close()
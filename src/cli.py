@@ -15,15 +15,33 @@ from src.cli_commands import (
     handle_status,
     handle_stop,
 )
+from src.backtest.monte_carlo import DEFAULT_RUIN_DRAWDOWN_PCT, MONTE_CARLO_METHODS
+from src.backtest.sweep import DEFAULT_RANK_METRIC, RANK_METRICS
+from src.backtest.walk_forward import DEFAULT_IN_SAMPLE_RATIO
+from src.benchmarking.analyzer_benchmarks import DEFAULT_ANALYZER_BAR_COUNTS, DEFAULT_ANALYZER_REPEATS
+from src.benchmarking.memory_benchmarks import DEFAULT_MEMORY_BAR_COUNTS, DEFAULT_MEMORY_CHUNK_ROWS
+from src.benchmarking.portfolio_benchmarks import DEFAULT_SYMBOL_COUNTS
 from src.cli_benchmark import handle_benchmark
+from src.cli_db_commands import handle_db_maintain, handle_db_migrate_candles
 from src.cli_context import CLICommandError, build_context, console
 from src.cli_order_commands import handle_order_cancel, handle_order_list, handle_order_place
 from src.cli_workflows import (
     handle_backtest,
+    handle_backtest_replay,
+    handle_backtest_sweep,
+    handle_backtest_walk_forward,
     handle_download,
     handle_export,
     handle_import,
     handle_live,
+    handle_repair,
+    handle_rollup,
+    handle_sync_columnar,
+)
+from src.utils.config_defaults import (
+    ALLOWED_ANALYZER_PROFILES,
+    ALLOWED_BACKTEST_ENGINES,
+    ALLOWED_MEMORY_MODES,
 )
 
 
@@ -85,8 +103,9 @@ def build_parser() -> argparse.ArgumentParser:
     order_cancel.set_defaults(handler=handle_order_cancel)
 
     backtest_parser = subparsers.add_parser("backtest", help="运行回测")
-    backtest_parser.add_argument("--strategy", required=True)
-    backtest_parser.add_argument("--symbol", required=True)
+    # Required by the plain run only; enforced in main() so `backtest sweep` can own its options.
+    backtest_parser.add_argument("--strategy")
+    backtest_parser.add_argument("--symbol")
     backtest_parser.add_argument("--timeframe")
     backtest_parser.add_argument("--start-ms", type=int)
     backtest_parser.add_argument("--end-ms", type=int)
@@ -94,15 +113,118 @@ def build_parser() -> argparse.ArgumentParser:
     backtest_parser.add_argument("--param", action="append", help="策略参数，格式 key=value")
     backtest_parser.add_argument("--output-dir", help="可选：导出回测结果目录")
     backtest_parser.add_argument("--prefix", help="导出文件名前缀")
-    backtest_parser.set_defaults(handler=handle_backtest)
+    backtest_parser.add_argument(
+        "--engine",
+        choices=sorted(ALLOWED_BACKTEST_ENGINES),
+        help="回测引擎（默认取 backtest.engine）",
+    )
+    backtest_parser.add_argument(
+        "--memory-mode",
+        choices=sorted(ALLOWED_MEMORY_MODES),
+        help="内存模式（默认取 backtest.memory_mode）；bounded 流式读取K线，适合多年 1m 数据",
+    )
+    backtest_parser.add_argument(
+        "--analyzer-profile",
+        choices=sorted(ALLOWED_ANALYZER_PROFILES),
+        help=(
+            "分析器档位（默认取 backtest.analyzer_profile）；"
+            "standard/minimal 逐 bar 只记录账户净值，指标事后用 NumPy 计算"
+        ),
+    )
+    backtest_parser.add_argument(
+        "--monte-carlo",
+        type=int,
+        metavar="PATHS",
+        help="可选：对成交盈亏序列做 PATHS 次蒙特卡洛重采样",
+    )
+    backtest_parser.add_argument(
+        "--mc-method",
+        choices=list(MONTE_CARLO_METHODS),
+        default="bootstrap",
+        help="bootstrap=有放回抽样；shuffle=打乱顺序",
+    )
+    backtest_parser.add_argument("--mc-seed", type=int, default=42)
+    backtest_parser.add_argument(
+        "--mc-ruin-pct",
+        type=float,
+        default=DEFAULT_RUIN_DRAWDOWN_PCT,
+        help="回撤达到该百分比即计为破产",
+    )
+    backtest_parser.add_argument("--mc-workers", type=int, help="蒙特卡洛工作进程数，默认 CPU 核数")
+    backtest_parser.add_argument(
+        "--cost-commission",
+        type=float,
+        nargs="+",
+        metavar="RATE",
+        help="可选：按这些手续费率重新计价已成交交易（不重跑回测）",
+    )
+    backtest_parser.add_argument(
+        "--cost-slippage",
+        type=float,
+        nargs="+",
+        metavar="RATE",
+        help="可选：按这些滑点率重新计价；与 --cost-commission 组成网格，缺省取当前费率",
+    )
+    backtest_parser.add_argument(
+        "--profile",
+        choices=["stages", "cprofile"],
+        help="可选：stages=分阶段计时；cprofile=另加 cProfile 热点与折叠栈（跳过结果缓存）",
+    )
+    backtest_parser.add_argument("--profile-top", type=int, default=25, help="cProfile 热点表行数")
+    backtest_parser.add_argument("--no-cache", action="store_true", help="不读写回测结果缓存")
+    backtest_parser.set_defaults(handler=handle_backtest, required_options=("--strategy", "--symbol"))
+    backtest_subparsers = backtest_parser.add_subparsers(dest="backtest_command")
+
+    sweep_parser = backtest_subparsers.add_parser("sweep", help="并行参数网格扫描")
+    _add_grid_arguments(sweep_parser)
+    sweep_parser.add_argument("--top", type=int, default=20, help="表格显示前 N 名")
+    sweep_parser.add_argument("--output", help="可选：全部结果写入 CSV")
+    sweep_parser.set_defaults(handler=handle_backtest_sweep, required_options=())
+
+    walk_forward_parser = backtest_subparsers.add_parser("walk-forward", help="滚动窗口优化与样本外验证")
+    _add_grid_arguments(walk_forward_parser)
+    walk_forward_parser.add_argument("--folds", type=int, default=5, help="样本外窗口数")
+    walk_forward_parser.add_argument(
+        "--in-sample-ratio",
+        type=float,
+        default=DEFAULT_IN_SAMPLE_RATIO,
+        help="每折样本内占比（0-1）",
+    )
+    walk_forward_parser.add_argument(
+        "--anchored",
+        action="store_true",
+        help="样本内窗口固定从数据起点开始（默认滚动）",
+    )
+    walk_forward_parser.add_argument(
+        "--warmup-bars",
+        type=int,
+        default=None,
+        help="样本外运行前用于预热指标的K线数（默认等于样本内窗口长度）",
+    )
+    walk_forward_parser.add_argument("--output", help="可选：拼接后的样本外净值曲线写入 CSV")
+    walk_forward_parser.set_defaults(handler=handle_backtest_walk_forward, required_options=())
+
+    replay_parser = backtest_subparsers.add_parser("replay", help="用实时策略逐K线回放（内存撮合，结束后一次写账本）")
+    replay_parser.add_argument("--strategy", required=True)
+    replay_parser.add_argument("--symbol", required=True)
+    replay_parser.add_argument("--timeframe")
+    replay_parser.add_argument("--start-ms", type=int)
+    replay_parser.add_argument("--end-ms", type=int)
+    replay_parser.add_argument("--days", type=int)
+    replay_parser.add_argument("--param", action="append", help="策略参数，格式 key=value")
+    replay_parser.add_argument("--no-ledger", action="store_true", help="不写入 strategy_runs / sim_orders / sim_trades")
+    replay_parser.set_defaults(handler=handle_backtest_replay, required_options=())
 
     download_parser = subparsers.add_parser("download", help="下载历史K线到SQLite")
-    download_parser.add_argument("--symbol", required=True)
-    download_parser.add_argument("--timeframe", required=True)
+    download_target = download_parser.add_mutually_exclusive_group(required=True)
+    download_target.add_argument("--symbol")
+    download_target.add_argument("--manifest", help="YAML 数据集清单（symbols × timeframes / datasets）")
+    download_parser.add_argument("--timeframe")
     download_parser.add_argument("--start-ms", type=int)
     download_parser.add_argument("--end-ms", type=int)
     download_parser.add_argument("--days", type=int)
     download_parser.add_argument("--batch-size", type=int, default=500)
+    download_parser.add_argument("--workers", type=int, help="清单模式并发抓取线程数（覆盖清单 workers）")
     download_parser.set_defaults(handler=handle_download)
 
     live_parser = subparsers.add_parser("live", help="运行实时模拟")
@@ -114,24 +236,106 @@ def build_parser() -> argparse.ArgumentParser:
     live_parser.add_argument("--param", action="append", help="策略参数，格式 key=value")
     live_parser.set_defaults(handler=handle_live)
 
-    import_parser = subparsers.add_parser("import", help="从CSV导入K线到SQLite")
+    import_parser = subparsers.add_parser("import", help="从CSV/Parquet/Arrow流式导入K线到SQLite")
     import_parser.add_argument("--file", required=True)
-    import_parser.add_argument("--symbol", help="当CSV不含symbol列时使用")
-    import_parser.add_argument("--timeframe", help="当CSV不含timeframe列时使用")
+    import_parser.add_argument("--symbol", help="当文件不含symbol列时使用")
+    import_parser.add_argument("--timeframe", help="当文件不含timeframe列时使用")
+    import_parser.add_argument(
+        "--format",
+        choices=["auto", "csv", "parquet", "arrow"],
+        default="auto",
+        help="输入格式，auto 按扩展名识别（parquet/arrow 需安装 pyarrow）",
+    )
+    import_parser.add_argument("--chunk-rows", type=int, default=100_000, help="每个解析/写入批次的行数")
+    import_parser.add_argument(
+        "--strict",
+        action="store_true",
+        help="遇到第一条格式错误的行即中止导入（默认跳过并报告行号）",
+    )
     import_parser.set_defaults(handler=handle_import)
 
-    export_parser = subparsers.add_parser("export", help="从SQLite导出K线到CSV")
+    export_parser = subparsers.add_parser("export", help="从SQLite导出K线到CSV/Parquet/Arrow")
     export_parser.add_argument("--symbol", required=True)
     export_parser.add_argument("--timeframe", required=True)
     export_parser.add_argument("--output", required=True)
     export_parser.add_argument("--start-ms", type=int)
     export_parser.add_argument("--end-ms", type=int)
+    export_parser.add_argument(
+        "--format",
+        choices=["auto", "csv", "parquet", "arrow"],
+        default="auto",
+        help="输出格式，auto 按扩展名识别（parquet/arrow 需安装 pyarrow）",
+    )
+    export_parser.add_argument(
+        "--compression",
+        choices=["none", "gzip", "zstd", "lz4", "snappy"],
+        help="压缩算法（csv: none/gzip；parquet 默认 zstd；arrow 默认 none 以便零拷贝加载）",
+    )
+    export_parser.add_argument("--chunk-rows", type=int, default=100_000, help="每次 fetchmany 读取/写出的行数")
     export_parser.set_defaults(handler=handle_export)
 
+    sync_columnar_parser = subparsers.add_parser(
+        "sync-columnar",
+        help="将SQLite K线增量同步到列式内存映射文件",
+    )
+    sync_columnar_parser.add_argument("--symbol", help="仅同步指定交易对（需同时提供 --timeframe）")
+    sync_columnar_parser.add_argument("--timeframe", help="仅同步指定周期（需同时提供 --symbol）")
+    sync_columnar_parser.add_argument("--rebuild", action="store_true", help="忽略已有列文件并全量重建")
+    sync_columnar_parser.set_defaults(handler=handle_sync_columnar)
+
+    rollup_parser = subparsers.add_parser("rollup", help="由1m K线增量聚合更高周期（含自定义周期）")
+    rollup_parser.add_argument("--symbol", help="注册/重建该交易对的聚合目标")
+    rollup_parser.add_argument(
+        "--timeframe",
+        action="append",
+        help="目标周期，可重复，如 5m、30m、1w；不带参数时刷新全部脏桶",
+    )
+    rollup_parser.add_argument("--drop", action="store_true", help="移除指定聚合目标及其数据")
+    rollup_parser.set_defaults(handler=handle_rollup)
+
+    repair_parser = subparsers.add_parser("repair", help="增量扫描K线缺口并批量补抓")
+    repair_parser.add_argument("--symbol", help="仅处理指定交易对（需同时提供 --timeframe）")
+    repair_parser.add_argument("--timeframe", help="仅处理指定周期（需同时提供 --symbol）")
+    repair_parser.add_argument("--scan-only", action="store_true", help="只扫描并记录缺口，不补抓")
+    repair_parser.add_argument("--full-scan", action="store_true", help="忽略上次检查位置，全量重扫")
+    repair_parser.add_argument("--batch-size", type=int, default=500, help="每次补抓请求的K线数")
+    repair_parser.add_argument("--max-gaps", type=int, help="每个数据集本轮最多补抓的缺口数")
+    repair_parser.add_argument("--max-attempts", type=int, default=3, help="同一缺口最多补抓次数（交易所停机造成的空洞不再重试）")
+    repair_parser.add_argument("--watch", type=float, help="后台调度：每隔 N 秒重复扫描与修复")
+    repair_parser.add_argument("--max-cycles", type=int, help="配合 --watch 的最大轮数")
+    repair_parser.set_defaults(handler=handle_repair)
+
     cleanup_parser = subparsers.add_parser("cleanup", help="清理过期K线")
-    cleanup_parser.add_argument("--days", type=int, required=True)
+    cleanup_parser.add_argument("--days", type=int, help="保留天数；未匹配 market_data.retention.policies 的数据集使用该值")
+    cleanup_parser.add_argument("--batch-rows", type=int, help="每个删除事务的最大行数（默认取配置）")
+    cleanup_parser.add_argument("--pause-ms", type=int, help="批次之间的让出间隔毫秒（默认取配置）")
+    cleanup_parser.add_argument("--no-vacuum", action="store_true", help="删除后不执行增量 VACUUM")
     cleanup_parser.set_defaults(handler=handle_cleanup)
 
+    db_parser = subparsers.add_parser("db", help="数据库维护")
+    db_subparsers = db_parser.add_subparsers(dest="db_command", required=True)
+    db_migrate_candles = db_subparsers.add_parser(
+        "migrate-candles",
+        help="在线迁移K线表到紧凑聚簇布局（datasets 字典 + WITHOUT ROWID）",
+    )
+    db_migrate_candles.add_argument("--chunk-rows", type=int, default=20_000, help="每个回填事务复制的行数")
+    db_migrate_candles.add_argument("--vacuum", action="store_true", help="迁移后执行 VACUUM 收缩数据库文件")
+    db_migrate_candles.set_defaults(handler=handle_db_migrate_candles)
+    db_maintain = db_subparsers.add_parser(
+        "maintain",
+        help="增量 VACUUM 回收空闲页并刷新查询统计（PRAGMA optimize）",
+    )
+    db_maintain.add_argument("--analyze", action="store_true", help="执行完整 ANALYZE（默认仅 PRAGMA optimize）")
+    db_maintain.add_argument(
+        "--convert-vacuum",
+        action="store_true",
+        help="把旧数据库转换为 auto_vacuum=INCREMENTAL（一次完整 VACUUM，期间持有写锁）",
+    )
+    db_maintain.add_argument("--step-pages", type=int, default=1_000, help="每次 incremental_vacuum 释放的页数")
+    db_maintain.add_argument("--pause-ms", type=int, default=50, help="两次 VACUUM 步骤之间的让出间隔毫秒")
+    db_maintain.add_argument("--max-steps", type=int, help="最多执行的 VACUUM 步数")
+    db_maintain.set_defaults(handler=handle_db_maintain)
+
     reconcile_parser = subparsers.add_parser("reconcile", help="按成交重建持仓")
     reconcile_parser.set_defaults(handler=handle_reconcile)
 
@@ -145,17 +349,119 @@ def build_parser() -> argparse.ArgumentParser:
     benchmark_parser.add_argument("--realtime-iterations", type=int, default=300)
     benchmark_parser.add_argument("--order-iterations", type=int, default=500)
     benchmark_parser.add_argument("--seed", type=int, default=42)
+    benchmark_parser.add_argument(
+        "--suite",
+        choices=["step40", "storage", "portfolio", "memory", "analyzers"],
+        default="step40",
+        help=(
+            "step40=回测/实时/订单基准；storage=SQLite profile 存储层对比；portfolio=多标的组合回测；"
+            "memory=full/bounded 内存模式峰值对比；analyzers=分析器档位逐 bar 开销对比"
+        ),
+    )
+    benchmark_parser.add_argument(
+        "--read-iterations",
+        type=int,
+        default=200,
+        help="storage 基准每个 profile 的区间读取次数",
+    )
+    benchmark_parser.add_argument(
+        "--symbol-counts",
+        nargs="+",
+        type=int,
+        default=list(DEFAULT_SYMBOL_COUNTS),
+        help="portfolio 基准的组合规模（标的数量）",
+    )
+    benchmark_parser.add_argument(
+        "--bars",
+        type=int,
+        default=24 * 30,
+        help="portfolio 基准每个标的的 1h K线数量",
+    )
+    benchmark_parser.add_argument(
+        "--memory-bars",
+        nargs="+",
+        type=int,
+        default=list(DEFAULT_MEMORY_BAR_COUNTS),
+        help="memory 基准的 1m K线数量（每个数量分别跑 full 与 bounded）",
+    )
+    benchmark_parser.add_argument(
+        "--chunk-rows",
+        type=int,
+        default=DEFAULT_MEMORY_CHUNK_ROWS,
+        help="memory 基准中 bounded 模式每批读取的行数",
+    )
+    benchmark_parser.add_argument(
+        "--analyzer-bars",
+        nargs="+",
+        type=int,
+        default=list(DEFAULT_ANALYZER_BAR_COUNTS),
+        help="analyzers 基准的 1m K线数量（每个数量分别跑 full/standard/minimal）",
+    )
+    benchmark_parser.add_argument(
+        "--repeats",
+        type=int,
+        default=DEFAULT_ANALYZER_REPEATS,
+        help="analyzers 基准每个档位的重复次数（取最快一次）",
+    )
     benchmark_parser.set_defaults(handler=handle_benchmark)
 
     return parser
 
 
+def _add_grid_arguments(parser: argparse.ArgumentParser) -> None:
+    parser.add_argument("--strategy", required=True)
+    parser.add_argument("--symbol", required=True)
+    parser.add_argument("--timeframe")
+    parser.add_argument("--start-ms", type=int)
+    parser.add_argument("--end-ms", type=int)
+    parser.add_argument("--days", type=int)
+    parser.add_argument(
+        "--grid",
+        nargs="+",
+        action="extend",
+        required=True,
+        help="参数网格，格式 name=start:stop:step 或 name=a,b,c（区间含终点）",
+    )
+    parser.add_argument("--param", action="append", help="固定策略参数，格式 key=value")
+    parser.add_argument("--workers", type=int, help="工作进程数（默认 CPU 核数）")
+    parser.add_argument("--no-cache", action="store_true", help="不读写回测结果缓存")
+    parser.add_argument(
+        "--engine",
+        choices=sorted(ALLOWED_BACKTEST_ENGINES),
+        help="回测引擎（默认取 backtest.engine）",
+    )
+    parser.add_argument(
+        "--analyzer-profile",
+        choices=sorted(ALLOWED_ANALYZER_PROFILES),
+        help=(
+            "分析器档位（默认取 backtest.analyzer_profile）；"
+            "standard/minimal 逐 bar 只记录账户净值，指标事后用 NumPy 计算"
+        ),
+    )
+    parser.add_argument(
+        "--rank-by",
+        choices=sorted(RANK_METRICS),
+        default=DEFAULT_RANK_METRIC,
+        help="排序指标",
+    )
+
+
 def main(argv: Sequence[str] | None = None) -> int:
     parser = build_parser()
     try:
         args = parser.parse_args(list(argv) if argv is not None else None)
     except SystemExit as exc:
         return int(exc.code)
+    missing = [
+        option
+        for option in getattr(args, "required_options", ())
+        if getattr(args, option.lstrip("-").replace("-", "_"), None) is None
+    ]
+    if missing:
+        try:
+            parser.error(f"缺少必需参数: {', '.join(missing)}")
+        except SystemExit as exc:
+            return int(exc.code)
 
     context = None
     try:
@@ -7,13 +7,33 @@ from typing import Any, Mapping
 
 from rich.table import Table
 
-from src.benchmarking.reporter import save_benchmark_report
+from src.benchmarking.analyzer_benchmarks import run_analyzer_benchmark
+from src.benchmarking.executors import BenchmarkExecutionError
+from src.benchmarking.memory_benchmarks import run_memory_benchmark
+from src.benchmarking.portfolio_benchmarks import run_portfolio_benchmark
+from src.benchmarking.reporter import (
+    save_analyzer_benchmark_report,
+    save_benchmark_report,
+    save_memory_benchmark_report,
+    save_portfolio_benchmark_report,
+    save_storage_benchmark_report,
+)
 from src.benchmarking.runner import BenchmarkRunnerError, run_benchmark
+from src.benchmarking.storage_benchmarks import run_storage_benchmark
 from src.cli_context import CLICommandError, CLIContext, console
 
 
 def handle_benchmark(ctx: CLIContext, args: Any) -> int:
     """Run Step-40 benchmarks and output report artifacts."""
+    if getattr(args, "suite", "step40") == "storage":
+        return _handle_storage_benchmark(ctx, args)
+    if getattr(args, "suite", "step40") == "portfolio":
+        return _handle_portfolio_benchmark(ctx, args)
+    if getattr(args, "suite", "step40") == "memory":
+        return _handle_memory_benchmark(ctx, args)
+    if getattr(args, "suite", "step40") == "analyzers":
+        return _handle_analyzer_benchmark(ctx, args)
+
     symbol = _require_non_empty_text(args.symbol, "symbol")
     strategy = _require_non_empty_text(args.strategy, "strategy")
 
@@ -73,6 +93,196 @@ def handle_benchmark(ctx: CLIContext, args: Any) -> int:
     return report.evaluation.exit_code
 
 
+def _handle_storage_benchmark(ctx: CLIContext, args: Any) -> int:
+    symbol = _require_non_empty_text(args.symbol, "symbol")
+    read_iterations = _require_positive_int(args.read_iterations, "read-iterations")
+    if args.output_dir:
+        output_dir = Path(args.output_dir).expanduser()
+    else:
+        output_dir = _default_output_dir(ctx.config)
+
+    try:
+        report = run_storage_benchmark(
+            output_dir=output_dir,
+            symbol=symbol.upper(),
+            read_iterations=read_iterations,
+            seed=int(args.seed),
+        )
+    except (BenchmarkExecutionError, OSError) as exc:
+        raise CLICommandError(str(exc)) from exc
+
+    artifact_paths = save_storage_benchmark_report(report, output_dir)
+
+    summary = Table(title="存储层性能基准结果")
+    summary.add_column("profile")
+    summary.add_column("journal_mode")
+    summary.add_column("insert rows/s", justify="right")
+    summary.add_column("read p95(ms)", justify="right")
+    summary.add_column("read p95 并发写(ms)", justify="right")
+    for item in report.profiles:
+        summary.add_row(
+            item.profile,
+            item.journal_mode,
+            f"{item.insert_rows_per_second:.1f}",
+            f"{item.read_latency_ms.p95_ms:.6f}",
+            f"{item.contended_read_latency_ms.p95_ms:.6f}",
+        )
+    console.print(summary)
+    ingest = report.ingest_validation
+    if ingest is not None:
+        console.print(
+            "[green]入库校验吞吐[/green] "
+            f"per_row_rows_per_sec={ingest.per_row_rows_per_second:.1f} "
+            f"vectorized_rows_per_sec={ingest.vectorized_rows_per_second:.1f} "
+            f"speedup={ingest.speedup:.2f}x"
+        )
+    layout = report.candle_layout
+    if layout is not None:
+        console.print(
+            "[green]K线表布局对比[/green] "
+            f"legacy_bytes={layout.legacy_size_bytes} "
+            f"compact_bytes={layout.compact_size_bytes} "
+            f"size_ratio={layout.size_ratio:.2%} "
+            f"load_p95_legacy_ms={layout.legacy_load_latency_ms.p95_ms:.3f} "
+            f"load_p95_compact_ms={layout.compact_load_latency_ms.p95_ms:.3f}"
+        )
+    console.print({name: str(path) for name, path in artifact_paths.items()})
+    return 0
+
+
+def _handle_portfolio_benchmark(ctx: CLIContext, args: Any) -> int:
+    bars = _require_positive_int(args.bars, "bars")
+    symbol_counts = [_require_positive_int(count, "symbol-counts") for count in args.symbol_counts]
+    if args.output_dir:
+        output_dir = Path(args.output_dir).expanduser()
+    else:
+        output_dir = _default_output_dir(ctx.config)
+
+    try:
+        report = run_portfolio_benchmark(
+            output_dir=output_dir,
+            symbol_counts=symbol_counts,
+            bars=bars,
+            seed=int(args.seed),
+        )
+    except (BenchmarkExecutionError, OSError) as exc:
+        raise CLICommandError(str(exc)) from exc
+
+    artifact_paths = save_portfolio_benchmark_report(report, output_dir)
+
+    summary = Table(title="多标的组合回测性能基准结果")
+    summary.add_column("symbols", justify="right")
+    summary.add_column("批量加载(s)", justify="right")
+    summary.add_column("逐标的加载(s)", justify="right")
+    summary.add_column("加载加速比", justify="right")
+    summary.add_column("回测(s)", justify="right")
+    summary.add_column("bars/s", justify="right")
+    summary.add_column("trades", justify="right")
+    for item in report.scales:
+        summary.add_row(
+            str(item.symbols),
+            f"{item.bulk_load_seconds:.6f}",
+            f"{item.per_symbol_load_seconds:.6f}",
+            f"{item.load_speedup:.2f}x",
+            f"{item.run_seconds:.3f}",
+            f"{item.bars_per_second:.1f}",
+            str(item.total_trades),
+        )
+    console.print(summary)
+    console.print({name: str(path) for name, path in artifact_paths.items()})
+    return 0
+
+
+def _handle_memory_benchmark(ctx: CLIContext, args: Any) -> int:
+    bar_counts = [_require_positive_int(count, "memory-bars") for count in args.memory_bars]
+    chunk_rows = _require_positive_int(args.chunk_rows, "chunk-rows")
+    if args.output_dir:
+        output_dir = Path(args.output_dir).expanduser()
+    else:
+        output_dir = _default_output_dir(ctx.config)
+
+    try:
+        report = run_memory_benchmark(
+            output_dir=output_dir,
+            bar_counts=bar_counts,
+            chunk_rows=chunk_rows,
+            seed=int(args.seed),
+        )
+    except (BenchmarkExecutionError, OSError) as exc:
+        raise CLICommandError(str(exc)) from exc
+
+    artifact_paths = save_memory_benchmark_report(report, output_dir)
+
+    summary = Table(title="回测内存模式基准结果")
+    summary.add_column("memory_mode")
+    summary.add_column("bars", justify="right")
+    summary.add_column("峰值(MB)", justify="right")
+    summary.add_column("峰值/bar(B)", justify="right")
+    summary.add_column("回测(s)", justify="right")
+    summary.add_column("trades", justify="right")
+    summary.add_column("目标")
+    for item in report.runs:
+        summary.add_row(
+            item.memory_mode,
+            str(item.bars),
+            f"{item.peak_bytes / (1024 * 1024):.2f}",
+            f"{item.peak_bytes_per_bar:.1f}",
+            f"{item.run_seconds:.3f}",
+            str(item.total_trades),
+            "-" if item.memory_mode != "bounded" else ("[red]超出[/red]" if report.over_target(item) else "达标"),
+        )
+    console.print(summary)
+    target_mb = report.bounded_peak_target_bytes / (1024 * 1024)
+    for item in report.bounded_runs_over_target:
+        console.print(
+            f"[yellow]bounded 峰值超出目标[/yellow] bars={item.bars} "
+            f"peak={item.peak_bytes / (1024 * 1024):.2f}MB target<{target_mb:.0f}MB"
+        )
+    console.print({name: str(path) for name, path in artifact_paths.items()})
+    return 0
+
+
+def _handle_analyzer_benchmark(ctx: CLIContext, args: Any) -> int:
+    bar_counts = [_require_positive_int(count, "analyzer-bars") for count in args.analyzer_bars]
+    repeats = _require_positive_int(args.repeats, "repeats")
+    if args.output_dir:
+        output_dir = Path(args.output_dir).expanduser()
+    else:
+        output_dir = _default_output_dir(ctx.config)
+
+    try:
+        report = run_analyzer_benchmark(
+            output_dir=output_dir,
+            bar_counts=bar_counts,
+            repeats=repeats,
+            seed=int(args.seed),
+        )
+    except (BenchmarkExecutionError, OSError) as exc:
+        raise CLICommandError(str(exc)) from exc
+
+    artifact_paths = save_analyzer_benchmark_report(report, output_dir)
+
+    summary = Table(title="回测分析器档位基准结果")
+    summary.add_column("analyzer_profile")
+    summary.add_column("bars", justify="right")
+    summary.add_column("回测(s)", justify="right")
+    summary.add_column("每bar(us)", justify="right")
+    summary.add_column("节省/bar(us)", justify="right")
+    summary.add_column("max_dd(%)", justify="right")
+    for item in report.runs:
+        summary.add_row(
+            item.analyzer_profile,
+            str(item.bars),
+            f"{item.run_seconds:.3f}",
+            f"{item.us_per_bar:.2f}",
+            f"{item.saved_us_per_bar:.2f}",
+            f"{item.max_drawdown_pct:.4f}",
+        )
+    console.print(summary)
+    console.print({name: str(path) for name, path in artifact_paths.items()})
+    return 0
+
+
 def _default_output_dir(config: Mapping[str, Any]) -> Path:
     system = config.get("system")
     if isinstance(system, Mapping):
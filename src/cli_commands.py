@@ -3,7 +3,6 @@
 from __future__ import annotations
 
 import shutil
-import time
 from pathlib import Path
 from typing import Any
 
@@ -19,6 +18,14 @@ from src.cli_context import (
     write_runtime_state,
 )
 from src.core.enums import OrderSide, OrderStatus
+from src.core.maintenance import DEFAULT_VACUUM_STEP_PAGES, incremental_vacuum
+from src.data.retention import (
+    DEFAULT_RETENTION_BATCH_ROWS,
+    DEFAULT_RETENTION_PAUSE_MS,
+    CandleRetentionManager,
+    RetentionPolicyError,
+    retention_policies_from_config,
+)
 
 
 def handle_start(ctx: CLIContext, _args: Any) -> int:
@@ -56,7 +63,7 @@ def handle_status(ctx: CLIContext, args: Any) -> int:
     monitor = read_monitor_state(ctx.config)
     secure_status = credential_storage_status(ctx.config)
 
-    with ctx.database.transaction() as tx:
+    with ctx.database.read() as tx:
         metrics = {
             "accounts": _count_rows(tx, "accounts"),
             "orders": _count_rows(tx, "orders"),
@@ -152,16 +159,65 @@ def handle_positions(ctx: CLIContext, _args: Any) -> int:
 
 
 def handle_cleanup(ctx: CLIContext, args: Any) -> int:
-    if args.days <= 0:
+    if args.days is not None and args.days <= 0:
         raise CLICommandError("days 必须 > 0")
 
-    cutoff_ms = int(time.time() * 1000) - args.days * 24 * 3600 * 1000
-    with ctx.database.transaction() as tx:
-        before = tx.total_changes
-        tx.execute("DELETE FROM candles WHERE timestamp < ?;", (cutoff_ms,))
-        deleted = tx.total_changes - before
+    retention_cfg = (ctx.config.get("market_data") or {}).get("retention") or {}
+    try:
+        policies = retention_policies_from_config(retention_cfg.get("policies"))
+    except RetentionPolicyError as exc:
+        raise CLICommandError(str(exc)) from exc
+    if args.days is None and not policies:
+        raise CLICommandError("请提供 --days，或在 market_data.retention.policies 中配置保留策略")
 
-    console.print(f"[green]清理完成[/green] deleted_candles={deleted} cutoff_ms={cutoff_ms}")
+    batch_rows = args.batch_rows if args.batch_rows is not None else int(
+        retention_cfg.get("batch_rows", DEFAULT_RETENTION_BATCH_ROWS)
+    )
+    pause_ms = args.pause_ms if args.pause_ms is not None else int(
+        retention_cfg.get("pause_ms", DEFAULT_RETENTION_PAUSE_MS)
+    )
+    try:
+        manager = CandleRetentionManager(ctx.database, batch_rows=batch_rows, pause_seconds=pause_ms / 1000)
+        results = manager.purge(policies, default_days=args.days)
+    except RetentionPolicyError as exc:
+        raise CLICommandError(str(exc)) from exc
+
+    table = Table(title="K线保留清理")
+    table.add_column("symbol")
+    table.add_column("timeframe")
+    table.add_column("days", justify="right")
+    table.add_column("cutoff_ms", justify="right")
+    table.add_column("deleted", justify="right")
+    table.add_column("batches", justify="right")
+    table.add_column("max_lock_ms", justify="right")
+    for result in results:
+        table.add_row(
+            result.symbol,
+            result.timeframe,
+            str(result.retention_days),
+            str(result.cutoff_ms),
+            str(result.deleted_rows),
+            str(result.batches),
+            f"{result.max_lock_seconds * 1000:.1f}",
+        )
+    console.print(table)
+
+    deleted = sum(result.deleted_rows for result in results)
+    max_lock_ms = max((result.max_lock_seconds for result in results), default=0.0) * 1000
+    summary = f"deleted_candles={deleted} datasets={len(results)} max_lock_ms={max_lock_ms:.1f}"
+    if not args.no_vacuum and deleted:
+        vacuum = incremental_vacuum(
+            ctx.database,
+            step_pages=int(retention_cfg.get("vacuum_step_pages", DEFAULT_VACUUM_STEP_PAGES)),
+            pause_seconds=pause_ms / 1000,
+        )
+        summary += f" freed_pages={vacuum.freed_pages} reclaimed_bytes={vacuum.reclaimed_bytes}"
+        if vacuum.auto_vacuum != "incremental":
+            console.print(
+                "[yellow]提示[/yellow] 数据库未启用增量 VACUUM，空闲页不会归还文件系统；"
+                "可执行 db maintain --convert-vacuum 转换（需一次完整 VACUUM）。"
+            )
+    console.print(f"[green]清理完成[/green] {summary}")
     return 0
 
 
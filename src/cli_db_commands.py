@@ -0,0 +1,86 @@
+"""Database maintenance CLI commands."""
+
+from __future__ import annotations
+
+from typing import Any
+
+from rich.table import Table
+
+from src.cli_context import CLICommandError, CLIContext, console
+from src.core.maintenance import enable_incremental_auto_vacuum, incremental_vacuum, optimize_database
+from src.data.candle_schema import CandleMigrationError, CompactCandleMigration
+
+
+def handle_db_migrate_candles(ctx: CLIContext, args: Any) -> int:
+    if args.chunk_rows <= 0:
+        raise CLICommandError("--chunk-rows 必须 > 0")
+
+    def _on_progress(symbol: str, timeframe: str, copied: int) -> None:
+        console.print(f"[cyan]迁移中[/cyan] {symbol} {timeframe} copied={copied}")
+
+    migration = CompactCandleMigration(
+        ctx.database,
+        chunk_rows=args.chunk_rows,
+        on_progress=_on_progress,
+    )
+    try:
+        result = migration.run(vacuum=args.vacuum)
+    except CandleMigrationError as exc:
+        raise CLICommandError(str(exc)) from exc
+
+    if not result.migrated:
+        console.print(
+            f"[yellow]已是紧凑布局[/yellow] datasets={result.datasets} rows={result.rows}"
+        )
+        return 0
+    console.print(
+        "[green]K线表迁移完成[/green] "
+        f"datasets={result.datasets} "
+        f"rows={result.rows} "
+        f"size_before={result.size_bytes_before} "
+        f"size_after={result.size_bytes_after} "
+        f"size_ratio={result.size_ratio:.2%} "
+        f"vacuumed={result.vacuumed}"
+    )
+    if not result.vacuumed:
+        console.print("[yellow]提示[/yellow] 旧表页已释放但文件未收缩，可加 --vacuum 重新打包数据库文件。")
+    return 0
+
+
+def handle_db_maintain(ctx: CLIContext, args: Any) -> int:
+    if args.step_pages <= 0:
+        raise CLICommandError("--step-pages 必须 > 0")
+    if args.max_steps is not None and args.max_steps <= 0:
+        raise CLICommandError("--max-steps 必须 > 0")
+
+    converted = enable_incremental_auto_vacuum(ctx.database) if args.convert_vacuum else False
+    vacuum = incremental_vacuum(
+        ctx.database,
+        step_pages=args.step_pages,
+        pause_seconds=args.pause_ms / 1000,
+        max_steps=args.max_steps,
+    )
+    optimize = optimize_database(ctx.database, analyze=args.analyze)
+
+    table = Table(title="数据库维护")
+    table.add_column("item")
+    table.add_column("value", justify="right")
+    table.add_row("auto_vacuum", vacuum.auto_vacuum)
+    table.add_row("converted", str(converted))
+    table.add_row("freed_pages", str(vacuum.freed_pages))
+    table.add_row("vacuum_steps", str(vacuum.steps))
+    table.add_row("vacuum_max_lock_ms", f"{vacuum.max_lock_seconds * 1000:.1f}")
+    table.add_row("size_before", str(vacuum.size_bytes_before))
+    table.add_row("size_after", str(vacuum.size_bytes_after))
+    table.add_row("analyze", "full" if optimize.analyzed else "optimize")
+    table.add_row("analyze_ms", f"{optimize.elapsed_seconds * 1000:.1f}")
+    console.print(table)
+    console.print(
+        "[green]数据库维护完成[/green] "
+        f"reclaimed_bytes={vacuum.reclaimed_bytes} "
+        f"freed_pages={vacuum.freed_pages} "
+        f"max_lock_ms={vacuum.max_lock_seconds * 1000:.1f}"
+    )
+    if vacuum.auto_vacuum != "incremental":
+        console.print("[yellow]提示[/yellow] 当前未启用增量 VACUUM，可加 --convert-vacuum 转换（一次性完整 VACUUM）。")
+    return 0
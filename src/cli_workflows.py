@@ -3,14 +3,22 @@
 from __future__ import annotations
 
 import csv
+import threading
+import time
+from collections.abc import Callable
 from pathlib import Path
 from typing import Any
 
 from rich.table import Table
 
-from src.backtest.engine import BacktestEngine
+from src.backtest.cost_sensitivity import CostSensitivityError, cost_grid, reprice_trades
+from src.backtest.engine import BacktestEngine, BacktestEngineError
 from src.backtest.exporter import BacktestResultExporter
-from src.backtest.result_models import BacktestRunRequest
+from src.backtest.instrumentation import BacktestProfile, InstrumentationError, ProfilingOptions
+from src.backtest.monte_carlo import MonteCarloError, MonteCarloSimulator, MonteCarloSummary
+from src.backtest.result_models import BacktestRunRequest, BacktestRunResult
+from src.backtest.sweep import ParameterSweepError, ParameterSweepRunner, SweepResult, parse_grid_spec
+from src.backtest.walk_forward import WalkForwardError, WalkForwardOptimizer
 from src.analysis.visualization import PerformanceVisualizer, VisualizationError
 from src.cli_context import (
     CLICommandError,
@@ -20,21 +28,33 @@ from src.cli_context import (
     resolve_time_range_ms,
     write_runtime_state,
 )
+from src.data.candle_export import StreamingCandleExporter
+from src.data.candle_import import CandleImportProgress, StreamingCandleImporter
+from src.data.columnar_store import ColumnarCandleStore, ColumnarStoreError
+from src.data.download_pipeline import (
+    ConcurrentCandleDownloader,
+    DatasetDownloadReport,
+    DownloadManifestError,
+    load_download_manifest,
+)
+from src.data.gaps import CandleGapRepairer, CandleGapScanner
 from src.data.market import MarketDataFetcher
-from src.data.storage import CandleDownloadRequest, HistoricalCandleStorage
+from src.data.rollup import CandleRollupEngine, CandleRollupError
+from src.data.storage import (
+    CandleDownloadRequest,
+    HistoricalCandleStorage,
+    HistoricalDataStorageError,
+    OfflineCandleFetcher,
+)
 from src.data.timeframe_metrics import (
     compute_coverage_ratio,
     estimate_expected_candle_count,
 )
+from src.data.feed import BacktestDataSlice
 from src.live.realtime_loop import RealtimeSimulationLoop
+from src.live.sim_backtest import LiveBacktestError, LiveStrategyBacktester, flush_ledger
 from src.strategies.factory import create_live_strategy
 from src.strategies.registry import StrategyRegistry
-from src.utils.config_defaults import ALLOWED_TIMEFRAMES
-
-
-class _NoopFetcher:
-    def fetch_ohlcv(self, *_args: Any, **_kwargs: Any) -> list[list[Any]]:
-        return []
 
 
 def handle_backtest(ctx: CLIContext, args: Any) -> int:
@@ -52,17 +72,22 @@ def handle_backtest(ctx: CLIContext, args: Any) -> int:
         days=args.days,
     )
 
-    trading_cfg = ctx.config.get("trading", {})
-    commission_cfg = trading_cfg.get("commission", {}) if isinstance(trading_cfg, dict) else {}
-    engine = BacktestEngine(
-        database=ctx.database,
-        initial_capital=float(ctx.config.get("account", {}).get("initial_capital", 10000.0)),
-        commission_rate=float(commission_cfg.get("taker", 0.001)),
-        slippage_rate=float(trading_cfg.get("slippage", 0.0)) if isinstance(trading_cfg, dict) else 0.0,
-        data_read_source=str(ctx.config.get("backtest", {}).get("data_read_source", "sqlite")),
-        strategies_config=ctx.strategies_config,
-        strategy_registry=registry,
-    )
+    try:
+        engine = _build_backtest_engine(
+            ctx,
+            registry,
+            args.engine,
+            use_cache=not args.no_cache,
+            memory_mode=args.memory_mode,
+            analyzer_profile=args.analyzer_profile,
+            profiling=(
+                ProfilingOptions(cprofile=args.profile == "cprofile", top_n=args.profile_top)
+                if args.profile
+                else None
+            ),
+        )
+    except (BacktestEngineError, InstrumentationError) as exc:
+        raise CLICommandError(str(exc)) from exc
 
     result = engine.run(
         BacktestRunRequest(
@@ -74,6 +99,7 @@ def handle_backtest(ctx: CLIContext, args: Any) -> int:
             strategy_params=params,
         )
     )
+    cache_stats = engine.result_cache_stats
 
     table = Table(title="回测结果")
     table.add_column("指标")
@@ -88,7 +114,19 @@ def handle_backtest(ctx: CLIContext, args: Any) -> int:
     table.add_row("trades", str(result.trade_stats.total_trades))
     table.add_row("max_drawdown_pct", f"{result.risk_metrics.max_drawdown_pct:.4f}")
     table.add_row("sharpe_ratio", str(result.risk_metrics.sharpe_ratio))
+    table.add_row("sortino_ratio", str(result.risk_metrics.sortino_ratio))
     console.print(table)
+    if cache_stats is not None and cache_stats.hits:
+        console.print("[cyan]命中回测结果缓存[/cyan]（数据、策略、参数与费率均未变化；--no-cache 可强制重算）")
+    frame_note = _frame_cache_note(engine)
+    if frame_note:
+        console.print(f"[dim]数据帧缓存[/dim]{frame_note}")
+
+    if result.profile is not None:
+        _print_profile(result.profile)
+    monte_carlo = _run_monte_carlo(args, result) if args.monte_carlo is not None else None
+    if args.cost_commission or args.cost_slippage:
+        _run_cost_sensitivity(args, engine, result)
 
     expected_bars = estimate_expected_candle_count(start_ms, end_ms, timeframe)
     backtest_coverage = compute_coverage_ratio(
@@ -111,16 +149,8 @@ def handle_backtest(ctx: CLIContext, args: Any) -> int:
         try:
             visualizer = PerformanceVisualizer(args.output_dir)
             
-            # Reconstruct absolute equity curve from time_series_returns
-            equity_curve: list[tuple[str, float]] = []
-            current_equity = result.initial_capital
-            
-            for ts, ret in result.time_series_returns.items():
-                current_equity *= (1.0 + ret)
-                equity_curve.append((ts, current_equity))
-
             chart_artifacts = visualizer.export_all(
-                equity_curve=equity_curve,
+                equity_curve=result.time_series_returns.compound(result.initial_capital),
                 trade_log=result.trade_log,
                 prefix=args.prefix or "",
             )
@@ -130,18 +160,430 @@ def handle_backtest(ctx: CLIContext, args: Any) -> int:
             paths["holding_time_chart"] = chart_artifacts.holding_time_path
         except VisualizationError as exc:
             console.print(f"[yellow]无法生成可视化图表[/yellow]: {exc}")
+
+        if monte_carlo is not None:
+            paths["monte_carlo_json"] = exporter.export_monte_carlo_json(
+                monte_carlo,
+                f"monte_carlo_{args.prefix}.json" if args.prefix else "monte_carlo.json",
+            )
             
         console.print({name: str(path) for name, path in paths.items()})
 
     return 0
 
 
+def _run_monte_carlo(args: Any, result: BacktestRunResult) -> MonteCarloSummary:
+    try:
+        summary = MonteCarloSimulator(workers=args.mc_workers).run(
+            result,
+            paths=args.monte_carlo,
+            method=args.mc_method,
+            seed=args.mc_seed,
+            ruin_drawdown_pct=args.mc_ruin_pct,
+        )
+    except MonteCarloError as exc:
+        raise CLICommandError(str(exc)) from exc
+
+    table = Table(title="蒙特卡洛交易序列检验")
+    table.add_column("指标")
+    for percentile in summary.return_percentiles:
+        table.add_column(f"p{percentile:g}", justify="right")
+    table.add_column("回测实际", justify="right")
+    table.add_row(
+        "total_return_pct",
+        *(f"{value:.4f}" for value in summary.return_percentiles.values()),
+        f"{summary.observed_return_pct:.4f}",
+    )
+    table.add_row(
+        "max_drawdown_pct(按平仓)",
+        *(f"{value:.4f}" for value in summary.drawdown_percentiles.values()),
+        f"{summary.observed_drawdown_pct:.4f}",
+    )
+    console.print(table)
+    console.print(
+        "[green]蒙特卡洛完成[/green] "
+        f"paths={summary.paths} method={summary.method} trades={summary.trades} "
+        f"prob_loss={summary.probability_of_loss:.2%} "
+        f"prob_ruin={summary.probability_of_ruin:.2%}(dd>={summary.ruin_drawdown_pct:g}%) "
+        f"bar_max_drawdown_pct={summary.risk_metrics.max_drawdown_pct:.4f} "
+        f"workers={summary.workers} elapsed={summary.elapsed_seconds:.2f}s"
+    )
+    return summary
+
+
+def _print_profile(profile: BacktestProfile) -> None:
+    table = Table(title="回测分阶段耗时")
+    table.add_column("阶段")
+    table.add_column("秒", justify="right")
+    table.add_column("占比", justify="right")
+    for stage, seconds in profile.stage_seconds.items():
+        share = seconds / profile.total_seconds if profile.total_seconds > 0 else 0.0
+        table.add_row(stage, f"{seconds:.4f}", f"{share:.1%}")
+    for name, seconds in profile.analyzer_seconds.items():
+        table.add_row(f"  analyzer:{name}", f"{seconds:.4f}", "")
+    console.print(table)
+    latency = profile.next_latency_us
+    console.print(
+        "[green]分阶段计时完成[/green] "
+        f"total={profile.total_seconds:.3f}s bars={profile.bars} next_calls={profile.next_calls} "
+        f"orders={profile.orders_completed}(rejected={profile.orders_rejected}) trades={profile.trades}"
+        + (
+            f" next_us p50={latency['p50']:.1f} p95={latency['p95']:.1f} max={latency['max']:.1f}"
+            if latency
+            else ""
+        )
+    )
+    if profile.hotspots:
+        hotspots = Table(title=f"cProfile 热点（前 {len(profile.hotspots)} 个，按自身耗时）")
+        for column in ("ncalls", "tottime", "cumtime", "function"):
+            hotspots.add_column(column, justify="left" if column == "function" else "right")
+        for hotspot in profile.hotspots:
+            hotspots.add_row(
+                str(hotspot.calls),
+                f"{hotspot.total_seconds:.4f}",
+                f"{hotspot.cumulative_seconds:.4f}",
+                hotspot.function,
+            )
+        console.print(hotspots)
+
+
+def _run_cost_sensitivity(args: Any, engine: BacktestEngine, result: BacktestRunResult) -> None:
+    try:
+        surface = reprice_trades(
+            result,
+            cost_grid(
+                args.cost_commission or [engine.commission_rate],
+                args.cost_slippage or [engine.slippage_rate],
+            ),
+            commission_rate=engine.commission_rate,
+            slippage_rate=engine.slippage_rate,
+        )
+    except CostSensitivityError as exc:
+        raise CLICommandError(str(exc)) from exc
+
+    table = Table(title="成本敏感性（按成交重新计价）")
+    for column in (
+        "commission",
+        "slippage",
+        "net_pnl",
+        "total_return_pct",
+        "max_drawdown_pct(按平仓)",
+        "win_rate",
+        "profit_factor",
+    ):
+        table.add_column(column, justify="right")
+    for row in surface.to_rows():
+        profit_factor = row["profit_factor"]
+        table.add_row(
+            f"{row['entry_fee_rate']:g}",
+            f"{row['slippage_rate']:g}",
+            f"{row['net_pnl']:.4f}",
+            f"{row['total_return'] * 100.0:.4f}",
+            f"{row['max_drawdown'] * 100.0:.4f}",
+            f"{row['win_rate']:.2%}",
+            "inf" if profit_factor is None else f"{profit_factor:.4f}",
+        )
+    console.print(table)
+    console.print(
+        "[green]成本敏感性完成[/green] "
+        f"scenarios={len(surface.scenarios)} trades={surface.net_pnl.shape[1]} "
+        f"elapsed={surface.elapsed_seconds * 1000.0:.2f}ms（沿用原成交与仓位，一阶近似）"
+    )
+
+
+def handle_backtest_sweep(ctx: CLIContext, args: Any) -> int:
+    if args.top <= 0:
+        raise CLICommandError("--top 必须 > 0")
+    registry = StrategyRegistry.default()
+    request, grid = _grid_request(ctx, args, registry)
+    try:
+        engine = _build_backtest_engine(
+            ctx,
+            registry,
+            args.engine,
+            use_cache=not args.no_cache,
+            analyzer_profile=args.analyzer_profile,
+        )
+        runner = ParameterSweepRunner(engine, workers=args.workers)
+        result = runner.run(request, grid, rank_by=args.rank_by)
+    except (BacktestEngineError, ParameterSweepError) as exc:
+        raise CLICommandError(str(exc)) from exc
+
+    table = Table(title="参数扫描结果")
+    table.add_column("rank", justify="right")
+    for name in result.param_names:
+        table.add_column(name, justify="right")
+    for metric in ("total_return_pct", "sharpe_ratio", "max_drawdown_pct", "trades", "win_rate", "status"):
+        table.add_column(metric, justify="right")
+    for rank, run in enumerate(result.runs[: args.top], start=1):
+        table.add_row(
+            str(rank),
+            *(str(run.params.get(name)) for name in result.param_names),
+            _format_metric(run.total_return_pct),
+            _format_metric(run.sharpe_ratio),
+            _format_metric(run.max_drawdown_pct),
+            str(run.total_trades),
+            _format_metric(run.win_rate),
+            "ok" if run.ok else str(run.error),
+        )
+    console.print(table)
+
+    if args.output:
+        _write_sweep_csv(Path(args.output), result)
+
+    console.print(
+        "[green]参数扫描完成[/green] "
+        f"runs={len(result.runs)} failed={result.failed} workers={result.workers} "
+        f"bars={result.bars} rank_by={result.rank_by} "
+        f"elapsed={result.elapsed_seconds:.2f}s runs_per_sec={result.runs_per_second:.2f}"
+        + _cache_hits_note(engine)
+        + (f" output={args.output}" if args.output else "")
+    )
+    return 0
+
+
+def handle_backtest_walk_forward(ctx: CLIContext, args: Any) -> int:
+    registry = StrategyRegistry.default()
+    request, grid = _grid_request(ctx, args, registry)
+    try:
+        engine = _build_backtest_engine(
+            ctx,
+            registry,
+            args.engine,
+            use_cache=not args.no_cache,
+            analyzer_profile=args.analyzer_profile,
+        )
+        optimizer = WalkForwardOptimizer(engine, workers=args.workers)
+        result = optimizer.run(
+            request,
+            grid,
+            folds=args.folds,
+            in_sample_ratio=args.in_sample_ratio,
+            mode="anchored" if args.anchored else "rolling",
+            rank_by=args.rank_by,
+            warmup_bars=args.warmup_bars,
+        )
+    except (BacktestEngineError, ParameterSweepError, WalkForwardError) as exc:
+        raise CLICommandError(str(exc)) from exc
+
+    table = Table(title="滚动窗口优化结果")
+    table.add_column("fold", justify="right")
+    table.add_column("in_sample")
+    table.add_column("out_of_sample")
+    table.add_column("best_params")
+    table.add_column(f"is_{result.rank_by}", justify="right")
+    table.add_column("oos_return_pct", justify="right")
+    table.add_column("oos_max_drawdown_pct", justify="right")
+    table.add_column("oos_trades", justify="right")
+    for fold in result.folds:
+        best = fold.best_in_sample
+        oos = fold.out_of_sample
+        table.add_row(
+            str(fold.fold.index + 1),
+            f"{fold.in_sample_start_time} ({fold.fold.in_sample_bars})",
+            f"{fold.out_sample_start_time} ({fold.fold.out_sample_bars})",
+            "-" if best is None else " ".join(f"{key}={value}" for key, value in best.params.items()),
+            "-" if best is None else _format_metric(best.metric(result.rank_by)),
+            "-" if oos is None else (_format_metric(oos.total_return_pct) if oos.ok else str(oos.error)),
+            "-" if oos is None else _format_metric(oos.max_drawdown_pct),
+            "-" if oos is None else str(oos.total_trades),
+        )
+    console.print(table)
+
+    if args.output:
+        output = Path(args.output)
+        output.parent.mkdir(parents=True, exist_ok=True)
+        with output.open("w", encoding="utf-8", newline="") as handle:
+            writer = csv.writer(handle)
+            writer.writerow(["datetime", "equity"])
+            writer.writerows(result.equity_curve.items())
+
+    console.print(
+        "[green]滚动优化完成[/green] "
+        f"folds={len(result.folds)} mode={result.mode} workers={result.workers} bars={result.bars} "
+        f"oos_return_pct={result.total_return_pct:.4f} oos_max_drawdown_pct={result.max_drawdown_pct:.4f} "
+        f"elapsed={result.elapsed_seconds:.2f}s"
+        + _cache_hits_note(engine)
+        + (f" output={args.output}" if args.output else "")
+    )
+    return 0
+
+
+def handle_backtest_replay(ctx: CLIContext, args: Any) -> int:
+    try:
+        strategy, merged_params = create_live_strategy(
+            strategy_name=args.strategy,
+            strategies_config=ctx.strategies_config,
+            explicit_params=parse_param_pairs(args.param),
+        )
+    except Exception as exc:
+        raise CLICommandError(str(exc)) from exc
+    timeframe = args.timeframe or str(ctx.config.get("backtest", {}).get("default_timeframe", "1h"))
+    start_ms, end_ms = resolve_time_range_ms(
+        start_ms=args.start_ms,
+        end_ms=args.end_ms,
+        days=args.days,
+    )
+    try:
+        backtester = LiveStrategyBacktester.from_config(ctx.database, ctx.config)
+        result = backtester.run(
+            strategy,
+            BacktestDataSlice(
+                symbol=args.symbol,
+                timeframe=timeframe,
+                start_timestamp=start_ms,
+                end_timestamp=end_ms,
+            ),
+            strategy_params=merged_params,
+        )
+    except LiveBacktestError as exc:
+        raise CLICommandError(str(exc)) from exc
+    run_id = None if args.no_ledger else flush_ledger(ctx.database, result)
+
+    table = Table(title="实时策略回放结果")
+    table.add_column("指标")
+    table.add_column("数值", justify="right")
+    table.add_row("K线数", str(result.bars_processed))
+    table.add_row("订单数", str(len(result.orders)))
+    table.add_row("成交数", str(len(result.trades)))
+    table.add_row("被拒信号", str(result.rejected_signals))
+    table.add_row("初始资金", f"{result.initial_capital:.2f}")
+    table.add_row("期末权益", f"{result.final_equity:.2f}")
+    table.add_row("总收益率(%)", f"{result.total_return_pct:.4f}")
+    table.add_row("最大回撤(%)", f"{result.max_drawdown_pct:.4f}")
+    table.add_row("累计手续费", f"{result.total_fees:.6f}")
+    table.add_row("期末持仓", f"{result.position_amount:.8f}")
+    table.add_row("已实现盈亏", f"{result.realized_pnl:.6f}")
+    console.print(table)
+    console.print(
+        "[green]回放完成[/green] "
+        f"strategy={result.strategy_name} symbol={result.symbol} timeframe={result.timeframe} "
+        f"events_per_sec={result.events_per_second:.0f} elapsed={result.elapsed_seconds:.2f}s "
+        + ("ledger=skipped" if run_id is None else f"run_id={run_id}")
+    )
+    return 0
+
+
+def _grid_request(
+    ctx: CLIContext,
+    args: Any,
+    registry: StrategyRegistry,
+) -> tuple[BacktestRunRequest, dict[str, tuple[Any, ...]]]:
+    try:
+        strategy_spec = registry.get_by_name(args.strategy)
+        grid = dict(parse_grid_spec(spec) for spec in args.grid)
+    except Exception as exc:
+        raise CLICommandError(str(exc)) from exc
+    if len(grid) != len(args.grid):
+        raise CLICommandError("--grid 中存在重复的参数名")
+    if args.workers is not None and args.workers <= 0:
+        raise CLICommandError("--workers 必须 > 0")
+
+    timeframe = args.timeframe or str(ctx.config.get("backtest", {}).get("default_timeframe", "1h"))
+    start_ms, end_ms = resolve_time_range_ms(
+        start_ms=args.start_ms,
+        end_ms=args.end_ms,
+        days=args.days,
+    )
+    request = BacktestRunRequest(
+        symbol=args.symbol,
+        timeframe=timeframe,
+        start_timestamp=start_ms,
+        end_timestamp=end_ms,
+        strategy_class=strategy_spec.strategy_class,
+        strategy_params=parse_param_pairs(args.param),
+    )
+    return request, grid
+
+
+def _build_backtest_engine(
+    ctx: CLIContext,
+    registry: StrategyRegistry,
+    engine_mode: str | None = None,
+    *,
+    use_cache: bool = True,
+    memory_mode: str | None = None,
+    analyzer_profile: str | None = None,
+    profiling: ProfilingOptions | None = None,
+) -> BacktestEngine:
+    return BacktestEngine.from_config(
+        ctx.database,
+        ctx.config,
+        strategies_config=ctx.strategies_config,
+        strategy_registry=registry,
+        engine_mode=engine_mode,
+        memory_mode=memory_mode,
+        analyzer_profile=analyzer_profile,
+        use_cache=use_cache,
+        profiling=profiling,
+    )
+
+
+def _cache_hits_note(engine: BacktestEngine) -> str:
+    stats = engine.result_cache_stats
+    note = "" if stats is None else f" cache_hits={stats.hits}/{stats.hits + stats.misses}"
+    return note + _frame_cache_note(engine)
+
+
+def _frame_cache_note(engine: BacktestEngine) -> str:
+    stats = engine.frame_cache_stats
+    if stats is None:
+        return ""
+    return f" frame_cache_hits={stats.hits}/{stats.hits + stats.misses} frame_cache_mb={stats.current_bytes / 1048576:.1f}"
+
+
+def _format_metric(value: float | None) -> str:
+    return "-" if value is None else f"{value:.4f}"
+
+
+def _write_sweep_csv(path: Path, result: SweepResult) -> None:
+    path.parent.mkdir(parents=True, exist_ok=True)
+    with path.open("w", encoding="utf-8", newline="") as handle:
+        writer = csv.writer(handle)
+        writer.writerow(
+            [
+                "rank",
+                *result.param_names,
+                "total_return_pct",
+                "sharpe_ratio",
+                "max_drawdown_pct",
+                "profit_factor",
+                "win_rate",
+                "total_trades",
+                "final_value",
+                "elapsed_seconds",
+                "error",
+            ]
+        )
+        for rank, run in enumerate(result.runs, start=1):
+            writer.writerow(
+                [
+                    rank,
+                    *(run.params.get(name) for name in result.param_names),
+                    run.total_return_pct,
+                    run.sharpe_ratio,
+                    run.max_drawdown_pct,
+                    run.profit_factor,
+                    run.win_rate,
+                    run.total_trades,
+                    run.final_value,
+                    f"{run.elapsed_seconds:.6f}",
+                    run.error or "",
+                ]
+            )
+
+
 def handle_download(ctx: CLIContext, args: Any) -> int:
     start_ms, end_ms = resolve_time_range_ms(
         start_ms=args.start_ms,
         end_ms=args.end_ms,
         days=args.days,
     )
+    if args.manifest:
+        return _handle_manifest_download(ctx, args, start_ms=start_ms, end_ms=end_ms)
+    if not args.timeframe:
+        raise CLICommandError("--timeframe is required with --symbol")
+
     fetcher = MarketDataFetcher.from_config(ctx.config)
     storage = HistoricalCandleStorage(ctx.database, fetcher)
     result = storage.download_and_store(
@@ -158,6 +600,8 @@ def handle_download(ctx: CLIContext, args: Any) -> int:
         "[green]下载完成[/green] "
         f"dataset={result.dataset_name} "
         f"downloaded_count={result.downloaded_count} "
+        f"fetched_pages={result.fetched_pages} "
+        f"rejected_count={result.rejected_count} "
         f"stored_count={result.stored_count} "
         f"expected_count={result.expected_count} "
         f"coverage={result.coverage_ratio:.2%} "
@@ -173,6 +617,85 @@ def handle_download(ctx: CLIContext, args: Any) -> int:
     return 0
 
 
+def _handle_manifest_download(ctx: CLIContext, args: Any, *, start_ms: int, end_ms: int) -> int:
+    try:
+        manifest = load_download_manifest(
+            args.manifest,
+            default_start_timestamp=start_ms,
+            default_end_timestamp=end_ms,
+            default_batch_size=args.batch_size,
+        )
+    except DownloadManifestError as exc:
+        raise CLICommandError(str(exc)) from exc
+    workers = args.workers if args.workers is not None else manifest.workers
+    if workers <= 0:
+        raise CLICommandError("--workers must be > 0")
+
+    def _on_progress(report: DatasetDownloadReport) -> None:
+        if report.error is not None:
+            console.print(f"[red]下载失败[/red] {report.symbol} {report.timeframe}: {report.error}")
+            return
+        console.print(
+            f"[cyan]数据集完成[/cyan] {report.symbol} {report.timeframe} "
+            f"downloaded_count={report.downloaded_count} rows_per_sec={report.rows_per_second:.1f}"
+        )
+
+    storage = HistoricalCandleStorage(ctx.database, OfflineCandleFetcher())
+    downloader = ConcurrentCandleDownloader(
+        storage,
+        _shared_rate_limit_fetcher_factory(ctx.config),
+        workers=workers,
+        on_progress=_on_progress,
+    )
+    report = downloader.run(manifest.requests)
+
+    table = Table(title="清单下载结果")
+    table.add_column("dataset")
+    table.add_column("downloaded", justify="right")
+    table.add_column("pages", justify="right")
+    table.add_column("coverage", justify="right")
+    table.add_column("rows/s", justify="right")
+    table.add_column("status")
+    for item in report.datasets:
+        table.add_row(
+            HistoricalCandleStorage.build_dataset_name(item.symbol, item.timeframe),
+            str(item.downloaded_count),
+            str(item.fetched_pages),
+            "-" if item.result is None else f"{item.result.coverage_ratio:.2%}",
+            f"{item.rows_per_second:.1f}",
+            "ok" if item.error is None else "failed",
+        )
+    console.print(table)
+    console.print(
+        "[green]清单下载完成[/green] "
+        f"datasets={len(report.datasets)} "
+        f"failed={len(report.failed)} "
+        f"workers={report.workers} "
+        f"downloaded_count={report.downloaded_count} "
+        f"fetched_pages={report.fetched_pages} "
+        f"elapsed_seconds={report.elapsed_seconds:.2f} "
+        f"rows_per_sec={report.rows_per_second:.1f}"
+    )
+    if report.failed:
+        raise CLICommandError(f"{len(report.failed)} dataset(s) failed to download")
+    return 0
+
+
+def _shared_rate_limit_fetcher_factory(config: Any) -> Callable[[], MarketDataFetcher]:
+    """Return a factory whose fetchers all draw from the first fetcher's rate limiter."""
+    lock = threading.Lock()
+    shared: list[MarketDataFetcher] = []
+
+    def _factory() -> MarketDataFetcher:
+        with lock:
+            if not shared:
+                shared.append(MarketDataFetcher.from_config(config))
+                return shared[0]
+            return MarketDataFetcher.from_config(config, rate_limiter=shared[0].rate_limiter)
+
+    return _factory
+
+
 def handle_live(ctx: CLIContext, args: Any) -> int:
     explicit_params = parse_param_pairs(args.param)
     strategy, merged_params = create_live_strategy(
@@ -231,21 +754,38 @@ def handle_import(ctx: CLIContext, args: Any) -> int:
     if not csv_path.exists():
         raise CLICommandError(f"导入文件不存在: {csv_path}")
 
-    rows = _read_candles_from_csv(csv_path, default_symbol=args.symbol, default_timeframe=args.timeframe)
-    with ctx.database.transaction() as tx:
-        before = tx.total_changes
-        tx.executemany(
-            """
-            INSERT OR IGNORE INTO candles(symbol, timeframe, timestamp, open, high, low, close, volume)
-            VALUES (?, ?, ?, ?, ?, ?, ?, ?);
-            """,
-            rows,
+    def _report(progress: CandleImportProgress) -> None:
+        console.print(
+            f"[cyan]导入进度[/cyan] chunks={progress.chunks} parsed={progress.parsed_rows} "
+            f"inserted={progress.inserted_rows} rows_per_sec={progress.rows_per_second:.0f}"
         )
-        inserted = tx.total_changes - before
+
+    importer = StreamingCandleImporter(
+        ctx.database,
+        chunk_rows=args.chunk_rows,
+        on_progress=_report,
+        strict=args.strict,
+    )
+    try:
+        result = importer.run(
+            csv_path,
+            symbol=args.symbol,
+            timeframe=args.timeframe,
+            file_format=None if args.format == "auto" else args.format,
+        )
+    except HistoricalDataStorageError as exc:
+        raise CLICommandError(str(exc)) from exc
 
     console.print(
-        f"[green]导入完成[/green] file={csv_path} parsed={len(rows)} inserted={inserted}"
+        f"[green]导入完成[/green] file={csv_path} format={result.file_format} "
+        f"parsed={result.parsed_rows} inserted={result.inserted_rows} "
+        f"rejected_count={result.rejected_rows} rows_per_sec={result.rows_per_second:.0f}"
     )
+    if result.rejected_lines:
+        shown = ", ".join(f"第 {item.line} 行: {item.reason}" for item in result.rejected_lines)
+        more = result.rejected_rows - len(result.rejected_lines)
+        suffix = f"，另有 {more} 行未列出" if more > 0 else ""
+        console.print(f"[yellow]已跳过格式错误的行[/yellow] {shown}{suffix}")
     return 0
 
 
@@ -253,83 +793,194 @@ def handle_export(ctx: CLIContext, args: Any) -> int:
     if args.start_ms is not None and args.end_ms is not None and args.start_ms > args.end_ms:
         raise CLICommandError("start-ms 不能大于 end-ms")
 
-    sql = [
-        "SELECT symbol, timeframe, timestamp, open, high, low, close, volume",
-        "FROM candles",
-        "WHERE symbol = ? AND timeframe = ?",
-    ]
-    params: list[Any] = [args.symbol.strip().upper(), args.timeframe]
-    if args.start_ms is not None:
-        sql.append("AND timestamp >= ?")
-        params.append(args.start_ms)
-    if args.end_ms is not None:
-        sql.append("AND timestamp <= ?")
-        params.append(args.end_ms)
-    sql.append("ORDER BY timestamp ASC")
-
-    with ctx.database.transaction() as tx:
-        rows = tx.execute(" ".join(sql), params).fetchall()
-
-    output = Path(args.output)
-    output.parent.mkdir(parents=True, exist_ok=True)
-    with output.open("w", encoding="utf-8", newline="") as handle:
-        writer = csv.writer(handle)
-        writer.writerow(["symbol", "timeframe", "timestamp", "open", "high", "low", "close", "volume"])
-        for row in rows:
-            writer.writerow(
-                [
-                    row["symbol"],
-                    row["timeframe"],
-                    row["timestamp"],
-                    row["open"],
-                    row["high"],
-                    row["low"],
-                    row["close"],
-                    row["volume"],
-                ]
-            )
+    exporter = StreamingCandleExporter(ensure_export_storage(ctx), chunk_rows=args.chunk_rows)
+    try:
+        result = exporter.run(
+            args.output,
+            symbol=args.symbol,
+            timeframe=args.timeframe,
+            start_timestamp=args.start_ms,
+            end_timestamp=args.end_ms,
+            file_format=None if args.format == "auto" else args.format,
+            compression=args.compression,
+        )
+    except HistoricalDataStorageError as exc:
+        raise CLICommandError(str(exc)) from exc
 
-    console.print(f"[green]导出完成[/green] rows={len(rows)} output={output}")
+    console.print(
+        f"[green]导出完成[/green] rows={result.rows} output={result.path} format={result.file_format} "
+        f"compression={result.compression} bytes={result.bytes_written} "
+        f"rows_per_sec={result.rows_per_second:.0f}"
+    )
     return 0
 
 
-def _read_candles_from_csv(
-    csv_path: Path,
-    *,
-    default_symbol: str | None,
-    default_timeframe: str | None,
-) -> list[tuple[Any, ...]]:
-    rows: list[tuple[Any, ...]] = []
-
-    with csv_path.open("r", encoding="utf-8", newline="") as handle:
-        reader = csv.DictReader(handle)
-        required = {"timestamp", "open", "high", "low", "close", "volume"}
-        if reader.fieldnames is None or not required.issubset(set(reader.fieldnames)):
-            raise CLICommandError("CSV 缺少必要列: timestamp/open/high/low/close/volume")
-
-        for line_no, row in enumerate(reader, start=2):
-            symbol = (row.get("symbol") or default_symbol or "").strip().upper()
-            timeframe = (row.get("timeframe") or default_timeframe or "").strip()
-            if not symbol:
-                raise CLICommandError(f"第 {line_no} 行缺少 symbol，且未提供 --symbol")
-            if timeframe not in ALLOWED_TIMEFRAMES:
-                raise CLICommandError(f"第 {line_no} 行 timeframe 非法: {timeframe}")
-
-            try:
-                timestamp = int(row["timestamp"])
-                open_price = float(row["open"])
-                high = float(row["high"])
-                low = float(row["low"])
-                close = float(row["close"])
-                volume = float(row["volume"])
-            except (TypeError, ValueError) as exc:
-                raise CLICommandError(f"第 {line_no} 行数据格式错误") from exc
-
-            rows.append((symbol, timeframe, timestamp, open_price, high, low, close, volume))
-
-    return rows
+def handle_sync_columnar(ctx: CLIContext, args: Any) -> int:
+    store = ColumnarCandleStore(_columnar_dir(ctx), ctx.database)
+    if args.symbol or args.timeframe:
+        if not args.symbol or not args.timeframe:
+            raise CLICommandError("--symbol 与 --timeframe 需同时提供")
+        datasets = [(args.symbol.strip().upper(), args.timeframe.strip())]
+    else:
+        datasets = store.list_sqlite_datasets()
+
+    table = Table(title="列式存储同步")
+    table.add_column("symbol")
+    table.add_column("timeframe")
+    table.add_column("appended", justify="right")
+    table.add_column("total", justify="right")
+    table.add_column("rebuilt")
+    for symbol, timeframe in datasets:
+        try:
+            result = store.sync(symbol, timeframe, rebuild=bool(args.rebuild))
+        except ColumnarStoreError as exc:
+            raise CLICommandError(str(exc)) from exc
+        table.add_row(
+            result.symbol,
+            result.timeframe,
+            str(result.appended_rows),
+            str(result.total_rows),
+            "yes" if result.rebuilt else "no",
+        )
+    console.print(table)
+    console.print(f"[green]同步完成[/green] datasets={len(datasets)} root={store.root_dir}")
+    return 0
+
+
+def handle_rollup(ctx: CLIContext, args: Any) -> int:
+    engine = CandleRollupEngine(ctx.database)
+    timeframes = list(args.timeframe or [])
+    try:
+        if args.symbol:
+            if not timeframes:
+                raise CLICommandError("--symbol 需配合至少一个 --timeframe")
+            if args.drop:
+                for timeframe in timeframes:
+                    engine.unregister(args.symbol, timeframe)
+                console.print(
+                    f"[green]已移除聚合目标[/green] symbol={args.symbol.strip().upper()} "
+                    f"timeframes={','.join(timeframes)}"
+                )
+                return 0
+            results = [engine.register(args.symbol, timeframe) for timeframe in timeframes]
+        elif args.drop or timeframes:
+            raise CLICommandError("--timeframe/--drop 需同时提供 --symbol")
+        else:
+            results = engine.refresh()
+    except CandleRollupError as exc:
+        raise CLICommandError(str(exc)) from exc
+
+    table = Table(title="K线聚合")
+    table.add_column("symbol")
+    table.add_column("timeframe")
+    table.add_column("refreshed_buckets", justify="right")
+    table.add_column("written", justify="right")
+    table.add_column("removed", justify="right")
+    for result in results:
+        table.add_row(
+            result.symbol,
+            result.timeframe,
+            str(result.refreshed_buckets),
+            str(result.written_bars),
+            str(result.removed_bars),
+        )
+    console.print(table)
+    console.print(
+        f"[green]聚合完成[/green] targets={len(results)} "
+        f"refreshed_buckets={sum(result.refreshed_buckets for result in results)}"
+    )
+    return 0
+
+
+def handle_repair(ctx: CLIContext, args: Any) -> int:
+    if bool(args.symbol) != bool(args.timeframe):
+        raise CLICommandError("--symbol 与 --timeframe 需同时提供")
+    if args.watch is not None and args.watch <= 0:
+        raise CLICommandError("--watch 必须 > 0")
+
+    scanner = CandleGapScanner(ctx.database)
+    repairer = None
+    if not args.scan_only:
+        try:
+            repairer = CandleGapRepairer(
+                HistoricalCandleStorage(ctx.database, MarketDataFetcher.from_config(ctx.config)),
+                scanner,
+                max_attempts=args.max_attempts,
+            )
+        except HistoricalDataStorageError as exc:
+            raise CLICommandError(str(exc)) from exc
+
+    cycle = 0
+    while True:
+        cycle += 1
+        datasets = (
+            [(args.symbol.strip().upper(), args.timeframe.strip())]
+            if args.symbol
+            else scanner.list_datasets()
+        )
+        _run_repair_cycle(scanner, repairer, datasets, args)
+        if args.watch is None or (args.max_cycles is not None and cycle >= args.max_cycles):
+            return 0
+        time.sleep(args.watch)
+
+
+def _run_repair_cycle(
+    scanner: CandleGapScanner,
+    repairer: CandleGapRepairer | None,
+    datasets: list[tuple[str, str]],
+    args: Any,
+) -> None:
+    table = Table(title="K线缺口扫描与修复")
+    table.add_column("symbol")
+    table.add_column("timeframe")
+    table.add_column("new_gaps", justify="right")
+    table.add_column("open_gaps", justify="right")
+    table.add_column("missing_bars", justify="right")
+    table.add_column("fetch_windows", justify="right")
+    table.add_column("inserted", justify="right")
+    table.add_column("repaired", justify="right")
+    table.add_column("remaining", justify="right")
+    total_missing = total_remaining = 0
+    for symbol, timeframe in datasets:
+        try:
+            scan = scanner.scan(symbol, timeframe, full=bool(args.full_scan))
+            repair = (
+                repairer.repair(symbol, timeframe, batch_size=args.batch_size, max_gaps=args.max_gaps)
+                if repairer is not None and scan.open_gaps
+                else None
+            )
+        except (HistoricalDataStorageError, ValueError) as exc:
+            raise CLICommandError(str(exc)) from exc
+        remaining = repair.remaining_gaps if repair is not None else scan.open_gaps
+        total_missing += scan.missing_bars
+        total_remaining += remaining
+        table.add_row(
+            symbol,
+            timeframe,
+            str(scan.new_gaps),
+            str(scan.open_gaps),
+            str(scan.missing_bars),
+            str(repair.fetch_windows) if repair is not None else "-",
+            str(repair.inserted_count) if repair is not None else "-",
+            str(repair.repaired_gaps) if repair is not None else "-",
+            str(remaining),
+        )
+    console.print(table)
+    console.print(
+        f"[green]缺口检查完成[/green] datasets={len(datasets)} "
+        f"missing_bars={total_missing} remaining_gaps={total_remaining}"
+    )
+
+
+def _columnar_dir(ctx: CLIContext) -> str:
+    backtest_cfg = ctx.config.get("backtest", {})
+    if isinstance(backtest_cfg, dict):
+        raw = backtest_cfg.get("columnar_dir")
+        if isinstance(raw, str) and raw.strip():
+            return raw.strip()
+    return "data/columnar"
 
 
 def ensure_export_storage(ctx: CLIContext) -> HistoricalCandleStorage:
     """Utility kept for compatibility with workflow commands."""
-    return HistoricalCandleStorage(ctx.database, _NoopFetcher())
+    return HistoricalCandleStorage(ctx.database, OfflineCandleFetcher())
@@ -94,8 +94,8 @@ class AccountService:
         return Account.validate(dict(row))
 
     def list_accounts(self) -> list[Account]:
-        with self._db.transaction() as tx:
-            rows = tx.execute(
+        with self._db.read() as conn:
+            rows = conn.execute(
                 "SELECT currency, balance, available, frozen FROM accounts ORDER BY currency;"
             ).fetchall()
         return [Account.validate(dict(row)) for row in rows]
@@ -165,8 +165,8 @@ class AccountService:
     # Position recovery & valuation
     # ------------------------------------------------------------------ #
     def load_positions(self) -> list[Position]:
-        with self._db.transaction() as tx:
-            rows = tx.execute(
+        with self._db.read() as conn:
+            rows = conn.execute(
                 """
                 SELECT symbol, amount, entry_price, current_price, unrealized_pnl,
                        realized_pnl, opened_at, updated_at
@@ -3,9 +3,12 @@
 from __future__ import annotations
 
 import datetime as dt
+import queue
 import sqlite3
+import threading
 from collections.abc import Generator, Mapping
 from contextlib import contextmanager
+from dataclasses import dataclass, replace
 from pathlib import Path
 from typing import Any
 
@@ -104,19 +107,182 @@ SCHEMA_STATEMENTS: tuple[str, ...] = (
         CHECK(end_timestamp >= start_timestamp)
     );
     """,
+    """
+    CREATE TABLE IF NOT EXISTS candle_coverage (
+        symbol TEXT NOT NULL,
+        timeframe TEXT NOT NULL,
+        start_timestamp INTEGER NOT NULL,
+        end_timestamp INTEGER NOT NULL,
+        updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+        PRIMARY KEY(symbol, timeframe, start_timestamp),
+        CHECK(start_timestamp >= 0),
+        CHECK(end_timestamp >= start_timestamp)
+    );
+    """,
+    """
+    CREATE TABLE IF NOT EXISTS dataset_versions (
+        symbol TEXT NOT NULL,
+        timeframe TEXT NOT NULL,
+        version INTEGER NOT NULL DEFAULT 0,
+        PRIMARY KEY(symbol, timeframe)
+    ) WITHOUT ROWID;
+    """,
+    """
+    CREATE TABLE IF NOT EXISTS candle_gaps (
+        symbol TEXT NOT NULL,
+        timeframe TEXT NOT NULL,
+        gap_start INTEGER NOT NULL,
+        gap_end INTEGER NOT NULL,
+        missing_bars INTEGER NOT NULL,
+        repair_attempts INTEGER NOT NULL DEFAULT 0,
+        detected_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+        PRIMARY KEY(symbol, timeframe, gap_start),
+        CHECK(gap_end >= gap_start)
+    ) WITHOUT ROWID;
+    """,
+    """
+    CREATE TABLE IF NOT EXISTS candle_gap_scan_state (
+        symbol TEXT NOT NULL,
+        timeframe TEXT NOT NULL,
+        checked_until INTEGER NOT NULL,
+        scanned_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+        PRIMARY KEY(symbol, timeframe)
+    ) WITHOUT ROWID;
+    """,
+    """
+    CREATE TABLE IF NOT EXISTS candle_rollup_targets (
+        symbol TEXT NOT NULL,
+        timeframe TEXT NOT NULL,
+        created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+        PRIMARY KEY(symbol, timeframe)
+    ) WITHOUT ROWID;
+    """,
+    """
+    CREATE TABLE IF NOT EXISTS candle_rollup_dirty (
+        symbol TEXT NOT NULL,
+        timeframe TEXT NOT NULL,
+        bucket_start INTEGER NOT NULL,
+        PRIMARY KEY(symbol, timeframe, bucket_start)
+    ) WITHOUT ROWID;
+    """,
+    """
+    CREATE TABLE IF NOT EXISTS candle_rollups (
+        symbol TEXT NOT NULL,
+        timeframe TEXT NOT NULL,
+        timestamp INTEGER NOT NULL,
+        open REAL NOT NULL,
+        high REAL NOT NULL,
+        low REAL NOT NULL,
+        close REAL NOT NULL,
+        volume REAL NOT NULL,
+        source_bars INTEGER NOT NULL,
+        PRIMARY KEY(symbol, timeframe, timestamp)
+    ) WITHOUT ROWID;
+    """,
+    """
+    CREATE TABLE IF NOT EXISTS backtest_result_cache (
+        cache_key TEXT PRIMARY KEY,
+        payload BLOB NOT NULL,
+        size_bytes INTEGER NOT NULL,
+        created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+        last_used_at INTEGER NOT NULL
+    );
+    """,
+    """
+    CREATE TABLE IF NOT EXISTS sim_orders (
+        run_id INTEGER NOT NULL,
+        id TEXT NOT NULL,
+        symbol TEXT NOT NULL,
+        type TEXT NOT NULL,
+        side TEXT NOT NULL,
+        price REAL,
+        amount REAL NOT NULL,
+        filled REAL DEFAULT 0,
+        status TEXT NOT NULL,
+        created_at INTEGER,
+        updated_at INTEGER,
+        PRIMARY KEY (run_id, id),
+        FOREIGN KEY (run_id) REFERENCES strategy_runs(id)
+    );
+    """,
+    """
+    CREATE TABLE IF NOT EXISTS sim_trades (
+        run_id INTEGER NOT NULL,
+        trade_id INTEGER NOT NULL,
+        order_id TEXT NOT NULL,
+        symbol TEXT NOT NULL,
+        side TEXT NOT NULL,
+        price REAL NOT NULL,
+        amount REAL NOT NULL,
+        fee REAL NOT NULL,
+        timestamp INTEGER NOT NULL,
+        PRIMARY KEY (run_id, trade_id),
+        FOREIGN KEY (run_id) REFERENCES strategy_runs(id)
+    );
+    """,
 )
 
 INDEX_STATEMENTS: tuple[str, ...] = (
     "CREATE INDEX IF NOT EXISTS idx_positions_symbol ON positions(symbol);",
-    "CREATE INDEX IF NOT EXISTS idx_candles_symbol_time ON candles(symbol, timeframe, timestamp);",
-    "CREATE INDEX IF NOT EXISTS idx_candles_timestamp ON candles(timestamp);",
     "CREATE INDEX IF NOT EXISTS idx_candle_cache_lookup ON candle_download_cache(symbol, timeframe, start_timestamp, end_timestamp);",
     "CREATE INDEX IF NOT EXISTS idx_trades_order_id ON trades(order_id);",
+    "CREATE INDEX IF NOT EXISTS idx_backtest_result_cache_lru ON backtest_result_cache(last_used_at);",
+)
+
+# Only applied while ``candles`` is the original row table; after the compact
+# migration it is a view over ``candle_bars`` and cannot carry indexes.
+LEGACY_CANDLE_INDEX_STATEMENTS: tuple[str, ...] = (
+    "CREATE INDEX IF NOT EXISTS idx_candles_symbol_time ON candles(symbol, timeframe, timestamp);",
+    "CREATE INDEX IF NOT EXISTS idx_candles_timestamp ON candles(timestamp);",
 )
 
 _SQLITE_DATE_CONVERTERS_REGISTERED = False
 
 
+@dataclass(frozen=True)
+class SQLitePragmaProfile:
+    """Connection-level PRAGMA settings applied when a connection is opened."""
+
+    name: str
+    journal_mode: str
+    synchronous: str
+    cache_size: int
+    mmap_size: int
+    temp_store: str
+
+    @property
+    def uses_wal(self) -> bool:
+        return self.journal_mode.upper() == "WAL"
+
+
+PRAGMA_PROFILES: dict[str, SQLitePragmaProfile] = {
+    # SQLite defaults: rollback journal, full fsync, ~2 MB page cache.
+    "legacy": SQLitePragmaProfile(
+        name="legacy",
+        journal_mode="DELETE",
+        synchronous="FULL",
+        cache_size=-2_000,
+        mmap_size=0,
+        temp_store="DEFAULT",
+    ),
+    # WAL lets readers proceed while the live loop writes; NORMAL sync is
+    # durable across application crashes (only an OS crash can lose the tail).
+    "wal": SQLitePragmaProfile(
+        name="wal",
+        journal_mode="WAL",
+        synchronous="NORMAL",
+        cache_size=-65_536,
+        mmap_size=268_435_456,
+        temp_store="MEMORY",
+    ),
+}
+DEFAULT_PRAGMA_PROFILE = "legacy"
+DEFAULT_READ_POOL_SIZE = 4
+
+_SYNCHRONOUS_VALUES = {"OFF", "NORMAL", "FULL", "EXTRA"}
+_TEMP_STORE_VALUES = {"DEFAULT", "FILE", "MEMORY"}
+
+
 def _adapt_date_iso(value: dt.date) -> str:
     return value.isoformat()
 
@@ -151,17 +317,74 @@ class DatabaseLifecycleError(RuntimeError):
     """Raised when database lifecycle operations are invalid."""
 
 
+def resolve_pragma_profile(
+    profile: str | SQLitePragmaProfile,
+    overrides: Mapping[str, Any] | None = None,
+) -> SQLitePragmaProfile:
+    """Look up a named PRAGMA profile and apply optional per-setting overrides."""
+    if isinstance(profile, SQLitePragmaProfile):
+        resolved = profile
+    else:
+        name = str(profile).strip().lower()
+        if name not in PRAGMA_PROFILES:
+            raise DatabaseLifecycleError(
+                f"database profile must be one of {sorted(PRAGMA_PROFILES)}"
+            )
+        resolved = PRAGMA_PROFILES[name]
+
+    changes: dict[str, Any] = {}
+    for key, value in (overrides or {}).items():
+        if value is None:
+            continue
+        if key in ("cache_size", "mmap_size"):
+            if not isinstance(value, int) or isinstance(value, bool):
+                raise DatabaseLifecycleError(f"database.{key} must be an integer")
+            if key == "mmap_size" and value < 0:
+                raise DatabaseLifecycleError("database.mmap_size must be >= 0")
+            changes[key] = value
+        elif key == "synchronous":
+            normalized = str(value).strip().upper()
+            if normalized not in _SYNCHRONOUS_VALUES:
+                raise DatabaseLifecycleError(
+                    f"database.synchronous must be one of {sorted(_SYNCHRONOUS_VALUES)}"
+                )
+            changes[key] = normalized
+        elif key == "temp_store":
+            normalized = str(value).strip().upper()
+            if normalized not in _TEMP_STORE_VALUES:
+                raise DatabaseLifecycleError(
+                    f"database.temp_store must be one of {sorted(_TEMP_STORE_VALUES)}"
+                )
+            changes[key] = normalized
+    return replace(resolved, **changes) if changes else resolved
+
+
 class SQLiteDatabase:
     """Manage SQLite connection open/close and transaction boundaries."""
 
-    def __init__(self, database_path: str | Path, timeout: float = 30.0) -> None:
+    def __init__(
+        self,
+        database_path: str | Path,
+        timeout: float = 30.0,
+        *,
+        pragma_profile: str | SQLitePragmaProfile = DEFAULT_PRAGMA_PROFILE,
+        read_pool_size: int = DEFAULT_READ_POOL_SIZE,
+    ) -> None:
         path = Path(database_path).expanduser()
         if not str(path).strip():
             raise DatabaseLifecycleError("database_path must not be empty")
+        if not isinstance(read_pool_size, int) or isinstance(read_pool_size, bool) or read_pool_size < 0:
+            raise DatabaseLifecycleError("read_pool_size must be an integer >= 0")
         self._database_path = path
         self._timeout = timeout
+        self._pragma_profile = resolve_pragma_profile(pragma_profile)
+        self._read_pool_size = read_pool_size
         self._connection: sqlite3.Connection | None = None
+        self._journal_mode: str | None = None
         self._transaction_depth = 0
+        self._idle_readers: queue.LifoQueue[sqlite3.Connection] = queue.LifoQueue()
+        self._reader_count = 0
+        self._reader_lock = threading.Lock()
 
     @classmethod
     def from_config(
@@ -178,13 +401,43 @@ class SQLiteDatabase:
         if not isinstance(database_path, str) or not database_path.strip():
             raise DatabaseLifecycleError("Missing config value: system.database_path")
 
-        return cls(database_path=database_path.strip(), timeout=timeout)
+        database_cfg = system.get("database") or {}
+        if not isinstance(database_cfg, Mapping):
+            raise DatabaseLifecycleError("system.database must be a mapping")
+        profile = resolve_pragma_profile(
+            database_cfg.get("profile", DEFAULT_PRAGMA_PROFILE),
+            overrides={
+                key: database_cfg.get(key)
+                for key in ("synchronous", "cache_size", "mmap_size", "temp_store")
+            },
+        )
+        read_pool_size = database_cfg.get("read_pool_size", DEFAULT_READ_POOL_SIZE)
+        return cls(
+            database_path=database_path.strip(),
+            timeout=timeout,
+            pragma_profile=profile,
+            read_pool_size=read_pool_size,
+        )
 
     @property
     def database_path(self) -> Path:
         """Return configured database path."""
         return self._database_path
 
+    @property
+    def pragma_profile(self) -> SQLitePragmaProfile:
+        """Return the PRAGMA profile applied to every opened connection."""
+        return self._pragma_profile
+
+    @property
+    def journal_mode(self) -> str | None:
+        """Journal mode SQLite actually applied on open (lower case), ``None`` before :meth:`open`.
+
+        It can differ from the profile: in-memory databases only support
+        ``memory``/``off``, so a WAL profile ends up in ``memory`` mode there.
+        """
+        return self._journal_mode
+
     @property
     def is_open(self) -> bool:
         """Return whether the underlying SQLite connection is open."""
@@ -211,6 +464,13 @@ class SQLiteDatabase:
         )
         connection.row_factory = sqlite3.Row
         connection.execute("PRAGMA foreign_keys = ON;")
+        # Only takes effect on a new file (and must precede the WAL switch);
+        # existing files keep their mode until `db maintain --convert-vacuum`.
+        connection.execute("PRAGMA auto_vacuum = INCREMENTAL;")
+        applied = connection.execute(f"PRAGMA journal_mode = {self._pragma_profile.journal_mode};").fetchone()
+        self._journal_mode = str(applied[0]).lower()
+        connection.execute(f"PRAGMA synchronous = {self._pragma_profile.synchronous};")
+        self._apply_cache_pragmas(connection)
 
         self._connection = connection
         self._transaction_depth = 0
@@ -218,12 +478,14 @@ class SQLiteDatabase:
 
     def close(self) -> None:
         """Close SQLite connection and rollback uncommitted work."""
+        self._close_idle_readers()
         if self._connection is None:
             return
         if self._connection.in_transaction:
             self._connection.rollback()
         self._connection.close()
         self._connection = None
+        self._journal_mode = None
         self._transaction_depth = 0
 
     def initialize_schema(self) -> None:
@@ -233,6 +495,12 @@ class SQLiteDatabase:
                 tx.execute(statement)
             for statement in INDEX_STATEMENTS:
                 tx.execute(statement)
+            candles_type = tx.execute(
+                "SELECT type FROM sqlite_master WHERE name = 'candles';"
+            ).fetchone()
+            if candles_type is not None and candles_type[0] == "table":
+                for statement in LEGACY_CANDLE_INDEX_STATEMENTS:
+                    tx.execute(statement)
 
     @contextmanager
     def transaction(self) -> Generator[sqlite3.Connection, None, None]:
@@ -263,6 +531,93 @@ class SQLiteDatabase:
             else:
                 connection.execute(f"RELEASE SAVEPOINT {savepoint_name};")
 
+    @contextmanager
+    def read(self) -> Generator[sqlite3.Connection, None, None]:
+        """Open a read-only snapshot scope on a pooled connection.
+
+        Pooled readers are only used when WAL is actually in effect on a file,
+        where they never block (or get blocked by) the writer. Inside an active
+        write transaction, when the pool is disabled, or when SQLite kept another
+        journal mode (``:memory:`` databases, read-only media), the writer
+        connection is used so reads observe uncommitted changes of the caller.
+        """
+        self.open()
+        if self._transaction_depth > 0 or self._read_pool_size == 0 or not self._pooled_reads:
+            with self.transaction() as tx:
+                yield tx
+            return
+
+        reader = self._acquire_reader()
+        try:
+            reader.execute("BEGIN;")
+            yield reader
+        finally:
+            if reader.in_transaction:
+                reader.execute("ROLLBACK;")
+            self._release_reader(reader)
+
+    @property
+    def _pooled_reads(self) -> bool:
+        return self._journal_mode == "wal" and str(self._database_path) != ":memory:"
+
+    def _acquire_reader(self) -> sqlite3.Connection:
+        try:
+            return self._idle_readers.get_nowait()
+        except queue.Empty:
+            pass
+        with self._reader_lock:
+            if self._reader_count < self._read_pool_size:
+                self._reader_count += 1
+                create = True
+            else:
+                create = False
+        if not create:
+            return self._idle_readers.get(timeout=self._timeout)
+        try:
+            return self._open_reader()
+        except Exception:
+            with self._reader_lock:
+                self._reader_count -= 1
+            raise
+
+    def _release_reader(self, reader: sqlite3.Connection) -> None:
+        if self._connection is None:
+            # Database was closed while the reader was checked out.
+            reader.close()
+            with self._reader_lock:
+                self._reader_count -= 1
+            return
+        self._idle_readers.put(reader)
+
+    def _open_reader(self) -> sqlite3.Connection:
+        uri = f"{self._database_path.resolve().as_uri()}?mode=ro"
+        reader = sqlite3.connect(
+            uri,
+            uri=True,
+            timeout=self._timeout,
+            detect_types=sqlite3.PARSE_DECLTYPES,
+            isolation_level=None,
+            check_same_thread=False,
+        )
+        reader.row_factory = sqlite3.Row
+        self._apply_cache_pragmas(reader)
+        return reader
+
+    def _close_idle_readers(self) -> None:
+        while True:
+            try:
+                reader = self._idle_readers.get_nowait()
+            except queue.Empty:
+                break
+            reader.close()
+            with self._reader_lock:
+                self._reader_count -= 1
+
+    def _apply_cache_pragmas(self, connection: sqlite3.Connection) -> None:
+        connection.execute(f"PRAGMA cache_size = {int(self._pragma_profile.cache_size)};")
+        connection.execute(f"PRAGMA mmap_size = {int(self._pragma_profile.mmap_size)};")
+        connection.execute(f"PRAGMA temp_store = {self._pragma_profile.temp_store};")
+
     def __enter__(self) -> "SQLiteDatabase":
         self.open()
         return self
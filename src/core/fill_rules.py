@@ -0,0 +1,150 @@
+"""Pure fill rules shared by the SQLite matching engines and the simulated exchange.
+
+Trigger checks, execution prices, fees, fund freezing and position arithmetic
+live here so :class:`~src.core.matching.MatchingEngine`,
+:class:`~src.core.limit_matching.LimitOrderMatchingEngine`,
+:class:`~src.core.stop_trigger.StopTriggerEngine` and the in-memory
+:class:`~src.live.sim_exchange.SimulatedExchange` cannot drift apart. Nothing
+in this module touches storage.
+"""
+
+from __future__ import annotations
+
+from dataclasses import dataclass
+from typing import Any, Callable, Iterable
+
+from src.core.enums import OrderSide, OrderType
+from src.core.execution_cost import ExecutionCostProfile, LiquidityRole
+from src.core.order import Order
+
+# Tolerance for float dust in balance, position and remaining-amount checks.
+FILL_EPS = 1e-12
+
+
+@dataclass(frozen=True)
+class FillQuote:
+    """Execution price and fee of one fill."""
+
+    execution_price: float
+    fee: float
+
+
+def quote_market_fill(
+    cost_profile: ExecutionCostProfile,
+    *,
+    side: OrderSide,
+    reference_price: float,
+    amount: float,
+) -> FillQuote:
+    """Market fill: adverse slippage from ``reference_price`` and the taker fee."""
+    execution_price = cost_profile.apply_slippage(reference_price=reference_price, side=side)
+    fee = cost_profile.calculate_fee(execution_price=execution_price, amount=amount, liquidity=LiquidityRole.TAKER)
+    return FillQuote(execution_price, fee)
+
+
+def quote_limit_fill(
+    cost_profile: ExecutionCostProfile,
+    *,
+    side: OrderSide,
+    limit_price: float,
+    latest_price: float,
+    amount: float,
+) -> FillQuote:
+    """Limit fill: the better of limit and latest price, slipped within the limit, maker fee."""
+    if side == OrderSide.BUY:
+        reference_price = min(limit_price, latest_price)
+    else:
+        reference_price = max(limit_price, latest_price)
+    execution_price = cost_profile.apply_slippage_with_limit(
+        reference_price=reference_price,
+        side=side,
+        limit_price=limit_price,
+    )
+    fee = cost_profile.calculate_fee(execution_price=execution_price, amount=amount, liquidity=LiquidityRole.MAKER)
+    return FillQuote(execution_price, fee)
+
+
+def quote_trigger_fill(
+    cost_profile: ExecutionCostProfile,
+    *,
+    side: OrderSide,
+    trigger_price: float,
+    amount: float,
+) -> FillQuote:
+    """Stop-loss / take-profit fill: taker fill slipped from the trigger price."""
+    return quote_market_fill(cost_profile, side=side, reference_price=trigger_price, amount=amount)
+
+
+def is_limit_triggered(side: OrderSide, limit_price: float, latest_price: float) -> bool:
+    """Whether ``latest_price`` crosses a resting limit order."""
+    if side == OrderSide.BUY:
+        return latest_price <= limit_price
+    return latest_price >= limit_price
+
+
+def is_trigger_hit(order_type: OrderType, side: OrderSide, trigger_price: float, latest_price: float) -> bool:
+    """Whether ``latest_price`` fires a stop-loss / take-profit order."""
+    if order_type == OrderType.STOP_LOSS:
+        if side == OrderSide.SELL:
+            return latest_price <= trigger_price
+        return latest_price >= trigger_price
+    if order_type == OrderType.TAKE_PROFIT:
+        if side == OrderSide.SELL:
+            return latest_price >= trigger_price
+        return latest_price <= trigger_price
+    return False
+
+
+def price_time_priority(orders: Iterable[Order], arrival: Callable[[Order], Any]) -> list[Order]:
+    """Limit queue order: buys high to low, then sells low to high, ties by ``arrival``."""
+    orders = list(orders)
+    buys = sorted(
+        (order for order in orders if order.side == OrderSide.BUY),
+        key=lambda order: (-(order.price if order.price is not None else 0.0), arrival(order)),
+    )
+    sells = sorted(
+        (order for order in orders if order.side == OrderSide.SELL),
+        key=lambda order: (order.price if order.price is not None else 0.0, arrival(order)),
+    )
+    return [*buys, *sells]
+
+
+def buy_freeze_amount(amount: float, order_price: float) -> float:
+    """Quote currency a buy order freezes, and a buy fill of ``amount`` consumes, at ``order_price``."""
+    return amount * order_price
+
+
+def buy_price_improvement_refund(
+    side: OrderSide,
+    limit_price: float,
+    execution_price: float,
+    amount: float,
+) -> float:
+    """Quote currency returned to available when a buy fills below its limit; 0 otherwise."""
+    if side != OrderSide.BUY or execution_price >= limit_price:
+        return 0.0
+    refund = (limit_price - execution_price) * amount
+    return refund if refund > FILL_EPS else 0.0
+
+
+def position_after_buy(
+    amount: float,
+    entry_price: float,
+    fill_amount: float,
+    fill_price: float,
+) -> tuple[float, float]:
+    """``(amount, entry_price)`` of a position after a buy fill."""
+    new_amount = amount + fill_amount
+    if new_amount <= 0:
+        return new_amount, fill_price
+    return new_amount, (amount * entry_price + fill_amount * fill_price) / new_amount
+
+
+def position_after_sell(
+    amount: float,
+    entry_price: float,
+    fill_amount: float,
+    fill_price: float,
+) -> tuple[float, float]:
+    """``(amount, realized_pnl_increment)`` of a position after a sell fill."""
+    return max(amount - fill_amount, 0.0), (fill_price - entry_price) * fill_amount
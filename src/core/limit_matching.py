@@ -8,11 +8,18 @@ from typing import Protocol
 from src.core.account_service import AccountService
 from src.core.database import SQLiteDatabase
 from src.core.enums import OrderSide, OrderStatus, OrderType
-from src.core.execution_cost import ExecutionCostProfile, LiquidityRole
+from src.core.execution_cost import ExecutionCostProfile
+from src.core.fill_rules import (
+    FILL_EPS,
+    buy_price_improvement_refund,
+    is_limit_triggered,
+    price_time_priority,
+    quote_limit_fill,
+)
 from src.core.limit_settlement import LimitOrderSettlement, LimitOrderSettlementError
 from src.core.order import Order
 from src.core.order_service import CreateOrderRequest, OrderService, OrderServiceError
-from src.core.risk import RiskControl, RiskControlError, RiskLimits
+from src.core.risk import RiskControl, RiskControlError, RiskLimits, SQLitePortfolio
 from src.core.trade import Trade
 from src.core.trade_service import CreateTradeRequest, TradeService, TradeServiceError
 from src.data.realtime_payloads import RealtimeMarketSnapshot
@@ -74,7 +81,7 @@ class LimitOrderMatchingEngine:
         self._market_reader = market_reader
         self._settlement = LimitOrderSettlement(account_service)
         self._cost_profile = cost_profile or ExecutionCostProfile()
-        self._risk_control = RiskControl(database, account_service, limits=risk_limits)
+        self._risk_control = RiskControl(SQLitePortfolio(database, account_service), limits=risk_limits)
 
     def place_limit_order(self, request: LimitOrderRequest) -> Order:
         """Create one limit order and move it into OPEN queue state."""
@@ -131,28 +138,24 @@ class LimitOrderMatchingEngine:
         with self._db.transaction() as tx:
             queue = self._load_open_limit_orders(tx, symbol_filter)
             for order in queue:
-                if not self._is_price_triggered(order, latest_price):
-                    continue
-                if order.price is None:
+                if order.price is None or not is_limit_triggered(order.side, order.price, latest_price):
                     continue
 
                 remaining_amount = order.amount - order.filled
-                if remaining_amount <= 1e-12:
+                if remaining_amount <= FILL_EPS:
                     continue
 
                 try:
                     base_currency, quote_currency = self._settlement.split_symbol(order.symbol)
-                    reference_price = self._resolve_execution_price(order, latest_price)
-                    execution_price = self._cost_profile.apply_slippage_with_limit(
-                        reference_price=reference_price,
+                    quote = quote_limit_fill(
+                        self._cost_profile,
                         side=order.side,
                         limit_price=order.price,
-                    )
-                    trade_fee = self._cost_profile.calculate_fee(
-                        execution_price=execution_price,
+                        latest_price=latest_price,
                         amount=remaining_amount,
-                        liquidity=LiquidityRole.MAKER,
                     )
+                    execution_price = quote.execution_price
+                    trade_fee = quote.fee
                     if order.side == OrderSide.SELL and not self._settlement.has_sell_capacity(
                         tx=tx,
                         symbol=order.symbol,
@@ -180,13 +183,9 @@ class LimitOrderMatchingEngine:
                         base_currency=base_currency,
                         quote_currency=quote_currency,
                     )
-                    self._apply_buy_price_improvement_refund(
-                        side=order.side,
-                        limit_price=order.price,
-                        execution_price=execution_price,
-                        amount=remaining_amount,
-                        quote_currency=quote_currency,
-                    )
+                    refund = buy_price_improvement_refund(order.side, order.price, execution_price, remaining_amount)
+                    if refund > 0:
+                        self._account_service.add_to_available(quote_currency, refund)
                 except (TradeServiceError, LimitOrderSettlementError) as exc:
                     raise LimitOrderMatchingError(f"failed to process limit order {order.id}: {exc}") from exc
 
@@ -229,32 +228,10 @@ class LimitOrderMatchingEngine:
         rows = tx.execute(query, params).fetchall()
         orders = [Order.validate(dict(row)) for row in rows]
 
-        # Price-time priority queue: buy(high->low), sell(low->high), tie by creation time.
-        buy_orders = sorted(
-            (order for order in orders if order.side == OrderSide.BUY),
-            key=lambda order: (
-                -(order.price if order.price is not None else 0.0),
-                order.created_at if order.created_at is not None else 0,
-                order.id,
-            ),
-        )
-        sell_orders = sorted(
-            (order for order in orders if order.side == OrderSide.SELL),
-            key=lambda order: (
-                order.price if order.price is not None else 0.0,
-                order.created_at if order.created_at is not None else 0,
-                order.id,
-            ),
+        return price_time_priority(
+            orders,
+            lambda order: (order.created_at if order.created_at is not None else 0, order.id),
         )
-        return [*buy_orders, *sell_orders]
-
-    @staticmethod
-    def _is_price_triggered(order: Order, latest_price: float) -> bool:
-        if order.price is None:
-            return False
-        if order.side == OrderSide.BUY:
-            return latest_price <= order.price
-        return latest_price >= order.price
 
     def _resolve_latest_price(self, symbol: str) -> tuple[float, int]:
         try:
@@ -271,28 +248,3 @@ class LimitOrderMatchingEngine:
         if latest_price <= 0:
             raise LimitOrderMatchingError(f"latest price must be > 0 for symbol {symbol}")
         return latest_price, int(snapshot.fetched_at_ms)
-
-    @staticmethod
-    def _resolve_execution_price(order: Order, latest_price: float) -> float:
-        if order.price is None:
-            return latest_price
-        if order.side == OrderSide.BUY:
-            return min(order.price, latest_price)
-        return max(order.price, latest_price)
-
-    def _apply_buy_price_improvement_refund(
-        self,
-        *,
-        side: OrderSide,
-        limit_price: float | None,
-        execution_price: float,
-        amount: float,
-        quote_currency: str,
-    ) -> None:
-        if side != OrderSide.BUY or limit_price is None:
-            return
-        if execution_price >= limit_price:
-            return
-        refund = (limit_price - execution_price) * amount
-        if refund > 1e-12:
-            self._account_service.add_to_available(quote_currency, refund)
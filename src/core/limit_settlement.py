@@ -4,6 +4,7 @@ from __future__ import annotations
 
 from src.core.account_service import AccountService, AccountServiceError
 from src.core.enums import OrderSide
+from src.core.fill_rules import FILL_EPS, position_after_buy, position_after_sell
 from src.core.position import Position
 
 
@@ -30,13 +31,13 @@ class LimitOrderSettlement:
             base_account = self._account_service.get_account(base_currency)
         except AccountServiceError:
             return False
-        if base_account.available + 1e-12 < amount:
+        if base_account.available + FILL_EPS < amount:
             return False
 
         position = self._get_position(tx, symbol)
         if position is None:
             return False
-        return position.amount + 1e-12 >= amount
+        return position.amount + FILL_EPS >= amount
 
     def settle(
         self,
@@ -94,8 +95,7 @@ class LimitOrderSettlement:
             )
             return
 
-        new_amount = position.amount + amount
-        new_entry = ((position.amount * position.entry_price) + (amount * price)) / new_amount
+        new_amount, new_entry = position_after_buy(position.amount, position.entry_price, amount, price)
         unrealized_pnl = (price - new_entry) * new_amount
         tx.execute(
             """
@@ -110,11 +110,10 @@ class LimitOrderSettlement:
         position = self._get_position(tx, symbol)
         if position is None:
             raise LimitOrderSettlementError(f"position not found for symbol {symbol}")
-        if position.amount + 1e-12 < amount:
+        if position.amount + FILL_EPS < amount:
             raise LimitOrderSettlementError(f"insufficient position amount for symbol {symbol}")
 
-        new_amount = max(position.amount - amount, 0.0)
-        realized_increment = (price - position.entry_price) * amount
+        new_amount, realized_increment = position_after_sell(position.amount, position.entry_price, amount, price)
         realized_pnl = position.realized_pnl + realized_increment
         unrealized_pnl = (price - position.entry_price) * new_amount
 
@@ -0,0 +1,135 @@
+"""Paced incremental vacuum and planner-statistics maintenance for SQLite."""
+
+from __future__ import annotations
+
+import sqlite3
+import time
+from collections.abc import Callable
+from dataclasses import dataclass
+from pathlib import Path
+
+from src.core.database import DatabaseLifecycleError, SQLiteDatabase
+
+AUTO_VACUUM_MODES = {0: "none", 1: "full", 2: "incremental"}
+DEFAULT_VACUUM_STEP_PAGES = 1_000
+
+
+@dataclass(frozen=True)
+class IncrementalVacuumResult:
+    auto_vacuum: str
+    freed_pages: int
+    steps: int
+    page_size: int
+    size_bytes_before: int
+    size_bytes_after: int
+    max_lock_seconds: float
+
+    @property
+    def reclaimed_bytes(self) -> int:
+        return max(self.size_bytes_before - self.size_bytes_after, 0)
+
+
+@dataclass(frozen=True)
+class OptimizeResult:
+    analyzed: bool
+    elapsed_seconds: float
+
+
+def auto_vacuum_mode(conn: sqlite3.Connection) -> str:
+    return AUTO_VACUUM_MODES.get(int(conn.execute("PRAGMA auto_vacuum;").fetchone()[0]), "none")
+
+
+def free_page_count(conn: sqlite3.Connection) -> int:
+    return int(conn.execute("PRAGMA freelist_count;").fetchone()[0])
+
+
+def database_size_bytes(database: SQLiteDatabase) -> int:
+    """On-disk size of the main file plus its WAL (0 for in-memory databases)."""
+    path = Path(database.database_path)
+    return sum(
+        candidate.stat().st_size
+        for candidate in (path, path.with_name(path.name + "-wal"))
+        if candidate.exists()
+    )
+
+
+def incremental_vacuum(
+    database: SQLiteDatabase,
+    *,
+    step_pages: int = DEFAULT_VACUUM_STEP_PAGES,
+    pause_seconds: float = 0.0,
+    max_steps: int | None = None,
+    sleep_fn: Callable[[float], None] = time.sleep,
+) -> IncrementalVacuumResult:
+    """Return free pages to the OS ``step_pages`` at a time.
+
+    Each step is its own short write transaction, and the loop sleeps
+    ``pause_seconds`` between steps so other writers can take the lock.
+    Databases created before ``auto_vacuum=INCREMENTAL`` was enabled report
+    ``auto_vacuum='none'`` and free nothing until converted with a full VACUUM.
+    """
+    if step_pages <= 0:
+        raise DatabaseLifecycleError("step_pages must be > 0")
+    connection = database.open()
+    if connection.in_transaction:
+        raise DatabaseLifecycleError("incremental vacuum cannot run inside a transaction")
+    mode = auto_vacuum_mode(connection)
+    page_size = int(connection.execute("PRAGMA page_size;").fetchone()[0])
+    size_before = database_size_bytes(database)
+    freed = steps = 0
+    max_lock = 0.0
+    if mode == "incremental":
+        remaining = free_page_count(connection)
+        while remaining > 0 and (max_steps is None or steps < max_steps):
+            if steps:
+                sleep_fn(pause_seconds)
+            started = time.perf_counter()
+            # executescript steps the pragma to completion; a plain execute()
+            # stops after the first page.
+            connection.executescript(f"PRAGMA incremental_vacuum({int(step_pages)});")
+            max_lock = max(max_lock, time.perf_counter() - started)
+            after = free_page_count(connection)
+            if after >= remaining:
+                break
+            freed += remaining - after
+            remaining = after
+            steps += 1
+        if freed and database.journal_mode == "wal":
+            connection.execute("PRAGMA wal_checkpoint(TRUNCATE);")
+    return IncrementalVacuumResult(
+        auto_vacuum=mode,
+        freed_pages=freed,
+        steps=steps,
+        page_size=page_size,
+        size_bytes_before=size_before,
+        size_bytes_after=database_size_bytes(database),
+        max_lock_seconds=max_lock,
+    )
+
+
+def enable_incremental_auto_vacuum(database: SQLiteDatabase) -> bool:
+    """Switch an existing file to ``auto_vacuum=INCREMENTAL``; returns False if already set.
+
+    The mode only takes effect through a full VACUUM, which rewrites the file
+    and holds the write lock for its whole duration.
+    """
+    connection = database.open()
+    if auto_vacuum_mode(connection) == "incremental":
+        return False
+    connection.execute("PRAGMA auto_vacuum = INCREMENTAL;")
+    connection.execute("VACUUM;")
+    if database.journal_mode == "wal":
+        connection.execute("PRAGMA wal_checkpoint(TRUNCATE);")
+    return True
+
+
+def optimize_database(database: SQLiteDatabase, *, analyze: bool = False) -> OptimizeResult:
+    """Refresh planner statistics: full ``ANALYZE`` on request, then ``PRAGMA optimize``."""
+    connection = database.open()
+    started = time.perf_counter()
+    if analyze:
+        connection.execute("ANALYZE;")
+    connection.execute("PRAGMA optimize;").fetchall()
+    if connection.in_transaction:
+        connection.commit()
+    return OptimizeResult(analyzed=analyze, elapsed_seconds=time.perf_counter() - started)
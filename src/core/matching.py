@@ -8,11 +8,12 @@ from typing import Protocol
 from src.core.account_service import AccountService, AccountServiceError
 from src.core.database import SQLiteDatabase
 from src.core.enums import OrderSide, OrderStatus, OrderType
-from src.core.execution_cost import ExecutionCostProfile, LiquidityRole
+from src.core.execution_cost import ExecutionCostProfile
+from src.core.fill_rules import FILL_EPS, position_after_buy, position_after_sell, quote_market_fill
 from src.core.order import Order
 from src.core.order_service import CreateOrderRequest, OrderService, OrderServiceError
 from src.core.position import Position
-from src.core.risk import RiskControl, RiskControlError, RiskLimits
+from src.core.risk import RiskControl, RiskControlError, RiskLimits, SQLitePortfolio
 from src.core.trade import Trade
 from src.core.trade_service import CreateTradeRequest, TradeService, TradeServiceError
 from src.data.realtime_payloads import RealtimeMarketSnapshot
@@ -62,7 +63,7 @@ class MatchingEngine:
         self._trade_service = trade_service
         self._market_reader = market_reader
         self._cost_profile = cost_profile or ExecutionCostProfile()
-        self._risk_control = RiskControl(database, account_service, limits=risk_limits)
+        self._risk_control = RiskControl(SQLitePortfolio(database, account_service), limits=risk_limits)
 
     def execute_market_order(self, request: MarketOrderRequest) -> MarketOrderMatchResult:
         """Execute one market order using latest price."""
@@ -74,15 +75,14 @@ class MatchingEngine:
 
         base_currency, quote_currency = self._split_symbol(symbol)
         reference_price, matched_at_ms = self._resolve_latest_price(symbol)
-        execution_price = self._cost_profile.apply_slippage(
-            reference_price=reference_price,
+        quote = quote_market_fill(
+            self._cost_profile,
             side=request.side,
-        )
-        trade_fee = self._cost_profile.calculate_fee(
-            execution_price=execution_price,
+            reference_price=reference_price,
             amount=request.amount,
-            liquidity=LiquidityRole.TAKER,
         )
+        execution_price = quote.execution_price
+        trade_fee = quote.fee
         try:
             self._risk_control.check_pre_order(symbol=symbol, side=request.side, amount=request.amount, reference_price=execution_price)
         except RiskControlError as exc:
@@ -202,12 +202,7 @@ class MatchingEngine:
                 )
             return
 
-        new_amount = position.amount + fill_amount
-        new_entry = (
-            ((position.amount * position.entry_price) + (fill_amount * fill_price)) / new_amount
-            if new_amount > 0
-            else fill_price
-        )
+        new_amount, new_entry = position_after_buy(position.amount, position.entry_price, fill_amount, fill_price)
         unrealized_pnl = (fill_price - new_entry) * new_amount
         with self._db.transaction() as tx:
             tx.execute(
@@ -229,11 +224,12 @@ class MatchingEngine:
         position = self._get_position(symbol)
         if position is None:
             raise MatchingEngineError(f"position not found for symbol {symbol}")
-        if position.amount + 1e-12 < fill_amount:
+        if position.amount + FILL_EPS < fill_amount:
             raise MatchingEngineError(f"insufficient position amount for symbol {symbol}")
 
-        new_amount = max(position.amount - fill_amount, 0.0)
-        realized_increment = (fill_price - position.entry_price) * fill_amount
+        new_amount, realized_increment = position_after_sell(
+            position.amount, position.entry_price, fill_amount, fill_price
+        )
         realized_pnl = position.realized_pnl + realized_increment
         unrealized_pnl = (fill_price - position.entry_price) * new_amount
 
@@ -253,13 +249,13 @@ class MatchingEngine:
         except AccountServiceError as exc:
             raise MatchingEngineError(f"missing base account for sell order: {exc}") from exc
 
-        if base_account.available + 1e-12 < amount:
+        if base_account.available + FILL_EPS < amount:
             raise MatchingEngineError("insufficient base asset balance for sell market order")
 
         position = self._get_position(symbol)
         if position is None:
             raise MatchingEngineError(f"position not found for symbol {symbol}")
-        if position.amount + 1e-12 < amount:
+        if position.amount + FILL_EPS < amount:
             raise MatchingEngineError(f"insufficient position amount for symbol {symbol}")
 
     def _ensure_account_exists(self, currency: str) -> None:
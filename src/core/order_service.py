@@ -11,6 +11,7 @@ from typing import Sequence
 from src.core.account_service import AccountService
 from src.core.database import SQLiteDatabase
 from src.core.enums import OrderSide, OrderStatus, OrderType
+from src.core.fill_rules import buy_freeze_amount
 from src.core.order import Order
 
 
@@ -83,9 +84,9 @@ class OrderService:
                         raise OrderServiceError(
                             "price must be provided for market buy orders in simulation"
                         )
-                    required_funds = request.amount * request.price
+                    required_funds = buy_freeze_amount(request.amount, request.price)
                 else:
-                    required_funds = request.amount * request.price  # type: ignore
+                    required_funds = buy_freeze_amount(request.amount, request.price)  # type: ignore[arg-type]
 
                 # Extract base currency from symbol (e.g., BTC/USDT -> USDT)
                 base_currency = self._extract_quote_currency(request.symbol)
@@ -172,8 +173,8 @@ class OrderService:
             query += " LIMIT ?"
             params.append(limit)
 
-        with self._db.transaction() as tx:
-            rows = tx.execute(query, params).fetchall()
+        with self._db.read() as conn:
+            rows = conn.execute(query, params).fetchall()
 
         return [Order.validate(dict(row)) for row in rows]
 
@@ -228,7 +229,7 @@ class OrderService:
                 if unfilled_amount > 0:
                     if order.price is None:
                         raise OrderServiceError("cannot release funds: order price is None")
-                    frozen_funds = unfilled_amount * order.price
+                    frozen_funds = buy_freeze_amount(unfilled_amount, order.price)
                     base_currency = self._extract_quote_currency(order.symbol)
                     try:
                         self._account_service.release_funds(base_currency, frozen_funds)
@@ -240,7 +241,7 @@ class OrderService:
                 filled_delta = new_filled - order.filled
                 if order.price is None:
                     raise OrderServiceError("cannot consume funds: order price is None")
-                funds_to_consume = filled_delta * order.price
+                funds_to_consume = buy_freeze_amount(filled_delta, order.price)
                 base_currency = self._extract_quote_currency(order.symbol)
                 try:
                     self._consume_frozen_funds(tx, base_currency, funds_to_consume)
@@ -291,7 +292,7 @@ class OrderService:
                 if unfilled_amount > 0:
                     if order.price is None:
                         raise OrderServiceError("cannot release funds: order price is None")
-                    frozen_funds = unfilled_amount * order.price
+                    frozen_funds = buy_freeze_amount(unfilled_amount, order.price)
                     base_currency = self._extract_quote_currency(order.symbol)
                     try:
                         self._account_service.release_funds(base_currency, frozen_funds)
@@ -3,7 +3,7 @@
 from __future__ import annotations
 
 from dataclasses import dataclass
-from typing import Any, Mapping
+from typing import Any, Mapping, Protocol
 
 from src.core.account_service import AccountService, AccountServiceError
 from src.core.database import SQLiteDatabase
@@ -57,17 +57,79 @@ class RiskCheckSnapshot:
     projected_total_position_ratio: float
 
 
+@dataclass(frozen=True)
+class PortfolioMetrics:
+    """Cash and position values a risk check is evaluated against."""
+
+    base_cash: float
+    total_assets: float
+    positions_value: float
+    cost_basis_value: float
+
+
+class PortfolioSource(Protocol):
+    """Interface required by :class:`RiskControl` to value the portfolio."""
+
+    def portfolio_metrics(self, price_overrides: Mapping[str, float]) -> PortfolioMetrics:
+        ...
+
+
+class SQLitePortfolio:
+    """Portfolio values read from the ``accounts`` and ``positions`` tables."""
+
+    def __init__(self, database: SQLiteDatabase, account_service: AccountService) -> None:
+        self._db = database
+        self._account_service = account_service
+
+    def portfolio_metrics(self, price_overrides: Mapping[str, float]) -> PortfolioMetrics:
+        base_cash = self._read_base_cash()
+        current_positions_value = 0.0
+        cost_basis_value = 0.0
+
+        with self._db.read() as conn:
+            rows = conn.execute(
+                """
+                SELECT symbol, amount, entry_price, current_price
+                FROM positions;
+                """
+            ).fetchall()
+
+        for row in rows:
+            amount = float(row["amount"])
+            if amount <= _EPS:
+                continue
+
+            symbol = str(row["symbol"])
+            entry_price = float(row["entry_price"])
+            reference_price = resolve_reference_price(
+                symbol=symbol,
+                entry_price=entry_price,
+                current_price=row["current_price"],
+                price_overrides=price_overrides,
+            )
+            current_positions_value += amount * reference_price
+            cost_basis_value += amount * entry_price
+
+        total_assets = base_cash + current_positions_value
+        return PortfolioMetrics(base_cash, total_assets, current_positions_value, cost_basis_value)
+
+    def _read_base_cash(self) -> float:
+        try:
+            base_account = self._account_service.get_account(self._account_service.base_currency)
+        except AccountServiceError:
+            return 0.0
+        return float(base_account.available + base_account.frozen)
+
+
 class RiskControl:
     """Evaluate single-order, total-position, and drawdown constraints."""
 
     def __init__(
         self,
-        database: SQLiteDatabase,
-        account_service: AccountService,
+        portfolio: PortfolioSource,
         limits: RiskLimits | None = None,
     ) -> None:
-        self._db = database
-        self._account_service = account_service
+        self._portfolio = portfolio
         self._limits = limits or RiskLimits.from_config(DEFAULT_CONFIG)
         self._peak_equity: float | None = None
         self._logger = get_logger("trade")
@@ -88,12 +150,11 @@ class RiskControl:
         if reference_price <= 0:
             raise RiskControlError("reference_price must be > 0")
 
-        (
-            base_cash,
-            total_assets,
-            current_positions_value,
-            cost_basis_value,
-        ) = self._portfolio_metrics({normalized_symbol: reference_price})
+        metrics = self._portfolio.portfolio_metrics({normalized_symbol: reference_price})
+        base_cash = metrics.base_cash
+        total_assets = metrics.total_assets
+        current_positions_value = metrics.positions_value
+        cost_basis_value = metrics.cost_basis_value
 
         if total_assets <= _EPS:
             self._reject(
@@ -162,48 +223,6 @@ class RiskControl:
             projected_total_position_ratio=projected_total_position_ratio,
         )
 
-    def _portfolio_metrics(
-        self,
-        price_overrides: Mapping[str, float],
-    ) -> tuple[float, float, float, float]:
-        base_cash = self._read_base_cash()
-        current_positions_value = 0.0
-        cost_basis_value = 0.0
-
-        with self._db.transaction() as tx:
-            rows = tx.execute(
-                """
-                SELECT symbol, amount, entry_price, current_price
-                FROM positions;
-                """
-            ).fetchall()
-
-        for row in rows:
-            amount = float(row["amount"])
-            if amount <= _EPS:
-                continue
-
-            symbol = str(row["symbol"])
-            entry_price = float(row["entry_price"])
-            reference_price = _resolve_reference_price(
-                symbol=symbol,
-                entry_price=entry_price,
-                current_price=row["current_price"],
-                price_overrides=price_overrides,
-            )
-            current_positions_value += amount * reference_price
-            cost_basis_value += amount * entry_price
-
-        total_assets = base_cash + current_positions_value
-        return base_cash, total_assets, current_positions_value, cost_basis_value
-
-    def _read_base_cash(self) -> float:
-        try:
-            base_account = self._account_service.get_account(self._account_service.base_currency)
-        except AccountServiceError:
-            return 0.0
-        return float(base_account.available + base_account.frozen)
-
     def _update_peak_equity(
         self,
         *,
@@ -264,13 +283,14 @@ def _as_non_negative_ratio(values: Mapping[str, Any], key: str) -> float:
     return parsed
 
 
-def _resolve_reference_price(
+def resolve_reference_price(
     *,
     symbol: str,
     entry_price: float,
     current_price: object,
     price_overrides: Mapping[str, float],
 ) -> float:
+    """Override, else a positive ``current_price``, else ``entry_price`` for valuing a position."""
     if symbol in price_overrides:
         override = float(price_overrides[symbol])
         if override <= 0:
@@ -8,11 +8,12 @@ from typing import Protocol
 from src.core.account_service import AccountService
 from src.core.database import SQLiteDatabase
 from src.core.enums import OrderSide, OrderStatus, OrderType
-from src.core.execution_cost import ExecutionCostProfile, LiquidityRole
+from src.core.execution_cost import ExecutionCostProfile
+from src.core.fill_rules import FILL_EPS, is_trigger_hit, quote_trigger_fill
 from src.core.limit_settlement import LimitOrderSettlement, LimitOrderSettlementError
 from src.core.order import Order
 from src.core.order_service import CreateOrderRequest, OrderService, OrderServiceError
-from src.core.risk import RiskControl, RiskControlError, RiskLimits
+from src.core.risk import RiskControl, RiskControlError, RiskLimits, SQLitePortfolio
 from src.core.trade import Trade
 from src.core.trade_service import CreateTradeRequest, TradeService, TradeServiceError
 from src.data.realtime_payloads import RealtimeMarketSnapshot
@@ -80,7 +81,7 @@ class StopTriggerEngine:
         self._market_reader = market_reader
         self._settlement = LimitOrderSettlement(account_service)
         self._cost_profile = cost_profile or ExecutionCostProfile()
-        self._risk_control = RiskControl(database, account_service, limits=risk_limits)
+        self._risk_control = RiskControl(SQLitePortfolio(database, account_service), limits=risk_limits)
 
     def place_trigger_order(self, request: TriggerOrderRequest) -> Order:
         """Create one trigger order and move it into OPEN state."""
@@ -139,13 +140,11 @@ class StopTriggerEngine:
         with self._db.transaction() as tx:
             queue = self._load_open_trigger_orders(tx, symbol_filter)
             for order in queue:
-                if not self._is_triggered(order, latest_price):
-                    continue
-                if order.price is None:
+                if order.price is None or not is_trigger_hit(order.type, order.side, order.price, latest_price):
                     continue
 
                 remaining_amount = order.amount - order.filled
-                if remaining_amount <= 1e-12:
+                if remaining_amount <= FILL_EPS:
                     continue
 
                 try:
@@ -158,15 +157,14 @@ class StopTriggerEngine:
                     ):
                         continue
 
-                    execution_price = self._cost_profile.apply_slippage(
-                        reference_price=order.price,
+                    quote = quote_trigger_fill(
+                        self._cost_profile,
                         side=order.side,
-                    )
-                    trade_fee = self._cost_profile.calculate_fee(
-                        execution_price=execution_price,
+                        trigger_price=order.price,
                         amount=remaining_amount,
-                        liquidity=LiquidityRole.TAKER,
                     )
+                    execution_price = quote.execution_price
+                    trade_fee = quote.fee
                     trade = self._trade_service.record_trade(
                         CreateTradeRequest(
                             order_id=order.id,
@@ -227,20 +225,6 @@ class StopTriggerEngine:
         ).fetchall()
         return [Order.validate(dict(row)) for row in rows]
 
-    @staticmethod
-    def _is_triggered(order: Order, latest_price: float) -> bool:
-        if order.price is None:
-            return False
-        if order.type == OrderType.STOP_LOSS:
-            if order.side == OrderSide.SELL:
-                return latest_price <= order.price
-            return latest_price >= order.price
-        if order.type == OrderType.TAKE_PROFIT:
-            if order.side == OrderSide.SELL:
-                return latest_price >= order.price
-            return latest_price <= order.price
-        return False
-
     def _resolve_latest_price(self, symbol: str) -> tuple[float, int]:
         try:
             snapshot = self._market_reader.get_latest_price(symbol)
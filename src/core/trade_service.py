@@ -8,6 +8,7 @@ from typing import Sequence
 
 from src.core.database import SQLiteDatabase
 from src.core.enums import OrderSide, OrderStatus
+from src.core.fill_rules import buy_freeze_amount
 from src.core.order_service import OrderService
 from src.core.order_state_machine import can_transition
 from src.core.trade import Trade
@@ -97,7 +98,7 @@ class TradeService:
             if order.side == OrderSide.BUY:
                 if order.price is None:
                     raise TradeServiceError("order price is required to consume funds")
-                funds_to_consume = request.amount * order.price
+                funds_to_consume = buy_freeze_amount(request.amount, order.price)
                 base_currency = self._order_service._extract_quote_currency(order.symbol)  # noqa: SLF001
                 self._order_service._consume_frozen_funds(tx, base_currency, funds_to_consume)  # noqa: SLF001
 
@@ -1,10 +1,20 @@
 """Data-layer exports."""
 
-from src.data.feed import BacktestDataSlice, SQLiteFeedError, SQLitePandasFeedFactory
+from src.data.columnar_store import ColumnarCandleStore, ColumnarStoreError, ColumnarSyncResult
+from src.data.feed import (
+    BacktestDataSlice,
+    ColumnarPandasFeedFactory,
+    SQLiteFeedError,
+    SQLitePandasFeedFactory,
+)
 from src.data.realtime_market import RealtimeMarketDataService, RealtimeMarketSnapshot
 
 __all__ = [
     "BacktestDataSlice",
+    "ColumnarCandleStore",
+    "ColumnarPandasFeedFactory",
+    "ColumnarStoreError",
+    "ColumnarSyncResult",
     "RealtimeMarketDataService",
     "RealtimeMarketSnapshot",
     "SQLiteFeedError",
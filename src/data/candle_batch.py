@@ -0,0 +1,227 @@
+"""Column-oriented candle batches and vectorized OHLCV validation."""
+
+from __future__ import annotations
+
+from collections.abc import Iterator, Sequence
+from dataclasses import dataclass
+from typing import Any
+
+import numpy as np
+
+from src.data.storage_types import HistoricalDataStorageError, RejectedCandleRow
+
+CandleInsertRow = tuple[str, str, int, float, float, float, float, float]
+
+# Checked in order; a row is reported with the first rule it breaks, which
+# mirrors the messages ``Candle.validate`` raises for a single row.
+_RULES: tuple[tuple[str, str], ...] = (
+    ("non_finite", "values must be finite numbers"),
+    ("negative_timestamp", "timestamp must be >= 0"),
+    ("non_positive_price", "open/high/low/close must be > 0"),
+    ("negative_volume", "volume must be >= 0"),
+    ("high_below_low", "high must be >= low"),
+    ("open_outside_range", "open must be between low and high"),
+    ("close_outside_range", "close must be between low and high"),
+)
+
+
+@dataclass(frozen=True)
+class CandleBatch:
+    """One chunk of stored candles as parallel NumPy columns (timestamp ascending)."""
+
+    symbol: str
+    timeframe: str
+    timestamp: np.ndarray
+    open: np.ndarray
+    high: np.ndarray
+    low: np.ndarray
+    close: np.ndarray
+    volume: np.ndarray
+
+    def __len__(self) -> int:
+        return int(self.timestamp.shape[0])
+
+    @classmethod
+    def from_rows(cls, rows: Sequence[Sequence[Any]], *, symbol: str, timeframe: str) -> "CandleBatch":
+        """Build a batch from ``(timestamp, open, high, low, close, volume)`` tuples."""
+        values = np.asarray(rows, dtype=np.float64).reshape(-1, 6)
+        return cls(
+            symbol=symbol,
+            timeframe=timeframe,
+            timestamp=values[:, 0].astype(np.int64),
+            open=np.ascontiguousarray(values[:, 1]),
+            high=np.ascontiguousarray(values[:, 2]),
+            low=np.ascontiguousarray(values[:, 3]),
+            close=np.ascontiguousarray(values[:, 4]),
+            volume=np.ascontiguousarray(values[:, 5]),
+        )
+
+    @classmethod
+    def concat(cls, batches: Sequence["CandleBatch"]) -> "CandleBatch":
+        """Join consecutive batches of one dataset into a single batch."""
+        if len(batches) == 1:
+            return batches[0]
+        return cls(
+            symbol=batches[0].symbol,
+            timeframe=batches[0].timeframe,
+            **{
+                name: np.concatenate([getattr(batch, name) for batch in batches])
+                for name in ("timestamp", "open", "high", "low", "close", "volume")
+            },
+        )
+
+    def chunks(self, chunk_rows: int) -> Iterator["CandleBatch"]:
+        """Yield consecutive views of at most ``chunk_rows`` rows (no copies)."""
+        for offset in range(0, len(self), chunk_rows):
+            yield CandleBatch(
+                symbol=self.symbol,
+                timeframe=self.timeframe,
+                **{
+                    name: getattr(self, name)[offset : offset + chunk_rows]
+                    for name in ("timestamp", "open", "high", "low", "close", "volume")
+                },
+            )
+
+    def first_invalid_row(self) -> tuple[int, str] | None:
+        """Return ``(position, reason)`` of the first row breaking an OHLCV invariant."""
+        values = np.column_stack(
+            (self.timestamp, self.open, self.high, self.low, self.close, self.volume)
+        ).astype(np.float64, copy=False)
+        reasons = _rule_violations(values, self.timestamp, np.ones(len(self), dtype=bool))
+        bad = np.flatnonzero(reasons >= 0)
+        if bad.size == 0:
+            return None
+        return int(bad[0]), _RULES[int(reasons[bad[0]])][1]
+
+
+@dataclass(frozen=True)
+class ValidatedCandlePage:
+    """Validated, timestamp-sorted rows ready for ``executemany`` plus the error report."""
+
+    rows: list[CandleInsertRow]
+    rejected: tuple[RejectedCandleRow, ...]
+    out_of_range_count: int = 0
+    duplicate_count: int = 0
+    reordered: bool = False
+
+    @property
+    def accepted_count(self) -> int:
+        return len(self.rows)
+
+    @property
+    def rejected_count(self) -> int:
+        return len(self.rejected)
+
+
+def validate_ohlcv_batch(
+    rows: Sequence[Sequence[Any]],
+    *,
+    symbol: str,
+    timeframe: str,
+    start_timestamp: int | None = None,
+    end_timestamp: int | None = None,
+) -> ValidatedCandlePage:
+    """Validate a whole page of ``[timestamp, open, high, low, close, volume]`` rows at once.
+
+    Rows outside ``[start_timestamp, end_timestamp]`` are dropped silently (the
+    exchange pages past the requested window); rows breaking an OHLCV invariant
+    are returned in ``rejected`` instead of raising. Accepted rows are sorted by
+    timestamp and de-duplicated (first occurrence wins), and come back as plain
+    tuples so they can be handed straight to ``executemany``.
+    """
+    if len(rows) == 0:
+        return ValidatedCandlePage(rows=[], rejected=())
+
+    values = _to_matrix(rows)
+    finite = np.isfinite(values).all(axis=1)
+    # NaN timestamps are caught by ``finite``; zero them so the cast is defined.
+    timestamps = np.where(np.isfinite(values[:, 0]), values[:, 0], 0.0).astype(np.int64)
+
+    in_range = np.ones(len(values), dtype=bool)
+    if start_timestamp is not None:
+        in_range &= timestamps >= start_timestamp
+    if end_timestamp is not None:
+        in_range &= timestamps <= end_timestamp
+    # Broken timestamps are reported even though they cannot be range-checked.
+    in_range |= ~finite
+
+    reasons = _rule_violations(values, timestamps, in_range)
+
+    rejected_positions = np.flatnonzero(reasons >= 0)
+    rejected = tuple(
+        RejectedCandleRow(
+            index=int(position),
+            timestamp=int(timestamps[position]) if finite[position] else None,
+            reason=_RULES[int(reasons[position])][1],
+        )
+        for position in rejected_positions
+    )
+
+    accepted = np.flatnonzero(in_range & (reasons < 0))
+    out_of_range_count = int(len(values) - np.count_nonzero(in_range))
+    accepted_timestamps = timestamps[accepted]
+    reordered = bool(accepted.size > 1 and np.any(np.diff(accepted_timestamps) < 0))
+    if reordered:
+        order = np.argsort(accepted_timestamps, kind="stable")
+        accepted = accepted[order]
+        accepted_timestamps = accepted_timestamps[order]
+    keep = np.ones(accepted.size, dtype=bool)
+    if accepted.size > 1:
+        keep[1:] = np.diff(accepted_timestamps) != 0
+    duplicate_count = int(accepted.size - np.count_nonzero(keep))
+    accepted = accepted[keep]
+
+    prices = values[accepted, 1:6].tolist()
+    payload: list[CandleInsertRow] = [
+        (symbol, timeframe, ts, o, h, lo, c, v)
+        for ts, (o, h, lo, c, v) in zip(timestamps[accepted].tolist(), prices)
+    ]
+    return ValidatedCandlePage(
+        rows=payload,
+        rejected=rejected,
+        out_of_range_count=out_of_range_count,
+        duplicate_count=duplicate_count,
+        reordered=reordered,
+    )
+
+
+def _rule_violations(values: np.ndarray, timestamps: np.ndarray, mask: np.ndarray) -> np.ndarray:
+    """Index into ``_RULES`` of the first broken rule per row (``-1`` when valid or unmasked)."""
+    finite = np.isfinite(values).all(axis=1)
+    open_, high, low, close, volume = (values[:, column] for column in range(1, 6))
+    with np.errstate(invalid="ignore"):
+        failures = {
+            "non_finite": ~finite,
+            "negative_timestamp": timestamps < 0,
+            "non_positive_price": (open_ <= 0) | (high <= 0) | (low <= 0) | (close <= 0),
+            "negative_volume": volume < 0,
+            "high_below_low": high < low,
+            "open_outside_range": (open_ < low) | (open_ > high),
+            "close_outside_range": (close < low) | (close > high),
+        }
+    reasons = np.full(len(values), -1, dtype=np.int8)
+    for rule_index, (name, _message) in enumerate(_RULES):
+        reasons[(reasons < 0) & failures[name] & mask] = rule_index
+    return reasons
+
+
+def _to_matrix(rows: Sequence[Sequence[Any]]) -> np.ndarray:
+    try:
+        values = np.asarray(rows, dtype=np.float64)
+    except (TypeError, ValueError):
+        values = None
+    if values is not None and values.ndim == 2 and values.shape[1] >= 6:
+        return values[:, :6]
+
+    # Ragged page or unparsable cells: fall back to a per-row conversion that
+    # turns bad cells into NaN (reported as non-finite) and rejects bad shapes.
+    matrix = np.empty((len(rows), 6), dtype=np.float64)
+    for position, row in enumerate(rows):
+        if not isinstance(row, (list, tuple)) or len(row) < 6:
+            raise HistoricalDataStorageError("invalid OHLCV row: expected 6 values")
+        for column in range(6):
+            try:
+                matrix[position, column] = float(row[column])
+            except (TypeError, ValueError):
+                matrix[position, column] = np.nan
+    return matrix
@@ -0,0 +1,228 @@
+"""Streaming CSV / Parquet / Arrow IPC candle export with bounded memory.
+
+Candles are read as ``fetchmany`` column batches and handed straight to a
+format writer, so only one chunk is ever held in memory. Arrow IPC files are
+written uncompressed by default, one record batch per chunk. Exports are for
+external tools (pandas, DuckDB, notebooks): no backtest data source reads them,
+and ``load_arrow_columns`` is only a convenience loader for such analysis.
+"""
+
+from __future__ import annotations
+
+import csv
+import gzip
+import time
+from collections.abc import Iterable
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any, TextIO
+
+import numpy as np
+
+try:
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+except Exception:  # pragma: no cover - optional dependency; CSV export works without it.
+    pa = None  # type: ignore[assignment]
+    pq = None  # type: ignore[assignment]
+
+from src.data.candle_batch import CandleBatch
+from src.data.candle_import import detect_import_format
+from src.data.columnar_store import COLUMN_DTYPES, ColumnarCandleColumns
+from src.data.storage import HistoricalCandleStorage
+from src.data.storage_types import HistoricalDataStorageError
+
+EXPORT_FORMATS = ("csv", "parquet", "arrow")
+EXPORT_COLUMNS = ("symbol", "timeframe", "timestamp", "open", "high", "low", "close", "volume")
+DEFAULT_EXPORT_CHUNK_ROWS = 100_000
+# First entry is the default; "none" writes uncompressed output.
+EXPORT_COMPRESSIONS: dict[str, tuple[str, ...]] = {
+    "csv": ("none", "gzip"),
+    "parquet": ("zstd", "snappy", "gzip", "lz4", "none"),
+    "arrow": ("none", "zstd", "lz4"),
+}
+
+
+class CandleExportError(HistoricalDataStorageError):
+    """Raised when an export format/compression is unsupported or the file cannot be written."""
+
+
+@dataclass(frozen=True)
+class CandleExportResult:
+    path: Path
+    file_format: str
+    compression: str
+    chunks: int
+    rows: int
+    bytes_written: int
+    elapsed_seconds: float
+
+    @property
+    def rows_per_second(self) -> float:
+        return self.rows / self.elapsed_seconds if self.elapsed_seconds > 0 else 0.0
+
+
+class StreamingCandleExporter:
+    """Write one stored dataset to disk chunk by chunk."""
+
+    def __init__(
+        self,
+        storage: HistoricalCandleStorage,
+        *,
+        chunk_rows: int = DEFAULT_EXPORT_CHUNK_ROWS,
+    ) -> None:
+        if chunk_rows <= 0:
+            raise CandleExportError("chunk_rows must be > 0")
+        self._storage = storage
+        self._chunk_rows = chunk_rows
+
+    def run(
+        self,
+        output: str | Path,
+        *,
+        symbol: str,
+        timeframe: str,
+        start_timestamp: int | None = None,
+        end_timestamp: int | None = None,
+        file_format: str | None = None,
+        compression: str | None = None,
+    ) -> CandleExportResult:
+        target = Path(output)
+        resolved_format = file_format or detect_import_format(target)
+        if resolved_format not in EXPORT_FORMATS:
+            raise CandleExportError(f"format must be one of {list(EXPORT_FORMATS)}")
+        allowed = EXPORT_COMPRESSIONS[resolved_format]
+        resolved_compression = compression or allowed[0]
+        if resolved_compression not in allowed:
+            raise CandleExportError(
+                f"compression for {resolved_format} must be one of {list(allowed)}"
+            )
+        if resolved_format != "csv" and pa is None:
+            raise CandleExportError(f"pyarrow is required to export {resolved_format} files")
+
+        batches = self._storage.query_candle_batches(
+            symbol,
+            timeframe,
+            start_timestamp,
+            end_timestamp,
+            chunk_rows=self._chunk_rows,
+            trusted=True,
+        )
+        started = time.perf_counter()
+        target.parent.mkdir(parents=True, exist_ok=True)
+        try:
+            if resolved_format == "csv":
+                chunks, rows = _write_csv(target, batches, resolved_compression)
+            elif resolved_format == "parquet":
+                chunks, rows = _write_parquet(target, batches, resolved_compression)
+            else:
+                chunks, rows = _write_arrow(target, batches, resolved_compression)
+        except OSError as exc:
+            raise CandleExportError(f"failed to write {target}: {exc}") from exc
+        return CandleExportResult(
+            path=target,
+            file_format=resolved_format,
+            compression=resolved_compression,
+            chunks=chunks,
+            rows=rows,
+            bytes_written=target.stat().st_size,
+            elapsed_seconds=time.perf_counter() - started,
+        )
+
+
+def load_arrow_columns(path: str | Path) -> ColumnarCandleColumns:
+    """Load an Arrow IPC export as NumPy columns, for analysis outside the backtest path.
+
+    The file is memory mapped, but only a file holding a single record batch
+    (an uncompressed export of at most ``chunk_rows`` rows) is viewed without
+    copying. Larger exports hold one batch per chunk and every column is
+    concatenated into a fresh array. Backtests read SQLite, the columnar store
+    or rollups, never these files.
+    """
+    if pa is None:
+        raise CandleExportError("pyarrow is required to load arrow files")
+    table = pa.ipc.open_file(pa.memory_map(str(path), "r")).read_all()
+    columns: dict[str, np.ndarray] = {}
+    for name, dtype in COLUMN_DTYPES.items():
+        chunked = table.column(name)
+        if chunked.num_chunks == 1:
+            columns[name] = chunked.chunk(0).to_numpy(zero_copy_only=True)
+        else:
+            columns[name] = chunked.to_numpy().astype(dtype, copy=False)
+    return ColumnarCandleColumns(**columns)
+
+
+def _write_csv(target: Path, batches: Iterable[CandleBatch], compression: str) -> tuple[int, int]:
+    handle: TextIO
+    if compression == "gzip":
+        handle = gzip.open(target, "wt", encoding="utf-8", newline="")
+    else:
+        handle = target.open("w", encoding="utf-8", newline="")
+    chunks = rows = 0
+    with handle:
+        writer = csv.writer(handle)
+        writer.writerow(EXPORT_COLUMNS)
+        for batch in batches:
+            # ``tolist`` converts each column in C; one ``writerows`` call per chunk.
+            writer.writerows(
+                (batch.symbol, batch.timeframe, *values)
+                for values in zip(
+                    batch.timestamp.tolist(),
+                    batch.open.tolist(),
+                    batch.high.tolist(),
+                    batch.low.tolist(),
+                    batch.close.tolist(),
+                    batch.volume.tolist(),
+                )
+            )
+            chunks += 1
+            rows += len(batch)
+    return chunks, rows
+
+
+def _write_parquet(target: Path, batches: Iterable[CandleBatch], compression: str) -> tuple[int, int]:
+    chunks = rows = 0
+    with pq.ParquetWriter(target, _arrow_schema(), compression=compression) as writer:
+        for batch in batches:
+            writer.write_batch(_record_batch(batch))
+            chunks += 1
+            rows += len(batch)
+    return chunks, rows
+
+
+def _write_arrow(target: Path, batches: Iterable[CandleBatch], compression: str) -> tuple[int, int]:
+    options = pa.ipc.IpcWriteOptions(compression=None if compression == "none" else compression)
+    chunks = rows = 0
+    with pa.OSFile(str(target), "wb") as sink, pa.ipc.new_file(sink, _arrow_schema(), options=options) as writer:
+        for batch in batches:
+            writer.write_batch(_record_batch(batch))
+            chunks += 1
+            rows += len(batch)
+    return chunks, rows
+
+
+def _arrow_schema() -> Any:
+    label = pa.dictionary(pa.int32(), pa.string())
+    return pa.schema(
+        [("symbol", label), ("timeframe", label), ("timestamp", pa.int64())]
+        + [(name, pa.float64()) for name in ("open", "high", "low", "close", "volume")]
+    )
+
+
+def _record_batch(batch: CandleBatch) -> Any:
+    # Labels are dictionary-encoded (one dictionary entry per batch); the
+    # numeric columns wrap the NumPy buffers without copying.
+    indices = pa.array(np.zeros(len(batch), dtype=np.int32))
+    return pa.RecordBatch.from_arrays(
+        [
+            pa.DictionaryArray.from_arrays(indices, pa.array([batch.symbol])),
+            pa.DictionaryArray.from_arrays(indices, pa.array([batch.timeframe])),
+            pa.array(batch.timestamp),
+            pa.array(batch.open),
+            pa.array(batch.high),
+            pa.array(batch.low),
+            pa.array(batch.close),
+            pa.array(batch.volume),
+        ],
+        schema=_arrow_schema(),
+    )
@@ -0,0 +1,339 @@
+"""Chunked CSV / Parquet / Arrow IPC candle import with bounded memory.
+
+Files are parsed in chunks of ``chunk_rows`` rows (pandas for CSV, pyarrow
+record batches for Parquet/Arrow), validated with the vectorized OHLCV rules,
+appended to a TEMP staging table and moved into the candle store with one
+sorted ``INSERT ... SELECT`` per chunk. Each chunk commits on its own, so a
+rerun after an interruption simply skips rows that already landed.
+
+Rejected rows are skipped and counted; the first few of them are reported by
+source line (CSV data lines are 1-based and count the header, Parquet/Arrow
+rows are 1-based). With ``strict=True`` the first rejected row aborts the
+import instead, leaving earlier chunks committed.
+"""
+
+from __future__ import annotations
+
+import sqlite3
+import time
+from collections.abc import Callable, Iterator
+from dataclasses import dataclass
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+try:
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+except Exception:  # pragma: no cover - optional dependency; CSV import works without it.
+    pa = None  # type: ignore[assignment]
+    pq = None  # type: ignore[assignment]
+
+from src.core.database import SQLiteDatabase
+from src.data.candle_batch import validate_ohlcv_batch
+from src.data.candle_schema import LAYOUT_LEGACY, bump_dataset_versions, candle_layout, ensure_dataset_id
+from src.data.rollup import ROLLUP_SOURCE_TIMEFRAME, mark_rollup_dirty
+from src.data.storage_types import HistoricalDataStorageError
+from src.utils.config_defaults import ALLOWED_TIMEFRAMES
+
+IMPORT_FORMATS = ("csv", "parquet", "arrow")
+DEFAULT_IMPORT_CHUNK_ROWS = 100_000
+MAX_REPORTED_REJECTED_LINES = 10
+REQUIRED_COLUMNS = ("timestamp", "open", "high", "low", "close", "volume")
+_SUFFIX_FORMATS = {
+    ".csv": "csv",
+    ".parquet": "parquet",
+    ".pq": "parquet",
+    ".arrow": "arrow",
+    ".feather": "arrow",
+    ".ipc": "arrow",
+}
+
+
+class CandleImportError(HistoricalDataStorageError):
+    """Raised when an import file is unreadable or structurally invalid."""
+
+
+@dataclass(frozen=True)
+class RejectedImportLine:
+    """One row skipped by validation, located by its line in the source file."""
+
+    line: int
+    reason: str
+
+
+@dataclass(frozen=True)
+class CandleImportProgress:
+    """Running totals reported after each committed chunk."""
+
+    chunks: int
+    parsed_rows: int
+    inserted_rows: int
+    rejected_rows: int
+    elapsed_seconds: float
+
+    @property
+    def rows_per_second(self) -> float:
+        return self.parsed_rows / self.elapsed_seconds if self.elapsed_seconds > 0 else 0.0
+
+
+@dataclass(frozen=True)
+class CandleImportResult:
+    path: Path
+    file_format: str
+    chunks: int
+    parsed_rows: int
+    inserted_rows: int
+    rejected_rows: int
+    elapsed_seconds: float
+    # The first MAX_REPORTED_REJECTED_LINES rejected rows in file order.
+    rejected_lines: tuple[RejectedImportLine, ...] = ()
+
+    @property
+    def rows_per_second(self) -> float:
+        return self.parsed_rows / self.elapsed_seconds if self.elapsed_seconds > 0 else 0.0
+
+
+def detect_import_format(path: str | Path) -> str:
+    """Infer the format from the file suffix (unknown suffixes are read as CSV)."""
+    return _SUFFIX_FORMATS.get(Path(path).suffix.lower(), "csv")
+
+
+class StreamingCandleImporter:
+    """Stream a candle file into SQLite one chunk (one transaction) at a time."""
+
+    def __init__(
+        self,
+        database: SQLiteDatabase,
+        *,
+        chunk_rows: int = DEFAULT_IMPORT_CHUNK_ROWS,
+        on_progress: Callable[[CandleImportProgress], None] | None = None,
+        strict: bool = False,
+    ) -> None:
+        if chunk_rows <= 0:
+            raise CandleImportError("chunk_rows must be > 0")
+        self._database = database
+        self._chunk_rows = chunk_rows
+        self._on_progress = on_progress
+        self._strict = strict
+
+    def run(
+        self,
+        path: str | Path,
+        *,
+        symbol: str | None = None,
+        timeframe: str | None = None,
+        file_format: str | None = None,
+    ) -> CandleImportResult:
+        source = Path(path)
+        if not source.exists():
+            raise CandleImportError(f"import file not found: {source}")
+        resolved_format = file_format or detect_import_format(source)
+        if resolved_format not in IMPORT_FORMATS:
+            raise CandleImportError(f"format must be one of {list(IMPORT_FORMATS)}")
+
+        started = time.perf_counter()
+        chunks = parsed = inserted = rejected = 0
+        rejected_lines: list[RejectedImportLine] = []
+        for offset, frame in self._iter_frames(source, resolved_format):
+            chunk_inserted, chunk_rejected = self._load_chunk(
+                frame,
+                first_line=offset + 2 if resolved_format == "csv" else offset + 1,
+                default_symbol=symbol,
+                default_timeframe=timeframe,
+            )
+            chunks += 1
+            parsed += len(frame)
+            inserted += chunk_inserted
+            rejected += len(chunk_rejected)
+            rejected_lines.extend(chunk_rejected[: MAX_REPORTED_REJECTED_LINES - len(rejected_lines)])
+            if self._on_progress is not None:
+                self._on_progress(
+                    CandleImportProgress(
+                        chunks=chunks,
+                        parsed_rows=parsed,
+                        inserted_rows=inserted,
+                        rejected_rows=rejected,
+                        elapsed_seconds=time.perf_counter() - started,
+                    )
+                )
+        return CandleImportResult(
+            path=source,
+            file_format=resolved_format,
+            chunks=chunks,
+            parsed_rows=parsed,
+            inserted_rows=inserted,
+            rejected_rows=rejected,
+            elapsed_seconds=time.perf_counter() - started,
+            rejected_lines=tuple(rejected_lines),
+        )
+
+    def _iter_frames(self, source: Path, file_format: str) -> Iterator[tuple[int, pd.DataFrame]]:
+        """Yield ``(row_offset, frame)`` chunks of at most ``chunk_rows`` rows."""
+        if file_format == "csv":
+            header = pd.read_csv(source, nrows=0)
+            self._check_columns(header.columns)
+            reader = pd.read_csv(
+                source,
+                chunksize=self._chunk_rows,
+                dtype={name: "string" for name in ("symbol", "timeframe") if name in header.columns},
+                keep_default_na=False,
+                na_values={name: [""] for name in REQUIRED_COLUMNS},
+            )
+            offset = 0
+            with reader:
+                for frame in reader:
+                    yield offset, frame
+                    offset += len(frame)
+            return
+
+        if pa is None:
+            raise CandleImportError(f"pyarrow is required to import {file_format} files")
+        if file_format == "parquet":
+            parquet = pq.ParquetFile(source)
+            self._check_columns(parquet.schema_arrow.names)
+            batches: Iterator[pa.RecordBatch] = parquet.iter_batches(batch_size=self._chunk_rows)
+        else:
+            reader = pa.ipc.open_file(pa.memory_map(str(source), "r"))
+            self._check_columns(reader.schema.names)
+            batches = (reader.get_batch(index) for index in range(reader.num_record_batches))
+        offset = 0
+        for batch in batches:
+            # IPC files may hold batches larger than chunk_rows; slicing is zero-copy.
+            for start in range(0, batch.num_rows, self._chunk_rows):
+                piece = batch.slice(start, self._chunk_rows)
+                yield offset, piece.to_pandas()
+                offset += piece.num_rows
+
+    def _load_chunk(
+        self,
+        frame: pd.DataFrame,
+        *,
+        first_line: int,
+        default_symbol: str | None,
+        default_timeframe: str | None,
+    ) -> tuple[int, list[RejectedImportLine]]:
+        """Validate and commit one chunk; return ``(inserted, rejected rows in line order)``."""
+        symbols = self._label_column(frame, "symbol", default_symbol.upper() if default_symbol else None)
+        if "symbol" in frame.columns:
+            symbols = symbols.str.upper()
+        timeframes = self._label_column(frame, "timeframe", default_timeframe)
+        missing_symbol = np.flatnonzero((symbols == "").to_numpy())
+        if missing_symbol.size:
+            raise CandleImportError(
+                f"line {first_line + int(missing_symbol[0])}: missing symbol and no default symbol given"
+            )
+        bad_timeframe = np.flatnonzero(~timeframes.isin(ALLOWED_TIMEFRAMES).to_numpy())
+        if bad_timeframe.size:
+            position = int(bad_timeframe[0])
+            raise CandleImportError(
+                f"line {first_line + position}: invalid timeframe {timeframes.iloc[position]!r}"
+            )
+
+        # Unparsable cells become NaN and are rejected as non-finite rows; remember
+        # the first such column per row so the report can name it.
+        columns = [pd.to_numeric(frame[name], errors="coerce").to_numpy(dtype=np.float64) for name in REQUIRED_COLUMNS]
+        values = np.column_stack(columns)
+        unparsable = np.full(len(frame), "", dtype=object)
+        for name, column in zip(reversed(REQUIRED_COLUMNS), reversed(columns)):
+            unparsable[np.isnan(column) & frame[name].notna().to_numpy()] = name
+        keys = pd.DataFrame({"symbol": symbols.to_numpy(), "timeframe": timeframes.to_numpy()})
+        pages = []
+        rejected: list[RejectedImportLine] = []
+        for (symbol, timeframe), positions in keys.groupby(["symbol", "timeframe"], sort=False).indices.items():
+            page = validate_ohlcv_batch(values[positions], symbol=str(symbol), timeframe=str(timeframe))
+            pages.append(((str(symbol), str(timeframe)), page))
+            rejected.extend(
+                self._rejected_line(first_line, int(positions[row.index]), row.reason, unparsable)
+                for row in page.rejected
+            )
+        rejected.sort(key=lambda item: item.line)
+        if rejected and self._strict:
+            raise CandleImportError(f"line {rejected[0].line}: bad data format ({rejected[0].reason})")
+
+        with self._database.transaction() as tx:
+            self._ensure_staging(tx)
+            touched: dict[tuple[str, str], np.ndarray] = {}
+            for key, page in pages:
+                if page.rows:
+                    tx.executemany(
+                        "INSERT INTO temp.candle_import_staging VALUES (?, ?, ?, ?, ?, ?, ?, ?);",
+                        page.rows,
+                    )
+                    touched[key] = np.fromiter((row[2] for row in page.rows), dtype=np.int64, count=len(page.rows))
+            inserted = self._flush_staging(tx)
+            if inserted:
+                bump_dataset_versions(tx, touched)
+                for (symbol, timeframe), timestamps in touched.items():
+                    if timeframe == ROLLUP_SOURCE_TIMEFRAME:
+                        mark_rollup_dirty(tx, symbol, timestamps.tolist())
+        return inserted, rejected
+
+    @staticmethod
+    def _rejected_line(first_line: int, position: int, reason: str, unparsable: np.ndarray) -> RejectedImportLine:
+        column = unparsable[position]
+        return RejectedImportLine(
+            line=first_line + position,
+            reason=f"unparsable {column} value" if column else reason,
+        )
+
+    @staticmethod
+    def _ensure_staging(conn: sqlite3.Connection) -> None:
+        conn.execute(
+            """
+            CREATE TEMP TABLE IF NOT EXISTS candle_import_staging (
+                symbol TEXT NOT NULL,
+                timeframe TEXT NOT NULL,
+                timestamp INTEGER NOT NULL,
+                open REAL NOT NULL,
+                high REAL NOT NULL,
+                low REAL NOT NULL,
+                close REAL NOT NULL,
+                volume REAL NOT NULL
+            );
+            """
+        )
+
+    @staticmethod
+    def _flush_staging(conn: sqlite3.Connection) -> int:
+        """Move staged rows into the store in clustered-key order, then empty staging."""
+        if candle_layout(conn) == LAYOUT_LEGACY:
+            inserted = conn.execute(
+                """
+                INSERT OR IGNORE INTO candles(symbol, timeframe, timestamp, open, high, low, close, volume)
+                SELECT symbol, timeframe, timestamp, open, high, low, close, volume
+                FROM temp.candle_import_staging
+                ORDER BY symbol, timeframe, timestamp;
+                """
+            ).rowcount
+        else:
+            for symbol, timeframe in conn.execute(
+                "SELECT DISTINCT symbol, timeframe FROM temp.candle_import_staging;"
+            ).fetchall():
+                ensure_dataset_id(conn, str(symbol), str(timeframe))
+            inserted = conn.execute(
+                """
+                INSERT OR IGNORE INTO candle_bars(dataset_id, timestamp, open, high, low, close, volume)
+                SELECT d.dataset_id, s.timestamp, s.open, s.high, s.low, s.close, s.volume
+                FROM temp.candle_import_staging AS s
+                JOIN datasets AS d ON d.symbol = s.symbol AND d.timeframe = s.timeframe
+                ORDER BY d.dataset_id, s.timestamp;
+                """
+            ).rowcount
+        conn.execute("DELETE FROM temp.candle_import_staging;")
+        return max(inserted, 0)
+
+    @staticmethod
+    def _label_column(frame: pd.DataFrame, name: str, default: str | None) -> pd.Series:
+        fallback = (default or "").strip()
+        if name not in frame.columns:
+            return pd.Series(fallback, index=frame.index, dtype="string")
+        column = frame[name].astype("string").fillna("").str.strip()
+        return column.where(column != "", fallback)
+
+    @staticmethod
+    def _check_columns(columns: object) -> None:
+        missing = [name for name in REQUIRED_COLUMNS if name not in set(columns)]  # type: ignore[arg-type]
+        if missing:
+            raise CandleImportError(f"missing required columns: {'/'.join(REQUIRED_COLUMNS)}")
@@ -0,0 +1,390 @@
+"""Compact clustered candle layout and the online migration that produces it.
+
+The original ``candles`` table repeats symbol/timeframe text on every row and
+carries a rowid, ``created_at`` and two secondary indexes. The compact layout
+stores bars in ``candle_bars`` -- a ``WITHOUT ROWID`` table clustered on
+``(dataset_id, timestamp)`` -- with symbol/timeframe interned in ``datasets``.
+``candles`` then becomes a view with INSTEAD OF triggers, so existing SQL keeps
+working; hot paths write to ``candle_bars`` directly through the helpers here.
+"""
+
+from __future__ import annotations
+
+import sqlite3
+from collections.abc import Callable, Iterable, Sequence
+from dataclasses import dataclass
+from itertools import groupby
+
+from src.core.database import SQLiteDatabase
+from src.core.maintenance import database_size_bytes
+
+LAYOUT_LEGACY = "legacy"
+LAYOUT_COMPACT = "compact"
+DEFAULT_MIGRATION_CHUNK_ROWS = 20_000
+
+COMPACT_TABLE_STATEMENTS: tuple[str, ...] = (
+    """
+    CREATE TABLE IF NOT EXISTS datasets (
+        dataset_id INTEGER PRIMARY KEY,
+        symbol TEXT NOT NULL,
+        timeframe TEXT NOT NULL,
+        UNIQUE(symbol, timeframe)
+    );
+    """,
+    """
+    CREATE TABLE IF NOT EXISTS candle_bars (
+        dataset_id INTEGER NOT NULL REFERENCES datasets(dataset_id),
+        timestamp INTEGER NOT NULL,
+        open REAL NOT NULL,
+        high REAL NOT NULL,
+        low REAL NOT NULL,
+        close REAL NOT NULL,
+        volume REAL NOT NULL,
+        PRIMARY KEY(dataset_id, timestamp)
+    ) WITHOUT ROWID;
+    """,
+)
+
+_DATASET_ID_SQL = "(SELECT dataset_id FROM datasets WHERE symbol = {row}.symbol AND timeframe = {row}.timeframe)"
+
+# Mirror triggers keep candle_bars current while the backfill runs, so writers
+# (downloads, the live loop's upserts, cleanup) never have to pause.
+_MIRROR_TRIGGER_STATEMENTS: tuple[str, ...] = (
+    f"""
+    CREATE TRIGGER IF NOT EXISTS candles_migrate_insert AFTER INSERT ON candles BEGIN
+        INSERT OR IGNORE INTO datasets(symbol, timeframe) VALUES (NEW.symbol, NEW.timeframe);
+        INSERT OR REPLACE INTO candle_bars(dataset_id, timestamp, open, high, low, close, volume)
+        VALUES ({_DATASET_ID_SQL.format(row="NEW")}, NEW.timestamp, NEW.open, NEW.high, NEW.low, NEW.close, NEW.volume);
+    END;
+    """,
+    f"""
+    CREATE TRIGGER IF NOT EXISTS candles_migrate_update AFTER UPDATE ON candles BEGIN
+        DELETE FROM candle_bars
+        WHERE dataset_id = {_DATASET_ID_SQL.format(row="OLD")} AND timestamp = OLD.timestamp;
+        INSERT OR IGNORE INTO datasets(symbol, timeframe) VALUES (NEW.symbol, NEW.timeframe);
+        INSERT OR REPLACE INTO candle_bars(dataset_id, timestamp, open, high, low, close, volume)
+        VALUES ({_DATASET_ID_SQL.format(row="NEW")}, NEW.timestamp, NEW.open, NEW.high, NEW.low, NEW.close, NEW.volume);
+    END;
+    """,
+    f"""
+    CREATE TRIGGER IF NOT EXISTS candles_migrate_delete AFTER DELETE ON candles BEGIN
+        DELETE FROM candle_bars
+        WHERE dataset_id = {_DATASET_ID_SQL.format(row="OLD")} AND timestamp = OLD.timestamp;
+    END;
+    """,
+)
+_MIRROR_TRIGGERS = ("candles_migrate_insert", "candles_migrate_update", "candles_migrate_delete")
+
+_COMPAT_VIEW_STATEMENTS: tuple[str, ...] = (
+    """
+    CREATE VIEW candles AS
+    SELECT
+        d.symbol AS symbol,
+        d.timeframe AS timeframe,
+        b.timestamp AS timestamp,
+        b.open AS open,
+        b.high AS high,
+        b.low AS low,
+        b.close AS close,
+        b.volume AS volume,
+        NULL AS created_at
+    FROM candle_bars AS b
+    JOIN datasets AS d ON d.dataset_id = b.dataset_id;
+    """,
+    f"""
+    CREATE TRIGGER candles_view_insert INSTEAD OF INSERT ON candles BEGIN
+        INSERT OR IGNORE INTO datasets(symbol, timeframe) VALUES (NEW.symbol, NEW.timeframe);
+        INSERT INTO candle_bars(dataset_id, timestamp, open, high, low, close, volume)
+        VALUES ({_DATASET_ID_SQL.format(row="NEW")}, NEW.timestamp, NEW.open, NEW.high, NEW.low, NEW.close, NEW.volume);
+    END;
+    """,
+    f"""
+    CREATE TRIGGER candles_view_update INSTEAD OF UPDATE ON candles BEGIN
+        DELETE FROM candle_bars
+        WHERE dataset_id = {_DATASET_ID_SQL.format(row="OLD")} AND timestamp = OLD.timestamp;
+        INSERT OR IGNORE INTO datasets(symbol, timeframe) VALUES (NEW.symbol, NEW.timeframe);
+        INSERT INTO candle_bars(dataset_id, timestamp, open, high, low, close, volume)
+        VALUES ({_DATASET_ID_SQL.format(row="NEW")}, NEW.timestamp, NEW.open, NEW.high, NEW.low, NEW.close, NEW.volume);
+    END;
+    """,
+    f"""
+    CREATE TRIGGER candles_view_delete INSTEAD OF DELETE ON candles BEGIN
+        DELETE FROM candle_bars
+        WHERE dataset_id = {_DATASET_ID_SQL.format(row="OLD")} AND timestamp = OLD.timestamp;
+    END;
+    """,
+)
+
+
+class CandleMigrationError(RuntimeError):
+    """Raised when the compact candle migration cannot complete safely."""
+
+
+@dataclass(frozen=True)
+class CandleMigrationResult:
+    """Outcome of migrating ``candles`` to the compact layout."""
+
+    migrated: bool
+    datasets: int
+    rows: int
+    size_bytes_before: int
+    size_bytes_after: int
+    vacuumed: bool
+
+    @property
+    def size_ratio(self) -> float:
+        if self.size_bytes_before <= 0:
+            return 1.0
+        return self.size_bytes_after / self.size_bytes_before
+
+
+def candle_layout(conn: sqlite3.Connection) -> str:
+    """Return ``compact`` when ``candles`` is the compatibility view, else ``legacy``."""
+    row = conn.execute("SELECT type FROM sqlite_master WHERE name = 'candles';").fetchone()
+    return LAYOUT_COMPACT if row is not None and row[0] == "view" else LAYOUT_LEGACY
+
+
+def ensure_dataset_id(conn: sqlite3.Connection, symbol: str, timeframe: str) -> int:
+    """Return the dictionary id of (symbol, timeframe), registering it if new."""
+    conn.execute(
+        "INSERT OR IGNORE INTO datasets(symbol, timeframe) VALUES (?, ?);",
+        (symbol, timeframe),
+    )
+    row = conn.execute(
+        "SELECT dataset_id FROM datasets WHERE symbol = ? AND timeframe = ?;",
+        (symbol, timeframe),
+    ).fetchone()
+    return int(row[0])
+
+
+def dataset_version(conn: sqlite3.Connection, symbol: str, timeframe: str) -> int:
+    """Return the write counter of (symbol, timeframe); ``0`` if never bumped."""
+    row = conn.execute(
+        "SELECT version FROM dataset_versions WHERE symbol = ? AND timeframe = ?;",
+        (symbol, timeframe),
+    ).fetchone()
+    return 0 if row is None else int(row[0])
+
+
+def bump_dataset_versions(conn: sqlite3.Connection, datasets: Iterable[tuple[str, str]]) -> None:
+    """Advance the write counter of each dataset (call in the writing transaction)."""
+    conn.executemany(
+        """
+        INSERT INTO dataset_versions(symbol, timeframe, version) VALUES (?, ?, 1)
+        ON CONFLICT(symbol, timeframe) DO UPDATE SET version = version + 1;
+        """,
+        sorted(set(datasets)),
+    )
+
+
+def insert_candle_rows(
+    conn: sqlite3.Connection,
+    rows: Sequence[Sequence[object]],
+) -> int:
+    """``INSERT OR IGNORE`` ``(symbol, timeframe, timestamp, o, h, l, c, v)`` rows.
+
+    Works on either layout and returns the number of new bars (dictionary
+    inserts are not counted). Datasets that gained bars get their version
+    bumped. Call inside a transaction.
+    """
+    if not rows:
+        return 0
+    # ``rowcount`` excludes trigger side effects (e.g. migration mirroring).
+    if candle_layout(conn) == LAYOUT_LEGACY:
+        inserted = conn.executemany(
+            """
+            INSERT OR IGNORE INTO candles(symbol, timeframe, timestamp, open, high, low, close, volume)
+            VALUES (?, ?, ?, ?, ?, ?, ?, ?);
+            """,
+            rows,
+        ).rowcount
+        if inserted:
+            bump_dataset_versions(conn, ((str(row[0]), str(row[1])) for row in rows))
+        return inserted
+
+    inserted = 0
+    for (symbol, timeframe), group in groupby(rows, key=lambda row: (row[0], row[1])):
+        dataset_id = ensure_dataset_id(conn, str(symbol), str(timeframe))
+        group_inserted = conn.executemany(
+            """
+            INSERT OR IGNORE INTO candle_bars(dataset_id, timestamp, open, high, low, close, volume)
+            VALUES (?, ?, ?, ?, ?, ?, ?);
+            """,
+            ((dataset_id, *row[2:8]) for row in group),
+        ).rowcount
+        if group_inserted:
+            bump_dataset_versions(conn, ((str(symbol), str(timeframe)),))
+        inserted += group_inserted
+    return inserted
+
+
+def upsert_live_candle(
+    conn: sqlite3.Connection,
+    *,
+    symbol: str,
+    timeframe: str,
+    timestamp: int,
+    price: float,
+) -> None:
+    """Fold a live price into the open bar (views cannot be UPSERT targets)."""
+    bump_dataset_versions(conn, ((symbol, timeframe),))
+    if candle_layout(conn) == LAYOUT_LEGACY:
+        conn.execute(
+            """
+            INSERT INTO candles(symbol, timeframe, timestamp, open, high, low, close, volume)
+            VALUES (?, ?, ?, ?, ?, ?, ?, 0)
+            ON CONFLICT(symbol, timeframe, timestamp) DO UPDATE SET
+                high = MAX(candles.high, excluded.high),
+                low = MIN(candles.low, excluded.low),
+                close = excluded.close,
+                volume = candles.volume + excluded.volume;
+            """,
+            (symbol, timeframe, timestamp, price, price, price, price),
+        )
+        return
+    dataset_id = ensure_dataset_id(conn, symbol, timeframe)
+    conn.execute(
+        """
+        INSERT INTO candle_bars(dataset_id, timestamp, open, high, low, close, volume)
+        VALUES (?, ?, ?, ?, ?, ?, 0)
+        ON CONFLICT(dataset_id, timestamp) DO UPDATE SET
+            high = MAX(candle_bars.high, excluded.high),
+            low = MIN(candle_bars.low, excluded.low),
+            close = excluded.close,
+            volume = candle_bars.volume + excluded.volume;
+        """,
+        (dataset_id, timestamp, price, price, price, price),
+    )
+
+
+class CompactCandleMigration:
+    """Move ``candles`` into ``candle_bars`` + ``datasets`` without taking the database offline.
+
+    1. Create the compact tables and mirror triggers on the old table.
+    2. Backfill each dataset in ``chunk_rows`` slices, one short write
+       transaction per slice, so other writers interleave between slices.
+    3. In one final transaction, verify row counts, drop the old table and
+       its indexes, and install the ``candles`` compatibility view.
+
+    An interrupted run is safe to repeat: every step is idempotent. While the
+    mirror triggers are active, ``total_changes`` also counts mirrored writes;
+    ``insert_candle_rows`` reports ``rowcount`` and is unaffected.
+    """
+
+    def __init__(
+        self,
+        database: SQLiteDatabase,
+        *,
+        chunk_rows: int = DEFAULT_MIGRATION_CHUNK_ROWS,
+        on_progress: Callable[[str, str, int], None] | None = None,
+    ) -> None:
+        if chunk_rows <= 0:
+            raise CandleMigrationError("chunk_rows must be > 0")
+        self._database = database
+        self._chunk_rows = chunk_rows
+        self._on_progress = on_progress
+
+    def run(self, *, vacuum: bool = False) -> CandleMigrationResult:
+        size_before = database_size_bytes(self._database)
+        with self._database.transaction() as tx:
+            if candle_layout(tx) == LAYOUT_COMPACT:
+                datasets, rows = self._compact_counts(tx)
+                return CandleMigrationResult(
+                    migrated=False,
+                    datasets=datasets,
+                    rows=rows,
+                    size_bytes_before=size_before,
+                    size_bytes_after=size_before,
+                    vacuumed=False,
+                )
+            for statement in (*COMPACT_TABLE_STATEMENTS, *_MIRROR_TRIGGER_STATEMENTS):
+                tx.execute(statement)
+            tx.execute(
+                """
+                INSERT OR IGNORE INTO datasets(symbol, timeframe)
+                SELECT DISTINCT symbol, timeframe FROM candles ORDER BY symbol, timeframe;
+                """
+            )
+            keys = [
+                (int(row[0]), str(row[1]), str(row[2]))
+                for row in tx.execute(
+                    "SELECT dataset_id, symbol, timeframe FROM datasets ORDER BY dataset_id;"
+                ).fetchall()
+            ]
+
+        for dataset_id, symbol, timeframe in keys:
+            self._backfill_dataset(dataset_id, symbol, timeframe)
+
+        with self._database.transaction() as tx:
+            legacy_rows = int(tx.execute("SELECT COUNT(*) FROM candles;").fetchone()[0])
+            compact_rows = int(tx.execute("SELECT COUNT(*) FROM candle_bars;").fetchone()[0])
+            if legacy_rows != compact_rows:
+                raise CandleMigrationError(
+                    f"row count mismatch after backfill: candles={legacy_rows} candle_bars={compact_rows}"
+                )
+            for trigger in _MIRROR_TRIGGERS:
+                tx.execute(f"DROP TRIGGER IF EXISTS {trigger};")
+            tx.execute("DROP TABLE candles;")
+            for statement in _COMPAT_VIEW_STATEMENTS:
+                tx.execute(statement)
+            datasets, rows = self._compact_counts(tx)
+
+        if vacuum:
+            vacuum_database(self._database)
+        return CandleMigrationResult(
+            migrated=True,
+            datasets=datasets,
+            rows=rows,
+            size_bytes_before=size_before,
+            size_bytes_after=database_size_bytes(self._database),
+            vacuumed=vacuum,
+        )
+
+    def _backfill_dataset(self, dataset_id: int, symbol: str, timeframe: str) -> None:
+        cursor_ts = -1
+        copied = 0
+        while True:
+            with self._database.transaction() as tx:
+                bounds = tx.execute(
+                    """
+                    SELECT COUNT(*), MAX(timestamp) FROM (
+                        SELECT timestamp FROM candles
+                        WHERE symbol = ? AND timeframe = ? AND timestamp > ?
+                        ORDER BY timestamp ASC
+                        LIMIT ?
+                    );
+                    """,
+                    (symbol, timeframe, cursor_ts, self._chunk_rows),
+                ).fetchone()
+                count = int(bounds[0])
+                if count == 0:
+                    return
+                chunk_end = int(bounds[1])
+                # IGNORE keeps bars the mirror triggers already wrote (they are newer).
+                tx.execute(
+                    """
+                    INSERT OR IGNORE INTO candle_bars(dataset_id, timestamp, open, high, low, close, volume)
+                    SELECT ?, timestamp, open, high, low, close, volume
+                    FROM candles
+                    WHERE symbol = ? AND timeframe = ? AND timestamp > ? AND timestamp <= ?;
+                    """,
+                    (dataset_id, symbol, timeframe, cursor_ts, chunk_end),
+                )
+            cursor_ts = chunk_end
+            copied += count
+            if self._on_progress is not None:
+                self._on_progress(symbol, timeframe, copied)
+
+    @staticmethod
+    def _compact_counts(conn: sqlite3.Connection) -> tuple[int, int]:
+        datasets = int(conn.execute("SELECT COUNT(*) FROM datasets;").fetchone()[0])
+        rows = int(conn.execute("SELECT COUNT(*) FROM candle_bars;").fetchone()[0])
+        return datasets, rows
+
+
+def vacuum_database(database: SQLiteDatabase) -> None:
+    """Repack the file and, in WAL mode, fold the rewritten pages back into it."""
+    connection = database.open()
+    connection.execute("VACUUM;")
+    if database.journal_mode == "wal":
+        connection.execute("PRAGMA wal_checkpoint(TRUNCATE);")
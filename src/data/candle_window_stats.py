@@ -32,8 +32,8 @@ def fetch_candle_window_stats(
 ) -> CandleWindowStats:
     """Read stored bars in range and compute expected/coverage metrics."""
     expected_count = estimate_expected_candle_count(start_timestamp, end_timestamp, timeframe)
-    with database.transaction() as tx:
-        row = tx.execute(
+    with database.read() as conn:
+        row = conn.execute(
             """
             SELECT
                 COUNT(*) AS stored_count,
@@ -0,0 +1,360 @@
+"""Columnar memory-mapped candle store mirrored from the SQLite candles table."""
+
+from __future__ import annotations
+
+import json
+import os
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any, BinaryIO
+
+import numpy as np
+
+from src.core.database import SQLiteDatabase
+from src.data.candle_schema import dataset_version
+from src.data.storage import HistoricalCandleStorage
+from src.utils.config_defaults import ALLOWED_TIMEFRAMES
+
+COLUMNAR_FORMAT_VERSION = 2
+COLUMN_DTYPES: dict[str, np.dtype] = {
+    "timestamp": np.dtype("<i8"),
+    "open": np.dtype("<f8"),
+    "high": np.dtype("<f8"),
+    "low": np.dtype("<f8"),
+    "close": np.dtype("<f8"),
+    "volume": np.dtype("<f8"),
+}
+_PRICE_COLUMNS = ("open", "high", "low", "close", "volume")
+_META_FILE = "meta.json"
+_SYNC_FETCH_SIZE = 50_000
+# Prefix checksum: sum of ``timestamp mod 2**32`` over the mirrored rows. Exact
+# in SQLite's 64-bit SUM and catches rows inserted, deleted or moved in the prefix.
+_CHECKSUM_MODULUS = 1 << 32
+
+
+class ColumnarStoreError(RuntimeError):
+    """Raised when columnar candle files are missing, stale, or inconsistent."""
+
+
+@dataclass(frozen=True)
+class ColumnarSyncResult:
+    """Outcome of syncing one (symbol, timeframe) dataset from SQLite."""
+
+    symbol: str
+    timeframe: str
+    appended_rows: int
+    total_rows: int
+    rebuilt: bool
+    last_timestamp: int | None
+
+
+@dataclass(frozen=True)
+class ColumnarCandleColumns:
+    """Read-only column views over one timestamp-sliced dataset window."""
+
+    timestamp: np.ndarray
+    open: np.ndarray
+    high: np.ndarray
+    low: np.ndarray
+    close: np.ndarray
+    volume: np.ndarray
+
+    def __len__(self) -> int:
+        return int(self.timestamp.shape[0])
+
+
+class ColumnarCandleStore:
+    """Keep per-dataset raw column files in sync with SQLite and slice them by time.
+
+    Every dataset lives in ``<root>/<SYMBOL_TIMEFRAME>/`` as one little-endian
+    binary file per column plus ``meta.json``. ``meta.json`` is written last and
+    its ``rows`` field is authoritative, so bytes left behind by an interrupted
+    append are ignored and overwritten by the next sync. ``meta.json`` also
+    records the dataset's write counter (``dataset_versions``) and a checksum
+    of the mirrored prefix.
+    """
+
+    def __init__(self, root_dir: str | Path, database: SQLiteDatabase) -> None:
+        root = Path(root_dir).expanduser()
+        if not str(root).strip():
+            raise ColumnarStoreError("root_dir must not be empty")
+        self._root = root
+        self._database = database
+
+    @property
+    def root_dir(self) -> Path:
+        return self._root
+
+    def dataset_dir(self, symbol: str, timeframe: str) -> Path:
+        return self._root / HistoricalCandleStorage.build_dataset_name(symbol, timeframe)
+
+    def list_sqlite_datasets(self) -> list[tuple[str, str]]:
+        """Return every (symbol, timeframe) pair present in the candles table."""
+        with self._database.read() as conn:
+            rows = conn.execute(
+                "SELECT DISTINCT symbol, timeframe FROM candles ORDER BY symbol, timeframe;"
+            ).fetchall()
+        return [(str(row[0]), str(row[1])) for row in rows]
+
+    def sync(self, symbol: str, timeframe: str, *, rebuild: bool = False) -> ColumnarSyncResult:
+        """Append new SQLite rows to the column files, rebuilding only when the prefix changed.
+
+        A dataset whose write counter (``dataset_versions``, bumped by every
+        candle write path) matches ``meta.json`` is left untouched: one keyed
+        lookup, no scan, no writes. Only when the counter moved are the row
+        count and prefix checksum compared to choose between append and
+        rebuild. The checksum covers timestamps only, so an in-place OHLCV
+        rewrite of mirrored rows, or a write that skips the counter, needs
+        ``rebuild=True``. Appends rewrite the provisional last row in place and
+        never shrink a file, so memmap views handed out earlier stay valid;
+        rebuilds write fresh files and swap them in.
+        """
+        normalized_symbol, normalized_timeframe = self._normalize_key(symbol, timeframe)
+        dataset_dir = self.dataset_dir(normalized_symbol, normalized_timeframe)
+        meta = None if rebuild else self._read_meta(dataset_dir)
+
+        with self._database.read() as conn:
+            # Read the counter before the rows: a concurrent write then leaves a
+            # stale counter in meta.json and the next sync looks again.
+            version = dataset_version(conn, normalized_symbol, normalized_timeframe)
+            if meta is not None and meta["dataset_version"] == version:
+                return ColumnarSyncResult(
+                    symbol=normalized_symbol,
+                    timeframe=normalized_timeframe,
+                    appended_rows=0,
+                    total_rows=int(meta["rows"]),
+                    rebuilt=False,
+                    last_timestamp=meta["last_timestamp"],
+                )
+
+            if meta is not None and meta["rows"] > 0 and meta["last_timestamp"] is not None:
+                prefix_count, prefix_checksum = conn.execute(
+                    f"""
+                    SELECT COUNT(*), COALESCE(SUM(timestamp % {_CHECKSUM_MODULUS}), 0) FROM candles
+                    WHERE symbol = ? AND timeframe = ? AND timestamp < ?;
+                    """,
+                    (normalized_symbol, normalized_timeframe, meta["last_timestamp"]),
+                ).fetchone()
+                if int(prefix_count) != meta["rows"] - 1 or int(prefix_checksum) != meta["prefix_checksum"]:
+                    # Rows were inserted into, deleted from or moved within the
+                    # mirrored prefix (gap repair, retention cleanup); an append
+                    # cannot fix that.
+                    meta = None
+            elif meta is not None and (meta["rows"] != 0 or meta["last_timestamp"] is not None):
+                meta = None
+
+            rebuilt = meta is None
+            if meta is None or meta["rows"] == 0:
+                base_rows = 0
+                base_checksum = 0
+                from_ts = 0
+            else:
+                # The newest mirrored candle may still be open and upserted by the
+                # live loop, so it is always rewritten together with the tail.
+                base_rows = int(meta["rows"]) - 1
+                base_checksum = int(meta["prefix_checksum"])
+                from_ts = int(meta["last_timestamp"])
+
+            dataset_dir.mkdir(parents=True, exist_ok=True)
+            handles = self._open_column_files(dataset_dir, base_rows=base_rows, fresh=rebuilt)
+            appended = 0
+            checksum = base_checksum
+            last_timestamp: int | None = None
+            completed = False
+            try:
+                cursor = conn.execute(
+                    """
+                    SELECT timestamp, open, high, low, close, volume
+                    FROM candles
+                    WHERE symbol = ? AND timeframe = ? AND timestamp >= ?
+                    ORDER BY timestamp ASC;
+                    """,
+                    (normalized_symbol, normalized_timeframe, from_ts),
+                )
+                while True:
+                    batch = cursor.fetchmany(_SYNC_FETCH_SIZE)
+                    if not batch:
+                        break
+                    timestamps = np.fromiter(
+                        (row[0] for row in batch),
+                        dtype=COLUMN_DTYPES["timestamp"],
+                        count=len(batch),
+                    )
+                    values = np.asarray([tuple(row)[1:] for row in batch], dtype=np.float64)
+                    handles["timestamp"].write(timestamps.tobytes())
+                    for index, column in enumerate(_PRICE_COLUMNS):
+                        handles[column].write(
+                            np.ascontiguousarray(values[:, index], dtype=COLUMN_DTYPES[column]).tobytes()
+                        )
+                    checksum += int((timestamps % _CHECKSUM_MODULUS).sum())
+                    appended += len(batch)
+                    last_timestamp = int(timestamps[-1])
+                completed = True
+            finally:
+                for handle in handles.values():
+                    handle.flush()
+                    os.fsync(handle.fileno())
+                    handle.close()
+                if rebuilt:
+                    self._install_fresh_columns(dataset_dir, install=completed)
+
+        if base_rows > 0 and appended == 0:
+            # The provisional last candle vanished from SQLite; start over.
+            return self.sync(normalized_symbol, normalized_timeframe, rebuild=True)
+
+        total_rows = base_rows + appended
+        appended_rows = total_rows - (0 if meta is None else int(meta["rows"]))
+        if last_timestamp is not None:
+            # The checksum covers every row but the provisional last one.
+            checksum -= last_timestamp % _CHECKSUM_MODULUS
+        self._write_meta(
+            dataset_dir,
+            symbol=normalized_symbol,
+            timeframe=normalized_timeframe,
+            rows=total_rows,
+            last_timestamp=last_timestamp,
+            dataset_version=version,
+            prefix_checksum=checksum,
+        )
+        return ColumnarSyncResult(
+            symbol=normalized_symbol,
+            timeframe=normalized_timeframe,
+            appended_rows=appended_rows,
+            total_rows=total_rows,
+            rebuilt=rebuilt,
+            last_timestamp=last_timestamp,
+        )
+
+    def load_columns(
+        self,
+        symbol: str,
+        timeframe: str,
+        start_timestamp: int,
+        end_timestamp: int,
+    ) -> ColumnarCandleColumns:
+        """Return zero-copy memmap views for candles within ``[start, end]`` (inclusive)."""
+        normalized_symbol, normalized_timeframe = self._normalize_key(symbol, timeframe)
+        dataset_dir = self.dataset_dir(normalized_symbol, normalized_timeframe)
+        meta = self._read_meta(dataset_dir)
+        if meta is None:
+            raise ColumnarStoreError(
+                f"columnar dataset not found for {normalized_symbol} {normalized_timeframe}; "
+                "run sync-columnar first"
+            )
+
+        rows = int(meta["rows"])
+        columns = {name: self._map_column(dataset_dir, name, rows) for name in COLUMN_DTYPES}
+        timestamps = columns["timestamp"]
+        lo = int(np.searchsorted(timestamps, start_timestamp, side="left"))
+        hi = int(np.searchsorted(timestamps, end_timestamp, side="right"))
+        return ColumnarCandleColumns(**{name: array[lo:hi] for name, array in columns.items()})
+
+    def _normalize_key(self, symbol: str, timeframe: str) -> tuple[str, str]:
+        if not isinstance(symbol, str) or not symbol.strip():
+            raise ColumnarStoreError("symbol must not be empty")
+        if not isinstance(timeframe, str) or timeframe.strip() not in ALLOWED_TIMEFRAMES:
+            raise ColumnarStoreError(f"timeframe must be one of {sorted(ALLOWED_TIMEFRAMES)}")
+        return symbol.strip().upper(), timeframe.strip()
+
+    @staticmethod
+    def _map_column(dataset_dir: Path, name: str, rows: int) -> np.ndarray:
+        dtype = COLUMN_DTYPES[name]
+        if rows == 0:
+            return np.empty(0, dtype=dtype)
+        path = dataset_dir / f"{name}.bin"
+        try:
+            size = path.stat().st_size
+        except OSError as exc:
+            raise ColumnarStoreError(f"missing column file: {path}") from exc
+        if size < rows * dtype.itemsize:
+            raise ColumnarStoreError(f"column file shorter than meta rows: {path}")
+        return np.memmap(path, dtype=dtype, mode="r", shape=(rows,))
+
+    @staticmethod
+    def _open_column_files(
+        dataset_dir: Path,
+        *,
+        base_rows: int,
+        fresh: bool,
+    ) -> dict[str, BinaryIO]:
+        """Open every column file positioned at row ``base_rows``.
+
+        ``fresh`` writes to empty ``*.bin.tmp`` files that
+        :meth:`_install_fresh_columns` swaps in afterwards. Otherwise the live
+        files are opened in place and never truncated: bytes past ``meta.json``'s
+        ``rows`` are overwritten by the append or ignored by readers.
+        """
+        handles: dict[str, BinaryIO] = {}
+        try:
+            for name, dtype in COLUMN_DTYPES.items():
+                path = dataset_dir / f"{name}.bin"
+                if fresh:
+                    handle = open(path.with_name(f"{path.name}.tmp"), "w+b")
+                else:
+                    handle = open(path, "r+b" if path.exists() else "w+b")
+                handles[name] = handle
+                handle.seek(0 if fresh else base_rows * dtype.itemsize)
+        except OSError as exc:
+            for handle in handles.values():
+                handle.close()
+            raise ColumnarStoreError(f"failed to open column files in {dataset_dir}: {exc}") from exc
+        return handles
+
+    @staticmethod
+    def _install_fresh_columns(dataset_dir: Path, *, install: bool) -> None:
+        """Swap rebuilt ``*.bin.tmp`` files in (or drop them after a failed rebuild).
+
+        Replacing rather than truncating leaves memmaps of the old files intact.
+        """
+        for name in COLUMN_DTYPES:
+            tmp_path = dataset_dir / f"{name}.bin.tmp"
+            if install:
+                os.replace(tmp_path, dataset_dir / f"{name}.bin")
+            else:
+                tmp_path.unlink(missing_ok=True)
+
+    @staticmethod
+    def _read_meta(dataset_dir: Path) -> dict[str, Any] | None:
+        path = dataset_dir / _META_FILE
+        if not path.exists():
+            return None
+        try:
+            meta = json.loads(path.read_text(encoding="utf-8"))
+        except (OSError, ValueError):
+            return None
+        if not isinstance(meta, dict) or meta.get("version") != COLUMNAR_FORMAT_VERSION:
+            return None
+        rows = meta.get("rows")
+        last_timestamp = meta.get("last_timestamp")
+        if not isinstance(rows, int) or rows < 0:
+            return None
+        if last_timestamp is not None and not isinstance(last_timestamp, int):
+            return None
+        if not isinstance(meta.get("dataset_version"), int) or not isinstance(meta.get("prefix_checksum"), int):
+            return None
+        return meta
+
+    @staticmethod
+    def _write_meta(
+        dataset_dir: Path,
+        *,
+        symbol: str,
+        timeframe: str,
+        rows: int,
+        last_timestamp: int | None,
+        dataset_version: int,
+        prefix_checksum: int,
+    ) -> None:
+        payload = {
+            "version": COLUMNAR_FORMAT_VERSION,
+            "symbol": symbol,
+            "timeframe": timeframe,
+            "rows": rows,
+            "last_timestamp": last_timestamp,
+            "dataset_version": dataset_version,
+            "prefix_checksum": prefix_checksum,
+            "columns": {name: dtype.str for name, dtype in COLUMN_DTYPES.items()},
+        }
+        tmp_path = dataset_dir / f"{_META_FILE}.tmp"
+        tmp_path.write_text(json.dumps(payload, ensure_ascii=False, indent=2), encoding="utf-8")
+        os.replace(tmp_path, dataset_dir / _META_FILE)
@@ -0,0 +1,134 @@
+"""Merged download-coverage intervals and gap planning for candle datasets."""
+
+from __future__ import annotations
+
+from collections.abc import Iterable, Sequence
+
+from src.core.database import SQLiteDatabase
+
+Interval = tuple[int, int]
+
+
+def merge_intervals(intervals: Iterable[Interval]) -> list[Interval]:
+    """Merge overlapping or adjacent inclusive ``[start, end]`` intervals."""
+    merged: list[Interval] = []
+    for start, end in sorted(intervals):
+        if merged and start <= merged[-1][1] + 1:
+            if end > merged[-1][1]:
+                merged[-1] = (merged[-1][0], end)
+            continue
+        merged.append((start, end))
+    return merged
+
+
+def subtract_intervals(window: Interval, covered: Sequence[Interval]) -> list[Interval]:
+    """Return the parts of ``window`` not covered by the merged ``covered`` intervals."""
+    window_start, window_end = window
+    gaps: list[Interval] = []
+    cursor = window_start
+    for start, end in covered:
+        if end < cursor:
+            continue
+        if start > window_end:
+            break
+        if start > cursor:
+            gaps.append((cursor, start - 1))
+        cursor = max(cursor, end + 1)
+        if cursor > window_end:
+            return gaps
+    if cursor <= window_end:
+        gaps.append((cursor, window_end))
+    return gaps
+
+
+class CandleCoverageIndex:
+    """Persist which timestamp ranges have already been fetched from the exchange.
+
+    Coverage is stored as merged, non-overlapping intervals per
+    (symbol, timeframe). Rows of the legacy exact-match ``candle_download_cache``
+    table are read as coverage too, so existing databases keep their history.
+    """
+
+    def __init__(self, database: SQLiteDatabase) -> None:
+        self._database = database
+
+    def covered_intervals(
+        self,
+        symbol: str,
+        timeframe: str,
+        start_timestamp: int,
+        end_timestamp: int,
+    ) -> list[Interval]:
+        """Return merged coverage intervals that touch ``[start, end]``."""
+        with self._database.read() as conn:
+            rows = conn.execute(
+                """
+                SELECT start_timestamp, end_timestamp FROM candle_coverage
+                WHERE symbol = ? AND timeframe = ? AND start_timestamp <= ? AND end_timestamp >= ?
+                UNION ALL
+                SELECT start_timestamp, end_timestamp FROM candle_download_cache
+                WHERE symbol = ? AND timeframe = ? AND start_timestamp <= ? AND end_timestamp >= ?;
+                """,
+                (
+                    symbol,
+                    timeframe,
+                    end_timestamp + 1,
+                    start_timestamp - 1,
+                    symbol,
+                    timeframe,
+                    end_timestamp + 1,
+                    start_timestamp - 1,
+                ),
+            ).fetchall()
+        return merge_intervals((int(row[0]), int(row[1])) for row in rows)
+
+    def plan_gaps(
+        self,
+        symbol: str,
+        timeframe: str,
+        start_timestamp: int,
+        end_timestamp: int,
+    ) -> list[Interval]:
+        """Subtract stored coverage from the requested window."""
+        covered = self.covered_intervals(symbol, timeframe, start_timestamp, end_timestamp)
+        return subtract_intervals((start_timestamp, end_timestamp), covered)
+
+    def mark_covered(
+        self,
+        symbol: str,
+        timeframe: str,
+        start_timestamp: int,
+        end_timestamp: int,
+    ) -> Interval:
+        """Record ``[start, end]`` as fetched, merging with neighbouring intervals.
+
+        Runs inside the caller's transaction when one is open, so a page of
+        candles and its coverage commit (or roll back) together.
+        """
+        if start_timestamp > end_timestamp:
+            raise ValueError("start_timestamp must be <= end_timestamp")
+        with self._database.transaction() as tx:
+            rows = tx.execute(
+                """
+                SELECT start_timestamp, end_timestamp FROM candle_coverage
+                WHERE symbol = ? AND timeframe = ? AND start_timestamp <= ? AND end_timestamp >= ?;
+                """,
+                (symbol, timeframe, end_timestamp + 1, start_timestamp - 1),
+            ).fetchall()
+            merged_start = min([start_timestamp, *(int(row[0]) for row in rows)])
+            merged_end = max([end_timestamp, *(int(row[1]) for row in rows)])
+            tx.execute(
+                """
+                DELETE FROM candle_coverage
+                WHERE symbol = ? AND timeframe = ? AND start_timestamp <= ? AND end_timestamp >= ?;
+                """,
+                (symbol, timeframe, end_timestamp + 1, start_timestamp - 1),
+            )
+            tx.execute(
+                """
+                INSERT INTO candle_coverage(symbol, timeframe, start_timestamp, end_timestamp)
+                VALUES (?, ?, ?, ?);
+                """,
+                (symbol, timeframe, merged_start, merged_end),
+            )
+        return merged_start, merged_end
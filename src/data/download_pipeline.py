@@ -0,0 +1,397 @@
+"""Manifest-driven concurrent candle download with a single SQLite writer."""
+
+from __future__ import annotations
+
+import queue
+import threading
+import time
+from collections.abc import Callable, Mapping, Sequence
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any
+
+import yaml
+
+from src.data.storage import CandleFetcher, HistoricalCandleStorage, iter_gap_pages
+from src.data.storage_types import (
+    CandleDownloadPlan,
+    CandleDownloadRequest,
+    CandleDownloadResult,
+    FetchedCandlePage,
+    HistoricalDataStorageError,
+    RejectedCandleRow,
+)
+
+DEFAULT_DOWNLOAD_WORKERS = 4
+_QUEUE_POLL_SECONDS = 0.1
+
+
+class DownloadManifestError(HistoricalDataStorageError):
+    """Raised when a download manifest file is missing or malformed."""
+
+
+@dataclass(frozen=True)
+class DownloadManifest:
+    """Datasets to sync plus pipeline settings parsed from a manifest file."""
+
+    requests: tuple[CandleDownloadRequest, ...]
+    workers: int = DEFAULT_DOWNLOAD_WORKERS
+
+
+@dataclass(frozen=True)
+class DatasetDownloadReport:
+    """Per-dataset outcome of a manifest download."""
+
+    symbol: str
+    timeframe: str
+    downloaded_count: int
+    fetched_pages: int
+    elapsed_seconds: float
+    result: CandleDownloadResult | None = None
+    error: str | None = None
+
+    @property
+    def rows_per_second(self) -> float:
+        if self.elapsed_seconds <= 0:
+            return 0.0
+        return self.downloaded_count / self.elapsed_seconds
+
+
+@dataclass(frozen=True)
+class ManifestDownloadReport:
+    """Aggregate outcome of one concurrent manifest download."""
+
+    datasets: tuple[DatasetDownloadReport, ...]
+    elapsed_seconds: float
+    workers: int
+
+    @property
+    def downloaded_count(self) -> int:
+        return sum(item.downloaded_count for item in self.datasets)
+
+    @property
+    def fetched_pages(self) -> int:
+        return sum(item.fetched_pages for item in self.datasets)
+
+    @property
+    def failed(self) -> tuple[DatasetDownloadReport, ...]:
+        return tuple(item for item in self.datasets if item.error is not None)
+
+    @property
+    def rows_per_second(self) -> float:
+        if self.elapsed_seconds <= 0:
+            return 0.0
+        return self.downloaded_count / self.elapsed_seconds
+
+
+def load_download_manifest(
+    path: str | Path,
+    *,
+    default_start_timestamp: int,
+    default_end_timestamp: int,
+    default_batch_size: int = 500,
+) -> DownloadManifest:
+    """Parse a YAML manifest into download requests.
+
+    Supported keys: ``symbols`` x ``timeframes`` (cross product), explicit
+    ``datasets`` entries (``symbol`` + ``timeframe``/``timeframes``, optional
+    ``start_ms``/``end_ms``/``batch_size``), and top-level ``start_ms``,
+    ``end_ms``, ``batch_size`` and ``workers``.
+    """
+    manifest_path = Path(path).expanduser()
+    try:
+        payload = yaml.safe_load(manifest_path.read_text(encoding="utf-8")) or {}
+    except OSError as exc:
+        raise DownloadManifestError(f"cannot read manifest {manifest_path}: {exc}") from exc
+    except yaml.YAMLError as exc:
+        raise DownloadManifestError(f"invalid manifest YAML {manifest_path}: {exc}") from exc
+    if not isinstance(payload, Mapping):
+        raise DownloadManifestError("manifest must be a mapping")
+
+    start_ts = _manifest_int(payload, "start_ms", default_start_timestamp)
+    end_ts = _manifest_int(payload, "end_ms", default_end_timestamp)
+    batch_size = _manifest_int(payload, "batch_size", default_batch_size)
+    workers = _manifest_int(payload, "workers", DEFAULT_DOWNLOAD_WORKERS)
+    if workers <= 0:
+        raise DownloadManifestError("manifest.workers must be > 0")
+
+    entries: list[tuple[str, str, int, int, int]] = []
+    symbols = _manifest_str_list(payload, "symbols")
+    timeframes = _manifest_str_list(payload, "timeframes")
+    if symbols and not timeframes:
+        raise DownloadManifestError("manifest.timeframes is required when symbols are listed")
+    for symbol in symbols:
+        for timeframe in timeframes:
+            entries.append((symbol, timeframe, start_ts, end_ts, batch_size))
+
+    raw_datasets = payload.get("datasets") or []
+    if not isinstance(raw_datasets, list):
+        raise DownloadManifestError("manifest.datasets must be a list")
+    for index, item in enumerate(raw_datasets):
+        if not isinstance(item, Mapping):
+            raise DownloadManifestError(f"manifest.datasets[{index}] must be a mapping")
+        symbol = item.get("symbol")
+        if not isinstance(symbol, str) or not symbol.strip():
+            raise DownloadManifestError(f"manifest.datasets[{index}].symbol must not be empty")
+        item_timeframes = _manifest_str_list(item, "timeframes")
+        if isinstance(item.get("timeframe"), str):
+            item_timeframes.append(item["timeframe"])
+        if not item_timeframes:
+            raise DownloadManifestError(f"manifest.datasets[{index}] needs timeframe(s)")
+        for timeframe in item_timeframes:
+            entries.append(
+                (
+                    symbol,
+                    timeframe,
+                    _manifest_int(item, "start_ms", start_ts),
+                    _manifest_int(item, "end_ms", end_ts),
+                    _manifest_int(item, "batch_size", batch_size),
+                )
+            )
+
+    if not entries:
+        raise DownloadManifestError("manifest lists no datasets")
+
+    seen: set[tuple[str, str]] = set()
+    requests: list[CandleDownloadRequest] = []
+    for symbol, timeframe, entry_start, entry_end, entry_batch in entries:
+        key = (symbol.strip().upper(), timeframe.strip())
+        if key in seen:
+            continue
+        seen.add(key)
+        requests.append(
+            CandleDownloadRequest(
+                symbol=key[0],
+                timeframe=key[1],
+                start_timestamp=entry_start,
+                end_timestamp=entry_end,
+                batch_size=entry_batch,
+            )
+        )
+    return DownloadManifest(requests=tuple(requests), workers=workers)
+
+
+class ConcurrentCandleDownloader:
+    """Fan dataset downloads out to fetch workers and persist pages on one writer.
+
+    Worker threads only talk to the exchange (each through its own fetcher from
+    ``fetcher_factory``; share one ``RequestRateLimiter`` across them to keep a
+    global request budget). Fetched pages flow through a bounded queue to the
+    calling thread, which is the only one touching SQLite, so the writer
+    connection never crosses threads and inserts overlap with network waits.
+    """
+
+    def __init__(
+        self,
+        storage: HistoricalCandleStorage,
+        fetcher_factory: Callable[[], CandleFetcher],
+        *,
+        workers: int = DEFAULT_DOWNLOAD_WORKERS,
+        queue_size: int = 64,
+        on_progress: Callable[[DatasetDownloadReport], None] | None = None,
+    ) -> None:
+        if not isinstance(workers, int) or isinstance(workers, bool) or workers <= 0:
+            raise HistoricalDataStorageError("workers must be a positive integer")
+        if queue_size <= 0:
+            raise HistoricalDataStorageError("queue_size must be > 0")
+        self._storage = storage
+        self._fetcher_factory = fetcher_factory
+        self._workers = workers
+        self._queue_size = queue_size
+        self._on_progress = on_progress
+
+    def run(self, requests: Sequence[CandleDownloadRequest]) -> ManifestDownloadReport:
+        started_at = time.perf_counter()
+        reports: dict[int, DatasetDownloadReport] = {}
+        jobs: queue.Queue[tuple[int, CandleDownloadPlan]] = queue.Queue()
+
+        # Coverage is planned up front on the writer thread.
+        for index, request in enumerate(requests):
+            try:
+                plan = self._storage.plan_download(request)
+            except HistoricalDataStorageError as exc:
+                self._finish(
+                    reports,
+                    index,
+                    DatasetDownloadReport(
+                        symbol=request.symbol,
+                        timeframe=request.timeframe,
+                        downloaded_count=0,
+                        fetched_pages=0,
+                        elapsed_seconds=0.0,
+                        error=str(exc),
+                    ),
+                )
+                continue
+            jobs.put((index, plan))
+
+        worker_count = min(self._workers, max(jobs.qsize(), 1))
+        pages: queue.Queue[_PipelineEvent] = queue.Queue(maxsize=self._queue_size)
+        stop = threading.Event()
+        threads = [
+            threading.Thread(
+                target=self._fetch_worker,
+                args=(jobs, pages, stop),
+                name=f"candle-fetch-{number}",
+                daemon=True,
+            )
+            for number in range(worker_count)
+        ]
+        for thread in threads:
+            thread.start()
+
+        plans: dict[int, CandleDownloadPlan] = {}
+        downloaded: dict[int, int] = {}
+        fetched: dict[int, int] = {}
+        rejected: dict[int, list[RejectedCandleRow]] = {}
+        write_errors: dict[int, str] = {}
+        finished_workers = 0
+        try:
+            while finished_workers < worker_count:
+                event = pages.get()
+                if event.kind == "worker_done":
+                    finished_workers += 1
+                    continue
+                index = event.index
+                if event.kind == "start":
+                    plans[index] = event.plan
+                    downloaded[index] = 0
+                    fetched[index] = 0
+                    rejected[index] = []
+                    continue
+                if event.kind == "page":
+                    fetched[index] += 1
+                    if index in write_errors:
+                        continue
+                    try:
+                        stored = self._storage.store_page(plans[index], event.page)
+                        downloaded[index] += stored.inserted_count
+                        rejected[index].extend(stored.rejected)
+                    except HistoricalDataStorageError as exc:
+                        write_errors[index] = str(exc)
+                    continue
+                # dataset finished (successfully or with a fetch error)
+                plan = plans[index]
+                error = event.error or write_errors.get(index)
+                result = None
+                if error is None:
+                    result = self._storage.summarize_download(
+                        plan,
+                        downloaded_count=downloaded[index],
+                        fetched_pages=fetched[index],
+                        rejected_rows=tuple(rejected[index]),
+                    )
+                self._finish(
+                    reports,
+                    index,
+                    DatasetDownloadReport(
+                        symbol=plan.symbol,
+                        timeframe=plan.timeframe,
+                        downloaded_count=downloaded[index],
+                        fetched_pages=fetched[index],
+                        elapsed_seconds=event.elapsed_seconds,
+                        result=result,
+                        error=error,
+                    ),
+                )
+        finally:
+            stop.set()
+            for thread in threads:
+                thread.join()
+
+        return ManifestDownloadReport(
+            datasets=tuple(reports[index] for index in sorted(reports)),
+            elapsed_seconds=time.perf_counter() - started_at,
+            workers=worker_count,
+        )
+
+    def _fetch_worker(
+        self,
+        jobs: queue.Queue[tuple[int, CandleDownloadPlan]],
+        pages: queue.Queue[_PipelineEvent],
+        stop: threading.Event,
+    ) -> None:
+        try:
+            fetcher = self._fetcher_factory()
+            while not stop.is_set():
+                try:
+                    index, plan = jobs.get_nowait()
+                except queue.Empty:
+                    break
+                started_at = time.perf_counter()
+                error: str | None = None
+                if not self._put(pages, _PipelineEvent("start", index, plan=plan), stop):
+                    return
+                try:
+                    for page in iter_gap_pages(fetcher, plan):
+                        if not self._put(pages, _PipelineEvent("page", index, page=page), stop):
+                            return
+                except Exception as exc:  # noqa: BLE001 - reported per dataset
+                    error = f"{exc.__class__.__name__}: {exc}"
+                done = _PipelineEvent(
+                    "done",
+                    index,
+                    error=error,
+                    elapsed_seconds=time.perf_counter() - started_at,
+                )
+                if not self._put(pages, done, stop):
+                    return
+        except Exception as exc:  # noqa: BLE001 - fetcher construction failure
+            # Drain remaining jobs as failed so the writer still terminates.
+            while True:
+                try:
+                    index, plan = jobs.get_nowait()
+                except queue.Empty:
+                    break
+                self._put(pages, _PipelineEvent("start", index, plan=plan), stop)
+                self._put(pages, _PipelineEvent("done", index, error=str(exc)), stop)
+        finally:
+            self._put(pages, _PipelineEvent("worker_done", -1), stop)
+
+    @staticmethod
+    def _put(pages: queue.Queue[_PipelineEvent], event: _PipelineEvent, stop: threading.Event) -> bool:
+        while not stop.is_set():
+            try:
+                pages.put(event, timeout=_QUEUE_POLL_SECONDS)
+                return True
+            except queue.Full:
+                continue
+        return False
+
+    def _finish(
+        self,
+        reports: dict[int, DatasetDownloadReport],
+        index: int,
+        report: DatasetDownloadReport,
+    ) -> None:
+        reports[index] = report
+        if self._on_progress is not None:
+            self._on_progress(report)
+
+
+@dataclass(frozen=True)
+class _PipelineEvent:
+    kind: str
+    index: int
+    plan: CandleDownloadPlan | None = None
+    page: FetchedCandlePage | None = None
+    error: str | None = None
+    elapsed_seconds: float = 0.0
+
+
+def _manifest_int(payload: Mapping[str, Any], key: str, default: int) -> int:
+    value = payload.get(key, default)
+    if value is None:
+        return default
+    if not isinstance(value, int) or isinstance(value, bool) or value < 0:
+        raise DownloadManifestError(f"manifest.{key} must be a non-negative integer")
+    return value
+
+
+def _manifest_str_list(payload: Mapping[str, Any], key: str) -> list[str]:
+    value = payload.get(key) or []
+    if isinstance(value, str):
+        value = [value]
+    if not isinstance(value, list) or not all(isinstance(item, str) and item.strip() for item in value):
+        raise DownloadManifestError(f"manifest.{key} must be a list of non-empty strings")
+    return [item.strip() for item in value]
@@ -2,19 +2,100 @@
 
 from __future__ import annotations
 
+import datetime as dt
+from collections.abc import Callable, Iterator, Mapping, Sequence
 from dataclasses import dataclass
+from pathlib import Path
 
 import backtrader as bt
+import numpy as np
 import pandas as pd
 
 from src.core.database import SQLiteDatabase
+from src.data.candle_batch import CandleBatch
+from src.data.candle_schema import dataset_version
+from src.data.columnar_store import ColumnarCandleColumns, ColumnarCandleStore, ColumnarStoreError
+from src.data.frame_cache import DataFrameLRUCache, FrameCacheKey
+from src.data.rollup import ROLLUP_SOURCE_TIMEFRAME, CandleRollupEngine, CandleRollupError
+from src.data.storage import iter_candle_batches, load_symbol_candle_batches
+from src.data.timeframe_metrics import parse_timeframe
 from src.utils.config_defaults import ALLOWED_TIMEFRAMES
 
+DEFAULT_STREAM_CHUNK_ROWS = 50_000
+# Backtrader's float day number of 1970-01-01, so epoch milliseconds map with one multiply-add.
+EPOCH_DATENUM = bt.date2num(dt.datetime(1970, 1, 1))
+MS_PER_DAY = 86_400_000
+
 
 class SQLiteFeedError(RuntimeError):
     """Raised when SQLite candle data cannot be transformed into a feed."""
 
 
+class StreamingCandleFeed(bt.feed.DataBase):
+    """Backtrader feed that pulls candle batches lazily instead of preloading a dataframe.
+
+    ``batches`` is a zero-argument callable returning an iterator of
+    :class:`CandleBatch`; only the current batch is held, so memory stays flat
+    when Cerebro runs with ``preload=False`` and ``exactbars``.
+    """
+
+    params = (("batches", None),)
+
+    def start(self) -> None:
+        super().start()
+        self._batches = iter(self.p.batches())
+        self._columns: tuple[np.ndarray, ...] = ()
+        self._position = 0
+        self._size = 0
+        self.rows_loaded = 0
+
+    def stop(self) -> None:
+        close = getattr(self._batches, "close", None)
+        if close is not None:
+            close()
+        super().stop()
+
+    def _load(self) -> bool:
+        while self._position >= self._size:
+            batch = next(self._batches, None)
+            if batch is None:
+                return False
+            # Kept as NumPy columns: a chunk of Python floats would cost ~4x the memory.
+            self._columns = (
+                batch.timestamp / MS_PER_DAY + EPOCH_DATENUM,
+                batch.open,
+                batch.high,
+                batch.low,
+                batch.close,
+                batch.volume,
+            )
+            self._position = 0
+            self._size = len(batch)
+        position = self._position
+        self._position += 1
+        self.rows_loaded += 1
+        datenum, open_, high, low, close, volume = self._columns
+        lines = self.lines
+        lines.datetime[0] = float(datenum[position])
+        lines.open[0] = float(open_[position])
+        lines.high[0] = float(high[position])
+        lines.low[0] = float(low[position])
+        lines.close[0] = float(close[position])
+        lines.volume[0] = float(volume[position])
+        lines.openinterest[0] = 0.0
+        return True
+
+
+def _prepend_batch(first: CandleBatch, rest: Iterator[CandleBatch]) -> Iterator[CandleBatch]:
+    try:
+        yield first
+        yield from rest
+    finally:
+        close = getattr(rest, "close", None)
+        if close is not None:
+            close()
+
+
 @dataclass(frozen=True)
 class BacktestDataSlice:
     """SQLite candle-query request used by the backtest engine."""
@@ -28,40 +109,175 @@ class BacktestDataSlice:
 class SQLitePandasFeedFactory:
     """Build Pandas dataframe and Backtrader feed from SQLite candles."""
 
-    def __init__(self, database: SQLiteDatabase) -> None:
+    def __init__(self, database: SQLiteDatabase, *, frame_cache: DataFrameLRUCache | None = None) -> None:
         self._database = database
+        self._frame_cache = frame_cache
+
+    @property
+    def frame_cache(self) -> DataFrameLRUCache | None:
+        return self._frame_cache
 
     def load_dataframe(self, request: BacktestDataSlice) -> pd.DataFrame:
         """Load candles from SQLite and normalize to Backtrader-compatible dataframe."""
+        symbol, timeframe, start_ts, end_ts = self._normalize_request(request)
+        return self._cached_frame(
+            symbol,
+            timeframe,
+            start_ts,
+            end_ts,
+            source_timeframe=timeframe,
+            loader=lambda: self._query_dataframe(symbol, timeframe, start_ts, end_ts),
+        )
+
+    def _query_dataframe(self, symbol: str, timeframe: str, start_ts: int, end_ts: int) -> pd.DataFrame:
+        batches = list(
+            iter_candle_batches(self._database, symbol, timeframe, start_ts, end_ts, trusted=True)
+        )
+        if not batches:
+            return pd.DataFrame(columns=["open", "high", "low", "close", "volume"])
+        return self._frame_from_columns(
+            timestamp=np.concatenate([batch.timestamp for batch in batches]),
+            columns={
+                name: np.concatenate([getattr(batch, name) for batch in batches])
+                for name in ("open", "high", "low", "close", "volume")
+            },
+        )
+
+    def load_symbol_dataframes(
+        self,
+        symbols: Sequence[str],
+        timeframe: str,
+        start_timestamp: int,
+        end_timestamp: int,
+    ) -> dict[str, pd.DataFrame]:
+        """Load several symbols of one timeframe with a single SQL query (frame cache bypassed)."""
+        normalized = self._normalize_symbols(symbols, timeframe, start_timestamp, end_timestamp)
+        timeframe, start_ts, end_ts = normalized[0][1:]
+        batches = load_symbol_candle_batches(
+            self._database,
+            [symbol for symbol, *_ in normalized],
+            timeframe,
+            start_ts,
+            end_ts,
+        )
+        return {symbol: self._batch_to_frame(batch) for symbol, batch in batches.items()}
+
+    def iter_dataframes(
+        self,
+        request: BacktestDataSlice,
+        *,
+        chunk_rows: int = DEFAULT_STREAM_CHUNK_ROWS,
+    ) -> Iterator[pd.DataFrame]:
+        """Yield the requested candles as consecutive dataframe chunks (bounded memory)."""
+        for batch in self.iter_batches(request, chunk_rows=chunk_rows):
+            yield self._batch_to_frame(batch)
+
+    def iter_batches(
+        self,
+        request: BacktestDataSlice,
+        *,
+        chunk_rows: int = DEFAULT_STREAM_CHUNK_ROWS,
+    ) -> Iterator[CandleBatch]:
+        """Yield the requested candles as consecutive column batches (bounded memory)."""
+        symbol, timeframe, start_ts, end_ts = self._normalize_request(request)
+        yield from iter_candle_batches(
+            self._database,
+            symbol,
+            timeframe,
+            start_ts,
+            end_ts,
+            chunk_rows=chunk_rows,
+            trusted=True,
+        )
+
+    def build_streaming_feed(
+        self,
+        request: BacktestDataSlice,
+        *,
+        chunk_rows: int = DEFAULT_STREAM_CHUNK_ROWS,
+    ) -> StreamingCandleFeed:
+        """Feed that reads ``request`` batch by batch while Cerebro runs (see :class:`StreamingCandleFeed`).
+
+        The first batch is read up front so an empty slice fails here rather
+        than inside Cerebro's analyzers.
+        """
+        _, timeframe, _, _ = self._normalize_request(request)
+        bt_timeframe, compression = self._to_backtrader_timeframe(timeframe)
+        batches = self.iter_batches(request, chunk_rows=chunk_rows)
+        first = next(batches, None)
+        if first is None:
+            raise SQLiteFeedError("No candle data found in SQLite for the requested symbol/timeframe/time range")
+        return StreamingCandleFeed(
+            batches=lambda: _prepend_batch(first, batches),
+            timeframe=bt_timeframe,
+            compression=compression,
+        )
+
+    def _cached_frame(
+        self,
+        symbol: str,
+        timeframe: str,
+        start_ts: int,
+        end_ts: int,
+        *,
+        source_timeframe: str,
+        loader: Callable[[], pd.DataFrame],
+    ) -> pd.DataFrame:
+        """Serve a slice from the frame cache, keyed by the source dataset's version."""
+        database_key = str(self._database.database_path)
+        if self._frame_cache is None or database_key == ":memory:":
+            return loader()
+        with self._database.read() as conn:
+            version = dataset_version(conn, symbol, source_timeframe)
+        key = FrameCacheKey(database_key, symbol, timeframe, start_ts, end_ts, version)
+        frame = self._frame_cache.get(key)
+        if frame is None:
+            frame = loader()
+            self._frame_cache.put(key, frame)
+        # Shallow copy: callers may rename/reindex without touching the cached entry.
+        return frame.copy(deep=False)
+
+    @classmethod
+    def _batch_to_frame(cls, batch: CandleBatch) -> pd.DataFrame:
+        return cls._frame_from_columns(
+            timestamp=batch.timestamp,
+            columns={
+                "open": batch.open,
+                "high": batch.high,
+                "low": batch.low,
+                "close": batch.close,
+                "volume": batch.volume,
+            },
+        )
+
+    @staticmethod
+    def _frame_from_columns(*, timestamp: np.ndarray, columns: dict[str, np.ndarray]) -> pd.DataFrame:
+        index = pd.DatetimeIndex(pd.to_datetime(timestamp, unit="ms", utc=True), name="datetime")
+        return pd.DataFrame(columns, index=index, copy=False)
+
+    def _normalize_request(self, request: BacktestDataSlice) -> tuple[str, str, int, int]:
         symbol = self._normalize_symbol(request.symbol)
         timeframe = self._normalize_timeframe(request.timeframe)
         start_ts = self._normalize_timestamp(request.start_timestamp, "start_timestamp")
         end_ts = self._normalize_timestamp(request.end_timestamp, "end_timestamp")
         if start_ts > end_ts:
             raise SQLiteFeedError("start_timestamp must be <= end_timestamp")
+        return symbol, timeframe, start_ts, end_ts
 
-        with self._database.transaction() as tx:
-            rows = tx.execute(
-                """
-                SELECT timestamp, open, high, low, close, volume
-                FROM candles
-                WHERE symbol = ? AND timeframe = ? AND timestamp >= ? AND timestamp <= ?
-                ORDER BY timestamp ASC;
-                """,
-                (symbol, timeframe, start_ts, end_ts),
-            ).fetchall()
-
-        if not rows:
-            return pd.DataFrame(columns=["open", "high", "low", "close", "volume"])
-
-        frame = pd.DataFrame.from_records(
-            rows,
-            columns=["timestamp", "open", "high", "low", "close", "volume"],
-        )
-        frame["datetime"] = pd.to_datetime(frame["timestamp"], unit="ms", utc=True)
-        frame = frame.drop(columns=["timestamp"])
-        frame = frame.set_index("datetime")
-        return frame[["open", "high", "low", "close", "volume"]]
+    def _normalize_symbols(
+        self,
+        symbols: Sequence[str],
+        timeframe: str,
+        start_timestamp: int,
+        end_timestamp: int,
+    ) -> list[tuple[str, str, int, int]]:
+        if not symbols:
+            raise SQLiteFeedError("symbols must not be empty")
+        normalized = [
+            self._normalize_request(BacktestDataSlice(symbol, timeframe, start_timestamp, end_timestamp))
+            for symbol in symbols
+        ]
+        return list({item[0]: item for item in normalized}.values())
 
     def build_feed(self, dataframe: pd.DataFrame, timeframe: str) -> bt.feeds.PandasData:
         """Create Backtrader PandasData feed with mapped timeframe/compression."""
@@ -99,16 +315,225 @@ class SQLitePandasFeedFactory:
 
     @staticmethod
     def _to_backtrader_timeframe(timeframe: str) -> tuple[int, int]:
-        if timeframe == "1m":
-            return bt.TimeFrame.Minutes, 1
-        if timeframe == "5m":
-            return bt.TimeFrame.Minutes, 5
-        if timeframe == "15m":
-            return bt.TimeFrame.Minutes, 15
-        if timeframe == "1h":
-            return bt.TimeFrame.Minutes, 60
-        if timeframe == "4h":
-            return bt.TimeFrame.Minutes, 240
-        if timeframe == "1d":
-            return bt.TimeFrame.Days, 1
-        raise SQLiteFeedError(f"unsupported timeframe mapping: {timeframe}")
+        try:
+            amount, unit = parse_timeframe(timeframe)
+        except ValueError as exc:
+            raise SQLiteFeedError(f"unsupported timeframe mapping: {timeframe}") from exc
+        if unit == "m":
+            return bt.TimeFrame.Minutes, amount
+        if unit == "h":
+            return bt.TimeFrame.Minutes, 60 * amount
+        if unit == "d":
+            return bt.TimeFrame.Days, amount
+        return bt.TimeFrame.Weeks, amount
+
+
+class ColumnarPandasFeedFactory(SQLitePandasFeedFactory):
+    """Build dataframes from memory-mapped column files instead of SQL scans.
+
+    With ``auto_sync`` the store is synced before each load. That costs one
+    ``dataset_versions`` lookup while nothing was written, and a tail append
+    otherwise. SQLite remains the source of truth. Prefix changes are detected
+    from row counts and timestamps, so in-place price corrections of already
+    mirrored candles are only picked up by ``sync-columnar --rebuild``.
+    """
+
+    def __init__(
+        self,
+        database: SQLiteDatabase,
+        columnar_dir: str | Path,
+        *,
+        auto_sync: bool = True,
+    ) -> None:
+        super().__init__(database)
+        self._store = ColumnarCandleStore(columnar_dir, database)
+        self._auto_sync = auto_sync
+
+    @property
+    def store(self) -> ColumnarCandleStore:
+        return self._store
+
+    def load_symbol_dataframes(
+        self,
+        symbols: Sequence[str],
+        timeframe: str,
+        start_timestamp: int,
+        end_timestamp: int,
+    ) -> dict[str, pd.DataFrame]:
+        """Column files are per dataset, so each symbol is sliced from its own store."""
+        return {
+            symbol: self.load_dataframe(BacktestDataSlice(symbol, timeframe, start_ts, end_ts))
+            for symbol, timeframe, start_ts, end_ts in self._normalize_symbols(
+                symbols, timeframe, start_timestamp, end_timestamp
+            )
+        }
+
+    def load_dataframe(self, request: BacktestDataSlice) -> pd.DataFrame:
+        """Slice columns by timestamp with binary search and wrap them without copying."""
+        symbol, timeframe, start_ts, end_ts = self._normalize_request(request)
+        columns = self._load_columns(symbol, timeframe, start_ts, end_ts)
+        if len(columns) == 0:
+            return pd.DataFrame(columns=["open", "high", "low", "close", "volume"])
+
+        return self._frame_from_columns(
+            timestamp=columns.timestamp,
+            columns={
+                "open": columns.open,
+                "high": columns.high,
+                "low": columns.low,
+                "close": columns.close,
+                "volume": columns.volume,
+            },
+        )
+
+    def iter_batches(
+        self,
+        request: BacktestDataSlice,
+        *,
+        chunk_rows: int = DEFAULT_STREAM_CHUNK_ROWS,
+    ) -> Iterator[CandleBatch]:
+        """Chunk the memory-mapped columns; pages are only faulted in as each chunk is read."""
+        symbol, timeframe, start_ts, end_ts = self._normalize_request(request)
+        columns = self._load_columns(symbol, timeframe, start_ts, end_ts)
+        batch = CandleBatch(
+            symbol=symbol,
+            timeframe=timeframe,
+            timestamp=columns.timestamp,
+            open=columns.open,
+            high=columns.high,
+            low=columns.low,
+            close=columns.close,
+            volume=columns.volume,
+        )
+        yield from batch.chunks(chunk_rows)
+
+    def _load_columns(self, symbol: str, timeframe: str, start_ts: int, end_ts: int) -> ColumnarCandleColumns:
+        try:
+            if self._auto_sync:
+                self._store.sync(symbol, timeframe)
+            return self._store.load_columns(symbol, timeframe, start_ts, end_ts)
+        except ColumnarStoreError as exc:
+            raise SQLiteFeedError(str(exc)) from exc
+
+
+class RollupPandasFeedFactory(SQLitePandasFeedFactory):
+    """Serve any ``<n>m/h/d/w`` timeframe from stored 1m candles via incremental rollups.
+
+    1m requests read raw candles; coarser ones register the rollup target on
+    first use and refresh only its dirty buckets before each load.
+    """
+
+    def __init__(self, database: SQLiteDatabase, *, frame_cache: DataFrameLRUCache | None = None) -> None:
+        super().__init__(database, frame_cache=frame_cache)
+        self._engine = CandleRollupEngine(database)
+
+    @property
+    def engine(self) -> CandleRollupEngine:
+        return self._engine
+
+    def load_dataframe(self, request: BacktestDataSlice) -> pd.DataFrame:
+        symbol, timeframe, start_ts, end_ts = self._normalize_request(request)
+        if timeframe == ROLLUP_SOURCE_TIMEFRAME:
+            return super().load_dataframe(request)
+        # Rollups only change when their 1m source does, so its version keys the cache.
+        return self._cached_frame(
+            symbol,
+            timeframe,
+            start_ts,
+            end_ts,
+            source_timeframe=ROLLUP_SOURCE_TIMEFRAME,
+            loader=lambda: self._load_rollup_frame(symbol, timeframe, start_ts, end_ts),
+        )
+
+    def load_symbol_dataframes(
+        self,
+        symbols: Sequence[str],
+        timeframe: str,
+        start_timestamp: int,
+        end_timestamp: int,
+    ) -> dict[str, pd.DataFrame]:
+        """Rollups refresh per dataset, so each symbol goes through :meth:`load_dataframe`."""
+        return {
+            symbol: self.load_dataframe(BacktestDataSlice(symbol, timeframe, start_ts, end_ts))
+            for symbol, timeframe, start_ts, end_ts in self._normalize_symbols(
+                symbols, timeframe, start_timestamp, end_timestamp
+            )
+        }
+
+    def iter_batches(
+        self,
+        request: BacktestDataSlice,
+        *,
+        chunk_rows: int = DEFAULT_STREAM_CHUNK_ROWS,
+    ) -> Iterator[CandleBatch]:
+        """1m streams from SQLite; coarser targets are refreshed and read whole, then chunked."""
+        symbol, timeframe, start_ts, end_ts = self._normalize_request(request)
+        if timeframe == ROLLUP_SOURCE_TIMEFRAME:
+            yield from super().iter_batches(request, chunk_rows=chunk_rows)
+            return
+        yield from self._load_rollup_batch(symbol, timeframe, start_ts, end_ts).chunks(chunk_rows)
+
+    def _load_rollup_batch(self, symbol: str, timeframe: str, start_ts: int, end_ts: int) -> CandleBatch:
+        try:
+            return self._engine.load_batch(symbol, timeframe, start_ts, end_ts)
+        except CandleRollupError as exc:
+            raise SQLiteFeedError(str(exc)) from exc
+
+    def _load_rollup_frame(self, symbol: str, timeframe: str, start_ts: int, end_ts: int) -> pd.DataFrame:
+        batch = self._load_rollup_batch(symbol, timeframe, start_ts, end_ts)
+        if len(batch) == 0:
+            return pd.DataFrame(columns=["open", "high", "low", "close", "volume"])
+        return self._batch_to_frame(batch)
+
+    @staticmethod
+    def _normalize_timeframe(timeframe: str) -> str:
+        if not timeframe or not timeframe.strip():
+            raise SQLiteFeedError("timeframe must not be empty")
+        normalized = timeframe.strip()
+        try:
+            parse_timeframe(normalized)
+        except ValueError as exc:
+            raise SQLiteFeedError(str(exc)) from exc
+        return normalized
+
+
+def align_symbol_frames(frames: Mapping[str, pd.DataFrame]) -> dict[str, pd.DataFrame]:
+    """Reindex per-symbol candles onto one shared timeline so their feeds advance in lockstep.
+
+    The timeline is the union of all timestamps, starting at the latest first
+    candle so every symbol has a price from bar one. A symbol missing a bar
+    gets a flat candle at its previous close with zero volume.
+    """
+    non_empty = {symbol: frame for symbol, frame in frames.items() if not frame.empty}
+    if len(non_empty) != len(frames):
+        missing = sorted(set(frames) - set(non_empty))
+        raise SQLiteFeedError(f"no candle data for symbols: {missing}")
+    if not frames:
+        return {}
+    first_common = max(frame.index[0] for frame in frames.values())
+    timeline = frames[next(iter(frames))].index
+    for frame in frames.values():
+        if not frame.index.equals(timeline):
+            timeline = timeline.union(frame.index)
+    timeline = timeline[timeline >= first_common]
+
+    aligned: dict[str, pd.DataFrame] = {}
+    for symbol, frame in frames.items():
+        if frame.index.equals(timeline):
+            aligned[symbol] = frame
+            continue
+        # Keep the last candle before the timeline so the first bar can carry its close.
+        expanded = frame.reindex(frame.index.union(timeline))
+        close = expanded["close"].ffill()
+        filled = pd.DataFrame(
+            {
+                "open": expanded["open"].fillna(close),
+                "high": expanded["high"].fillna(close),
+                "low": expanded["low"].fillna(close),
+                "close": close,
+                "volume": expanded["volume"].fillna(0.0),
+            },
+            index=expanded.index,
+        )
+        aligned[symbol] = filled.loc[timeline]
+    return aligned
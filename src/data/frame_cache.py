@@ -0,0 +1,153 @@
+"""Process-wide LRU cache of backtest dataframes, bounded by a byte budget.
+
+Entries are keyed by the dataset's write counter (``dataset_versions``), so a
+write through the candle helpers makes older slices unreachable; they are
+dropped as soon as a newer version of the same dataset is cached.
+"""
+
+from __future__ import annotations
+
+import threading
+from collections import OrderedDict
+from dataclasses import dataclass
+
+import pandas as pd
+
+DEFAULT_FRAME_CACHE_BYTES = 256 * 1024 * 1024
+
+
+@dataclass(frozen=True)
+class FrameCacheKey:
+    """Identity of one cached slice."""
+
+    database: str
+    symbol: str
+    timeframe: str
+    start_timestamp: int
+    end_timestamp: int
+    dataset_version: int
+
+    @property
+    def dataset(self) -> tuple[str, str, str]:
+        return self.database, self.symbol, self.timeframe
+
+
+@dataclass(frozen=True)
+class FrameCacheStats:
+    """Counters since the cache was created (or last cleared)."""
+
+    hits: int
+    misses: int
+    evictions: int
+    entries: int
+    current_bytes: int
+    max_bytes: int
+
+    @property
+    def hit_ratio(self) -> float:
+        lookups = self.hits + self.misses
+        return self.hits / lookups if lookups else 0.0
+
+    def to_dict(self) -> dict[str, float | int]:
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+            "entries": self.entries,
+            "current_bytes": self.current_bytes,
+            "max_bytes": self.max_bytes,
+            "hit_ratio": self.hit_ratio,
+        }
+
+
+class DataFrameLRUCache:
+    """Thread-safe LRU of dataframes; least recently used entries go first when over budget."""
+
+    def __init__(self, max_bytes: int = DEFAULT_FRAME_CACHE_BYTES) -> None:
+        self._lock = threading.Lock()
+        self._entries: OrderedDict[FrameCacheKey, tuple[pd.DataFrame, int]] = OrderedDict()
+        self._max_bytes = self._validate_budget(max_bytes)
+        self._current_bytes = 0
+        self._hits = 0
+        self._misses = 0
+        self._evictions = 0
+
+    @property
+    def max_bytes(self) -> int:
+        return self._max_bytes
+
+    def resize(self, max_bytes: int) -> None:
+        with self._lock:
+            self._max_bytes = self._validate_budget(max_bytes)
+            self._evict_over_budget()
+
+    def get(self, key: FrameCacheKey) -> pd.DataFrame | None:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                self._misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self._hits += 1
+            return entry[0]
+
+    def put(self, key: FrameCacheKey, frame: pd.DataFrame) -> None:
+        """Cache ``frame`` (treated as read-only) and drop older versions of its dataset."""
+        size = int(frame.memory_usage(index=True, deep=False).sum())
+        with self._lock:
+            stale = [
+                existing
+                for existing in self._entries
+                if existing.dataset == key.dataset and existing.dataset_version != key.dataset_version
+            ]
+            for existing in stale:
+                self._drop(existing)
+            if size > self._max_bytes:
+                return
+            if key in self._entries:
+                self._drop(key)
+            self._entries[key] = (frame, size)
+            self._current_bytes += size
+            self._evict_over_budget()
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+            self._current_bytes = 0
+            self._hits = self._misses = self._evictions = 0
+
+    def stats(self) -> FrameCacheStats:
+        with self._lock:
+            return FrameCacheStats(
+                hits=self._hits,
+                misses=self._misses,
+                evictions=self._evictions,
+                entries=len(self._entries),
+                current_bytes=self._current_bytes,
+                max_bytes=self._max_bytes,
+            )
+
+    def _evict_over_budget(self) -> None:
+        while self._current_bytes > self._max_bytes and self._entries:
+            self._drop(next(iter(self._entries)))
+
+    def _drop(self, key: FrameCacheKey) -> None:
+        _, size = self._entries.pop(key)
+        self._current_bytes -= size
+        self._evictions += 1
+
+    @staticmethod
+    def _validate_budget(max_bytes: int) -> int:
+        if not isinstance(max_bytes, int) or isinstance(max_bytes, bool) or max_bytes <= 0:
+            raise ValueError("max_bytes must be a positive integer")
+        return max_bytes
+
+
+_SHARED_CACHE = DataFrameLRUCache()
+
+
+def shared_frame_cache(max_bytes: int | None = None) -> DataFrameLRUCache:
+    """Return the process-wide cache, optionally resizing its budget."""
+    if max_bytes is not None and max_bytes != _SHARED_CACHE.max_bytes:
+        _SHARED_CACHE.resize(max_bytes)
+    return _SHARED_CACHE
@@ -0,0 +1,325 @@
+"""Stored-candle gap index (SQL ``LAG`` scan) and batched gap repair.
+
+``CandleGapScanner`` finds holes between consecutive stored bars with a window
+function, so timestamps never leave SQLite. Each dataset remembers the last
+timestamp it checked; later scans start there and only re-verify the gaps
+already on record. ``CandleGapRepairer`` refetches recorded gaps through the
+storage fetcher, merging nearby gaps into one paged request.
+"""
+
+from __future__ import annotations
+
+import sqlite3
+from collections.abc import Callable
+from dataclasses import dataclass
+
+from src.core.database import SQLiteDatabase
+from src.data.storage import HistoricalCandleStorage
+from src.data.storage_types import CandleDownloadRequest, HistoricalDataStorageError
+from src.data.timeframe_metrics import timeframe_to_milliseconds
+
+DEFAULT_MAX_REPAIR_ATTEMPTS = 3
+
+_GAP_QUERY = """
+    SELECT prev_timestamp, timestamp FROM (
+        SELECT timestamp, LAG(timestamp) OVER (ORDER BY timestamp) AS prev_timestamp
+        FROM candles
+        WHERE symbol = ? AND timeframe = ? AND timestamp >= ? AND timestamp <= ?
+    )
+    WHERE prev_timestamp IS NOT NULL AND timestamp - prev_timestamp >= ?;
+"""
+_MAX_TIMESTAMP = 2**63 - 1
+
+
+@dataclass(frozen=True)
+class CandleGap:
+    """Inclusive range of missing bar timestamps between two stored bars."""
+
+    symbol: str
+    timeframe: str
+    start_timestamp: int
+    end_timestamp: int
+    missing_bars: int
+    repair_attempts: int = 0
+
+
+@dataclass(frozen=True)
+class GapScanResult:
+    symbol: str
+    timeframe: str
+    scanned_from: int | None
+    checked_until: int | None
+    new_gaps: int
+    open_gaps: int
+    missing_bars: int
+
+
+@dataclass(frozen=True)
+class GapRepairResult:
+    symbol: str
+    timeframe: str
+    attempted_gaps: int
+    fetch_windows: int
+    fetched_pages: int
+    inserted_count: int
+    repaired_gaps: int
+    remaining_gaps: int
+
+
+class CandleGapScanner:
+    """Maintain ``candle_gaps`` for stored datasets."""
+
+    def __init__(self, database: SQLiteDatabase) -> None:
+        self._database = database
+
+    def list_datasets(self) -> list[tuple[str, str]]:
+        with self._database.read() as conn:
+            rows = conn.execute(
+                "SELECT DISTINCT symbol, timeframe FROM candles ORDER BY symbol, timeframe;"
+            ).fetchall()
+        return [(str(row[0]), str(row[1])) for row in rows]
+
+    def scan(self, symbol: str, timeframe: str, *, full: bool = False) -> GapScanResult:
+        """Record new gaps after the last checked timestamp (or everywhere when ``full``)."""
+        interval_ms = timeframe_to_milliseconds(timeframe)
+        with self._database.transaction() as tx:
+            if full:
+                tx.execute(
+                    "DELETE FROM candle_gaps WHERE symbol = ? AND timeframe = ?;",
+                    (symbol, timeframe),
+                )
+                scanned_from = None
+            else:
+                scanned_from = self._checked_until(tx, symbol, timeframe)
+                # Downloads may have filled recorded gaps since the last scan.
+                for gap in self._gaps(tx, symbol, timeframe):
+                    self._reverify(tx, gap, interval_ms, attempted=False)
+
+            lower = -1 if scanned_from is None else scanned_from
+            # The bar at ``lower`` is included, so a gap straddling it is found.
+            new_gaps = self._record(tx, symbol, timeframe, interval_ms, lower, _MAX_TIMESTAMP, attempts=0)
+            last = tx.execute(
+                "SELECT MAX(timestamp) FROM candles WHERE symbol = ? AND timeframe = ?;",
+                (symbol, timeframe),
+            ).fetchone()[0]
+            if last is not None:
+                tx.execute(
+                    """
+                    INSERT INTO candle_gap_scan_state(symbol, timeframe, checked_until)
+                    VALUES (?, ?, ?)
+                    ON CONFLICT(symbol, timeframe) DO UPDATE SET
+                        checked_until = excluded.checked_until,
+                        scanned_at = CURRENT_TIMESTAMP;
+                    """,
+                    (symbol, timeframe, int(last)),
+                )
+            gaps = self._gaps(tx, symbol, timeframe)
+        return GapScanResult(
+            symbol=symbol,
+            timeframe=timeframe,
+            scanned_from=scanned_from,
+            checked_until=None if last is None else int(last),
+            new_gaps=new_gaps,
+            open_gaps=len(gaps),
+            missing_bars=sum(gap.missing_bars for gap in gaps),
+        )
+
+    def list_gaps(
+        self,
+        symbol: str,
+        timeframe: str,
+        *,
+        max_attempts: int | None = None,
+    ) -> list[CandleGap]:
+        """Recorded gaps in time order, optionally only those tried fewer than ``max_attempts`` times."""
+        with self._database.read() as conn:
+            gaps = self._gaps(conn, symbol, timeframe)
+        if max_attempts is None:
+            return gaps
+        return [gap for gap in gaps if gap.repair_attempts < max_attempts]
+
+    def reverify_range(self, symbol: str, timeframe: str, start: int, end: int, *, attempted: bool) -> None:
+        """Recompute recorded gaps inside ``[start, end]`` after a refetch."""
+        interval_ms = timeframe_to_milliseconds(timeframe)
+        with self._database.transaction() as tx:
+            for gap in self._gaps(tx, symbol, timeframe):
+                if gap.start_timestamp <= end and gap.end_timestamp >= start:
+                    self._reverify(tx, gap, interval_ms, attempted=attempted)
+
+    def _reverify(self, conn: sqlite3.Connection, gap: CandleGap, interval_ms: int, *, attempted: bool) -> None:
+        filled = conn.execute(
+            """
+            SELECT COUNT(*) FROM candles
+            WHERE symbol = ? AND timeframe = ? AND timestamp >= ? AND timestamp <= ?;
+            """,
+            (gap.symbol, gap.timeframe, gap.start_timestamp, gap.end_timestamp),
+        ).fetchone()[0]
+        if not filled and not attempted:
+            return
+        conn.execute(
+            "DELETE FROM candle_gaps WHERE symbol = ? AND timeframe = ? AND gap_start = ?;",
+            (gap.symbol, gap.timeframe, gap.start_timestamp),
+        )
+        # The bounding bars sit exactly one interval outside the recorded range.
+        self._record(
+            conn,
+            gap.symbol,
+            gap.timeframe,
+            interval_ms,
+            gap.start_timestamp - interval_ms,
+            gap.end_timestamp + interval_ms,
+            attempts=gap.repair_attempts + (1 if attempted else 0),
+        )
+
+    @staticmethod
+    def _record(
+        conn: sqlite3.Connection,
+        symbol: str,
+        timeframe: str,
+        interval_ms: int,
+        lower: int,
+        upper: int,
+        *,
+        attempts: int,
+    ) -> int:
+        rows = conn.execute(_GAP_QUERY, (symbol, timeframe, lower, upper, 2 * interval_ms)).fetchall()
+        payload = []
+        for prev_timestamp, timestamp in rows:
+            gap_start = int(prev_timestamp) + interval_ms
+            gap_end = int(timestamp) - interval_ms
+            missing = (gap_end - gap_start) // interval_ms + 1
+            payload.append((symbol, timeframe, gap_start, gap_end, missing, attempts))
+        if not payload:
+            return 0
+        return conn.executemany(
+            """
+            INSERT OR IGNORE INTO candle_gaps(
+                symbol, timeframe, gap_start, gap_end, missing_bars, repair_attempts
+            )
+            VALUES (?, ?, ?, ?, ?, ?);
+            """,
+            payload,
+        ).rowcount
+
+    @staticmethod
+    def _checked_until(conn: sqlite3.Connection, symbol: str, timeframe: str) -> int | None:
+        row = conn.execute(
+            "SELECT checked_until FROM candle_gap_scan_state WHERE symbol = ? AND timeframe = ?;",
+            (symbol, timeframe),
+        ).fetchone()
+        return None if row is None else int(row[0])
+
+    @staticmethod
+    def _gaps(conn: sqlite3.Connection, symbol: str, timeframe: str) -> list[CandleGap]:
+        rows = conn.execute(
+            """
+            SELECT gap_start, gap_end, missing_bars, repair_attempts
+            FROM candle_gaps WHERE symbol = ? AND timeframe = ?
+            ORDER BY gap_start ASC;
+            """,
+            (symbol, timeframe),
+        ).fetchall()
+        return [
+            CandleGap(
+                symbol=symbol,
+                timeframe=timeframe,
+                start_timestamp=int(row[0]),
+                end_timestamp=int(row[1]),
+                missing_bars=int(row[2]),
+                repair_attempts=int(row[3]),
+            )
+            for row in rows
+        ]
+
+
+def merge_gap_windows(gaps: list[CandleGap], *, interval_ms: int, batch_size: int) -> list[tuple[int, int]]:
+    """Group time-ordered gaps into fetch windows spanning at most ``batch_size`` bars.
+
+    A gap longer than one page becomes its own window (paged by the fetcher);
+    short neighbours share one request instead of one each.
+    """
+    windows: list[tuple[int, int]] = []
+    span_limit = batch_size * interval_ms
+    for gap in gaps:
+        if windows:
+            start, end = windows[-1]
+            if gap.end_timestamp - start < span_limit:
+                windows[-1] = (start, max(end, gap.end_timestamp))
+                continue
+        windows.append((gap.start_timestamp, gap.end_timestamp))
+    return windows
+
+
+class CandleGapRepairer:
+    """Refetch recorded gaps through ``HistoricalCandleStorage`` and re-verify them."""
+
+    def __init__(
+        self,
+        storage: HistoricalCandleStorage,
+        scanner: CandleGapScanner,
+        *,
+        max_attempts: int = DEFAULT_MAX_REPAIR_ATTEMPTS,
+        on_window: Callable[[str, str, int, int], None] | None = None,
+    ) -> None:
+        if max_attempts <= 0:
+            raise HistoricalDataStorageError("max_attempts must be > 0")
+        self._storage = storage
+        self._scanner = scanner
+        self._max_attempts = max_attempts
+        self._on_window = on_window
+
+    def repair(
+        self,
+        symbol: str,
+        timeframe: str,
+        *,
+        batch_size: int = 500,
+        max_gaps: int | None = None,
+    ) -> GapRepairResult:
+        """Refetch gaps tried fewer than ``max_attempts`` times; holes the exchange
+        cannot fill (e.g. trading halts) stop being retried once the cap is hit."""
+        if batch_size <= 0:
+            raise HistoricalDataStorageError("batch_size must be > 0")
+        interval_ms = timeframe_to_milliseconds(timeframe)
+        gaps = self._scanner.list_gaps(symbol, timeframe, max_attempts=self._max_attempts)
+        if max_gaps is not None:
+            gaps = gaps[:max_gaps]
+
+        windows = merge_gap_windows(gaps, interval_ms=interval_ms, batch_size=batch_size)
+        fetched_pages = inserted = 0
+        for start, end in windows:
+            if self._on_window is not None:
+                self._on_window(symbol, timeframe, start, end)
+            result = self._storage.download_and_store(
+                CandleDownloadRequest(
+                    symbol=symbol,
+                    timeframe=timeframe,
+                    start_timestamp=start,
+                    end_timestamp=end,
+                    batch_size=batch_size,
+                ),
+                ignore_coverage=True,
+            )
+            fetched_pages += result.fetched_pages
+            inserted += result.downloaded_count
+            self._scanner.reverify_range(symbol, timeframe, start, end, attempted=True)
+
+        remaining = self._scanner.list_gaps(symbol, timeframe)
+        repaired = sum(
+            1
+            for gap in gaps
+            if not any(
+                other.start_timestamp <= gap.end_timestamp and other.end_timestamp >= gap.start_timestamp
+                for other in remaining
+            )
+        )
+        return GapRepairResult(
+            symbol=symbol,
+            timeframe=timeframe,
+            attempted_gaps=len(gaps),
+            fetch_windows=len(windows),
+            fetched_pages=fetched_pages,
+            inserted_count=inserted,
+            repaired_gaps=repaired,
+            remaining_gaps=len(remaining),
+        )
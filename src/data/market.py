@@ -101,7 +101,9 @@ class MarketDataFetcher:
         *,
         exchange_factory: Callable[..., ExchangeClient] = create_exchange_client,
         sleep_fn: Callable[[float], None] = time.sleep,
+        rate_limiter: RequestRateLimiter | None = None,
     ) -> "MarketDataFetcher":
+        """Build a fetcher from config; pass ``rate_limiter`` to share one request budget."""
         settings = read_exchange_settings(config)
         retry_policy = read_retry_policy(config)
         runtime_write_target = read_runtime_write_target(config)
@@ -113,10 +115,11 @@ class MarketDataFetcher:
             api_key=settings.api_key,
             api_secret=settings.api_secret,
         )
-        rate_limiter = RequestRateLimiter(
-            enabled=settings.enable_rate_limit,
-            min_interval_ms=float(getattr(exchange, "rateLimit", 0) or 0.0),
-        )
+        if rate_limiter is None:
+            rate_limiter = RequestRateLimiter(
+                enabled=settings.enable_rate_limit,
+                min_interval_ms=float(getattr(exchange, "rateLimit", 0) or 0.0),
+            )
         return cls(
             exchange=exchange,
             retry_policy=retry_policy,
@@ -151,6 +154,10 @@ class MarketDataFetcher:
     def runtime_write_target(self) -> str:
         return self._runtime_write_target
 
+    @property
+    def rate_limiter(self) -> RequestRateLimiter:
+        return self._rate_limiter
+
     def fetch_ticker(self, symbol: str) -> dict[str, Any]:
         validate_symbol(symbol)
         payload = self._request("fetch_ticker", symbol=symbol.strip())
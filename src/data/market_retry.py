@@ -2,6 +2,7 @@
 
 from __future__ import annotations
 
+import threading
 import time
 from typing import Callable
 
@@ -26,7 +27,12 @@ _NON_RETRYABLE_ERROR_NAMES = {
 
 
 class RequestRateLimiter:
-    """Simple local limiter used on top of exchange client settings."""
+    """Simple local limiter used on top of exchange client settings.
+
+    Thread-safe: concurrent callers reserve consecutive request slots under a
+    lock and sleep outside it, so one limiter can be shared as a global
+    request budget by several fetchers.
+    """
 
     def __init__(
         self,
@@ -40,6 +46,7 @@ class RequestRateLimiter:
         self._time_fn = time_fn
         self._sleep_fn = sleep_fn
         self._last_request_at: float | None = None
+        self._lock = threading.Lock()
 
     @property
     def min_interval_seconds(self) -> float:
@@ -48,14 +55,15 @@ class RequestRateLimiter:
     def wait(self) -> None:
         if not self._enabled:
             return
-        now = self._time_fn()
-        if self._last_request_at is None:
-            self._last_request_at = now
-            return
-        elapsed = now - self._last_request_at
-        if elapsed < self._min_interval_seconds:
-            self._sleep_fn(self._min_interval_seconds - elapsed)
-        self._last_request_at = self._time_fn()
+        with self._lock:
+            now = self._time_fn()
+            if self._last_request_at is None:
+                scheduled_at = now
+            else:
+                scheduled_at = max(now, self._last_request_at + self._min_interval_seconds)
+            self._last_request_at = scheduled_at
+        if scheduled_at > now:
+            self._sleep_fn(scheduled_at - now)
 
 
 def is_rate_limit_error(error: Exception) -> bool:
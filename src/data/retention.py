@@ -0,0 +1,237 @@
+"""Per-dataset candle retention with bounded delete batches.
+
+Each (symbol, timeframe) dataset is purged on its own, oldest bars first, in
+transactions of at most ``batch_rows`` rows with a pause between them. The
+write lock is therefore held for one small batch at a time and the live loop
+can commit in between. On the compact layout a batch is a contiguous primary
+key range of ``candle_bars``, so deletes touch neighbouring pages only.
+"""
+
+from __future__ import annotations
+
+import sqlite3
+import time
+from collections.abc import Callable, Iterable, Mapping, Sequence
+from dataclasses import dataclass
+from typing import Any
+
+from src.core.database import SQLiteDatabase
+from src.data.candle_schema import LAYOUT_LEGACY, bump_dataset_versions, candle_layout
+from src.data.rollup import ROLLUP_SOURCE_TIMEFRAME, mark_rollup_dirty
+from src.data.storage_types import HistoricalDataStorageError
+
+DAY_MS = 24 * 3_600_000
+WILDCARD = "*"
+DEFAULT_RETENTION_BATCH_ROWS = 5_000
+DEFAULT_RETENTION_PAUSE_MS = 50
+
+
+class RetentionPolicyError(HistoricalDataStorageError):
+    """Raised when a retention policy or purge setting is invalid."""
+
+
+@dataclass(frozen=True)
+class RetentionPolicy:
+    """Keep ``days`` of history for datasets matching ``symbol``/``timeframe`` (``*`` matches any)."""
+
+    days: int
+    symbol: str = WILDCARD
+    timeframe: str = WILDCARD
+
+    def matches(self, symbol: str, timeframe: str) -> bool:
+        return self.symbol in (WILDCARD, symbol) and self.timeframe in (WILDCARD, timeframe)
+
+    @property
+    def specificity(self) -> int:
+        return (self.symbol != WILDCARD) * 2 + (self.timeframe != WILDCARD)
+
+
+@dataclass(frozen=True)
+class DatasetPurgeResult:
+    symbol: str
+    timeframe: str
+    retention_days: int
+    cutoff_ms: int
+    deleted_rows: int
+    batches: int
+    max_lock_seconds: float
+    total_lock_seconds: float
+
+
+def retention_policies_from_config(entries: Sequence[Mapping[str, Any]] | None) -> list[RetentionPolicy]:
+    """Build policies from ``market_data.retention.policies`` entries."""
+    policies: list[RetentionPolicy] = []
+    for index, entry in enumerate(entries or ()):
+        if not isinstance(entry, Mapping):
+            raise RetentionPolicyError(f"retention policy #{index + 1} must be a mapping")
+        days = entry.get("days")
+        if not isinstance(days, int) or isinstance(days, bool) or days <= 0:
+            raise RetentionPolicyError(f"retention policy #{index + 1}: days must be an integer > 0")
+        symbol = str(entry.get("symbol") or WILDCARD).strip().upper() or WILDCARD
+        timeframe = str(entry.get("timeframe") or WILDCARD).strip() or WILDCARD
+        policies.append(RetentionPolicy(days=days, symbol=symbol, timeframe=timeframe))
+    return policies
+
+
+def resolve_retention_days(
+    policies: Iterable[RetentionPolicy],
+    symbol: str,
+    timeframe: str,
+    default_days: int | None = None,
+) -> int | None:
+    """Days to keep for one dataset: the most specific matching policy wins, else ``default_days``."""
+    best: RetentionPolicy | None = None
+    for policy in policies:
+        if policy.matches(symbol, timeframe) and (best is None or policy.specificity > best.specificity):
+            best = policy
+    return best.days if best is not None else default_days
+
+
+class CandleRetentionManager:
+    """Delete candles older than each dataset's retention window in small batches."""
+
+    def __init__(
+        self,
+        database: SQLiteDatabase,
+        *,
+        batch_rows: int = DEFAULT_RETENTION_BATCH_ROWS,
+        pause_seconds: float = DEFAULT_RETENTION_PAUSE_MS / 1000,
+        now_ms_fn: Callable[[], int] | None = None,
+        sleep_fn: Callable[[float], None] = time.sleep,
+    ) -> None:
+        if batch_rows <= 0:
+            raise RetentionPolicyError("batch_rows must be > 0")
+        if pause_seconds < 0:
+            raise RetentionPolicyError("pause_seconds must be >= 0")
+        self._database = database
+        self._batch_rows = batch_rows
+        self._pause_seconds = pause_seconds
+        self._now_ms_fn = now_ms_fn or (lambda: int(time.time() * 1000))
+        self._sleep_fn = sleep_fn
+
+    def list_datasets(self) -> list[tuple[str, str]]:
+        with self._database.read() as conn:
+            rows = conn.execute(
+                "SELECT DISTINCT symbol, timeframe FROM candles ORDER BY symbol, timeframe;"
+            ).fetchall()
+        return [(str(row[0]), str(row[1])) for row in rows]
+
+    def purge(
+        self,
+        policies: Sequence[RetentionPolicy] = (),
+        *,
+        default_days: int | None = None,
+        on_dataset: Callable[[DatasetPurgeResult], None] | None = None,
+    ) -> list[DatasetPurgeResult]:
+        """Apply retention to every stored dataset; datasets without a policy are kept."""
+        if default_days is not None and default_days <= 0:
+            raise RetentionPolicyError("days must be > 0")
+        now_ms = self._now_ms_fn()
+        results: list[DatasetPurgeResult] = []
+        for symbol, timeframe in self.list_datasets():
+            days = resolve_retention_days(policies, symbol, timeframe, default_days)
+            if days is None:
+                continue
+            result = self.purge_dataset(symbol, timeframe, now_ms - days * DAY_MS, retention_days=days)
+            results.append(result)
+            if on_dataset is not None:
+                on_dataset(result)
+        return results
+
+    def purge_dataset(
+        self,
+        symbol: str,
+        timeframe: str,
+        cutoff_ms: int,
+        *,
+        retention_days: int = 0,
+    ) -> DatasetPurgeResult:
+        """Delete bars with ``timestamp < cutoff_ms``, ``batch_rows`` per transaction."""
+        deleted = batches = 0
+        max_lock = total_lock = 0.0
+        while True:
+            if batches:
+                self._sleep_fn(self._pause_seconds)
+            started = time.perf_counter()
+            with self._database.transaction() as tx:
+                count = self._delete_batch(tx, symbol, timeframe, cutoff_ms)
+                if count == 0:
+                    self._trim_indexes(tx, symbol, timeframe, cutoff_ms)
+            elapsed = time.perf_counter() - started
+            max_lock = max(max_lock, elapsed)
+            total_lock += elapsed
+            if count == 0:
+                break
+            deleted += count
+            batches += 1
+        return DatasetPurgeResult(
+            symbol=symbol,
+            timeframe=timeframe,
+            retention_days=retention_days,
+            cutoff_ms=cutoff_ms,
+            deleted_rows=deleted,
+            batches=batches,
+            max_lock_seconds=max_lock,
+            total_lock_seconds=total_lock,
+        )
+
+    def _delete_batch(self, conn: sqlite3.Connection, symbol: str, timeframe: str, cutoff_ms: int) -> int:
+        timestamps = [
+            int(row[0])
+            for row in conn.execute(
+                """
+                SELECT timestamp FROM candles
+                WHERE symbol = ? AND timeframe = ? AND timestamp < ?
+                ORDER BY timestamp ASC LIMIT ?;
+                """,
+                (symbol, timeframe, cutoff_ms, self._batch_rows),
+            ).fetchall()
+        ]
+        if not timestamps:
+            return 0
+        lower, upper = timestamps[0], timestamps[-1]
+        if candle_layout(conn) == LAYOUT_LEGACY:
+            conn.execute(
+                """
+                DELETE FROM candles
+                WHERE symbol = ? AND timeframe = ? AND timestamp >= ? AND timestamp <= ?;
+                """,
+                (symbol, timeframe, lower, upper),
+            )
+        else:
+            # Bypass the view's per-row INSTEAD OF trigger with one key-range delete.
+            conn.execute(
+                """
+                DELETE FROM candle_bars
+                WHERE dataset_id = (SELECT dataset_id FROM datasets WHERE symbol = ? AND timeframe = ?)
+                  AND timestamp >= ? AND timestamp <= ?;
+                """,
+                (symbol, timeframe, lower, upper),
+            )
+        bump_dataset_versions(conn, [(symbol, timeframe)])
+        if timeframe == ROLLUP_SOURCE_TIMEFRAME:
+            mark_rollup_dirty(conn, symbol, timestamps)
+        return len(timestamps)
+
+    @staticmethod
+    def _trim_indexes(conn: sqlite3.Connection, symbol: str, timeframe: str, cutoff_ms: int) -> None:
+        """Forget coverage and gaps before the cutoff so a later download can refill the range."""
+        conn.execute(
+            "DELETE FROM candle_coverage WHERE symbol = ? AND timeframe = ? AND end_timestamp < ?;",
+            (symbol, timeframe, cutoff_ms),
+        )
+        conn.execute(
+            """
+            UPDATE candle_coverage SET start_timestamp = ?
+            WHERE symbol = ? AND timeframe = ? AND start_timestamp < ?;
+            """,
+            (cutoff_ms, symbol, timeframe, cutoff_ms),
+        )
+        conn.execute(
+            "DELETE FROM candle_download_cache WHERE symbol = ? AND timeframe = ? AND start_timestamp < ?;",
+            (symbol, timeframe, cutoff_ms),
+        )
+        conn.execute(
+            "DELETE FROM candle_gaps WHERE symbol = ? AND timeframe = ? AND gap_start < ?;",
+            (symbol, timeframe, cutoff_ms),
+        )
@@ -0,0 +1,345 @@
+"""Incremental higher-timeframe candles derived from stored 1m candles.
+
+A rollup target is a (symbol, timeframe) pair registered in
+``candle_rollup_targets``. Writers of 1m candles call ``mark_rollup_dirty`` in
+the same transaction, which records the affected target buckets in
+``candle_rollup_dirty``; ``CandleRollupEngine.refresh`` then recomputes only
+those buckets into ``candle_rollups``.
+
+Every stored bucket records how many 1m bars it was built from
+(``source_bars``). A bucket still being filled, or one with missing minutes,
+has fewer than :func:`expected_source_bars`; ``load_batch`` leaves such
+partial buckets out unless asked for them.
+"""
+
+from __future__ import annotations
+
+import sqlite3
+from collections.abc import Iterable
+from dataclasses import dataclass
+
+import numpy as np
+
+from src.core.database import SQLiteDatabase
+from src.data.candle_batch import CandleBatch
+from src.data.timeframe_metrics import (
+    parse_timeframe,
+    timeframe_alignment_offset,
+    timeframe_to_milliseconds,
+)
+
+ROLLUP_SOURCE_TIMEFRAME = "1m"
+DEFAULT_ROLLUP_CHUNK_ROWS = 50_000
+
+
+class CandleRollupError(RuntimeError):
+    """Raised when a rollup target is invalid or cannot be refreshed."""
+
+
+@dataclass(frozen=True)
+class RollupRefreshResult:
+    """Work done for one target by a refresh pass."""
+
+    symbol: str
+    timeframe: str
+    refreshed_buckets: int
+    written_bars: int
+    removed_bars: int
+
+
+def normalize_rollup_timeframe(timeframe: str) -> str:
+    """Validate a target timeframe: any ``<n>m/h/d/w`` coarser than 1m."""
+    try:
+        parse_timeframe(timeframe)
+    except ValueError as exc:
+        raise CandleRollupError(str(exc)) from exc
+    normalized = timeframe.strip()
+    if timeframe_to_milliseconds(normalized) <= timeframe_to_milliseconds(ROLLUP_SOURCE_TIMEFRAME):
+        raise CandleRollupError(f"rollup timeframe must be coarser than {ROLLUP_SOURCE_TIMEFRAME}")
+    return normalized
+
+
+def bucket_starts(timestamps: np.ndarray, timeframe: str) -> np.ndarray:
+    """Map millisecond timestamps to the start of their ``timeframe`` bucket."""
+    interval_ms = timeframe_to_milliseconds(timeframe)
+    offset = timeframe_alignment_offset(timeframe)
+    return (timestamps - offset) // interval_ms * interval_ms + offset
+
+
+def expected_source_bars(timeframe: str) -> int:
+    """Number of 1m bars in a complete ``timeframe`` bucket."""
+    return timeframe_to_milliseconds(timeframe) // timeframe_to_milliseconds(ROLLUP_SOURCE_TIMEFRAME)
+
+
+def mark_rollup_dirty(conn: sqlite3.Connection, symbol: str, timestamps: Iterable[int]) -> int:
+    """Record the target buckets touched by new/changed 1m bars of ``symbol``.
+
+    Call inside the transaction that wrote the bars. Returns newly dirtied
+    buckets; a no-op when the symbol has no rollup targets.
+    """
+    targets = [
+        str(row[0])
+        for row in conn.execute(
+            "SELECT timeframe FROM candle_rollup_targets WHERE symbol = ?;",
+            (symbol,),
+        ).fetchall()
+    ]
+    if not targets:
+        return 0
+    values = np.fromiter(timestamps, dtype=np.int64)
+    if values.size == 0:
+        return 0
+    marked = 0
+    for timeframe in targets:
+        marked += conn.executemany(
+            """
+            INSERT OR IGNORE INTO candle_rollup_dirty(symbol, timeframe, bucket_start)
+            VALUES (?, ?, ?);
+            """,
+            ((symbol, timeframe, bucket) for bucket in np.unique(bucket_starts(values, timeframe)).tolist()),
+        ).rowcount
+    return marked
+
+
+class CandleRollupEngine:
+    """Register rollup targets and recompute their dirty buckets from 1m candles."""
+
+    def __init__(self, database: SQLiteDatabase, *, chunk_rows: int = DEFAULT_ROLLUP_CHUNK_ROWS) -> None:
+        if chunk_rows <= 0:
+            raise CandleRollupError("chunk_rows must be > 0")
+        self._database = database
+        self._chunk_rows = chunk_rows
+
+    def targets(self) -> list[tuple[str, str]]:
+        with self._database.read() as conn:
+            rows = conn.execute(
+                "SELECT symbol, timeframe FROM candle_rollup_targets ORDER BY symbol, timeframe;"
+            ).fetchall()
+        return [(str(row[0]), str(row[1])) for row in rows]
+
+    def register(self, symbol: str, timeframe: str) -> RollupRefreshResult:
+        """Add a target (backfilling it from all stored 1m bars) and bring it up to date."""
+        normalized_symbol = self._normalize_symbol(symbol)
+        normalized_timeframe = normalize_rollup_timeframe(timeframe)
+        interval_ms = timeframe_to_milliseconds(normalized_timeframe)
+        offset = timeframe_alignment_offset(normalized_timeframe)
+        with self._database.transaction() as tx:
+            added = tx.execute(
+                "INSERT OR IGNORE INTO candle_rollup_targets(symbol, timeframe) VALUES (?, ?);",
+                (normalized_symbol, normalized_timeframe),
+            ).rowcount
+            if added:
+                # Floor division that stays exact for timestamps before the offset.
+                tx.execute(
+                    """
+                    INSERT OR IGNORE INTO candle_rollup_dirty(symbol, timeframe, bucket_start)
+                    SELECT DISTINCT ?, ?, timestamp - ((((timestamp - ?) % ?) + ?) % ?)
+                    FROM candles
+                    WHERE symbol = ? AND timeframe = ?;
+                    """,
+                    (
+                        normalized_symbol,
+                        normalized_timeframe,
+                        offset,
+                        interval_ms,
+                        interval_ms,
+                        interval_ms,
+                        normalized_symbol,
+                        ROLLUP_SOURCE_TIMEFRAME,
+                    ),
+                )
+        return self._refresh_target(normalized_symbol, normalized_timeframe)
+
+    def unregister(self, symbol: str, timeframe: str) -> None:
+        normalized_symbol = self._normalize_symbol(symbol)
+        normalized_timeframe = normalize_rollup_timeframe(timeframe)
+        with self._database.transaction() as tx:
+            for table in ("candle_rollup_targets", "candle_rollup_dirty", "candle_rollups"):
+                tx.execute(
+                    f"DELETE FROM {table} WHERE symbol = ? AND timeframe = ?;",
+                    (normalized_symbol, normalized_timeframe),
+                )
+
+    def refresh(self, symbol: str | None = None, timeframe: str | None = None) -> list[RollupRefreshResult]:
+        """Recompute dirty buckets of every registered target (optionally filtered)."""
+        results = []
+        for target_symbol, target_timeframe in self.targets():
+            if symbol is not None and target_symbol != self._normalize_symbol(symbol):
+                continue
+            if timeframe is not None and target_timeframe != timeframe.strip():
+                continue
+            results.append(self._refresh_target(target_symbol, target_timeframe))
+        return results
+
+    def load_batch(
+        self,
+        symbol: str,
+        timeframe: str,
+        start_timestamp: int,
+        end_timestamp: int,
+        *,
+        include_partial: bool = False,
+    ) -> CandleBatch:
+        """Return up-to-date rollup bars in ``[start, end]``, registering the target on first use.
+
+        Buckets built from fewer 1m bars than :func:`expected_source_bars` (the
+        in-progress bucket, or one spanning missing minutes) are skipped so
+        they are never served as full bars; ``include_partial`` returns them too.
+        """
+        normalized_symbol = self._normalize_symbol(symbol)
+        normalized_timeframe = normalize_rollup_timeframe(timeframe)
+        if (normalized_symbol, normalized_timeframe) in self.targets():
+            self._refresh_target(normalized_symbol, normalized_timeframe)
+        else:
+            self.register(normalized_symbol, normalized_timeframe)
+        with self._database.read() as conn:
+            cursor = conn.cursor()
+            cursor.row_factory = None
+            try:
+                rows = cursor.execute(
+                    """
+                    SELECT timestamp, open, high, low, close, volume
+                    FROM candle_rollups
+                    WHERE symbol = ? AND timeframe = ? AND timestamp >= ? AND timestamp <= ?
+                      AND source_bars >= ?
+                    ORDER BY timestamp ASC;
+                    """,
+                    (
+                        normalized_symbol,
+                        normalized_timeframe,
+                        start_timestamp,
+                        end_timestamp,
+                        0 if include_partial else expected_source_bars(normalized_timeframe),
+                    ),
+                ).fetchall()
+            finally:
+                cursor.close()
+        return CandleBatch.from_rows(rows, symbol=normalized_symbol, timeframe=normalized_timeframe)
+
+    def _refresh_target(self, symbol: str, timeframe: str) -> RollupRefreshResult:
+        interval_ms = timeframe_to_milliseconds(timeframe)
+        # One window reads at most ~chunk_rows 1m bars plus one trailing bucket.
+        window_ms = max(self._chunk_rows * timeframe_to_milliseconds(ROLLUP_SOURCE_TIMEFRAME), interval_ms)
+        refreshed = written = removed = 0
+        while True:
+            with self._database.transaction() as tx:
+                first = tx.execute(
+                    """
+                    SELECT MIN(bucket_start) FROM candle_rollup_dirty
+                    WHERE symbol = ? AND timeframe = ?;
+                    """,
+                    (symbol, timeframe),
+                ).fetchone()[0]
+                if first is None:
+                    break
+                dirty = np.asarray(
+                    [
+                        int(row[0])
+                        for row in tx.execute(
+                            """
+                            SELECT bucket_start FROM candle_rollup_dirty
+                            WHERE symbol = ? AND timeframe = ? AND bucket_start >= ? AND bucket_start < ?
+                            ORDER BY bucket_start ASC;
+                            """,
+                            (symbol, timeframe, int(first), int(first) + window_ms),
+                        ).fetchall()
+                    ],
+                    dtype=np.int64,
+                )
+                span_end = int(dirty[-1]) + interval_ms - 1
+                window_written, window_removed = self._recompute(tx, symbol, timeframe, dirty, span_end)
+                tx.execute(
+                    """
+                    DELETE FROM candle_rollup_dirty
+                    WHERE symbol = ? AND timeframe = ? AND bucket_start >= ? AND bucket_start <= ?;
+                    """,
+                    (symbol, timeframe, int(dirty[0]), int(dirty[-1])),
+                )
+            refreshed += int(dirty.size)
+            written += window_written
+            removed += window_removed
+        return RollupRefreshResult(
+            symbol=symbol,
+            timeframe=timeframe,
+            refreshed_buckets=refreshed,
+            written_bars=written,
+            removed_bars=removed,
+        )
+
+    @staticmethod
+    def _recompute(
+        conn: sqlite3.Connection,
+        symbol: str,
+        timeframe: str,
+        dirty: np.ndarray,
+        span_end: int,
+    ) -> tuple[int, int]:
+        cursor = conn.cursor()
+        cursor.row_factory = None
+        try:
+            rows = cursor.execute(
+                """
+                SELECT timestamp, open, high, low, close, volume
+                FROM candles
+                WHERE symbol = ? AND timeframe = ? AND timestamp >= ? AND timestamp <= ?
+                ORDER BY timestamp ASC;
+                """,
+                (symbol, ROLLUP_SOURCE_TIMEFRAME, int(dirty[0]), span_end),
+            ).fetchall()
+        finally:
+            cursor.close()
+
+        source = CandleBatch.from_rows(rows, symbol=symbol, timeframe=ROLLUP_SOURCE_TIMEFRAME)
+        keys = np.empty(0, dtype=np.int64)
+        payload: list[tuple[object, ...]] = []
+        if len(source):
+            buckets = bucket_starts(source.timestamp, timeframe)
+            # Source rows are timestamp-sorted, so each bucket is one contiguous run.
+            keys, first_idx, counts = np.unique(buckets, return_index=True, return_counts=True)
+            high = np.maximum.reduceat(source.high, first_idx)
+            low = np.minimum.reduceat(source.low, first_idx)
+            volume = np.add.reduceat(source.volume, first_idx)
+            # The span may cover clean buckets between dirty ones; leave those alone.
+            selected = np.isin(keys, dirty)
+            keys, counts = keys[selected], counts[selected]
+            first_idx = first_idx[selected]
+            last_idx = first_idx + counts - 1
+            high, low, volume = high[selected], low[selected], volume[selected]
+            payload = list(
+                zip(
+                    [symbol] * keys.size,
+                    [timeframe] * keys.size,
+                    keys.tolist(),
+                    source.open[first_idx].tolist(),
+                    high.tolist(),
+                    low.tolist(),
+                    source.close[last_idx].tolist(),
+                    volume.tolist(),
+                    counts.tolist(),
+                )
+            )
+        if payload:
+            conn.executemany(
+                """
+                INSERT OR REPLACE INTO candle_rollups(
+                    symbol, timeframe, timestamp, open, high, low, close, volume, source_bars
+                )
+                VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?);
+                """,
+                payload,
+            )
+        # Dirty buckets whose 1m bars are all gone (e.g. retention cleanup).
+        emptied = np.setdiff1d(dirty, keys, assume_unique=True)
+        removed = 0
+        if emptied.size:
+            removed = conn.executemany(
+                "DELETE FROM candle_rollups WHERE symbol = ? AND timeframe = ? AND timestamp = ?;",
+                ((symbol, timeframe, bucket) for bucket in emptied.tolist()),
+            ).rowcount
+        return len(payload), removed
+
+    @staticmethod
+    def _normalize_symbol(symbol: str) -> str:
+        if not isinstance(symbol, str) or not symbol.strip():
+            raise CandleRollupError("symbol must not be empty")
+        return symbol.strip().upper()
@@ -1,19 +1,34 @@
-"""Historical candle download, cache, and deduplicated SQLite persistence."""
+"""Historical candle download, coverage-aware gap filling, and deduplicated SQLite persistence."""
 
 from __future__ import annotations
 
-from typing import Any, Protocol
+import time
+from itertools import groupby
+from typing import Any, Callable, Iterator, Protocol, Sequence
+
+import numpy as np
 
 from src.core.candle import Candle
 from src.core.database import SQLiteDatabase
+from src.data.candle_batch import CandleBatch, CandleInsertRow, validate_ohlcv_batch
+from src.data.candle_schema import insert_candle_rows
 from src.data.candle_window_stats import fetch_candle_window_stats
+from src.data.coverage import CandleCoverageIndex
+from src.data.rollup import ROLLUP_SOURCE_TIMEFRAME, mark_rollup_dirty
 from src.data.storage_types import (
+    CandleDownloadPlan,
     CandleDownloadRequest,
     CandleDownloadResult,
+    FetchedCandlePage,
     HistoricalDataStorageError,
+    RejectedCandleRow,
+    StoredCandlePage,
 )
+from src.data.timeframe_metrics import timeframe_to_milliseconds
 from src.utils.config_defaults import ALLOWED_TIMEFRAMES
 
+DEFAULT_CHUNK_ROWS = 50_000
+
 
 class CandleFetcher(Protocol):
     """Protocol for candle-fetching clients (for example MarketDataFetcher)."""
@@ -28,13 +43,217 @@ class CandleFetcher(Protocol):
         ...
 
 
+class OfflineCandleFetcher:
+    """Fetcher for storages that only read or write local candles; any download attempt is an error."""
+
+    def fetch_ohlcv(self, *_args: Any, **_kwargs: Any) -> list[list[Any]]:
+        raise HistoricalDataStorageError("offline candle storage cannot fetch remote candles")
+
+
+def iter_gap_pages(fetcher: CandleFetcher, plan: CandleDownloadPlan) -> Iterator[FetchedCandlePage]:
+    """Page through every gap of ``plan`` with ``fetcher``, one exchange call per page.
+
+    Touches no database state, so it can run on a worker thread.
+    """
+    for gap_start, gap_end in plan.gaps:
+        since = gap_start
+        while since <= gap_end:
+            ohlcv_rows = fetcher.fetch_ohlcv(
+                symbol=plan.symbol,
+                timeframe=plan.timeframe,
+                since=since,
+                limit=plan.batch_size,
+            )
+            exhausted = len(ohlcv_rows) < plan.batch_size
+            last_timestamp = since
+            if ohlcv_rows:
+                last_timestamp = int(ohlcv_rows[-1][0])
+                if last_timestamp < since:
+                    raise HistoricalDataStorageError(
+                        "exchange returned out-of-order candles; cannot advance time cursor"
+                    )
+            yield FetchedCandlePage(
+                rows=ohlcv_rows,
+                covered_start=since,
+                covered_end=gap_end if exhausted else min(last_timestamp, gap_end),
+            )
+            if exhausted:
+                break
+            since = last_timestamp + 1
+
+
+def iter_candle_batches(
+    database: SQLiteDatabase,
+    symbol: str,
+    timeframe: str,
+    start_timestamp: int | None = None,
+    end_timestamp: int | None = None,
+    *,
+    chunk_rows: int = DEFAULT_CHUNK_ROWS,
+    trusted: bool = False,
+) -> Iterator[CandleBatch]:
+    """Stream stored candles as column batches of at most ``chunk_rows`` rows.
+
+    Pages by key (``timestamp > last`` with ``LIMIT``) and takes a fresh, short
+    :meth:`SQLiteDatabase.read` per chunk, so no connection or read snapshot
+    is held while the consumer works on a yielded batch and writers are never
+    blocked, pooled or not. Memory stays bounded by one chunk regardless of
+    the range; chunks may come from different snapshots. Unless ``trusted``
+    is set every chunk is re-checked against the OHLCV invariants
+    (vectorized) and a corrupt row raises ``HistoricalDataStorageError``.
+    ``symbol``/``timeframe`` are used as stored; callers normalize them first.
+    """
+    if chunk_rows <= 0:
+        raise HistoricalDataStorageError("chunk_rows must be > 0")
+    bounds = ["symbol = ?", "timeframe = ?"]
+    params: list[Any] = [symbol, timeframe]
+    if end_timestamp is not None:
+        bounds.append("timestamp <= ?")
+        params.append(end_timestamp)
+    select = "SELECT timestamp, open, high, low, close, volume FROM candles WHERE " + " AND ".join(bounds)
+    first_page_sql = select + (" AND timestamp >= ?" if start_timestamp is not None else "")
+    first_page_sql += " ORDER BY timestamp ASC LIMIT ?"
+    next_page_sql = select + " AND timestamp > ? ORDER BY timestamp ASC LIMIT ?"
+
+    last_timestamp: int | None = None
+    while True:
+        if last_timestamp is None:
+            page_params = [*params, *(() if start_timestamp is None else (start_timestamp,)), chunk_rows]
+            sql = first_page_sql
+        else:
+            page_params = [*params, last_timestamp, chunk_rows]
+            sql = next_page_sql
+        with database.read() as conn:
+            cursor = conn.cursor()
+            # Plain tuples convert to NumPy much faster than sqlite3.Row objects.
+            cursor.row_factory = None
+            try:
+                rows = cursor.execute(sql, page_params).fetchall()
+            finally:
+                cursor.close()
+        if not rows:
+            return
+        batch = CandleBatch.from_rows(rows, symbol=symbol, timeframe=timeframe)
+        if not trusted:
+            invalid = batch.first_invalid_row()
+            if invalid is not None:
+                position, reason = invalid
+                raise HistoricalDataStorageError(
+                    f"stored candle {symbol} {timeframe} "
+                    f"timestamp={int(batch.timestamp[position])} is invalid: {reason}"
+                )
+        yield batch
+        if len(rows) < chunk_rows:
+            return
+        last_timestamp = int(batch.timestamp[-1])
+
+
+def load_symbol_candle_batches(
+    database: SQLiteDatabase,
+    symbols: Sequence[str],
+    timeframe: str,
+    start_timestamp: int,
+    end_timestamp: int,
+    *,
+    chunk_rows: int = DEFAULT_CHUNK_ROWS,
+) -> dict[str, CandleBatch]:
+    """Load one timeframe of several symbols with a single query, split per symbol.
+
+    Rows come back grouped by symbol in index order and are cut into one
+    batch per symbol as they are fetched. One statement also means every
+    symbol is read from the same snapshot even while writers are active.
+    Symbols without stored candles map to an empty batch. Rows are trusted
+    (no OHLCV re-check), matching what the backtest feeds read.
+    """
+    if chunk_rows <= 0:
+        raise HistoricalDataStorageError("chunk_rows must be > 0")
+    names = list(dict.fromkeys(symbols))
+    placeholders = ", ".join("?" for _ in names)
+    sql = (
+        "SELECT symbol, timestamp, open, high, low, close, volume FROM candles "
+        f"WHERE symbol IN ({placeholders}) AND timeframe = ? AND timestamp >= ? AND timestamp <= ? "
+        "ORDER BY symbol, timestamp"
+    )
+    pending: dict[str, list[CandleBatch]] = {name: [] for name in names}
+    if names:
+        with database.read() as conn:
+            cursor = conn.cursor()
+            cursor.row_factory = None
+            try:
+                cursor.execute(sql, [*names, timeframe, start_timestamp, end_timestamp])
+                while True:
+                    rows = cursor.fetchmany(chunk_rows)
+                    if not rows:
+                        break
+                    # Transpose once, then cut the columns at each symbol change.
+                    symbol_column, *value_columns = zip(*rows)
+                    columns = [np.asarray(column, dtype=np.float64) for column in value_columns]
+                    offset = 0
+                    for symbol, group in groupby(symbol_column):
+                        size = sum(1 for _ in group)
+                        block = [column[offset : offset + size] for column in columns]
+                        pending[symbol].append(
+                            CandleBatch(symbol, timeframe, block[0].astype(np.int64), *block[1:])
+                        )
+                        offset += size
+            finally:
+                cursor.close()
+    return {
+        name: CandleBatch.concat(batches) if batches else CandleBatch.from_rows([], symbol=name, timeframe=timeframe)
+        for name, batches in pending.items()
+    }
+
+
 class HistoricalCandleStorage:
-    def __init__(self, database: SQLiteDatabase, fetcher: CandleFetcher) -> None:
+    def __init__(
+        self,
+        database: SQLiteDatabase,
+        fetcher: CandleFetcher,
+        *,
+        now_ms_fn: Callable[[], int] | None = None,
+    ) -> None:
         self._database = database
         self._fetcher = fetcher
-        self._request_cache: set[tuple[str, str, int, int]] = set()
+        self._coverage = CandleCoverageIndex(database)
+        self._now_ms_fn = now_ms_fn or (lambda: int(time.time() * 1000))
 
-    def download_and_store(self, request: CandleDownloadRequest) -> CandleDownloadResult:
+    @property
+    def coverage(self) -> CandleCoverageIndex:
+        return self._coverage
+
+    def download_and_store(
+        self,
+        request: CandleDownloadRequest,
+        *,
+        ignore_coverage: bool = False,
+    ) -> CandleDownloadResult:
+        plan = self.plan_download(request, ignore_coverage=ignore_coverage)
+        downloaded_count = 0
+        fetched_pages = 0
+        rejected: list[RejectedCandleRow] = []
+        for page in iter_gap_pages(self._fetcher, plan):
+            fetched_pages += 1
+            stored = self.store_page(plan, page)
+            downloaded_count += stored.inserted_count
+            rejected.extend(stored.rejected)
+        return self.summarize_download(
+            plan,
+            downloaded_count=downloaded_count,
+            fetched_pages=fetched_pages,
+            rejected_rows=tuple(rejected),
+        )
+
+    def plan_download(
+        self,
+        request: CandleDownloadRequest,
+        *,
+        ignore_coverage: bool = False,
+    ) -> CandleDownloadPlan:
+        """Validate a request and subtract stored coverage to get the windows to fetch.
+
+        ``ignore_coverage`` refetches the whole window (gap repair: the range was
+        fetched before but rows are missing).
+        """
         symbol = self._validate_symbol(request.symbol)
         timeframe = self._validate_timeframe(request.timeframe)
         start_timestamp, end_timestamp = self._validate_time_range(
@@ -42,55 +261,63 @@ class HistoricalCandleStorage:
             request.end_timestamp,
         )
         batch_size = self._validate_batch_size(request.batch_size)
-        cache_key = (symbol, timeframe, start_timestamp, end_timestamp)
-
-        if self._is_range_cached(cache_key):
-            return self._build_download_result(
-                symbol=symbol,
-                timeframe=timeframe,
-                start_timestamp=start_timestamp,
-                end_timestamp=end_timestamp,
-                downloaded_count=0,
-            )
-
-        downloaded_count = 0
-        since = start_timestamp
-        while since <= end_timestamp:
-            ohlcv_rows = self._fetcher.fetch_ohlcv(
-                symbol=symbol,
-                timeframe=timeframe,
-                since=since,
-                limit=batch_size,
-            )
-            if not ohlcv_rows:
-                break
-
-            candles = self._normalize_rows(
-                rows=ohlcv_rows,
-                symbol=symbol,
-                timeframe=timeframe,
-                start_timestamp=start_timestamp,
-                end_timestamp=end_timestamp,
-            )
-            if candles:
-                downloaded_count += self._insert_candles(candles)
 
-            last_timestamp = int(ohlcv_rows[-1][0])
-            if last_timestamp < since:
-                raise HistoricalDataStorageError(
-                    "exchange returned out-of-order candles; cannot advance time cursor"
-                )
-            since = last_timestamp + 1
-            if len(ohlcv_rows) < batch_size:
-                break
-
-        self._record_cached_range(cache_key)
-        return self._build_download_result(
+        # Only closed candles are recorded as covered; the still-forming bar
+        # is refetched by the next sync.
+        settled_until = self._now_ms_fn() - timeframe_to_milliseconds(timeframe)
+        if ignore_coverage:
+            gaps = [(start_timestamp, end_timestamp)]
+        else:
+            gaps = self._coverage.plan_gaps(symbol, timeframe, start_timestamp, end_timestamp)
+        return CandleDownloadPlan(
             symbol=symbol,
             timeframe=timeframe,
             start_timestamp=start_timestamp,
             end_timestamp=end_timestamp,
+            batch_size=batch_size,
+            gaps=tuple(gaps),
+            settled_until=settled_until,
+        )
+
+    def store_page(self, plan: CandleDownloadPlan, page: FetchedCandlePage) -> StoredCandlePage:
+        """Validate one fetched page as a batch and persist it with its coverage.
+
+        Rows breaking an OHLCV invariant are skipped and reported; the page's
+        window is still marked covered so a bad exchange row is not refetched
+        forever.
+        """
+        batch = validate_ohlcv_batch(
+            page.rows,
+            symbol=plan.symbol,
+            timeframe=plan.timeframe,
+            start_timestamp=plan.start_timestamp,
+            end_timestamp=plan.end_timestamp,
+        )
+        inserted = self._persist_page(
+            batch.rows,
+            symbol=plan.symbol,
+            timeframe=plan.timeframe,
+            covered_start=page.covered_start,
+            covered_end=min(page.covered_end, plan.settled_until),
+        )
+        return StoredCandlePage(inserted_count=inserted, rejected=batch.rejected)
+
+    def summarize_download(
+        self,
+        plan: CandleDownloadPlan,
+        *,
+        downloaded_count: int,
+        fetched_pages: int,
+        rejected_rows: tuple[RejectedCandleRow, ...] = (),
+    ) -> CandleDownloadResult:
+        return self._build_download_result(
+            symbol=plan.symbol,
+            timeframe=plan.timeframe,
+            start_timestamp=plan.start_timestamp,
+            end_timestamp=plan.end_timestamp,
             downloaded_count=downloaded_count,
+            fetched_pages=fetched_pages,
+            rejected_rows=rejected_rows,
         )
 
     def _build_download_result(
@@ -101,6 +328,8 @@ class HistoricalCandleStorage:
         start_timestamp: int,
         end_timestamp: int,
         downloaded_count: int,
+        fetched_pages: int = 0,
+        rejected_rows: tuple[RejectedCandleRow, ...] = (),
     ) -> CandleDownloadResult:
         stats = fetch_candle_window_stats(
             database=self._database,
@@ -122,6 +351,8 @@ class HistoricalCandleStorage:
             first_timestamp=stats.first_timestamp,
             last_timestamp=stats.last_timestamp,
             span_days=stats.span_days,
+            fetched_pages=fetched_pages,
+            rejected_rows=rejected_rows,
         )
 
     def query_candles(
@@ -134,16 +365,7 @@ class HistoricalCandleStorage:
     ) -> list[Candle]:
         normalized_symbol = self._validate_symbol(symbol)
         normalized_timeframe = self._validate_timeframe(timeframe)
-        if start_timestamp is not None and start_timestamp < 0:
-            raise HistoricalDataStorageError("start_timestamp must be >= 0")
-        if end_timestamp is not None and end_timestamp < 0:
-            raise HistoricalDataStorageError("end_timestamp must be >= 0")
-        if (
-            start_timestamp is not None
-            and end_timestamp is not None
-            and start_timestamp > end_timestamp
-        ):
-            raise HistoricalDataStorageError("start_timestamp must be <= end_timestamp")
+        self._validate_query_range(start_timestamp, end_timestamp)
         if limit is not None and limit <= 0:
             raise HistoricalDataStorageError("limit must be > 0")
 
@@ -164,74 +386,63 @@ class HistoricalCandleStorage:
             sql.append("LIMIT ?")
             params.append(limit)
 
-        with self._database.transaction() as tx:
-            rows = tx.execute(" ".join(sql), params).fetchall()
+        with self._database.read() as conn:
+            rows = conn.execute(" ".join(sql), params).fetchall()
         return [Candle.validate(dict(row)) for row in rows]
 
+    def query_candle_batches(
+        self,
+        symbol: str,
+        timeframe: str,
+        start_timestamp: int | None = None,
+        end_timestamp: int | None = None,
+        *,
+        chunk_rows: int = DEFAULT_CHUNK_ROWS,
+        trusted: bool = False,
+    ) -> Iterator[CandleBatch]:
+        """Stream candles as NumPy column batches instead of one ``Candle`` per row.
+
+        ``trusted=True`` skips the per-chunk invariant check for data this
+        process wrote itself.
+        """
+        normalized_symbol = self._validate_symbol(symbol)
+        normalized_timeframe = self._validate_timeframe(timeframe)
+        self._validate_query_range(start_timestamp, end_timestamp)
+        if chunk_rows <= 0:
+            raise HistoricalDataStorageError("chunk_rows must be > 0")
+        return iter_candle_batches(
+            self._database,
+            normalized_symbol,
+            normalized_timeframe,
+            start_timestamp,
+            end_timestamp,
+            chunk_rows=chunk_rows,
+            trusted=trusted,
+        )
+
     @staticmethod
     def build_dataset_name(symbol: str, timeframe: str) -> str:
         normalized_symbol = symbol.strip().upper().replace("/", "_").replace("-", "_")
         normalized_symbol = "_".join(part for part in normalized_symbol.split("_") if part)
         return f"{normalized_symbol}_{timeframe.strip()}"
 
-    def _insert_candles(self, candles: list[Candle]) -> int:
-        payload = [
-            (
-                candle.symbol,
-                candle.timeframe,
-                candle.timestamp,
-                candle.open,
-                candle.high,
-                candle.low,
-                candle.close,
-                candle.volume,
-            )
-            for candle in candles
-        ]
-        with self._database.transaction() as tx:
-            changes_before = tx.total_changes
-            tx.executemany(
-                """
-                INSERT OR IGNORE INTO candles(symbol, timeframe, timestamp, open, high, low, close, volume)
-                VALUES (?, ?, ?, ?, ?, ?, ?, ?);
-                """,
-                payload,
-            )
-            return tx.total_changes - changes_before
-
-    def _is_range_cached(self, cache_key: tuple[str, str, int, int]) -> bool:
-        if cache_key in self._request_cache:
-            return True
-
-        symbol, timeframe, start_timestamp, end_timestamp = cache_key
-        with self._database.transaction() as tx:
-            row = tx.execute(
-                """
-                SELECT 1 FROM candle_download_cache
-                WHERE symbol = ?
-                  AND timeframe = ?
-                  AND start_timestamp = ?
-                  AND end_timestamp = ?
-                LIMIT 1;
-                """,
-                (symbol, timeframe, start_timestamp, end_timestamp),
-            ).fetchone()
-        if row is None:
-            return False
-        self._request_cache.add(cache_key)
-        return True
-
-    def _record_cached_range(self, cache_key: tuple[str, str, int, int]) -> None:
-        symbol, timeframe, start_timestamp, end_timestamp = cache_key
+    def _persist_page(
+        self,
+        payload: list[CandleInsertRow],
+        *,
+        symbol: str,
+        timeframe: str,
+        covered_start: int,
+        covered_end: int,
+    ) -> int:
+        """Insert one fetched page and its coverage atomically (resume point on crash)."""
         with self._database.transaction() as tx:
-            tx.execute(
-                """
-                INSERT INTO candle_download_cache(symbol, timeframe, start_timestamp, end_timestamp) VALUES (?, ?, ?, ?)
-                ON CONFLICT(symbol, timeframe, start_timestamp, end_timestamp) DO UPDATE SET last_synced_at = CURRENT_TIMESTAMP;
-                """,
-                (symbol, timeframe, start_timestamp, end_timestamp),
-            )
-        self._request_cache.add(cache_key)
+            inserted = insert_candle_rows(tx, payload)
+            if timeframe == ROLLUP_SOURCE_TIMEFRAME and payload:
+                mark_rollup_dirty(tx, symbol, (row[2] for row in payload))
+            if covered_end >= covered_start:
+                self._coverage.mark_covered(symbol, timeframe, covered_start, covered_end)
+        return inserted
 
     @staticmethod
     def _validate_symbol(symbol: str) -> str:
@@ -260,42 +471,21 @@ class HistoricalCandleStorage:
             raise HistoricalDataStorageError("start_timestamp must be <= end_timestamp")
         return int(start_timestamp), int(end_timestamp)
 
+    @staticmethod
+    def _validate_query_range(start_timestamp: int | None, end_timestamp: int | None) -> None:
+        if start_timestamp is not None and start_timestamp < 0:
+            raise HistoricalDataStorageError("start_timestamp must be >= 0")
+        if end_timestamp is not None and end_timestamp < 0:
+            raise HistoricalDataStorageError("end_timestamp must be >= 0")
+        if (
+            start_timestamp is not None
+            and end_timestamp is not None
+            and start_timestamp > end_timestamp
+        ):
+            raise HistoricalDataStorageError("start_timestamp must be <= end_timestamp")
+
     @staticmethod
     def _validate_batch_size(batch_size: int) -> int:
         if batch_size <= 0:
             raise HistoricalDataStorageError("batch_size must be > 0")
         return int(batch_size)
-
-    def _normalize_rows(
-        self,
-        *,
-        rows: list[list[Any]],
-        symbol: str,
-        timeframe: str,
-        start_timestamp: int,
-        end_timestamp: int,
-    ) -> list[Candle]:
-        candles: list[Candle] = []
-        for row in rows:
-            if not isinstance(row, (list, tuple)) or len(row) < 6:
-                raise HistoricalDataStorageError("invalid OHLCV row: expected 6 values")
-
-            timestamp = int(row[0])
-            if timestamp < start_timestamp or timestamp > end_timestamp:
-                continue
-
-            candle = Candle.validate(
-                {
-                    "symbol": symbol,
-                    "timeframe": timeframe,
-                    "timestamp": timestamp,
-                    "open": row[1],
-                    "high": row[2],
-                    "low": row[3],
-                    "close": row[4],
-                    "volume": row[5],
-                }
-            )
-            candles.append(candle)
-        candles.sort(key=lambda item: item.timestamp)
-        return candles
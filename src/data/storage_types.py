@@ -3,6 +3,7 @@
 from __future__ import annotations
 
 from dataclasses import dataclass
+from typing import Any
 
 
 class HistoricalDataStorageError(RuntimeError):
@@ -20,6 +21,45 @@ class CandleDownloadRequest:
     batch_size: int = 500
 
 
+@dataclass(frozen=True)
+class CandleDownloadPlan:
+    """Validated request plus the uncovered windows that still need fetching."""
+
+    symbol: str
+    timeframe: str
+    start_timestamp: int
+    end_timestamp: int
+    batch_size: int
+    gaps: tuple[tuple[int, int], ...]
+    settled_until: int
+
+
+@dataclass(frozen=True)
+class FetchedCandlePage:
+    """One exchange page and the timestamp window it proves fetched."""
+
+    rows: list[list[Any]]
+    covered_start: int
+    covered_end: int
+
+
+@dataclass(frozen=True)
+class RejectedCandleRow:
+    """One fetched row that failed OHLCV validation, by its position in the page."""
+
+    index: int
+    timestamp: int | None
+    reason: str
+
+
+@dataclass(frozen=True)
+class StoredCandlePage:
+    """Outcome of persisting one fetched page."""
+
+    inserted_count: int
+    rejected: tuple[RejectedCandleRow, ...] = ()
+
+
 @dataclass(frozen=True)
 class CandleDownloadResult:
     """Summary returned after a successful download and persistence run."""
@@ -36,3 +76,9 @@ class CandleDownloadResult:
     first_timestamp: int | None
     last_timestamp: int | None
     span_days: float
+    fetched_pages: int = 0
+    rejected_rows: tuple[RejectedCandleRow, ...] = ()
+
+    @property
+    def rejected_count(self) -> int:
+        return len(self.rejected_rows)
@@ -2,6 +2,8 @@
 
 from __future__ import annotations
 
+import re
+
 TIMEFRAME_TO_MS: dict[str, int] = {
     "1m": 60_000,
     "5m": 5 * 60_000,
@@ -12,12 +14,46 @@ TIMEFRAME_TO_MS: dict[str, int] = {
 }
 
 
+UNIT_TO_MS: dict[str, int] = {
+    "m": 60_000,
+    "h": 60 * 60_000,
+    "d": 24 * 60 * 60_000,
+    "w": 7 * 24 * 60 * 60_000,
+}
+# 1970-01-01 was a Thursday; weekly buckets start on Monday like exchange 1w bars.
+WEEK_ALIGNMENT_OFFSET_MS = 4 * UNIT_TO_MS["d"]
+_TIMEFRAME_PATTERN = re.compile(r"^([1-9][0-9]*)([mhdw])$")
+
+
+def parse_timeframe(timeframe: str) -> tuple[int, str]:
+    """Split ``<amount><unit>`` (unit in m/h/d/w), e.g. ``"30m"`` -> ``(30, "m")``."""
+    match = _TIMEFRAME_PATTERN.match(timeframe.strip()) if isinstance(timeframe, str) else None
+    if match is None:
+        raise ValueError(f"unsupported timeframe: {timeframe}")
+    return int(match.group(1)), match.group(2)
+
+
+def is_valid_timeframe(timeframe: str) -> bool:
+    try:
+        parse_timeframe(timeframe)
+    except ValueError:
+        return False
+    return True
+
+
 def timeframe_to_milliseconds(timeframe: str) -> int:
     """Return candle interval in milliseconds."""
     normalized = timeframe.strip()
-    if normalized not in TIMEFRAME_TO_MS:
-        raise ValueError(f"unsupported timeframe: {timeframe}")
-    return TIMEFRAME_TO_MS[normalized]
+    if normalized in TIMEFRAME_TO_MS:
+        return TIMEFRAME_TO_MS[normalized]
+    amount, unit = parse_timeframe(normalized)
+    return amount * UNIT_TO_MS[unit]
+
+
+def timeframe_alignment_offset(timeframe: str) -> int:
+    """Return the epoch offset bucket boundaries are aligned to (Monday for weeks)."""
+    _, unit = parse_timeframe(timeframe)
+    return WEEK_ALIGNMENT_OFFSET_MS if unit == "w" else 0
 
 
 def estimate_expected_candle_count(start_timestamp: int, end_timestamp: int, timeframe: str) -> int:
@@ -5,6 +5,8 @@ from src.live.loop_signal_executor import LoopSignalExecutor
 from src.live.monitor import RuntimeMonitor
 from src.live.price_service import PortfolioValuation, PositionAssessment, PriceService
 from src.live.realtime_loop import RealtimeSimulationLoop
+from src.live.sim_backtest import LiveBacktestError, LiveBacktestResult, LiveStrategyBacktester, flush_ledger
+from src.live.sim_exchange import SimulatedExchange, SimulatedExchangeError, SimulatedPosition
 from src.live.simulator import StrategyLifecycleDriver
 
 __all__ = [
@@ -17,4 +19,11 @@ __all__ = [
     "RealtimeLoopError",
     "LoopSignalExecutor",
     "RuntimeMonitor",
+    "SimulatedExchange",
+    "SimulatedExchangeError",
+    "SimulatedPosition",
+    "LiveStrategyBacktester",
+    "LiveBacktestResult",
+    "LiveBacktestError",
+    "flush_ledger",
 ]
@@ -14,7 +14,9 @@ from src.core.order_service import OrderService
 from src.core.risk import RiskLimits
 from src.core.stop_trigger import StopTriggerEngine
 from src.core.trade_service import TradeService
+from src.data.candle_schema import upsert_live_candle
 from src.data.realtime_market import RealtimeMarketDataService
+from src.data.rollup import ROLLUP_SOURCE_TIMEFRAME, mark_rollup_dirty
 from src.data.storage import HistoricalCandleStorage
 from src.live.monitor import RuntimeMonitor
 from src.live.loop_models import RealtimeLoopConfig, RealtimeLoopError
@@ -335,26 +337,15 @@ class RealtimeSimulationLoop:
             interval_ms = _timeframe_to_interval_ms(self._config.timeframe)
             bucket_ts = timestamp_ms - (timestamp_ms % interval_ms)
             with self._db.transaction() as tx:
-                tx.execute(
-                    """
-                    INSERT INTO candles(symbol, timeframe, timestamp, open, high, low, close, volume)
-                    VALUES (?, ?, ?, ?, ?, ?, ?, 0)
-                    ON CONFLICT(symbol, timeframe, timestamp) DO UPDATE SET
-                        high = MAX(candles.high, excluded.high),
-                        low = MIN(candles.low, excluded.low),
-                        close = excluded.close,
-                        volume = candles.volume + excluded.volume;
-                    """,
-                    (
-                        self._config.symbol,
-                        self._config.timeframe,
-                        bucket_ts,
-                        price,
-                        price,
-                        price,
-                        price,
-                    ),
+                upsert_live_candle(
+                    tx,
+                    symbol=self._config.symbol,
+                    timeframe=self._config.timeframe,
+                    timestamp=bucket_ts,
+                    price=price,
                 )
+                if self._config.timeframe == ROLLUP_SOURCE_TIMEFRAME:
+                    mark_rollup_dirty(tx, self._config.symbol, (bucket_ts,))
         except Exception as exc:
             self._strategy_logger.warning("persist latest candle failed: {}", exc)
 
@@ -0,0 +1,310 @@
+"""Event-driven replay of LiveStrategy classes over stored candles.
+
+Each candle plays the role of one ``RealtimeSimulationLoop`` iteration at the
+bar's close: queued limit and trigger orders are matched first, then the
+strategy runs, its signal is executed and order/trade callbacks are
+delivered. All state lives in a :class:`SimulatedExchange`; SQLite is read in
+candle batches and written once, by :func:`flush_ledger`, at the end.
+"""
+
+from __future__ import annotations
+
+import datetime as dt
+import time
+from array import array
+from collections.abc import Mapping
+from dataclasses import dataclass
+from typing import Any
+
+import numpy as np
+
+from src.core.database import SQLiteDatabase
+from src.core.enums import StrategyRunStatus
+from src.core.execution_cost import ExecutionCostProfile
+from src.core.order import Order
+from src.core.risk import RiskLimits
+from src.core.trade import Trade
+from src.data.feed import DEFAULT_STREAM_CHUNK_ROWS, BacktestDataSlice, SQLiteFeedError, SQLitePandasFeedFactory
+from src.live.sim_exchange import SimulatedExchange, SimulatedExchangeError
+from src.strategies.base import LiveStrategy, StrategyContext
+
+
+class LiveBacktestError(RuntimeError):
+    """Raised when a LiveStrategy replay cannot run."""
+
+
+@dataclass(frozen=True)
+class LiveBacktestResult:
+    """Outcome of one LiveStrategy replay; ``run_id`` is set once the ledger is flushed."""
+
+    strategy_name: str
+    symbol: str
+    timeframe: str
+    start_timestamp: int
+    end_timestamp: int
+    bars_processed: int
+    initial_capital: float
+    final_equity: float
+    total_fees: float
+    max_drawdown_pct: float
+    position_amount: float
+    realized_pnl: float
+    rejected_signals: int
+    orders: tuple[Order, ...]
+    trades: tuple[Trade, ...]
+    elapsed_seconds: float
+    run_id: int | None = None
+
+    @property
+    def total_return_pct(self) -> float:
+        if self.initial_capital <= 0:
+            return 0.0
+        return (self.final_equity - self.initial_capital) / self.initial_capital * 100.0
+
+    @property
+    def events_per_second(self) -> float:
+        """Bars, orders and fills processed per wall-clock second (strategy time included)."""
+        if self.elapsed_seconds <= 0:
+            return 0.0
+        return (self.bars_processed + len(self.orders) + len(self.trades)) / self.elapsed_seconds
+
+
+class LiveStrategyBacktester:
+    """Replay stored candles through a LiveStrategy against an in-memory exchange."""
+
+    def __init__(
+        self,
+        database: SQLiteDatabase,
+        *,
+        initial_capital: float,
+        cost_profile: ExecutionCostProfile | None = None,
+        risk_limits: RiskLimits | None = None,
+        feed_factory: SQLitePandasFeedFactory | None = None,
+        chunk_rows: int = DEFAULT_STREAM_CHUNK_ROWS,
+    ) -> None:
+        if initial_capital <= 0:
+            raise LiveBacktestError("initial_capital must be > 0")
+        if chunk_rows <= 0:
+            raise LiveBacktestError("chunk_rows must be > 0")
+        self._database = database
+        self._initial_capital = float(initial_capital)
+        self._cost_profile = cost_profile or ExecutionCostProfile()
+        self._risk_limits = risk_limits
+        self._feed_factory = feed_factory or SQLitePandasFeedFactory(database)
+        self._chunk_rows = chunk_rows
+
+    @classmethod
+    def from_config(cls, database: SQLiteDatabase, config: Mapping[str, Any]) -> "LiveStrategyBacktester":
+        """Costs and risk limits as ``RealtimeSimulationLoop.from_config`` builds them."""
+        trading = config.get("trading", {})
+        commission = trading.get("commission", {})
+        risk_config = config.get("risk", {})
+        return cls(
+            database,
+            initial_capital=float(config.get("account", {}).get("initial_capital", 10_000.0)),
+            cost_profile=ExecutionCostProfile(
+                maker_fee_rate=commission.get("maker", 0.001),
+                taker_fee_rate=commission.get("taker", 0.001),
+                slippage_rate=trading.get("slippage", 0.0005),
+            ),
+            risk_limits=RiskLimits(
+                max_position_size=risk_config.get("max_position_size", 0.3),
+                max_total_position=risk_config.get("max_total_position", 0.8),
+                max_drawdown=risk_config.get("max_drawdown", 0.2),
+            ),
+        )
+
+    def run(
+        self,
+        strategy: LiveStrategy,
+        data_slice: BacktestDataSlice,
+        *,
+        strategy_params: Mapping[str, Any] | None = None,
+    ) -> LiveBacktestResult:
+        """Initialize ``strategy``, replay ``data_slice`` bar by bar and stop it.
+
+        Rejected orders (risk limits, insufficient funds) are counted, as the
+        live loop logs and skips them; exceptions raised by the strategy itself
+        propagate so a replay never silently diverges.
+        """
+        try:
+            exchange = SimulatedExchange(
+                data_slice.symbol,
+                initial_capital=self._initial_capital,
+                cost_profile=self._cost_profile,
+                risk_limits=self._risk_limits,
+            )
+            batches = self._feed_factory.iter_batches(data_slice, chunk_rows=self._chunk_rows)
+        except (SimulatedExchangeError, SQLiteFeedError) as exc:
+            raise LiveBacktestError(str(exc)) from exc
+
+        strategy.initialize(
+            StrategyContext(
+                strategy_id=f"{strategy.name}_{data_slice.symbol}_replay",
+                symbol=data_slice.symbol,
+                timeframe=data_slice.timeframe,
+                parameters=dict(strategy_params or {}),
+            )
+        )
+        symbol = exchange.symbol
+        equity = array("d")
+        rejected = 0
+        first_timestamp: int | None = None
+        last_timestamp = 0
+        started_at = time.perf_counter()
+        try:
+            for batch in batches:
+                timestamps = batch.timestamp.tolist()
+                opens = batch.open.tolist()
+                highs = batch.high.tolist()
+                lows = batch.low.tolist()
+                closes = batch.close.tolist()
+                volumes = batch.volume.tolist()
+                if first_timestamp is None and timestamps:
+                    first_timestamp = timestamps[0]
+                for index, timestamp in enumerate(timestamps):
+                    price = closes[index]
+                    if exchange.has_open_orders:
+                        exchange.process_limit_order_queue(price, timestamp)
+                        exchange.process_trigger_orders(price, timestamp)
+                    signal = strategy.run(
+                        {
+                            "symbol": symbol,
+                            "timestamp": timestamp,
+                            "latest_price": price,
+                            "bid": None,
+                            "ask": None,
+                            "open": opens[index],
+                            "high": highs[index],
+                            "low": lows[index],
+                            "close": price,
+                            "volume": volumes[index],
+                        }
+                    )
+                    if signal:
+                        try:
+                            exchange.execute_signal(signal, price=price, timestamp=timestamp)
+                        except (SimulatedExchangeError, ValueError):
+                            rejected += 1
+                    order_events, trade_events = exchange.drain_events()
+                    for order_event in order_events:
+                        strategy.notify_order(order_event)
+                    for trade_event in trade_events:
+                        strategy.notify_trade(trade_event)
+                    equity.append(exchange.equity(price))
+                    last_timestamp = timestamp
+        except SQLiteFeedError as exc:
+            raise LiveBacktestError(str(exc)) from exc
+        finally:
+            batches.close()
+            strategy.stop(reason="replay finished")
+        elapsed = time.perf_counter() - started_at
+
+        if first_timestamp is None:
+            raise LiveBacktestError("No candle data found in SQLite for the requested symbol/timeframe/time range")
+        position = exchange.position
+        return LiveBacktestResult(
+            strategy_name=strategy.name,
+            symbol=symbol,
+            timeframe=data_slice.timeframe,
+            start_timestamp=first_timestamp,
+            end_timestamp=last_timestamp,
+            bars_processed=len(equity),
+            initial_capital=self._initial_capital,
+            final_equity=equity[-1],
+            total_fees=exchange.total_fees,
+            max_drawdown_pct=_max_drawdown_pct(np.frombuffer(equity, dtype=np.float64)),
+            position_amount=0.0 if position is None else position.amount,
+            realized_pnl=0.0 if position is None else position.realized_pnl,
+            rejected_signals=rejected,
+            orders=exchange.orders,
+            trades=exchange.trades,
+            elapsed_seconds=elapsed,
+        )
+
+
+def flush_ledger(database: SQLiteDatabase, result: LiveBacktestResult) -> int:
+    """Persist a replay as one ``strategy_runs`` row plus its orders and fills; returns the run id.
+
+    Replays write to ``sim_orders`` / ``sim_trades`` rather than the live
+    ``orders`` / ``trades`` tables, so they never show up as account activity.
+    """
+    with database.transaction() as tx:
+        cursor = tx.execute(
+            """
+            INSERT INTO strategy_runs(
+                strategy_name, symbol, start_time, end_time, initial_capital,
+                final_capital, total_return, max_drawdown, sharpe_ratio, status
+            )
+            VALUES (?, ?, ?, ?, ?, ?, ?, ?, NULL, ?);
+            """,
+            (
+                result.strategy_name,
+                result.symbol,
+                _utc_datetime(result.start_timestamp),
+                _utc_datetime(result.end_timestamp),
+                result.initial_capital,
+                max(result.final_equity, 0.0),
+                result.total_return_pct / 100.0,
+                min(result.max_drawdown_pct / 100.0, 1.0),
+                StrategyRunStatus.COMPLETED.value,
+            ),
+        )
+        run_id = int(cursor.lastrowid)
+        tx.executemany(
+            """
+            INSERT INTO sim_orders(
+                run_id, id, symbol, type, side, price, amount, filled, status, created_at, updated_at
+            )
+            VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?);
+            """,
+            [
+                (
+                    run_id,
+                    order.id,
+                    order.symbol,
+                    order.type.value,
+                    order.side.value,
+                    order.price,
+                    order.amount,
+                    order.filled,
+                    order.status.value,
+                    order.created_at,
+                    order.updated_at,
+                )
+                for order in result.orders
+            ],
+        )
+        tx.executemany(
+            """
+            INSERT INTO sim_trades(run_id, trade_id, order_id, symbol, side, price, amount, fee, timestamp)
+            VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?);
+            """,
+            [
+                (
+                    run_id,
+                    index,
+                    trade.order_id,
+                    trade.symbol,
+                    trade.side.value,
+                    trade.price,
+                    trade.amount,
+                    trade.fee,
+                    trade.timestamp,
+                )
+                for index, trade in enumerate(result.trades, start=1)
+            ],
+        )
+    return run_id
+
+
+def _max_drawdown_pct(equity: np.ndarray) -> float:
+    if equity.size == 0:
+        return 0.0
+    peaks = np.maximum.accumulate(equity)
+    drawdowns = np.divide(peaks - equity, peaks, out=np.zeros_like(equity), where=peaks > 0)
+    return float(drawdowns.max()) * 100.0
+
+
+def _utc_datetime(timestamp_ms: int) -> dt.datetime:
+    return dt.datetime.fromtimestamp(timestamp_ms / 1000, tz=dt.timezone.utc).replace(tzinfo=None)
@@ -0,0 +1,435 @@
+"""In-memory simulated exchange mirroring the SQLite matching engines.
+
+Accounts, the position, the limit queue and stop/take-profit orders live in
+plain Python structures, so a candle replay never touches SQLite per order.
+Trigger checks, execution prices, fees, fund freezing and position arithmetic
+come from :mod:`src.core.fill_rules`, the same functions :class:`MatchingEngine`,
+:class:`LimitOrderMatchingEngine` and :class:`StopTriggerEngine` call, so
+balances end up where the SQLite engines would leave them for the same
+sequence of prices and signals.
+"""
+
+from __future__ import annotations
+
+from dataclasses import dataclass, replace
+from typing import Any, Mapping
+
+from src.core.enums import OrderSide, OrderStatus, OrderType, TradeSide
+from src.core.execution_cost import ExecutionCostProfile
+from src.core.fill_rules import (
+    FILL_EPS,
+    buy_freeze_amount,
+    buy_price_improvement_refund,
+    is_limit_triggered,
+    is_trigger_hit,
+    position_after_buy,
+    position_after_sell,
+    price_time_priority,
+    quote_limit_fill,
+    quote_market_fill,
+    quote_trigger_fill,
+)
+from src.core.order import Order
+from src.core.risk import PortfolioMetrics, RiskControl, RiskControlError, RiskLimits, resolve_reference_price
+from src.core.trade import Trade
+from src.strategies.base import StrategyOrderEvent, StrategyTradeEvent
+
+
+class SimulatedExchangeError(RuntimeError):
+    """Raised when the simulated exchange rejects an order."""
+
+
+@dataclass(frozen=True)
+class SimulatedPosition:
+    """Position state of the simulated exchange's single symbol."""
+
+    symbol: str
+    amount: float
+    entry_price: float
+    current_price: float
+    realized_pnl: float
+
+
+class _Balance:
+    __slots__ = ("available", "frozen")
+
+    def __init__(self, available: float = 0.0) -> None:
+        self.available = available
+        self.frozen = 0.0
+
+
+class SimulatedExchange:
+    """Single-symbol exchange with market, limit and stop/take-profit orders held in memory."""
+
+    def __init__(
+        self,
+        symbol: str,
+        *,
+        initial_capital: float,
+        cost_profile: ExecutionCostProfile | None = None,
+        risk_limits: RiskLimits | None = None,
+    ) -> None:
+        normalized = symbol.strip()
+        parts = normalized.split("/")
+        if len(parts) != 2 or not parts[0].strip() or not parts[1].strip():
+            raise SimulatedExchangeError(f"invalid symbol format: {symbol}")
+        if initial_capital < 0:
+            raise SimulatedExchangeError("initial_capital must be non-negative")
+        self._symbol = normalized
+        self._base_currency = parts[0].strip()
+        self._quote_currency = parts[1].strip()
+        self._cost_profile = cost_profile or ExecutionCostProfile()
+        self._risk_control = RiskControl(self, limits=risk_limits)
+        self._base = _Balance()
+        self._quote = _Balance(float(initial_capital))
+        self._position: list[float] | None = None  # [amount, entry_price, current_price, realized_pnl]
+        self._orders: dict[str, Order] = {}
+        self._order_sequence: dict[str, int] = {}
+        self._limit_queue: list[str] = []
+        self._trigger_queue: list[str] = []
+        self._trades: list[Trade] = []
+        self._total_fees = 0.0
+        self._pending_orders: list[str] = []
+        self._pending_trades: list[int] = []
+
+    @property
+    def symbol(self) -> str:
+        return self._symbol
+
+    @property
+    def orders(self) -> tuple[Order, ...]:
+        return tuple(self._orders.values())
+
+    @property
+    def trades(self) -> tuple[Trade, ...]:
+        return tuple(self._trades)
+
+    @property
+    def total_fees(self) -> float:
+        return self._total_fees
+
+    @property
+    def position(self) -> SimulatedPosition | None:
+        if self._position is None:
+            return None
+        amount, entry_price, current_price, realized_pnl = self._position
+        return SimulatedPosition(self._symbol, amount, entry_price, current_price, realized_pnl)
+
+    @property
+    def has_open_orders(self) -> bool:
+        return bool(self._limit_queue or self._trigger_queue)
+
+    def balance(self, currency: str) -> tuple[float, float]:
+        """``(available, frozen)`` of the base or quote currency."""
+        if currency == self._base_currency:
+            return self._base.available, self._base.frozen
+        if currency == self._quote_currency:
+            return self._quote.available, self._quote.frozen
+        raise SimulatedExchangeError(f"unknown currency: {currency}")
+
+    def equity(self, price: float) -> float:
+        """Quote balance plus base balance valued at ``price``."""
+        return (
+            self._quote.available
+            + self._quote.frozen
+            + (self._base.available + self._base.frozen) * price
+        )
+
+    def portfolio_metrics(self, price_overrides: Mapping[str, float]) -> PortfolioMetrics:
+        """Portfolio values of the in-memory balances, for :class:`RiskControl`."""
+        base_cash = self._quote.available + self._quote.frozen
+        positions_value = 0.0
+        cost_basis_value = 0.0
+        position = self._position
+        if position is not None and position[0] > FILL_EPS:
+            amount, entry_price, current_price, _ = position
+            reference_price = resolve_reference_price(
+                symbol=self._symbol,
+                entry_price=entry_price,
+                current_price=current_price,
+                price_overrides=price_overrides,
+            )
+            positions_value = amount * reference_price
+            cost_basis_value = amount * entry_price
+        return PortfolioMetrics(base_cash, base_cash + positions_value, positions_value, cost_basis_value)
+
+    def execute_signal(self, signal: Mapping[str, Any], *, price: float, timestamp: int) -> Order | None:
+        """Place the order a strategy signal asks for (same contract as ``LoopSignalExecutor``)."""
+        action = signal.get("action")
+        if action not in ("buy", "sell"):
+            return None
+        side = OrderSide.BUY if action == "buy" else OrderSide.SELL
+        amount = signal.get("amount")
+        if amount is None or amount <= 0:
+            return None
+        order_type = signal.get("type", "market")
+        if order_type == "market":
+            return self.place_market_order(side, float(amount), price=price, timestamp=timestamp)
+        if order_type == "limit":
+            limit_price = signal.get("price")
+            if limit_price and limit_price > 0:
+                return self.place_limit_order(side, float(amount), float(limit_price), timestamp=timestamp)
+            return None
+        if order_type in ("stop_loss", "take_profit"):
+            trigger_price = signal.get("trigger_price")
+            if trigger_price and trigger_price > 0:
+                return self.place_trigger_order(
+                    OrderType.STOP_LOSS if order_type == "stop_loss" else OrderType.TAKE_PROFIT,
+                    side,
+                    float(amount),
+                    float(trigger_price),
+                    timestamp=timestamp,
+                )
+        return None
+
+    def place_market_order(self, side: OrderSide, amount: float, *, price: float, timestamp: int) -> Order:
+        """Fill immediately at ``price`` with adverse slippage and the taker fee."""
+        if amount <= 0:
+            raise SimulatedExchangeError("amount must be > 0")
+        if price <= 0:
+            raise SimulatedExchangeError("latest price must be > 0")
+        quote = quote_market_fill(self._cost_profile, side=side, reference_price=price, amount=amount)
+        execution_price = quote.execution_price
+        self._check_risk(side, amount, execution_price)
+        if side == OrderSide.SELL:
+            if self._base.available + FILL_EPS < amount:
+                raise SimulatedExchangeError("insufficient base asset balance for sell market order")
+            if self._position_amount() + FILL_EPS < amount:
+                raise SimulatedExchangeError(f"insufficient position amount for symbol {self._symbol}")
+        order = self._create_order(OrderType.MARKET, side, amount, execution_price, timestamp)
+        self._fill(order, execution_price, amount, quote.fee, timestamp)
+        return self._orders[order.id]
+
+    def place_limit_order(self, side: OrderSide, amount: float, limit_price: float, *, timestamp: int) -> Order:
+        """Queue a limit order; buys freeze ``amount * limit_price`` of quote currency."""
+        if amount <= 0:
+            raise SimulatedExchangeError("amount must be > 0")
+        if limit_price <= 0:
+            raise SimulatedExchangeError("limit_price must be > 0")
+        self._check_risk(side, amount, limit_price)
+        if side == OrderSide.SELL and not self._has_sell_capacity(amount):
+            raise SimulatedExchangeError("insufficient base asset balance for sell limit order")
+        order = self._create_order(OrderType.LIMIT, side, amount, limit_price, timestamp)
+        self._limit_queue.append(order.id)
+        return order
+
+    def place_trigger_order(
+        self,
+        order_type: OrderType,
+        side: OrderSide,
+        amount: float,
+        trigger_price: float,
+        *,
+        timestamp: int,
+    ) -> Order:
+        """Register a stop-loss / take-profit order that fills once ``trigger_price`` is crossed."""
+        if amount <= 0:
+            raise SimulatedExchangeError("amount must be > 0")
+        if trigger_price <= 0:
+            raise SimulatedExchangeError("trigger_price must be > 0")
+        if order_type not in (OrderType.STOP_LOSS, OrderType.TAKE_PROFIT):
+            raise SimulatedExchangeError("type must be stop_loss or take_profit")
+        self._check_risk(side, amount, trigger_price)
+        if side == OrderSide.SELL and not self._has_sell_capacity(amount):
+            raise SimulatedExchangeError("insufficient base asset balance for sell trigger order")
+        order = self._create_order(order_type, side, amount, trigger_price, timestamp)
+        self._trigger_queue.append(order.id)
+        return order
+
+    def process_limit_order_queue(self, price: float, timestamp: int) -> tuple[Order, ...]:
+        """Fill every queued limit order ``price`` crosses, in price-time priority."""
+        if not self._limit_queue:
+            return ()
+        queue = price_time_priority(
+            (self._orders[order_id] for order_id in self._limit_queue),
+            lambda order: self._order_sequence[order.id],
+        )
+        filled: list[Order] = []
+        for order in queue:
+            limit_price = order.price
+            if limit_price is None or not is_limit_triggered(order.side, limit_price, price):
+                continue
+            remaining = order.amount - order.filled
+            if remaining <= FILL_EPS:
+                continue
+            quote = quote_limit_fill(
+                self._cost_profile,
+                side=order.side,
+                limit_price=limit_price,
+                latest_price=price,
+                amount=remaining,
+            )
+            if order.side == OrderSide.SELL and not self._has_sell_capacity(remaining):
+                # Keep order in queue if inventory is not enough yet.
+                continue
+            self._fill(order, quote.execution_price, remaining, quote.fee, timestamp)
+            self._quote.available += buy_price_improvement_refund(
+                order.side, limit_price, quote.execution_price, remaining
+            )
+            filled.append(self._orders[order.id])
+        if filled:
+            done = {order.id for order in filled}
+            self._limit_queue = [order_id for order_id in self._limit_queue if order_id not in done]
+        return tuple(filled)
+
+    def process_trigger_orders(self, price: float, timestamp: int) -> tuple[Order, ...]:
+        """Fill every stop-loss / take-profit order ``price`` triggers, oldest first."""
+        if not self._trigger_queue:
+            return ()
+        filled: list[Order] = []
+        for order_id in self._trigger_queue:
+            order = self._orders[order_id]
+            trigger_price = order.price
+            if trigger_price is None or not is_trigger_hit(order.type, order.side, trigger_price, price):
+                continue
+            remaining = order.amount - order.filled
+            if remaining <= FILL_EPS:
+                continue
+            if order.side == OrderSide.SELL and not self._has_sell_capacity(remaining):
+                continue
+            quote = quote_trigger_fill(self._cost_profile, side=order.side, trigger_price=trigger_price, amount=remaining)
+            self._fill(order, quote.execution_price, remaining, quote.fee, timestamp)
+            filled.append(self._orders[order.id])
+        if filled:
+            done = {order.id for order in filled}
+            self._trigger_queue = [order_id for order_id in self._trigger_queue if order_id not in done]
+        return tuple(filled)
+
+    def drain_events(self) -> tuple[list[StrategyOrderEvent], list[StrategyTradeEvent]]:
+        """Order and trade callbacks accumulated since the previous drain."""
+        order_events = []
+        for order_id in self._pending_orders:
+            order = self._orders[order_id]
+            order_events.append(
+                StrategyOrderEvent(
+                    order_id=order.id,
+                    symbol=order.symbol,
+                    status=order.status.value,
+                    filled=order.filled,
+                )
+            )
+        trade_events = []
+        for index in self._pending_trades:
+            trade = self._trades[index]
+            trade_events.append(
+                StrategyTradeEvent(
+                    trade_id=str(index + 1),
+                    order_id=trade.order_id,
+                    symbol=trade.symbol,
+                    price=trade.price,
+                    amount=trade.amount,
+                    fee=trade.fee,
+                )
+            )
+        self._pending_orders = []
+        self._pending_trades = []
+        return order_events, trade_events
+
+    def _create_order(
+        self,
+        order_type: OrderType,
+        side: OrderSide,
+        amount: float,
+        price: float,
+        timestamp: int,
+    ) -> Order:
+        if side == OrderSide.BUY:
+            required = buy_freeze_amount(amount, price)
+            if self._quote.available < required:
+                raise SimulatedExchangeError("failed to freeze funds: insufficient available balance to freeze")
+            self._quote.available -= required
+            self._quote.frozen += required
+        sequence = len(self._orders) + 1
+        order = Order(
+            id=f"sim-{sequence:08d}",
+            symbol=self._symbol,
+            type=order_type,
+            side=side,
+            price=price,
+            amount=amount,
+            filled=0.0,
+            status=OrderStatus.OPEN,
+            created_at=timestamp,
+            updated_at=timestamp,
+        )
+        self._orders[order.id] = order
+        self._order_sequence[order.id] = sequence
+        self._pending_orders.append(order.id)
+        return order
+
+    def _fill(self, order: Order, execution_price: float, amount: float, fee: float, timestamp: int) -> None:
+        if order.side == OrderSide.BUY:
+            # Buys consume what was frozen at the order price, as ``TradeService`` does.
+            consumed = buy_freeze_amount(amount, order.price if order.price is not None else execution_price)
+            if self._quote.frozen < consumed:
+                raise SimulatedExchangeError("insufficient frozen funds to consume")
+            self._quote.frozen -= consumed
+            self._base.available += amount
+            self._apply_buy_position_update(amount, execution_price)
+        else:
+            # Same 1e-12 tolerance as the sell-capacity check, so float dust left
+            # by partial sells cannot wedge a queued order that already passed it.
+            if self._base.available + FILL_EPS < amount:
+                raise SimulatedExchangeError("insufficient available balance")
+            self._base.available = max(self._base.available - amount, 0.0)
+            self._quote.available += amount * execution_price
+            self._apply_sell_position_update(amount, execution_price)
+        filled = order.filled + amount
+        self._orders[order.id] = replace(
+            order,
+            filled=filled,
+            status=OrderStatus.FILLED if filled == order.amount else OrderStatus.PARTIALLY_FILLED,
+            updated_at=timestamp,
+        )
+        self._trades.append(
+            Trade(
+                order_id=order.id,
+                symbol=order.symbol,
+                side=TradeSide(order.side.value),
+                price=execution_price,
+                amount=amount,
+                fee=fee,
+                timestamp=timestamp,
+            )
+        )
+        self._total_fees += fee
+        if order.id not in self._pending_orders:
+            self._pending_orders.append(order.id)
+        self._pending_trades.append(len(self._trades) - 1)
+
+    def _apply_buy_position_update(self, amount: float, price: float) -> None:
+        position = self._position
+        if position is None:
+            self._position = [amount, price, price, 0.0]
+            return
+        position[0], position[1] = position_after_buy(position[0], position[1], amount, price)
+        position[2] = price
+
+    def _apply_sell_position_update(self, amount: float, price: float) -> None:
+        position = self._position
+        if position is None:
+            raise SimulatedExchangeError(f"position not found for symbol {self._symbol}")
+        if position[0] + FILL_EPS < amount:
+            raise SimulatedExchangeError(f"insufficient position amount for symbol {self._symbol}")
+        position[0], realized_increment = position_after_sell(position[0], position[1], amount, price)
+        position[3] += realized_increment
+        position[2] = price
+
+    def _position_amount(self) -> float:
+        return 0.0 if self._position is None else self._position[0]
+
+    def _has_sell_capacity(self, amount: float) -> bool:
+        if self._base.available + FILL_EPS < amount:
+            return False
+        return self._position is not None and self._position[0] + FILL_EPS >= amount
+
+    def _check_risk(self, side: OrderSide, amount: float, reference_price: float) -> None:
+        try:
+            self._risk_control.check_pre_order(
+                symbol=self._symbol,
+                side=side,
+                amount=amount,
+                reference_price=reference_price,
+            )
+        except RiskControlError as exc:
+            raise SimulatedExchangeError(f"risk check failed: {exc}") from exc
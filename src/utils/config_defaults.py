@@ -7,6 +7,11 @@ from typing import Any, Callable
 
 ALLOWED_LOG_LEVELS = {"DEBUG", "INFO", "WARNING", "ERROR", "CRITICAL"}
 ALLOWED_TIMEFRAMES = {"1m", "5m", "15m", "1h", "4h", "1d"}
+ALLOWED_DATABASE_PROFILES = {"legacy", "wal"}
+ALLOWED_DATA_READ_SOURCES = {"sqlite", "columnar", "rollup"}
+ALLOWED_BACKTEST_ENGINES = {"backtrader", "vectorized"}
+ALLOWED_MEMORY_MODES = {"full", "bounded"}
+ALLOWED_ANALYZER_PROFILES = {"full", "standard", "minimal"}
 
 DEFAULT_CONFIG: dict[str, Any] = {
     "system": {
@@ -14,6 +19,15 @@ DEFAULT_CONFIG: dict[str, Any] = {
         "log_dir": "logs",
         "data_dir": "data",
         "database_path": "data/database/trading.db",
+        "database": {
+            "profile": "wal",
+            "read_pool_size": 4,
+            # Optional per-setting overrides on top of the selected profile.
+            "synchronous": None,
+            "cache_size": None,
+            "mmap_size": None,
+            "temp_store": None,
+        },
     },
     "logging": {
         "level": "INFO",
@@ -66,6 +80,13 @@ DEFAULT_CONFIG: dict[str, Any] = {
             "backoff_multiplier": 2.0,
             "max_delay_seconds": 2.0,
         },
+        "retention": {
+            "batch_rows": 5000,
+            "pause_ms": 50,
+            "vacuum_step_pages": 1000,
+            # [{symbol: BTC/USDT | "*", timeframe: 1m | "*", days: 30}, ...]
+            "policies": [],
+        },
     },
     "account": {
         "initial_capital": 10000.0,
@@ -87,6 +108,12 @@ DEFAULT_CONFIG: dict[str, Any] = {
         "default_timeframe": "1h",
         "default_period": 90,
         "data_read_source": "sqlite",
+        "columnar_dir": "data/columnar",
+        "frame_cache_mb": 256,
+        "result_cache_mb": 64,
+        "engine": "backtrader",
+        "memory_mode": "full",
+        "analyzer_profile": "full",
     },
 }
 
@@ -4,7 +4,15 @@ from __future__ import annotations
 
 from typing import Any
 
-from src.utils.config_defaults import ALLOWED_LOG_LEVELS, ALLOWED_TIMEFRAMES
+from src.utils.config_defaults import (
+    ALLOWED_ANALYZER_PROFILES,
+    ALLOWED_BACKTEST_ENGINES,
+    ALLOWED_DATABASE_PROFILES,
+    ALLOWED_DATA_READ_SOURCES,
+    ALLOWED_LOG_LEVELS,
+    ALLOWED_MEMORY_MODES,
+    ALLOWED_TIMEFRAMES,
+)
 
 
 class ConfigValidationError(ValueError):
@@ -16,6 +24,14 @@ def validate_config(config: dict[str, Any]) -> None:
     _require_string(config, ("system", "data_dir"))
     _require_string(config, ("system", "database_path"))
     _require_log_level(config, ("system", "log_level"))
+    database_profile = _require_string(config, ("system", "database", "profile")).lower()
+    if database_profile not in ALLOWED_DATABASE_PROFILES:
+        raise ConfigValidationError(
+            f"system.database.profile must be one of {sorted(ALLOWED_DATABASE_PROFILES)}"
+        )
+    _require_int(config, ("system", "database", "read_pool_size"), min_value=0)
+    _optional_int(config, ("system", "database", "cache_size"))
+    _optional_int(config, ("system", "database", "mmap_size"), min_value=0)
 
     _require_log_level(config, ("logging", "level"))
     _require_string(config, ("logging", "rotation"))
@@ -62,6 +78,28 @@ def validate_config(config: dict[str, Any]) -> None:
         min_value=0.0,
         inclusive_min=False,
     )
+    _require_int(config, ("market_data", "retention", "batch_rows"), min_value=1)
+    _require_int(config, ("market_data", "retention", "pause_ms"), min_value=0)
+    _require_int(config, ("market_data", "retention", "vacuum_step_pages"), min_value=1)
+    policies = read_nested(config, ("market_data", "retention", "policies"))
+    if not isinstance(policies, list):
+        raise ConfigValidationError("market_data.retention.policies must be a list")
+    for index, policy in enumerate(policies):
+        key_path = f"market_data.retention.policies[{index}]"
+        if not isinstance(policy, dict):
+            raise ConfigValidationError(f"{key_path} must be a mapping")
+        unknown = set(policy) - {"symbol", "timeframe", "days"}
+        if unknown:
+            raise ConfigValidationError(f"Unsupported config key: {key_path}.{sorted(unknown)[0]}")
+        _require_int_value(policy, f"{key_path}.days", min_value=1)
+        symbol = policy.get("symbol", "*")
+        if not isinstance(symbol, str) or not symbol.strip():
+            raise ConfigValidationError(f"{key_path}.symbol must be a non-empty string")
+        timeframe = policy.get("timeframe", "*")
+        if timeframe != "*" and timeframe not in ALLOWED_TIMEFRAMES:
+            raise ConfigValidationError(
+                f"{key_path}.timeframe must be '*' or one of {sorted(ALLOWED_TIMEFRAMES)}"
+            )
 
     _require_number(config, ("account", "initial_capital"), min_value=0.0, inclusive_min=False)
     _require_string(config, ("account", "base_currency"))
@@ -103,11 +141,31 @@ def validate_config(config: dict[str, Any]) -> None:
         )
     _require_int(config, ("backtest", "default_period"), min_value=1)
     data_read_source = _require_string(config, ("backtest", "data_read_source"))
-    if data_read_source.lower() != "sqlite":
+    if data_read_source.lower() not in ALLOWED_DATA_READ_SOURCES:
         raise ConfigValidationError(
-            "backtest.data_read_source must be 'sqlite' "
+            f"backtest.data_read_source must be one of {sorted(ALLOWED_DATA_READ_SOURCES)} "
             "(CSV/Parquet runtime reads are not allowed)"
         )
+    _require_string(config, ("backtest", "columnar_dir"))
+    _require_int(config, ("backtest", "frame_cache_mb"), min_value=0)
+    _require_int(config, ("backtest", "result_cache_mb"), min_value=0)
+    engine = _require_string(config, ("backtest", "engine"))
+    if engine.lower() not in ALLOWED_BACKTEST_ENGINES:
+        raise ConfigValidationError(
+            f"backtest.engine must be one of {sorted(ALLOWED_BACKTEST_ENGINES)}"
+        )
+    memory_mode = _require_string(config, ("backtest", "memory_mode"))
+    if memory_mode.lower() not in ALLOWED_MEMORY_MODES:
+        raise ConfigValidationError(
+            f"backtest.memory_mode must be one of {sorted(ALLOWED_MEMORY_MODES)}"
+        )
+    if memory_mode.lower() == "bounded" and engine.lower() == "vectorized":
+        raise ConfigValidationError("backtest.memory_mode=bounded requires backtest.engine=backtrader")
+    analyzer_profile = _require_string(config, ("backtest", "analyzer_profile"))
+    if analyzer_profile.lower() not in ALLOWED_ANALYZER_PROFILES:
+        raise ConfigValidationError(
+            f"backtest.analyzer_profile must be one of {sorted(ALLOWED_ANALYZER_PROFILES)}"
+        )
 
 
 def validate_strategies_config(config: dict[str, Any]) -> None:
@@ -228,6 +286,16 @@ def _require_int(config: dict[str, Any], path: tuple[str, ...], min_value: int |
     return value
 
 
+def _optional_int(
+    config: dict[str, Any],
+    path: tuple[str, ...],
+    min_value: int | None = None,
+) -> int | None:
+    if read_nested(config, path) is None:
+        return None
+    return _require_int(config, path, min_value=min_value)
+
+
 def _require_bool_value(data: dict[str, Any], key_path: str) -> bool:
     key = key_path.split(".")[-1]
     value = data.get(key)
@@ -3,19 +3,27 @@
 from __future__ import annotations
 
 import tempfile
+from dataclasses import asdict
 from pathlib import Path
 
 import backtrader as bt
+import numpy as np
 import pytest
 
+from src.analysis.performance import analyze_performance
 from src.backtest import (
     BacktestEngine,
+    BacktestEngineError,
     BacktestRunRequest,
     ReturnsAnalysis,
     RiskMetrics,
+    TimeSeries,
     TradeStatistics,
 )
+from src.backtest.value_metrics import sortino_ratio
 from src.core.database import SQLiteDatabase
+from src.data.candle_schema import insert_candle_rows
+from src.strategies.sma_strategy import SMAStrategy
 
 
 class SimpleTestStrategy(bt.Strategy):
@@ -162,11 +170,10 @@ def test_all_analyzers_produce_output(temp_db: SQLiteDatabase) -> None:
     assert isinstance(result.returns_analysis.total_return, float)
     assert isinstance(result.returns_analysis.avg_return, float)
 
-    # Verify time_series_returns format (step 27)
-    assert isinstance(result.time_series_returns, dict)
-    for key, value in result.time_series_returns.items():
-        assert isinstance(key, str)  # ISO date string
-        assert isinstance(value, float)  # Return value
+    # Verify time_series_returns format (step 27): parallel datetime64 / float64 columns
+    assert isinstance(result.time_series_returns, TimeSeries)
+    assert result.time_series_returns.timestamps.dtype == "datetime64[us]"
+    assert result.time_series_returns.values.dtype == "float64"
 
 
 def test_no_trades_scenario_returns_zeros(temp_db: SQLiteDatabase) -> None:
@@ -202,7 +209,7 @@ def test_no_trades_scenario_returns_zeros(temp_db: SQLiteDatabase) -> None:
     # Other analyzers should still produce valid output
     assert isinstance(result.risk_metrics, RiskMetrics)
     assert isinstance(result.returns_analysis, ReturnsAnalysis)
-    assert isinstance(result.time_series_returns, dict)
+    assert isinstance(result.time_series_returns, TimeSeries)
 
 
 def test_sharpe_ratio_edge_case_insufficient_data(temp_db: SQLiteDatabase) -> None:
@@ -233,7 +240,7 @@ def test_sharpe_ratio_edge_case_insufficient_data(temp_db: SQLiteDatabase) -> No
 
 
 def test_time_series_format_iso_strings(temp_db: SQLiteDatabase) -> None:
-    """Verify time_series_returns keys are ISO strings and values are floats (step 27)."""
+    """Verify time_series_returns export as ISO string keys with float values (step 27)."""
     engine = BacktestEngine(
         temp_db,
         initial_capital=10000.0,
@@ -252,10 +259,12 @@ def test_time_series_format_iso_strings(temp_db: SQLiteDatabase) -> None:
     result = engine.run(request)
 
     # Verify time series format
-    assert isinstance(result.time_series_returns, dict)
+    assert isinstance(result.time_series_returns, TimeSeries)
+    exported = result.time_series_returns.to_dict()
+    assert len(exported) == len(result.time_series_returns)
 
-    if result.time_series_returns:  # May be empty for some strategies
-        for key, value in result.time_series_returns.items():
+    if exported:  # May be empty for some strategies
+        for key, value in exported.items():
             # Key should be ISO format string (e.g., "2021-01-01T00:00:00")
             assert isinstance(key, str)
             assert "T" in key or "-" in key  # Basic ISO format check
@@ -297,11 +306,12 @@ def test_field_completeness_all_fields_present(temp_db: SQLiteDatabase) -> None:
     }
     assert set(result.trade_stats.__dataclass_fields__.keys()) == trade_stats_fields
 
-    # Verify RiskMetrics has all 3 fields
+    # Verify RiskMetrics has all 4 fields
     risk_metrics_fields = {
         "sharpe_ratio",
         "max_drawdown_pct",
         "max_drawdown_duration_days",
+        "sortino_ratio",
     }
     assert set(result.risk_metrics.__dataclass_fields__.keys()) == risk_metrics_fields
 
@@ -309,7 +319,7 @@ def test_field_completeness_all_fields_present(temp_db: SQLiteDatabase) -> None:
     returns_analysis_fields = {"total_return", "avg_return"}
     assert set(result.returns_analysis.__dataclass_fields__.keys()) == returns_analysis_fields
 
-    # Verify BacktestRunResult has all 13 fields (8 basic + 4 analyzer + 1 trade log)
+    # Verify BacktestRunResult has all 15 fields (8 basic + 4 analyzer + 1 trade log + 1 portfolio + 1 profile)
     result_fields = {
         "symbol",
         "timeframe",
@@ -324,5 +334,74 @@ def test_field_completeness_all_fields_present(temp_db: SQLiteDatabase) -> None:
         "returns_analysis",
         "time_series_returns",
         "trade_log",  # step 28: individual closed trade records
+        "symbol_breakdown",  # portfolio runs: per-symbol slices
+        "profile",  # stage timings, set only on profiled runs
     }
     assert set(result.__dataclass_fields__.keys()) == result_fields
+
+
+def _seed_daily_walk(database: SQLiteDatabase, bars: int) -> None:
+    rng = np.random.default_rng(11)
+    close = 100.0 * np.exp(np.cumsum(rng.normal(0.0, 0.02, bars)))
+    open_ = np.concatenate(([100.0], close[:-1]))
+    start = 1_577_836_800_000  # 2020-01-01 00:00:00 UTC
+    high = np.maximum(open_, close) * 1.01
+    low = np.minimum(open_, close) * 0.99
+    rows = [
+        ("ETH/USDT", "1d", start + idx * 86_400_000, open_[idx], high[idx], low[idx], close[idx], 1.0)
+        for idx in range(bars)
+    ]
+    with database.transaction() as tx:
+        insert_candle_rows(tx, rows)
+
+
+@pytest.mark.parametrize("memory_mode", ["full", "bounded"])
+def test_standard_profile_matches_full_analyzers(temp_db: SQLiteDatabase, memory_mode: str) -> None:
+    """The recorded value array reproduces every analyzer output (3 years of daily bars)."""
+    _seed_daily_walk(temp_db, 1_100)
+    params = {"fast_period": 5, "slow_period": 20}
+    request = BacktestRunRequest("ETH/USDT", "1d", 0, 2_000_000_000_000, SMAStrategy, params)
+    results = {
+        profile: BacktestEngine(
+            temp_db,
+            initial_capital=10_000.0,
+            commission_rate=0.001,
+            slippage_rate=0.0005,
+            memory_mode=memory_mode,
+            analyzer_profile=profile,
+        ).run(request)
+        for profile in ("full", "standard", "minimal")
+    }
+    full, standard, minimal = results["full"], results["standard"], results["minimal"]
+
+    assert full.risk_metrics.sharpe_ratio is not None and full.risk_metrics.sortino_ratio is not None
+    assert asdict(standard.risk_metrics) == pytest.approx(asdict(full.risk_metrics), rel=1e-9)
+    assert asdict(standard.returns_analysis) == pytest.approx(asdict(full.returns_analysis), rel=1e-9)
+    assert asdict(standard.trade_stats) == pytest.approx(asdict(full.trade_stats), rel=1e-9)
+    assert np.array_equal(standard.time_series_returns.timestamps, full.time_series_returns.timestamps)
+    assert standard.time_series_returns.values == pytest.approx(full.time_series_returns.values, rel=1e-9)
+    assert (standard.final_value, standard.trade_log) == (full.final_value, full.trade_log)
+
+    # minimal keeps final value, drawdown, returns and trade stats only.
+    assert (minimal.risk_metrics.sharpe_ratio, minimal.risk_metrics.sortino_ratio) == (None, None)
+    assert len(minimal.time_series_returns) == 0
+    assert minimal.risk_metrics.max_drawdown_pct == pytest.approx(full.risk_metrics.max_drawdown_pct)
+    assert minimal.returns_analysis == standard.returns_analysis
+    assert minimal.trade_stats == standard.trade_stats
+
+
+def test_sortino_ratio_matches_analyze_performance() -> None:
+    stamps = np.arange("2024-01-01", "2024-03-01", dtype="datetime64[D]").astype("datetime64[us]")
+    returns = TimeSeries.from_arrays(stamps, np.random.default_rng(3).normal(0.001, 0.02, len(stamps)))
+    expected = analyze_performance(
+        returns_series=list(zip(returns.timestamps.tolist(), returns.values.tolist())),
+        initial_capital=1.0,
+        period_seconds=86_400.0,
+    )
+    assert sortino_ratio(returns) == pytest.approx(expected.sortino_ratio, rel=1e-9)
+    assert sortino_ratio(TimeSeries.from_arrays(stamps[:3], [0.01, -0.02, 0.03])) is None  # one losing period
+
+
+def test_unknown_analyzer_profile_is_rejected(temp_db: SQLiteDatabase) -> None:
+    with pytest.raises(BacktestEngineError, match="analyzer_profile"):
+        BacktestEngine(temp_db, initial_capital=1.0, commission_rate=0.0, slippage_rate=0.0, analyzer_profile="fast")
@@ -2,14 +2,22 @@
 
 from __future__ import annotations
 
+import math
 from collections.abc import Mapping
 from typing import Any
 
 import backtrader as bt
 import pytest
 
-from src.backtest.engine import BacktestEngine, BacktestEngineError, BacktestRunRequest
+from src.backtest.engine import (
+    BacktestEngine,
+    BacktestEngineError,
+    BacktestRunRequest,
+    _release_closed_trades,
+    _release_finished_orders,
+)
 from src.core.database import SQLiteDatabase
+from src.data.candle_schema import insert_candle_rows
 from src.strategies.registry import StrategyRegistry, StrategySpec
 
 
@@ -101,6 +109,31 @@ def test_backtest_engine_runs_with_pandas_feed_and_returns_basic_stats(
     )
 
 
+def test_backtest_engine_columnar_source_matches_sqlite(
+    sqlite_database: SQLiteDatabase,
+    tmp_path,
+) -> None:
+    request = BacktestRunRequest(
+        symbol="BTC/USDT",
+        timeframe="1h",
+        start_timestamp=1_700_000_000_000,
+        end_timestamp=1_700_000_010_800,
+        strategy_class=BuyThenSellStrategy,
+        strategy_params={"buy_size": 1.0, "sell_on_bar": 4},
+    )
+    config = dict(_build_config(data_read_source="columnar"))
+    config["backtest"] = {**config["backtest"], "columnar_dir": str(tmp_path / "columnar")}
+
+    sqlite_result = BacktestEngine.from_config(database=sqlite_database, config=_build_config()).run(request)
+    columnar_result = BacktestEngine.from_config(database=sqlite_database, config=config).run(request)
+
+    assert columnar_result.data_source == "columnar"
+    assert columnar_result.bars_processed == sqlite_result.bars_processed
+    assert columnar_result.final_value == pytest.approx(sqlite_result.final_value)
+    assert columnar_result.time_series_returns == sqlite_result.time_series_returns
+    assert (tmp_path / "columnar" / "BTC_USDT_1h" / "meta.json").exists()
+
+
 def test_backtest_engine_rejects_non_sqlite_data_read_path(
     sqlite_database: SQLiteDatabase,
 ) -> None:
@@ -172,3 +205,180 @@ def test_backtest_engine_applies_config_params(sqlite_database: SQLiteDatabase)
 
     engine.run(request)
     assert ParamSpyStrategy.last_threshold == 42
+
+
+class OrderArchiveSpyStrategy(bt.Strategy):
+    """Crosses a short SMA and reports how many orders backtrader still archives."""
+
+    params = (("period", 3),)
+    archived: dict[str, int] = {}
+
+    def __init__(self) -> None:
+        self._sma = bt.indicators.SMA(self.data.close, period=self.params.period)
+
+    def next(self) -> None:
+        if not self.position and self.data.close[0] > self._sma[0]:
+            self.buy(size=1.0)
+        elif self.position and self.data.close[0] < self._sma[0]:
+            self.close()
+
+    def stop(self) -> None:
+        OrderArchiveSpyStrategy.archived = {
+            "strategy": len(self._orders),
+            "broker": len(self.broker.orders),
+            "trades": sum(len(trades) for by_id in self._trades.values() for trades in by_id.values()),
+        }
+
+
+def test_bounded_memory_mode_streams_in_chunks_and_matches_full_run(tmp_path) -> None:
+    database = SQLiteDatabase(tmp_path / "bounded.db")
+    database.initialize_schema()
+    rows = []
+    for idx in range(240):
+        price = 100.0 + 10.0 * math.sin(idx / 6)
+        rows.append(("BTC/USDT", "1m", idx * 60_000, price, price + 0.5, price - 0.5, price, 1.0))
+    with database.transaction() as tx:
+        insert_candle_rows(tx, rows)
+    request = BacktestRunRequest(
+        symbol="BTC/USDT",
+        timeframe="1m",
+        start_timestamp=0,
+        end_timestamp=239 * 60_000,
+        strategy_class=OrderArchiveSpyStrategy,
+    )
+
+    def _run(memory_mode: str):
+        engine = BacktestEngine(
+            database,
+            initial_capital=10_000.0,
+            commission_rate=0.001,
+            slippage_rate=0.0,
+            memory_mode=memory_mode,
+            stream_chunk_rows=17,
+        )
+        return engine.run(request), dict(OrderArchiveSpyStrategy.archived)
+
+    full, full_archive = _run("full")
+    bounded, bounded_archive = _run("bounded")
+    database.close()
+
+    assert bounded.bars_processed == full.bars_processed == 240
+    assert bounded.final_value == pytest.approx(full.final_value)
+    assert bounded.trade_log == full.trade_log and len(bounded.trade_log) > 5
+    assert bounded.risk_metrics.max_drawdown_pct == pytest.approx(full.risk_metrics.max_drawdown_pct)
+    # Intraday returns are bucketed per day instead of per bar.
+    assert len(full.time_series_returns) == 240 and len(bounded.time_series_returns) == 1
+    assert full_archive["strategy"] > 10 and full_archive["trades"] == len(full.trade_log)
+    assert bounded_archive["strategy"] <= 2 and bounded_archive["broker"] <= 1
+    assert bounded_archive["trades"] <= 1
+
+
+class BracketAndOcoStrategy(bt.Strategy):
+    """Alternates bracket entries with market entries closed by a limit/stop OCO pair."""
+
+    archived: dict[str, int] = {}
+
+    def __init__(self) -> None:
+        self._entries = 0
+        self._pending: list[bt.Order] = []
+
+    def notify_order(self, order: bt.Order) -> None:
+        if not order.alive() and order in self._pending:
+            self._pending.remove(order)
+
+    def next(self) -> None:
+        if self._pending:
+            return
+        close = self.data.close[0]
+        if not self.position:
+            self._entries += 1
+            if self._entries % 2:
+                self._pending = list(self.buy_bracket(size=1.0, limitprice=close * 1.03, stopprice=close * 0.97,
+                                                     exectype=bt.Order.Market))
+            else:
+                self._pending = [self.buy(size=1.0)]
+            return
+        take_profit = self.sell(size=self.position.size, exectype=bt.Order.Limit, price=close * 1.03)
+        stop_loss = self.sell(size=self.position.size, exectype=bt.Order.Stop, price=close * 0.97, oco=take_profit)
+        self._pending = [take_profit, stop_loss]
+
+    def stop(self) -> None:
+        BracketAndOcoStrategy.archived = {
+            "strategy": len(self._orders),
+            "broker": len(self.broker.orders),
+            "brackets": len(self.broker._pchildren),
+        }
+
+
+def test_bounded_memory_mode_keeps_bracket_and_oco_orders_working(tmp_path) -> None:
+    database = SQLiteDatabase(tmp_path / "bracket.db")
+    database.initialize_schema()
+    rows = []
+    for idx in range(300):
+        price = 100.0 + 8.0 * math.sin(idx / 7)
+        rows.append(("BTC/USDT", "1m", idx * 60_000, price, price + 1.5, price - 1.5, price, 1.0))
+    with database.transaction() as tx:
+        insert_candle_rows(tx, rows)
+    request = BacktestRunRequest("BTC/USDT", "1m", 0, 299 * 60_000, BracketAndOcoStrategy)
+
+    def _run(memory_mode: str):
+        engine = BacktestEngine(
+            database,
+            initial_capital=10_000.0,
+            commission_rate=0.001,
+            slippage_rate=0.0,
+            memory_mode=memory_mode,
+            stream_chunk_rows=23,
+        )
+        return engine.run(request), dict(BracketAndOcoStrategy.archived)
+
+    full, full_archive = _run("full")
+    bounded, bounded_archive = _run("bounded")
+    database.close()
+
+    assert len(full.trade_log) > 6
+    assert bounded.trade_log == full.trade_log
+    assert bounded.final_value == pytest.approx(full.final_value)
+    assert full_archive["strategy"] > 20
+    # Only the live bracket legs or OCO pair (one clone per status change) remain.
+    assert bounded_archive["strategy"] <= 6 and bounded_archive["broker"] <= 3
+    assert bounded_archive["brackets"] <= 1
+
+
+def test_bounded_order_release_leaves_unknown_layouts_alone() -> None:
+    class _Broker:
+        orders = ("not", "a", "list")
+
+    class _Strategy:
+        broker = _Broker()
+        _orders = ["kept"]
+        _trades = None
+
+    strategy = _Strategy()
+    _release_finished_orders(strategy)
+    _release_closed_trades(strategy, object())
+
+    assert strategy._orders == ["kept"] and _Broker.orders == ("not", "a", "list")
+
+
+def test_bounded_memory_mode_rejects_unsupported_setups(sqlite_database: SQLiteDatabase) -> None:
+    with pytest.raises(BacktestEngineError, match="engine=backtrader"):
+        BacktestEngine(
+            sqlite_database,
+            initial_capital=10_000.0,
+            commission_rate=0.001,
+            slippage_rate=0.0,
+            engine_mode="vectorized",
+            memory_mode="bounded",
+        )
+    config = dict(_build_config())
+    config["backtest"] = {**config["backtest"], "memory_mode": "bounded"}
+    engine = BacktestEngine.from_config(database=sqlite_database, config=config)
+    empty = BacktestRunRequest("BTC/USDT", "1h", 1_700_000_100_000, 1_700_000_200_000, BuyThenSellStrategy)
+    with pytest.raises(BacktestEngineError, match="No candle data"):
+        engine.run(empty)
+    portfolio = BacktestRunRequest(
+        "BTC/USDT", "1h", 1_700_000_000_000, 1_700_000_010_800, BuyThenSellStrategy, symbols=("ETH/USDT",)
+    )
+    with pytest.raises(BacktestEngineError, match="single-symbol"):
+        engine.run(portfolio)
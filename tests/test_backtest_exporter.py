@@ -2,8 +2,10 @@
 
 import csv
 import json
+from datetime import datetime
 from pathlib import Path
 
+import numpy as np
 import pytest
 
 from src.backtest.exporter import BacktestExporterError, BacktestResultExporter
@@ -11,6 +13,7 @@ from src.backtest.result_models import (
     BacktestRunResult,
     ReturnsAnalysis,
     RiskMetrics,
+    TimeSeries,
     TradeStatistics,
 )
 
@@ -47,13 +50,13 @@ def sample_result() -> BacktestRunResult:
             total_return=0.25,
             avg_return=0.0035,
         ),
-        time_series_returns={
+        time_series_returns=TimeSeries.from_mapping({
             "2024-01-01T00:00:00": 0.0,
             "2024-01-02T00:00:00": 0.02,
             "2024-01-03T00:00:00": 0.05,
             "2024-01-04T00:00:00": 0.03,
             "2024-01-05T00:00:00": 0.08,
-        },
+        }),
     )
 
 
@@ -260,7 +263,7 @@ def test_export_handles_none_values_in_result(temp_output_dir: Path) -> None:
             total_return=0.02,
             avg_return=0.0002,
         ),
-        time_series_returns={},
+        time_series_returns=TimeSeries.empty(),
     )
     
     exporter = BacktestResultExporter(temp_output_dir)
@@ -424,8 +427,11 @@ def test_export_methods_handle_type_error(
         compromised_result = replace(sample_result, trade_stats=bad_stats)
     
     elif method_name == "export_equity_curve_json":
-        # Inject into time_series_returns dict
-        bad_series = {"2024-01-01": bad_obj}  # type: ignore
+        # Inject into the time_series_returns value column
+        bad_series = TimeSeries(
+            np.array(["2024-01-01"], dtype="datetime64[us]"),
+            np.array([bad_obj], dtype=object),
+        )
         compromised_result = replace(sample_result, time_series_returns=bad_series)
         
     elif method_name == "export_trade_log_json":
@@ -456,3 +462,20 @@ def test_export_methods_handle_type_error(
 
 
 
+
+
+def test_time_series_columns_export_like_isoformat() -> None:
+    """TimeSeries keeps datetime64/float64 columns; ISO strings only appear on export."""
+    end_of_day = datetime(2024, 1, 1, 23, 59, 59, 999989)
+    series = TimeSeries.from_mapping({end_of_day: 0.1, datetime(2024, 1, 2, 23, 59, 59, 999989): -0.5})
+
+    assert series.timestamps.dtype == "datetime64[us]"
+    assert series.values.dtype == "float64"
+    assert list(series.to_dict()) == [end_of_day.isoformat(), "2024-01-02T23:59:59.999989"]
+    assert series.compound(100.0).values.tolist() == pytest.approx([110.0, 55.0])
+    assert TimeSeries.from_mapping({"2024-01-01T00:00:00": 1.0}).to_dict() == {"2024-01-01T00:00:00": 1.0}
+
+    later = TimeSeries.from_mapping({"2024-01-02T23:59:59.999989": 0.2, "2024-01-03T00:00:00": 0.3})
+    joined = TimeSeries.concat([series, TimeSeries.empty(), later])
+    assert joined.values.tolist() == [0.1, 0.2, 0.3]
+    assert joined == TimeSeries.concat([joined])
@@ -10,6 +10,7 @@ import pytest
 
 from src.benchmarking import executors
 from src.benchmarking.executors import BenchmarkExecutionError
+from src.benchmarking.storage_benchmarks import run_storage_benchmark
 from src.backtest.result_models import BacktestRunRequest
 from src.strategies.registry import StrategyParamError
 
@@ -287,3 +288,32 @@ def test_realtime_benchmark_uses_iteration_duration_stats(
     assert stats.p95_ms == pytest.approx(5.0)
     assert stats.max_ms == pytest.approx(5.0)
     assert fake_db.closed is True
+
+
+def test_storage_benchmark_reports_each_profile(tmp_path: Path) -> None:
+    report = run_storage_benchmark(
+        output_dir=tmp_path,
+        rows=240,
+        read_iterations=5,
+        batch_size=100,
+    )
+
+    assert [item.profile for item in report.profiles] == ["legacy", "wal"]
+    assert [item.journal_mode for item in report.profiles] == ["DELETE", "WAL"]
+    for item in report.profiles:
+        assert item.rows == 240
+        assert item.insert_rows_per_second > 0
+        assert item.read_latency_ms.samples == 5
+        assert item.contended_read_latency_ms.samples == 5
+    assert report.to_dict()["conditions"]["rows"] == 240
+    ingest = report.ingest_validation
+    assert ingest is not None
+    assert ingest.rows == 240 and ingest.page_size == 100
+    assert ingest.per_row_rows_per_second > 0
+    assert ingest.vectorized_rows_per_second > 0
+    assert report.to_dict()["ingest_validation"]["speedup"] == ingest.speedup
+
+
+def test_storage_benchmark_rejects_unknown_profile(tmp_path: Path) -> None:
+    with pytest.raises(BenchmarkExecutionError, match="profiles"):
+        run_storage_benchmark(output_dir=tmp_path, profiles=("turbo",))
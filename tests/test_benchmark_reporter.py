@@ -13,10 +13,12 @@ from src.benchmarking.models import (
     BenchmarkReport,
     BenchmarkThresholds,
     LatencyStats,
+    MemoryBenchmarkReport,
+    MemoryModeResult,
     OrderBenchmarkResult,
     RealtimeBenchmarkResult,
 )
-from src.benchmarking.reporter import save_benchmark_report
+from src.benchmarking.reporter import save_benchmark_report, save_memory_benchmark_report
 
 
 def _report() -> BenchmarkReport:
@@ -68,3 +70,25 @@ def test_save_benchmark_report_avoids_overwriting_same_second(tmp_path: Path) ->
     second_payload = json.loads(second_paths["json"].read_text(encoding="utf-8"))
     assert first_payload["meta"]["generated_at_utc"] == second_payload["meta"]["generated_at_utc"]
 
+
+def test_memory_report_flags_bounded_runs_over_the_peak_target(tmp_path: Path) -> None:
+    def _run(mode: str, peak_mb: float) -> MemoryModeResult:
+        return MemoryModeResult(mode, 1_000, int(peak_mb * 1024 * 1024), 0.1, 0, 10_000.0, 1)
+
+    report = MemoryBenchmarkReport(
+        meta=BenchmarkMeta(generated_at_utc="2026-02-22T06:22:00Z", benchmark_version="memory-v1"),
+        timeframe="1m",
+        seed=42,
+        strategy="sma_strategy",
+        chunk_rows=5_000,
+        runs=(_run("full", 20.0), _run("bounded", 3.0), _run("bounded", 9.0)),
+        bounded_peak_target_bytes=8 * 1024 * 1024,
+    )
+
+    assert [item.peak_bytes for item in report.bounded_runs_over_target] == [9 * 1024 * 1024]
+    paths = save_memory_benchmark_report(report, tmp_path)
+    payload = json.loads(paths["json"].read_text(encoding="utf-8"))
+    assert [item["over_target"] for item in payload["runs"]] == [False, False, True]
+    markdown = paths["markdown"].read_text(encoding="utf-8")
+    assert "bounded 峰值目标: `< 8 MB`" in markdown
+    assert markdown.count("| 超出 |") == 1
@@ -0,0 +1,98 @@
+"""Tests for vectorized OHLCV page validation."""
+
+from __future__ import annotations
+
+import math
+
+import pytest
+
+from src.data.candle_batch import validate_ohlcv_batch
+from src.data.storage_types import HistoricalDataStorageError
+
+
+def test_valid_page_becomes_insert_tuples() -> None:
+    batch = validate_ohlcv_batch(
+        [
+            [1000, 100.0, 105.0, 95.0, 101.0, 10.0],
+            [2000, "101", "106", "99", "104", "0"],
+        ],
+        symbol="BTC/USDT",
+        timeframe="1h",
+    )
+
+    assert batch.rows == [
+        ("BTC/USDT", "1h", 1000, 100.0, 105.0, 95.0, 101.0, 10.0),
+        ("BTC/USDT", "1h", 2000, 101.0, 106.0, 99.0, 104.0, 0.0),
+    ]
+    assert all(type(row[2]) is int for row in batch.rows)
+    assert batch.rejected == ()
+    assert batch.accepted_count == 2
+
+
+def test_invalid_rows_are_reported_not_raised() -> None:
+    batch = validate_ohlcv_batch(
+        [
+            [1000, 100.0, 105.0, 95.0, 101.0, 10.0],
+            [2000, 0.0, 105.0, 95.0, 101.0, 10.0],
+            [3000, 100.0, 105.0, 95.0, 101.0, -1.0],
+            [4000, 100.0, 90.0, 95.0, 92.0, 1.0],
+            [5000, 110.0, 105.0, 95.0, 101.0, 1.0],
+            [6000, 100.0, 105.0, 95.0, 120.0, 1.0],
+            [7000, None, 105.0, 95.0, 101.0, 1.0],
+            [math.nan, 100.0, 105.0, 95.0, 101.0, 1.0],
+            [-1, 100.0, 105.0, 95.0, 101.0, 1.0],
+        ],
+        symbol="BTC/USDT",
+        timeframe="1h",
+    )
+
+    assert [row[2] for row in batch.rows] == [1000]
+    assert [(item.index, item.timestamp, item.reason) for item in batch.rejected] == [
+        (1, 2000, "open/high/low/close must be > 0"),
+        (2, 3000, "volume must be >= 0"),
+        (3, 4000, "high must be >= low"),
+        (4, 5000, "open must be between low and high"),
+        (5, 6000, "close must be between low and high"),
+        (6, None, "values must be finite numbers"),
+        (7, None, "values must be finite numbers"),
+        (8, -1, "timestamp must be >= 0"),
+    ]
+
+
+def test_range_filter_sort_and_duplicates() -> None:
+    batch = validate_ohlcv_batch(
+        [
+            [3000, 1.0, 1.0, 1.0, 1.0, 1.0],
+            [1000, 2.0, 2.0, 2.0, 2.0, 1.0],
+            [2000, 3.0, 3.0, 3.0, 3.0, 1.0],
+            [2000, 4.0, 4.0, 4.0, 4.0, 1.0],
+            [9000, 5.0, 5.0, 5.0, 5.0, 1.0],
+            [9000, 0.0, 5.0, 5.0, 5.0, 1.0],
+        ],
+        symbol="ETH/USDT",
+        timeframe="1m",
+        start_timestamp=1000,
+        end_timestamp=3000,
+    )
+
+    assert [(row[2], row[3]) for row in batch.rows] == [(1000, 2.0), (2000, 3.0), (3000, 1.0)]
+    assert batch.reordered is True
+    assert batch.duplicate_count == 1
+    # Out-of-window rows are dropped without being validated.
+    assert batch.out_of_range_count == 2
+    assert batch.rejected == ()
+
+
+def test_ragged_page_rejects_short_rows() -> None:
+    with pytest.raises(HistoricalDataStorageError, match="invalid OHLCV row"):
+        validate_ohlcv_batch(
+            [[1000, 1.0, 1.0, 1.0, 1.0, 1.0], [2000, 1.0, 2.0]],
+            symbol="BTC/USDT",
+            timeframe="1h",
+        )
+
+
+def test_empty_page() -> None:
+    batch = validate_ohlcv_batch([], symbol="BTC/USDT", timeframe="1h")
+
+    assert batch.rows == [] and batch.rejected == ()
@@ -0,0 +1,111 @@
+"""Tests for the streaming candle exporter."""
+
+from __future__ import annotations
+
+import csv
+import gzip
+from pathlib import Path
+
+import pytest
+
+from src.core.database import SQLiteDatabase
+from src.data import candle_export
+from src.data.candle_export import CandleExportError, StreamingCandleExporter, load_arrow_columns
+from src.data.candle_import import StreamingCandleImporter
+from src.data.candle_schema import insert_candle_rows
+from src.data.storage import HistoricalCandleStorage
+
+MINUTE_MS = 60_000
+
+
+class _NoFetch:
+    def fetch_ohlcv(self, *_args, **_kwargs):
+        raise AssertionError("export must not fetch")
+
+
+@pytest.fixture
+def database(tmp_path):
+    db = SQLiteDatabase(tmp_path / "export.db")
+    db.initialize_schema()
+    with db.transaction() as tx:
+        insert_candle_rows(
+            tx,
+            [
+                ("BTC/USDT", "1m", idx * MINUTE_MS, 100.0 + idx, 110.0 + idx, 90.0, 105.5, 1.25)
+                for idx in range(7)
+            ],
+        )
+    yield db
+    db.close()
+
+
+def _exporter(database: SQLiteDatabase, chunk_rows: int = 3) -> StreamingCandleExporter:
+    return StreamingCandleExporter(HistoricalCandleStorage(database, _NoFetch()), chunk_rows=chunk_rows)
+
+
+def test_csv_export_streams_chunks_in_the_existing_row_format(database: SQLiteDatabase, tmp_path: Path) -> None:
+    result = _exporter(database).run(
+        tmp_path / "out" / "candles.csv",
+        symbol="BTC/USDT",
+        timeframe="1m",
+        start_timestamp=MINUTE_MS,
+    )
+
+    assert (result.file_format, result.compression, result.chunks, result.rows) == ("csv", "none", 2, 6)
+    with result.path.open(encoding="utf-8", newline="") as handle:
+        rows = list(csv.reader(handle))
+    assert rows[0] == ["symbol", "timeframe", "timestamp", "open", "high", "low", "close", "volume"]
+    assert rows[1] == ["BTC/USDT", "1m", "60000", "101.0", "111.0", "90.0", "105.5", "1.25"]
+    assert len(rows) == 7
+    assert result.bytes_written == result.path.stat().st_size
+
+
+def test_gzip_csv_export_round_trips_through_the_importer(database: SQLiteDatabase, tmp_path: Path) -> None:
+    path = tmp_path / "candles.csv.gz"
+    result = _exporter(database).run(path, symbol="BTC/USDT", timeframe="1m", file_format="csv", compression="gzip")
+    with gzip.open(path, "rt", encoding="utf-8") as handle:
+        assert len(handle.read().splitlines()) == result.rows + 1
+
+    target = SQLiteDatabase(tmp_path / "target.db")
+    target.initialize_schema()
+    try:
+        imported = StreamingCandleImporter(target).run(path, file_format="csv")
+        assert (imported.parsed_rows, imported.inserted_rows) == (7, 7)
+    finally:
+        target.close()
+
+
+def test_export_rejects_unsupported_combinations(
+    database: SQLiteDatabase,
+    tmp_path: Path,
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    exporter = _exporter(database)
+    with pytest.raises(CandleExportError, match="compression for csv"):
+        exporter.run(tmp_path / "a.csv", symbol="BTC/USDT", timeframe="1m", compression="zstd")
+    with pytest.raises(CandleExportError, match="chunk_rows"):
+        _exporter(database, chunk_rows=0)
+
+    monkeypatch.setattr(candle_export, "pa", None)
+    with pytest.raises(CandleExportError, match="pyarrow is required"):
+        exporter.run(tmp_path / "a.arrow", symbol="BTC/USDT", timeframe="1m")
+    assert not (tmp_path / "a.arrow").exists()
+
+
+def test_arrow_and_parquet_exports_load_back(database: SQLiteDatabase, tmp_path: Path) -> None:
+    pytest.importorskip("pyarrow")
+    exporter = _exporter(database, chunk_rows=100)
+
+    arrow = exporter.run(tmp_path / "c.arrow", symbol="BTC/USDT", timeframe="1m")
+    parquet = exporter.run(tmp_path / "c.parquet", symbol="BTC/USDT", timeframe="1m")
+    columns = load_arrow_columns(arrow.path)
+
+    assert (arrow.compression, parquet.compression) == ("none", "zstd")
+    assert columns.timestamp.tolist() == [idx * MINUTE_MS for idx in range(7)]
+    assert columns.open[-1] == 106.0
+    target = SQLiteDatabase(tmp_path / "target.db")
+    target.initialize_schema()
+    try:
+        assert StreamingCandleImporter(target).run(parquet.path).inserted_rows == 7
+    finally:
+        target.close()
@@ -0,0 +1,159 @@
+"""Tests for the chunked streaming candle importer."""
+
+from __future__ import annotations
+
+import csv
+from pathlib import Path
+
+import pytest
+
+from src.core.database import SQLiteDatabase
+from src.data import candle_import
+from src.data.candle_import import CandleImportError, StreamingCandleImporter, detect_import_format
+from src.data.candle_schema import CompactCandleMigration, dataset_version
+from src.data.rollup import CandleRollupEngine
+
+MINUTE_MS = 60_000
+
+
+def _write_csv(path: Path, header: list[str], rows: list[list[object]]) -> Path:
+    with path.open("w", encoding="utf-8", newline="") as handle:
+        writer = csv.writer(handle)
+        writer.writerow(header)
+        writer.writerows(rows)
+    return path
+
+
+def _minute_rows(count: int, *, start: int = 0) -> list[list[object]]:
+    return [[start + idx * MINUTE_MS, 100, 110, 90, 105, 1] for idx in range(count)]
+
+
+def _stored(database: SQLiteDatabase) -> list[tuple]:
+    with database.read() as conn:
+        return [
+            tuple(row)
+            for row in conn.execute(
+                "SELECT symbol, timeframe, timestamp, close FROM candles ORDER BY symbol, timeframe, timestamp;"
+            ).fetchall()
+        ]
+
+
+@pytest.fixture
+def database(tmp_path):
+    db = SQLiteDatabase(tmp_path / "import.db", pragma_profile="wal")
+    db.initialize_schema()
+    yield db
+    db.close()
+
+
+def test_csv_import_streams_chunks_and_reports_progress(database: SQLiteDatabase, tmp_path: Path) -> None:
+    rows = [["eth/usdt", "5m", 0, 10, 11, 9, 10.5, 1]]
+    rows += [["", "", ts, 100, 110, 90, 105, 1] for ts, *_ in _minute_rows(9)]
+    rows += [["", "", 3 * MINUTE_MS, 100, 110, 90, 109, 1]]  # duplicate in a later chunk: ignored
+    rows += [["", "", 20 * MINUTE_MS, 100, 110, 90, "oops", 1]]  # unparsable: rejected
+    rows += [["", "", 21 * MINUTE_MS, 100, 90, 110, 105, 1]]  # high < low: rejected
+    path = _write_csv(
+        tmp_path / "mixed.csv",
+        ["symbol", "timeframe", "timestamp", "open", "high", "low", "close", "volume"],
+        rows,
+    )
+    progress = []
+
+    result = StreamingCandleImporter(database, chunk_rows=4, on_progress=progress.append).run(
+        path, symbol="BTC/USDT", timeframe="1m"
+    )
+
+    assert (result.file_format, result.chunks, result.parsed_rows) == ("csv", 4, 13)
+    assert (result.inserted_rows, result.rejected_rows) == (10, 2)
+    assert [(item.line, item.reason) for item in result.rejected_lines] == [
+        (13, "unparsable close value"),
+        (14, "high must be >= low"),
+    ]
+    assert [item.parsed_rows for item in progress] == [4, 8, 12, 13]
+    stored = _stored(database)
+    assert stored[0][:2] == ("BTC/USDT", "1m")
+    assert ("BTC/USDT", "1m", 3 * MINUTE_MS, 105.0) in stored
+    assert stored[-1] == ("ETH/USDT", "5m", 0, 10.5)
+    with database.transaction() as tx:
+        assert dataset_version(tx, "BTC/USDT", "1m") > 0
+        # Staging lives on the writer connection and is emptied after every chunk.
+        assert tx.execute("SELECT COUNT(*) FROM temp.candle_import_staging;").fetchone()[0] == 0
+
+
+def test_strict_import_stops_at_first_rejected_line(database: SQLiteDatabase, tmp_path: Path) -> None:
+    rows = _minute_rows(5)
+    rows[3][4] = "n/a"
+    path = _write_csv(tmp_path / "bad.csv", ["timestamp", "open", "high", "low", "close", "volume"], rows)
+
+    with pytest.raises(CandleImportError, match=r"line 5: bad data format \(unparsable close value\)"):
+        StreamingCandleImporter(database, chunk_rows=2, strict=True).run(path, symbol="BTC/USDT", timeframe="1m")
+    # The chunk holding the bad row is not committed; earlier chunks are.
+    assert [row[2] for row in _stored(database)] == [0, MINUTE_MS]
+
+    result = StreamingCandleImporter(database, chunk_rows=2).run(path, symbol="BTC/USDT", timeframe="1m")
+    assert result.rejected_rows == 1 and [item.line for item in result.rejected_lines] == [5]
+
+
+def test_import_into_compact_layout_marks_rollups_dirty(database: SQLiteDatabase, tmp_path: Path) -> None:
+    CompactCandleMigration(database).run()
+    engine = CandleRollupEngine(database)
+    first = _write_csv(tmp_path / "a.csv", ["timestamp", "open", "high", "low", "close", "volume"], _minute_rows(5))
+    StreamingCandleImporter(database, chunk_rows=2).run(first, symbol="BTC/USDT", timeframe="1m")
+    engine.register("BTC/USDT", "5m")
+
+    second = _write_csv(
+        tmp_path / "b.csv",
+        ["timestamp", "open", "high", "low", "close", "volume"],
+        _minute_rows(3, start=5 * MINUTE_MS),
+    )
+    result = StreamingCandleImporter(database, chunk_rows=2).run(second, symbol="BTC/USDT", timeframe="1m")
+    [refresh] = engine.refresh()
+
+    assert result.inserted_rows == 3
+    assert len(_stored(database)) == 8
+    assert refresh.written_bars == 1
+
+
+def test_import_rejects_structurally_invalid_files(database: SQLiteDatabase, tmp_path: Path) -> None:
+    importer = StreamingCandleImporter(database, chunk_rows=2)
+    no_volume = _write_csv(tmp_path / "a.csv", ["timestamp", "open", "high", "low", "close"], [[0, 1, 1, 1, 1]])
+    with pytest.raises(CandleImportError, match="missing required columns"):
+        importer.run(no_volume, symbol="BTC/USDT", timeframe="1m")
+
+    rows = _write_csv(tmp_path / "b.csv", ["timestamp", "open", "high", "low", "close", "volume"], _minute_rows(3))
+    with pytest.raises(CandleImportError, match="line 2: missing symbol"):
+        importer.run(rows, timeframe="1m")
+    with pytest.raises(CandleImportError, match="line 2: invalid timeframe '2m'"):
+        importer.run(rows, symbol="BTC/USDT", timeframe="2m")
+    with pytest.raises(CandleImportError, match="not found"):
+        importer.run(tmp_path / "missing.csv")
+
+
+def test_columnar_formats_need_pyarrow(database: SQLiteDatabase, tmp_path: Path, monkeypatch) -> None:
+    assert detect_import_format("x.parquet") == "parquet"
+    assert detect_import_format("x.feather") == "arrow"
+    assert detect_import_format("x.txt") == "csv"
+    path = tmp_path / "candles.parquet"
+    path.write_bytes(b"")
+    monkeypatch.setattr(candle_import, "pa", None)
+
+    with pytest.raises(CandleImportError, match="pyarrow is required"):
+        StreamingCandleImporter(database).run(path, symbol="BTC/USDT", timeframe="1m")
+
+
+def test_parquet_and_arrow_round_trip(database: SQLiteDatabase, tmp_path: Path) -> None:
+    pa = pytest.importorskip("pyarrow")
+    pq = pytest.importorskip("pyarrow.parquet")
+    table = pa.table(
+        {name: [row[idx] for row in _minute_rows(5)] for idx, name in enumerate(candle_import.REQUIRED_COLUMNS)}
+    )
+    pq.write_table(table, tmp_path / "c.parquet")
+    with pa.ipc.new_file(tmp_path / "c.arrow", table.schema) as writer:
+        writer.write_table(table)
+
+    importer = StreamingCandleImporter(database, chunk_rows=2)
+    parquet = importer.run(tmp_path / "c.parquet", symbol="BTC/USDT", timeframe="1m")
+    arrow = importer.run(tmp_path / "c.arrow", symbol="ETH/USDT", timeframe="1m")
+
+    assert (parquet.chunks, parquet.inserted_rows) == (3, 5)
+    assert (arrow.chunks, arrow.inserted_rows) == (3, 5)
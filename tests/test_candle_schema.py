@@ -0,0 +1,126 @@
+"""Tests for the compact candle layout and its online migration."""
+
+from __future__ import annotations
+
+import pytest
+
+from src.core.database import SQLiteDatabase
+from src.data.candle_schema import (
+    LAYOUT_COMPACT,
+    LAYOUT_LEGACY,
+    CandleMigrationError,
+    CompactCandleMigration,
+    candle_layout,
+    insert_candle_rows,
+    upsert_live_candle,
+)
+from src.data.feed import BacktestDataSlice, SQLitePandasFeedFactory
+from src.data.storage import HistoricalCandleStorage
+
+HOUR_MS = 3_600_000
+
+
+class _NoFetch:
+    def fetch_ohlcv(self, *args, **kwargs):  # pragma: no cover - never called
+        raise AssertionError("unexpected fetch")
+
+
+def _rows(symbol: str, count: int) -> list[tuple]:
+    return [
+        (symbol, "1h", idx * HOUR_MS, 100.0 + idx, 101.0 + idx, 99.0 + idx, 100.5 + idx, 1.0)
+        for idx in range(count)
+    ]
+
+
+@pytest.fixture
+def database(tmp_path):
+    db = SQLiteDatabase(tmp_path / "layout.db", pragma_profile="wal")
+    db.initialize_schema()
+    with db.transaction() as tx:
+        tx.executemany(
+            """
+            INSERT INTO candles(symbol, timeframe, timestamp, open, high, low, close, volume)
+            VALUES (?, ?, ?, ?, ?, ?, ?, ?);
+            """,
+            _rows("BTC/USDT", 25) + _rows("ETH/USDT", 10),
+        )
+    yield db
+    db.close()
+
+
+def test_migration_preserves_reads_and_drops_legacy_table(database: SQLiteDatabase) -> None:
+    request = BacktestDataSlice("BTC/USDT", "1h", 3 * HOUR_MS, 20 * HOUR_MS)
+    before = SQLitePandasFeedFactory(database).load_dataframe(request)
+
+    result = CompactCandleMigration(database, chunk_rows=7).run(vacuum=True)
+
+    assert result.migrated is True
+    assert (result.datasets, result.rows) == (2, 35)
+    assert result.vacuumed is True
+    with database.read() as conn:
+        assert candle_layout(conn) == LAYOUT_COMPACT
+        names = {row[0] for row in conn.execute("SELECT name FROM sqlite_master;").fetchall()}
+    assert "idx_candles_timestamp" not in names and "idx_candles_symbol_time" not in names
+    after = SQLitePandasFeedFactory(database).load_dataframe(request)
+    assert after.equals(before)
+
+    # Schema bootstrap keeps working on the migrated file, and a rerun is a no-op.
+    database.initialize_schema()
+    rerun = CompactCandleMigration(database).run()
+    assert rerun.migrated is False and rerun.rows == 35
+
+
+def test_writes_after_migration_go_through_compact_tables(database: SQLiteDatabase) -> None:
+    CompactCandleMigration(database).run()
+    storage = HistoricalCandleStorage(database, _NoFetch())
+
+    with database.transaction() as tx:
+        inserted = insert_candle_rows(tx, _rows("BTC/USDT", 27) + _rows("SOL/USDT", 2))
+        upsert_live_candle(tx, symbol="SOL/USDT", timeframe="1h", timestamp=HOUR_MS, price=500.0)
+        # Legacy SQL still works through the compatibility view.
+        tx.execute(
+            """
+            INSERT OR IGNORE INTO candles(symbol, timeframe, timestamp, open, high, low, close, volume)
+            VALUES ('ETH/USDT', '1h', ?, 1, 1, 1, 1, 1);
+            """,
+            (10 * HOUR_MS,),
+        )
+        tx.execute("DELETE FROM candles WHERE symbol = 'ETH/USDT' AND timestamp < ?;", (5 * HOUR_MS,))
+
+    assert inserted == 4
+    sol = storage.query_candles("SOL/USDT", "1h")
+    assert [candle.timestamp for candle in sol] == [0, HOUR_MS]
+    assert sol[1].high == 500.0 and sol[1].close == 500.0
+    assert sol[1].created_at is None
+    eth = [candle.timestamp for candle in storage.query_candles("ETH/USDT", "1h")]
+    assert eth == [idx * HOUR_MS for idx in range(5, 11)]
+
+
+def test_concurrent_writes_during_backfill_are_mirrored(database: SQLiteDatabase) -> None:
+    fired = []
+
+    def _write_between_chunks(symbol: str, timeframe: str, copied: int) -> None:
+        if fired:
+            return
+        fired.append(copied)
+        with database.transaction() as tx:
+            assert candle_layout(tx) == LAYOUT_LEGACY
+            tx.execute("UPDATE candles SET close = 100.0 WHERE symbol = 'BTC/USDT' AND timestamp = 0;")
+            tx.execute("UPDATE candles SET close = 120.0 WHERE symbol = 'BTC/USDT' AND timestamp = ?;", (20 * HOUR_MS,))
+            tx.execute("DELETE FROM candles WHERE symbol = 'BTC/USDT' AND timestamp = ?;", (24 * HOUR_MS,))
+            assert insert_candle_rows(tx, _rows("ADA/USDT", 3)) == 3
+
+    result = CompactCandleMigration(database, chunk_rows=5, on_progress=_write_between_chunks).run()
+
+    assert fired == [5]
+    assert (result.datasets, result.rows) == (3, 37)
+    storage = HistoricalCandleStorage(database, _NoFetch())
+    btc = {candle.timestamp: candle.close for candle in storage.query_candles("BTC/USDT", "1h")}
+    assert btc[0] == 100.0 and btc[20 * HOUR_MS] == 120.0
+    assert 24 * HOUR_MS not in btc
+    assert len(storage.query_candles("ADA/USDT", "1h")) == 3
+
+
+def test_migration_rejects_non_positive_chunk(database: SQLiteDatabase) -> None:
+    with pytest.raises(CandleMigrationError, match="chunk_rows"):
+        CompactCandleMigration(database, chunk_rows=0)
@@ -2,6 +2,7 @@
 
 from __future__ import annotations
 
+import json
 from pathlib import Path
 
 import pytest
@@ -17,6 +18,8 @@ from src.benchmarking.models import (
     LatencyStats,
     OrderBenchmarkResult,
     RealtimeBenchmarkResult,
+    StorageBenchmarkReport,
+    StorageProfileResult,
 )
 from src.cli import main as cli_main
 
@@ -167,3 +170,157 @@ def test_benchmark_command_fail_exit_one(
 )
 def test_benchmark_invalid_arguments(cli_files: dict[str, Path], command: tuple[str, ...]) -> None:
     assert _run_cli(cli_files, *command) == 1
+
+
+def test_benchmark_storage_suite_generates_reports(
+    cli_files: dict[str, Path],
+    monkeypatch: pytest.MonkeyPatch,
+    tmp_path: Path,
+) -> None:
+    captured: dict[str, object] = {}
+    stats = LatencyStats(samples=2, mean_ms=1.0, p95_ms=1.5, max_ms=2.0)
+
+    def _fake_storage_benchmark(**kwargs: object) -> StorageBenchmarkReport:
+        captured.update(kwargs)
+        return StorageBenchmarkReport(
+            meta=BenchmarkMeta(generated_at_utc="2026-02-22T00:00:00Z", benchmark_version="storage-v1"),
+            symbol="BTC/USDT",
+            timeframe="1h",
+            rows=10,
+            read_iterations=2,
+            batch_size=500,
+            seed=42,
+            profiles=(
+                StorageProfileResult(
+                    profile="wal",
+                    journal_mode="WAL",
+                    rows=10,
+                    insert_rows_per_second=1000.0,
+                    read_latency_ms=stats,
+                    contended_read_latency_ms=stats,
+                    concurrent_rows_written=50,
+                ),
+            ),
+        )
+
+    monkeypatch.setattr("src.cli_benchmark.run_storage_benchmark", _fake_storage_benchmark)
+
+    output_dir = tmp_path / "benchmarks"
+    exit_code = _run_cli(
+        cli_files,
+        "benchmark",
+        "--suite",
+        "storage",
+        "--read-iterations",
+        "2",
+        "--output-dir",
+        str(output_dir),
+    )
+    assert exit_code == 0
+    assert captured["read_iterations"] == 2
+    assert len(list(output_dir.glob("storage_benchmark_report_*.json"))) == 1
+    assert len(list(output_dir.glob("storage_benchmark_report_*.md"))) == 1
+
+
+def test_benchmark_portfolio_suite_generates_reports(
+    cli_files: dict[str, Path],
+    tmp_path: Path,
+) -> None:
+    output_dir = tmp_path / "benchmarks"
+    exit_code = _run_cli(
+        cli_files,
+        "benchmark",
+        "--suite",
+        "portfolio",
+        "--symbol-counts",
+        "2",
+        "3",
+        "--bars",
+        "48",
+        "--output-dir",
+        str(output_dir),
+    )
+
+    assert exit_code == 0
+    reports = list(output_dir.glob("portfolio_benchmark_report_*.json"))
+    assert len(reports) == 1
+    payload = json.loads(reports[0].read_text(encoding="utf-8"))
+    assert [item["symbols"] for item in payload["scales"]] == [2, 3]
+    assert len(list(output_dir.glob("portfolio_benchmark_report_*.md"))) == 1
+    assert _run_cli(cli_files, "benchmark", "--suite", "portfolio", "--symbol-counts", "1") == 1
+
+
+def test_benchmark_memory_suite_compares_full_and_bounded_runs(
+    cli_files: dict[str, Path],
+    tmp_path: Path,
+) -> None:
+    output_dir = tmp_path / "benchmarks"
+    exit_code = _run_cli(
+        cli_files,
+        "benchmark",
+        "--suite",
+        "memory",
+        "--memory-bars",
+        "120",
+        "240",
+        "--chunk-rows",
+        "50",
+        "--output-dir",
+        str(output_dir),
+    )
+
+    assert exit_code == 0
+    reports = list(output_dir.glob("memory_benchmark_report_*.json"))
+    assert len(reports) == 1
+    payload = json.loads(reports[0].read_text(encoding="utf-8"))
+    assert payload["conditions"]["chunk_rows"] == 50
+    runs = payload["runs"]
+    assert [(item["memory_mode"], item["bars"]) for item in runs] == [
+        ("full", 120),
+        ("bounded", 120),
+        ("full", 240),
+        ("bounded", 240),
+    ]
+    assert runs[3]["final_value"] == pytest.approx(runs[2]["final_value"])
+    assert all(item["peak_bytes"] > 0 for item in runs)
+    assert payload["conditions"]["bounded_peak_target_bytes"] == 8 * 1024 * 1024
+    assert [item["over_target"] for item in runs] == [False, False, False, False]
+    assert len(list(output_dir.glob("memory_benchmark_report_*.md"))) == 1
+    assert _run_cli(cli_files, "benchmark", "--suite", "memory", "--chunk-rows", "0") == 1
+
+
+def test_benchmark_analyzers_suite_measures_per_bar_savings(
+    cli_files: dict[str, Path],
+    tmp_path: Path,
+) -> None:
+    output_dir = tmp_path / "benchmarks"
+    exit_code = _run_cli(
+        cli_files,
+        "benchmark",
+        "--suite",
+        "analyzers",
+        "--analyzer-bars",
+        "300",
+        "--repeats",
+        "1",
+        "--output-dir",
+        str(output_dir),
+    )
+
+    assert exit_code == 0
+    reports = list(output_dir.glob("analyzer_benchmark_report_*.json"))
+    assert len(reports) == 1
+    payload = json.loads(reports[0].read_text(encoding="utf-8"))
+    runs = payload["runs"]
+    assert [(item["analyzer_profile"], item["bars"]) for item in runs] == [
+        ("full", 300),
+        ("standard", 300),
+        ("minimal", 300),
+    ]
+    assert runs[0]["saved_us_per_bar"] == 0.0
+    assert {item["final_value"] for item in runs} == {runs[0]["final_value"]}
+    assert runs[1]["max_drawdown_pct"] == pytest.approx(runs[0]["max_drawdown_pct"])
+    assert (runs[0]["time_series_points"], runs[2]["time_series_points"]) == (300, 0)
+    assert all(item["us_per_bar"] > 0 for item in runs)
+    assert len(list(output_dir.glob("analyzer_benchmark_report_*.md"))) == 1
+    assert _run_cli(cli_files, "benchmark", "--suite", "analyzers", "--repeats", "0") == 1
@@ -68,7 +68,6 @@ def cli_files(tmp_path: Path) -> dict[str, Path]:
         ("order",),
         ("order", "place", "--symbol", "BTC/USDT", "--side", "buy", "--type", "limit"),
         ("order", "cancel"),
-        ("cleanup",),
     ],
 )
 def test_runtime_required_arguments_validation(
@@ -78,6 +77,10 @@ def test_runtime_required_arguments_validation(
     assert _run_cli(cli_files, *command) == 2
 
 
+def test_cleanup_requires_days_or_configured_policies(cli_files: dict[str, Path]) -> None:
+    assert _run_cli(cli_files, "cleanup") == 1
+
+
 def test_start_stop_status_and_disk(cli_files: dict[str, Path]) -> None:
     assert _run_cli(cli_files, "startup") == 0
     assert _run_cli(cli_files, "status") == 0
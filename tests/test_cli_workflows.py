@@ -2,7 +2,10 @@
 
 from __future__ import annotations
 
+import json
+import math
 import csv
+import re
 import sqlite3
 from pathlib import Path
 
@@ -63,12 +66,12 @@ def cli_files(tmp_path: Path) -> dict[str, Path]:
     }
 
 
-def _seed_hourly_candles(db_path: Path, count: int = 60) -> tuple[int, int]:
+def _seed_hourly_candles(db_path: Path, count: int = 60, wave: float = 0.0) -> tuple[int, int]:
     start_ms = 1_700_000_000_000
     rows = []
     for idx in range(count):
         timestamp = start_ms + idx * 3_600_000
-        price = 100.0 + idx
+        price = 100.0 + idx + wave * math.sin(idx / 4)
         rows.append(
             (
                 "BTC/USDT",
@@ -130,6 +133,319 @@ def test_backtest_command(cli_files: dict[str, Path]) -> None:
         "--end-ms",
         str(end_ms),
     ) == 0
+    assert _run_cli(
+        cli_files,
+        "backtest",
+        "--strategy",
+        "sma_strategy",
+        "--symbol",
+        "BTC/USDT",
+        "--start-ms",
+        str(start_ms),
+        "--end-ms",
+        str(end_ms),
+        "--engine",
+        "vectorized",
+    ) == 0
+
+
+def test_backtest_monte_carlo_reports_trade_sequence_distribution(
+    cli_files: dict[str, Path],
+    tmp_path: Path,
+) -> None:
+    assert _run_cli(cli_files, "start") == 0
+    start_ms, end_ms = _seed_hourly_candles(cli_files["db"], count=200, wave=15.0)
+    output_dir = tmp_path / "mc"
+    command = (
+        "backtest",
+        "--strategy",
+        "sma_strategy",
+        "--symbol",
+        "BTC/USDT",
+        "--start-ms",
+        str(start_ms),
+        "--end-ms",
+        str(end_ms),
+        "--param",
+        "fast_period=3",
+        "--param",
+        "slow_period=8",
+    )
+
+    assert _run_cli(
+        cli_files,
+        *command,
+        "--monte-carlo",
+        "500",
+        "--mc-workers",
+        "1",
+        "--output-dir",
+        str(output_dir),
+    ) == 0
+
+    payload = json.loads((output_dir / "monte_carlo.json").read_text(encoding="utf-8"))
+    assert payload["paths"] == 500 and payload["trades"] >= 2
+    assert set(payload["max_drawdown_pct"]) == {"p5", "p25", "p50", "p75", "p95"}
+    assert _run_cli(cli_files, *command, "--monte-carlo", "0") == 1
+
+
+def test_backtest_cost_grid_reprices_recorded_trades(
+    cli_files: dict[str, Path],
+    capsys: pytest.CaptureFixture[str],
+) -> None:
+    assert _run_cli(cli_files, "start") == 0
+    start_ms, end_ms = _seed_hourly_candles(cli_files["db"], count=200, wave=15.0)
+    capsys.readouterr()
+
+    assert _run_cli(
+        cli_files,
+        "backtest",
+        "--strategy",
+        "sma_strategy",
+        "--symbol",
+        "BTC/USDT",
+        "--start-ms",
+        str(start_ms),
+        "--end-ms",
+        str(end_ms),
+        "--param",
+        "fast_period=3",
+        "--param",
+        "slow_period=8",
+        "--cost-commission",
+        "0",
+        "0.002",
+        "--cost-slippage",
+        "0",
+        "0.001",
+    ) == 0
+
+    output = capsys.readouterr().out
+    assert "成本敏感性" in output
+    assert "scenarios=4" in output
+
+
+def test_backtest_profile_prints_stages_and_writes_profiler_files(
+    cli_files: dict[str, Path],
+    tmp_path: Path,
+    capsys: pytest.CaptureFixture[str],
+) -> None:
+    assert _run_cli(cli_files, "start") == 0
+    start_ms, end_ms = _seed_hourly_candles(cli_files["db"], count=200, wave=15.0)
+    output_dir = tmp_path / "profiled"
+    capsys.readouterr()
+
+    assert _run_cli(
+        cli_files,
+        "backtest",
+        "--strategy",
+        "sma_strategy",
+        "--symbol",
+        "BTC/USDT",
+        "--start-ms",
+        str(start_ms),
+        "--end-ms",
+        str(end_ms),
+        "--profile",
+        "cprofile",
+        "--profile-top",
+        "5",
+        "--output-dir",
+        str(output_dir),
+    ) == 0
+
+    output = capsys.readouterr().out
+    assert "回测分阶段耗时" in output and "strategy_next" in output
+    assert json.loads((output_dir / "backtest_profile.json").read_text(encoding="utf-8"))["bars"] == 200
+    assert (output_dir / "backtest_hotspots.txt").is_file()
+    assert (output_dir / "backtest_profile.collapsed").stat().st_size > 0
+
+
+def test_backtest_analyzer_profile_swaps_analyzers_for_the_value_recorder(
+    cli_files: dict[str, Path],
+    capsys: pytest.CaptureFixture[str],
+) -> None:
+    assert _run_cli(cli_files, "start") == 0
+    start_ms, end_ms = _seed_hourly_candles(cli_files["db"], count=120, wave=15.0)
+    capsys.readouterr()
+
+    assert _run_cli(
+        cli_files,
+        "backtest",
+        "--strategy",
+        "sma_strategy",
+        "--symbol",
+        "BTC/USDT",
+        "--start-ms",
+        str(start_ms),
+        "--end-ms",
+        str(end_ms),
+        "--analyzer-profile",
+        "minimal",
+        "--profile",
+        "stages",
+    ) == 0
+
+    output = capsys.readouterr().out
+    assert "analyzer:values" in output and "analyzer:sharpe" not in output
+    assert "sortino_ratio" in output
+
+
+def test_backtest_reuses_cached_result_unless_no_cache(
+    cli_files: dict[str, Path],
+    capsys: pytest.CaptureFixture[str],
+) -> None:
+    assert _run_cli(cli_files, "start") == 0
+    start_ms, end_ms = _seed_hourly_candles(cli_files["db"], count=80)
+    command = (
+        "backtest",
+        "--strategy",
+        "sma_strategy",
+        "--symbol",
+        "BTC/USDT",
+        "--start-ms",
+        str(start_ms),
+        "--end-ms",
+        str(end_ms),
+    )
+
+    assert _run_cli(cli_files, *command) == 0
+    assert "命中回测结果缓存" not in capsys.readouterr().out
+    assert _run_cli(cli_files, *command) == 0
+    assert "命中回测结果缓存" in capsys.readouterr().out
+    assert _run_cli(cli_files, *command, "--no-cache") == 0
+    output = capsys.readouterr().out
+    assert "命中回测结果缓存" not in output
+    # --no-cache only skips the result cache; the candle frame comes from the frame cache.
+    hits = re.search(r"frame_cache_hits=(\d+)/", output)
+    assert hits is not None and int(hits.group(1)) >= 1
+
+
+def test_backtest_sweep_command_ranks_grid_and_writes_csv(
+    cli_files: dict[str, Path],
+    tmp_path: Path,
+) -> None:
+    assert _run_cli(cli_files, "start") == 0
+    start_ms, end_ms = _seed_hourly_candles(cli_files["db"])
+    output = tmp_path / "sweep.csv"
+
+    assert _run_cli(
+        cli_files,
+        "backtest",
+        "sweep",
+        "--strategy",
+        "sma_strategy",
+        "--symbol",
+        "BTC/USDT",
+        "--start-ms",
+        str(start_ms),
+        "--end-ms",
+        str(end_ms),
+        "--grid",
+        "fast_period=3:5:2",
+        "slow_period=10,20",
+        "--workers",
+        "1",
+        "--output",
+        str(output),
+    ) == 0
+
+    lines = output.read_text(encoding="utf-8").splitlines()
+    assert lines[0].startswith("rank,fast_period,slow_period,total_return_pct")
+    assert len(lines) == 5
+    assert _run_cli(cli_files, "backtest", "sweep", "--strategy", "sma_strategy", "--symbol", "BTC/USDT") == 2
+    assert _run_cli(
+        cli_files, "backtest", "sweep", "--strategy", "sma_strategy", "--symbol", "BTC/USDT", "--grid", "x=5:1"
+    ) == 1
+
+
+def test_backtest_walk_forward_command_writes_stitched_equity(
+    cli_files: dict[str, Path],
+    tmp_path: Path,
+) -> None:
+    assert _run_cli(cli_files, "start") == 0
+    start_ms, end_ms = _seed_hourly_candles(cli_files["db"], count=120)
+    output = tmp_path / "walk_forward.csv"
+
+    assert _run_cli(
+        cli_files,
+        "backtest",
+        "walk-forward",
+        "--strategy",
+        "sma_strategy",
+        "--symbol",
+        "BTC/USDT",
+        "--start-ms",
+        str(start_ms),
+        "--end-ms",
+        str(end_ms),
+        "--grid",
+        "fast_period=3,5",
+        "slow_period=10",
+        "--folds",
+        "2",
+        "--workers",
+        "1",
+        "--output",
+        str(output),
+    ) == 0
+
+    lines = output.read_text(encoding="utf-8").splitlines()
+    assert lines[0] == "datetime,equity"
+    assert len(lines) > 1
+    # 120 bars cannot hold 100 out-of-sample windows of at least two bars.
+    assert _run_cli(
+        cli_files,
+        "backtest",
+        "walk-forward",
+        "--strategy",
+        "sma_strategy",
+        "--symbol",
+        "BTC/USDT",
+        "--start-ms",
+        str(start_ms),
+        "--end-ms",
+        str(end_ms),
+        "--grid",
+        "fast_period=3",
+        "--folds",
+        "100",
+    ) == 1
+
+
+def test_backtest_replay_command_flushes_ledger_once(cli_files: dict[str, Path], capsys) -> None:
+    assert _run_cli(cli_files, "start") == 0
+    start_ms, end_ms = _seed_hourly_candles(cli_files["db"], count=60, wave=6.0)
+    command = (
+        "backtest",
+        "replay",
+        "--strategy",
+        "sma_strategy",
+        "--symbol",
+        "BTC/USDT",
+        "--start-ms",
+        str(start_ms),
+        "--end-ms",
+        str(end_ms),
+        "--param",
+        "fast_period=3",
+        "--param",
+        "slow_period=8",
+    )
+
+    assert _run_cli(cli_files, *command) == 0
+    assert "run_id=1" in capsys.readouterr().out
+    assert _run_cli(cli_files, *command, "--no-ledger") == 0
+    assert "ledger=skipped" in capsys.readouterr().out
+
+    with sqlite3.connect(cli_files["db"]) as conn:
+        runs = conn.execute("SELECT id, strategy_name, status FROM strategy_runs;").fetchall()
+        order_runs = {row[0] for row in conn.execute("SELECT run_id FROM sim_orders;")}
+        live_orders = conn.execute("SELECT COUNT(*) FROM orders;").fetchone()[0]
+    assert runs == [(1, "sma_strategy", "completed")]
+    assert order_runs == {1}
+    assert live_orders == 0
+    assert _run_cli(cli_files, "backtest", "replay", "--strategy", "sma_strategy", "--symbol", "ETH/USDT") == 1
 
 
 def test_backtest_output_dir_exports_reports_and_charts(
@@ -313,6 +629,26 @@ def test_import_export_cleanup_commands(cli_files: dict[str, Path], tmp_path: Pa
     assert _run_cli(cli_files, "cleanup", "--days", "1") == 0
 
 
+def test_import_reports_rejected_lines_and_strict_aborts(
+    cli_files: dict[str, Path],
+    tmp_path: Path,
+    capsys: pytest.CaptureFixture[str],
+) -> None:
+    csv_path = tmp_path / "bad.csv"
+    with csv_path.open("w", encoding="utf-8", newline="") as handle:
+        writer = csv.writer(handle)
+        writer.writerow(["timestamp", "open", "high", "low", "close", "volume"])
+        writer.writerow([1_600_000_000_000, 100, 110, 90, 105, 20])
+        writer.writerow([1_600_000_060_000, 105, "x", 100, 110, 22])
+    command = ("import", "--file", str(csv_path), "--symbol", "BTC/USDT", "--timeframe", "1m")
+
+    assert _run_cli(cli_files, *command, "--strict") == 1
+    assert "line 3: bad data format" in capsys.readouterr().out
+    assert _run_cli(cli_files, *command) == 0
+    output = capsys.readouterr().out
+    assert "rejected_count=1" in output and "第 3 行: unparsable high value" in output
+
+
 def test_live_command_with_mock_loop(cli_files: dict[str, Path], monkeypatch: pytest.MonkeyPatch) -> None:
     class _FakeLoop:
         def __init__(self) -> None:
@@ -395,3 +731,175 @@ def test_backtest_no_warning_when_data_coverage_ok(
 
     captured = capsys.readouterr().out
     assert "样本覆盖告警" not in captured
+
+
+def test_sync_columnar_command_mirrors_candles(cli_files: dict[str, Path], tmp_path: Path) -> None:
+    columnar_dir = tmp_path / "columnar"
+    config = yaml.safe_load(cli_files["config"].read_text(encoding="utf-8"))
+    config["backtest"] = {"columnar_dir": str(columnar_dir)}
+    cli_files["config"].write_text(yaml.safe_dump(config, sort_keys=False), encoding="utf-8")
+
+    assert _run_cli(cli_files, "start") == 0
+    _seed_hourly_candles(cli_files["db"], count=12)
+
+    assert _run_cli(cli_files, "sync-columnar") == 0
+    dataset_dir = columnar_dir / "BTC_USDT_1h"
+    assert (dataset_dir / "timestamp.bin").stat().st_size == 12 * 8
+
+    assert _run_cli(cli_files, "sync-columnar", "--symbol", "BTC/USDT") == 1
+    assert _run_cli(cli_files, "sync-columnar", "--symbol", "BTC/USDT", "--timeframe", "1h", "--rebuild") == 0
+
+
+def test_download_command_with_manifest(
+    cli_files: dict[str, Path],
+    monkeypatch: pytest.MonkeyPatch,
+    capsys: pytest.CaptureFixture[str],
+) -> None:
+    class _ManifestFetcher:
+        rate_limiter = None
+
+        def fetch_ohlcv(self, symbol: str, timeframe: str, since: int | None = None, limit: int | None = None):
+            if since is None or since > 1_700_100_060_000:
+                return []
+            return [
+                [ts, 10.0, 11.0, 9.0, 10.5, 20.0]
+                for ts in (1_700_100_000_000, 1_700_100_060_000)
+                if ts >= since
+            ]
+
+    monkeypatch.setattr(
+        "src.cli_workflows.MarketDataFetcher.from_config",
+        lambda _config, **_kwargs: _ManifestFetcher(),
+    )
+    manifest_path = cli_files["db"].parent / "universe.yaml"
+    manifest_path.write_text(
+        "symbols: [BTC/USDT, ETH/USDT]\ntimeframes: [1m]\nstart_ms: 1700100000000\nend_ms: 1700100060000\n",
+        encoding="utf-8",
+    )
+
+    assert _run_cli(cli_files, "download", "--manifest", str(manifest_path), "--workers", "2") == 0
+
+    captured = capsys.readouterr().out
+    assert "清单下载完成" in captured
+    assert "datasets=2" in captured
+    assert "downloaded_count=4" in captured
+
+
+def test_db_migrate_candles_command(
+    cli_files: dict[str, Path],
+    capsys: pytest.CaptureFixture[str],
+) -> None:
+    assert _run_cli(cli_files, "start") == 0
+    start_ms, end_ms = _seed_hourly_candles(cli_files["db"])
+
+    assert _run_cli(cli_files, "db", "migrate-candles", "--chunk-rows", "50", "--vacuum") == 0
+    captured = capsys.readouterr().out
+    assert "K线表迁移完成" in captured
+    assert "vacuumed=True" in captured
+
+    # The compatibility view keeps the backtest path working, and a rerun is a no-op.
+    assert _run_cli(
+        cli_files,
+        "backtest",
+        "--strategy",
+        "sma_strategy",
+        "--symbol",
+        "BTC/USDT",
+        "--timeframe",
+        "1h",
+        "--start-ms",
+        str(start_ms),
+        "--end-ms",
+        str(end_ms),
+    ) == 0
+    assert _run_cli(cli_files, "db", "migrate-candles") == 0
+    assert "已是紧凑布局" in capsys.readouterr().out
+
+
+def test_cleanup_batches_deletes_and_db_maintain_reports_reclaimed_space(
+    cli_files: dict[str, Path],
+    capsys: pytest.CaptureFixture[str],
+) -> None:
+    assert _run_cli(cli_files, "start") == 0
+    _seed_hourly_candles(cli_files["db"], count=500)
+
+    assert _run_cli(cli_files, "cleanup", "--days", "1", "--batch-rows", "120", "--pause-ms", "0") == 0
+    captured = capsys.readouterr().out
+    assert "deleted_candles=500" in captured
+    assert "reclaimed_bytes=" in captured
+
+    assert _run_cli(cli_files, "db", "maintain", "--analyze", "--pause-ms", "0") == 0
+    captured = capsys.readouterr().out
+    assert "数据库维护完成" in captured
+    assert "incremental" in captured
+
+
+def test_rollup_command_registers_targets_and_import_marks_them_dirty(
+    cli_files: dict[str, Path],
+    tmp_path: Path,
+    capsys: pytest.CaptureFixture[str],
+) -> None:
+    assert _run_cli(cli_files, "start") == 0
+    csv_path = tmp_path / "minutes.csv"
+    with csv_path.open("w", encoding="utf-8", newline="") as handle:
+        writer = csv.writer(handle)
+        writer.writerow(["timestamp", "open", "high", "low", "close", "volume"])
+        for idx in range(6):
+            writer.writerow([1_704_067_200_000 + idx * 60_000, 100, 110, 90, 105, 1])
+
+    assert _run_cli(
+        cli_files, "import", "--file", str(csv_path), "--symbol", "BTC/USDT", "--timeframe", "1m"
+    ) == 0
+    assert _run_cli(cli_files, "rollup", "--symbol", "BTC/USDT", "--timeframe", "5m", "--timeframe", "3m") == 0
+    assert "聚合完成" in capsys.readouterr().out
+
+    with csv_path.open("a", encoding="utf-8", newline="") as handle:
+        csv.writer(handle).writerow([1_704_067_200_000 + 6 * 60_000, 100, 120, 90, 105, 1])
+    assert _run_cli(
+        cli_files, "import", "--file", str(csv_path), "--symbol", "BTC/USDT", "--timeframe", "1m"
+    ) == 0
+    assert _run_cli(cli_files, "rollup") == 0
+    assert "refreshed_buckets=" in capsys.readouterr().out
+
+    conn = sqlite3.connect(cli_files["db"])
+    rows = conn.execute(
+        "SELECT timeframe, timestamp, high, source_bars FROM candle_rollups ORDER BY timeframe, timestamp;"
+    ).fetchall()
+    conn.close()
+    assert rows == [
+        ("3m", 1_704_067_200_000, 110.0, 3),
+        ("3m", 1_704_067_380_000, 110.0, 3),
+        ("3m", 1_704_067_560_000, 120.0, 1),
+        ("5m", 1_704_067_200_000, 110.0, 5),
+        ("5m", 1_704_067_500_000, 120.0, 2),
+    ]
+
+    assert _run_cli(cli_files, "rollup", "--timeframe", "5m") == 1
+    assert _run_cli(cli_files, "rollup", "--symbol", "BTC/USDT", "--timeframe", "5m", "--drop") == 0
+
+
+def test_repair_command_scans_and_refetches_gaps(
+    cli_files: dict[str, Path],
+    monkeypatch: pytest.MonkeyPatch,
+    capsys: pytest.CaptureFixture[str],
+) -> None:
+    assert _run_cli(cli_files, "start") == 0
+    start_ms, _end_ms = _seed_hourly_candles(cli_files["db"], count=10)
+    conn = sqlite3.connect(cli_files["db"])
+    conn.execute("DELETE FROM candles WHERE timestamp IN (?, ?);", (start_ms + 3 * 3_600_000, start_ms + 4 * 3_600_000))
+    conn.commit()
+    conn.close()
+
+    assert _run_cli(cli_files, "repair", "--scan-only") == 0
+    assert "missing_bars=2 remaining_gaps=1" in capsys.readouterr().out
+
+    class _GapFetcher:
+        def fetch_ohlcv(self, symbol: str, timeframe: str, since: int | None = None, limit: int | None = None):
+            return [[since, 100.0, 101.0, 99.0, 100.5, 1.0], [since + 3_600_000, 100.0, 101.0, 99.0, 100.5, 1.0]]
+
+    monkeypatch.setattr("src.cli_workflows.MarketDataFetcher.from_config", lambda _config: _GapFetcher())
+    assert _run_cli(cli_files, "repair", "--symbol", "BTC/USDT", "--timeframe", "1h", "--watch", "0.01", "--max-cycles", "2") == 0
+    captured = capsys.readouterr().out
+    assert captured.count("缺口检查完成") == 2
+    assert "remaining_gaps=0" in captured
+    assert _run_cli(cli_files, "repair", "--symbol", "BTC/USDT") == 1
@@ -0,0 +1,192 @@
+"""Tests for the columnar memory-mapped candle store."""
+
+from __future__ import annotations
+
+from contextlib import contextmanager
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from src.core.database import SQLiteDatabase
+from src.data.candle_schema import bump_dataset_versions
+from src.data.columnar_store import ColumnarCandleStore, ColumnarStoreError
+from src.data.feed import BacktestDataSlice, ColumnarPandasFeedFactory, SQLitePandasFeedFactory
+
+BASE_TS = 1_700_000_000_000
+HOUR_MS = 3_600_000
+
+
+def _insert(database: SQLiteDatabase, indexes: range | list[int], *, close_offset: float = 0.0) -> None:
+    rows = [
+        ("BTC/USDT", "1h", BASE_TS + idx * HOUR_MS, 100.0 + idx, 101.0 + idx, 99.0 + idx, 100.5 + idx + close_offset, 10.0)
+        for idx in indexes
+    ]
+    with database.transaction() as tx:
+        tx.executemany(
+            """
+            INSERT INTO candles(symbol, timeframe, timestamp, open, high, low, close, volume)
+            VALUES (?, ?, ?, ?, ?, ?, ?, ?)
+            ON CONFLICT(symbol, timeframe, timestamp) DO UPDATE SET close = excluded.close;
+            """,
+            rows,
+        )
+        bump_dataset_versions(tx, [("BTC/USDT", "1h")])
+
+
+@pytest.fixture
+def database(tmp_path) -> SQLiteDatabase:
+    db = SQLiteDatabase(tmp_path / "columnar.db")
+    db.initialize_schema()
+    yield db
+    db.close()
+
+
+def test_sync_then_slice_matches_sqlite_feed(database: SQLiteDatabase, tmp_path) -> None:
+    _insert(database, range(48))
+    request = BacktestDataSlice("BTC/USDT", "1h", BASE_TS + 5 * HOUR_MS, BASE_TS + 20 * HOUR_MS)
+
+    columnar = ColumnarPandasFeedFactory(database, tmp_path / "columnar").load_dataframe(request)
+    expected = SQLitePandasFeedFactory(database).load_dataframe(request)
+
+    assert len(columnar) == 16
+    pd.testing.assert_frame_equal(columnar, expected, check_index_type=False, check_freq=False)
+
+
+def test_sync_appends_only_new_tail(database: SQLiteDatabase, tmp_path) -> None:
+    store = ColumnarCandleStore(tmp_path / "columnar", database)
+    _insert(database, range(10))
+    first = store.sync("BTC/USDT", "1h")
+    assert (first.appended_rows, first.total_rows, first.rebuilt) == (10, 10, True)
+
+    _insert(database, range(10, 15))
+    second = store.sync("BTC/USDT", "1h")
+    assert (second.appended_rows, second.total_rows, second.rebuilt) == (5, 15, False)
+    assert second.last_timestamp == BASE_TS + 14 * HOUR_MS
+
+    columns = store.load_columns("BTC/USDT", "1h", 0, BASE_TS + 100 * HOUR_MS)
+    assert isinstance(columns.close.base, np.memmap) or isinstance(columns.close, np.memmap)
+    np.testing.assert_array_equal(columns.timestamp, BASE_TS + np.arange(15) * HOUR_MS)
+
+
+def test_sync_refreshes_upserted_last_candle(database: SQLiteDatabase, tmp_path) -> None:
+    store = ColumnarCandleStore(tmp_path / "columnar", database)
+    _insert(database, range(5))
+    store.sync("BTC/USDT", "1h")
+
+    _insert(database, [4], close_offset=7.0)
+    result = store.sync("BTC/USDT", "1h")
+
+    assert result.rebuilt is False
+    assert result.total_rows == 5
+    columns = store.load_columns("BTC/USDT", "1h", 0, BASE_TS + 10 * HOUR_MS)
+    assert columns.close[-1] == pytest.approx(104.5 + 7.0)
+
+
+def test_sync_rebuilds_when_prefix_changes(database: SQLiteDatabase, tmp_path) -> None:
+    store = ColumnarCandleStore(tmp_path / "columnar", database)
+    _insert(database, [0, 1, 3, 4])
+    store.sync("BTC/USDT", "1h")
+
+    _insert(database, [2])  # gap repaired inside the mirrored range
+    result = store.sync("BTC/USDT", "1h")
+
+    assert result.rebuilt is True
+    assert result.total_rows == 5
+    columns = store.load_columns("BTC/USDT", "1h", 0, BASE_TS + 10 * HOUR_MS)
+    np.testing.assert_array_equal(columns.timestamp, BASE_TS + np.arange(5) * HOUR_MS)
+
+
+def test_sync_overwrites_bytes_from_interrupted_append(database: SQLiteDatabase, tmp_path) -> None:
+    store = ColumnarCandleStore(tmp_path / "columnar", database)
+    _insert(database, range(3))
+    store.sync("BTC/USDT", "1h")
+    dataset_dir = store.dataset_dir("BTC/USDT", "1h")
+    with (dataset_dir / "timestamp.bin").open("ab") as handle:
+        handle.write(b"\x00" * 24)
+
+    _insert(database, [3])
+    result = store.sync("BTC/USDT", "1h")
+
+    assert (result.total_rows, result.rebuilt) == (4, False)
+    columns = store.load_columns("BTC/USDT", "1h", 0, BASE_TS + 10 * HOUR_MS)
+    np.testing.assert_array_equal(columns.timestamp, BASE_TS + np.arange(4) * HOUR_MS)
+
+
+def test_sync_is_a_no_op_when_dataset_is_unchanged(
+    database: SQLiteDatabase,
+    tmp_path,
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    store = ColumnarCandleStore(tmp_path / "columnar", database)
+    _insert(database, range(5))
+    store.sync("BTC/USDT", "1h")
+    dataset_dir = store.dataset_dir("BTC/USDT", "1h")
+    before = {path.name: path.stat().st_mtime_ns for path in dataset_dir.iterdir()}
+    statements: list[str] = []
+    original_read = database.read
+
+    @contextmanager
+    def traced_read():
+        with original_read() as conn:
+            conn.set_trace_callback(statements.append)
+            try:
+                yield conn
+            finally:
+                conn.set_trace_callback(None)
+
+    monkeypatch.setattr(database, "read", traced_read)
+    result = store.sync("BTC/USDT", "1h")
+
+    assert (result.appended_rows, result.total_rows, result.rebuilt) == (0, 5, False)
+    assert {path.name: path.stat().st_mtime_ns for path in dataset_dir.iterdir()} == before
+    # Only the write counter is looked up; the candles table is not scanned.
+    assert statements and not any("FROM candles" in statement for statement in statements)
+
+
+def test_sync_keeps_earlier_views_valid(database: SQLiteDatabase, tmp_path) -> None:
+    store = ColumnarCandleStore(tmp_path / "columnar", database)
+    _insert(database, [0, 1, 3, 4])
+    store.sync("BTC/USDT", "1h")
+    view = store.load_columns("BTC/USDT", "1h", 0, BASE_TS + 10 * HOUR_MS)
+
+    _insert(database, [5])
+    store.sync("BTC/USDT", "1h")
+    _insert(database, [2])  # forces a rebuild
+    store.sync("BTC/USDT", "1h")
+
+    np.testing.assert_array_equal(view.timestamp, BASE_TS + np.array([0, 1, 3, 4]) * HOUR_MS)
+    assert list(store.dataset_dir("BTC/USDT", "1h").glob("*.tmp")) == []
+
+
+def test_sync_rebuilds_when_prefix_rows_move(database: SQLiteDatabase, tmp_path) -> None:
+    store = ColumnarCandleStore(tmp_path / "columnar", database)
+    _insert(database, [0, 1, 3, 4])
+    store.sync("BTC/USDT", "1h")
+
+    with database.transaction() as tx:
+        tx.execute("DELETE FROM candles WHERE timestamp = ?;", (BASE_TS + HOUR_MS,))
+        bump_dataset_versions(tx, [("BTC/USDT", "1h")])
+    _insert(database, [2])  # same prefix row count, different rows
+    result = store.sync("BTC/USDT", "1h")
+
+    assert result.rebuilt is True
+    columns = store.load_columns("BTC/USDT", "1h", 0, BASE_TS + 10 * HOUR_MS)
+    np.testing.assert_array_equal(columns.timestamp, BASE_TS + np.array([0, 2, 3, 4]) * HOUR_MS)
+
+
+def test_load_without_sync_raises(database: SQLiteDatabase, tmp_path) -> None:
+    store = ColumnarCandleStore(tmp_path / "columnar", database)
+    with pytest.raises(ColumnarStoreError, match="sync-columnar"):
+        store.load_columns("BTC/USDT", "1h", 0, BASE_TS)
+
+
+def test_sqlite_feed_iter_dataframes_matches_full_load(database: SQLiteDatabase) -> None:
+    _insert(database, range(10))
+    request = BacktestDataSlice("BTC/USDT", "1h", BASE_TS, BASE_TS + 9 * HOUR_MS)
+    factory = SQLitePandasFeedFactory(database)
+
+    chunks = list(factory.iter_dataframes(request, chunk_rows=4))
+
+    assert [len(chunk) for chunk in chunks] == [4, 4, 2]
+    pd.testing.assert_frame_equal(pd.concat(chunks), factory.load_dataframe(request), check_freq=False)
@@ -142,3 +142,24 @@ sma_strategy:
 
     with pytest.raises(ConfigValidationError, match="fast_period"):
         load_strategies_config(config_path=strategies_file)
+
+
+def test_load_config_rejects_unknown_database_profile(
+    monkeypatch: pytest.MonkeyPatch,
+    tmp_path,
+) -> None:
+    for env_name in ("LOG_LEVEL", "DATABASE_PATH", "EXCHANGE_API_KEY", "EXCHANGE_API_SECRET"):
+        monkeypatch.delenv(env_name, raising=False)
+
+    config_file = tmp_path / "config.yaml"
+    config_file.write_text(
+        """
+system:
+  database:
+    profile: turbo
+        """.strip(),
+        encoding="utf-8",
+    )
+
+    with pytest.raises(ConfigValidationError, match="system.database.profile"):
+        load_config(config_path=config_file, env_path=tmp_path / ".env")
@@ -0,0 +1,154 @@
+"""Tests for re-pricing recorded trades under other cost assumptions."""
+
+from __future__ import annotations
+
+import numpy as np
+import pytest
+
+from src.analysis.performance import analyze_performance
+from src.backtest.cost_sensitivity import CostScenario, CostSensitivityError, cost_grid, reprice_trades
+from src.backtest.engine import BacktestEngine
+from src.backtest.result_models import (
+    BacktestRunRequest,
+    BacktestRunResult,
+    ReturnsAnalysis,
+    RiskMetrics,
+    TimeSeries,
+    TradeRecord,
+    TradeStatistics,
+)
+from src.benchmarking.scenarios import generate_minute_candles, seed_candles
+from src.core.database import SQLiteDatabase
+from src.core.execution_cost import ExecutionCostProfile, LiquidityRole
+from src.strategies.registry import StrategyRegistry
+
+_COMMISSION = 0.001
+_SLIPPAGE = 0.0005
+
+
+def _record(entry_time: str, exit_time: str, side: str, size: float, entry: float, exit_: float) -> TradeRecord:
+    """A trade as BacktestEngine records it at ``_COMMISSION`` / ``_SLIPPAGE``."""
+    sign = 1.0 if side == "long" else -1.0
+    entry_price = entry * (1.0 + sign * _SLIPPAGE)
+    exit_price = exit_ * (1.0 - sign * _SLIPPAGE)
+    gross = sign * size * (exit_price - entry_price)
+    net = gross - size * (entry_price + exit_price) * _COMMISSION
+    return TradeRecord(entry_time, exit_time, side, size, entry_price, exit_price, gross, net)
+
+
+def _result(trades: tuple[TradeRecord, ...]) -> BacktestRunResult:
+    return BacktestRunResult(
+        symbol="BTC/USDT",
+        timeframe="1h",
+        data_source="sqlite",
+        initial_capital=1_000.0,
+        final_value=1_000.0,
+        pnl=0.0,
+        total_return_pct=0.0,
+        bars_processed=100,
+        trade_stats=TradeStatistics(len(trades), 0, 0, 0.0, 0.0, 0.0, 0.0, 0.0, 0.0),
+        risk_metrics=RiskMetrics(sharpe_ratio=None, max_drawdown_pct=0.0, max_drawdown_duration_days=0),
+        returns_analysis=ReturnsAnalysis(total_return=0.0, avg_return=0.0),
+        time_series_returns=TimeSeries.empty(),
+        trade_log=trades,
+    )
+
+
+_TRADES = (
+    _record("2024-01-01T00:00:00", "2024-01-01T05:00:00", "long", 2.0, 100.0, 104.0),
+    # Recorded out of exit order: re-pricing sorts by exit time.
+    _record("2024-01-02T00:00:00", "2024-01-02T08:00:00", "long", 1.5, 103.0, 99.0),
+    _record("2024-01-01T06:00:00", "2024-01-01T09:00:00", "short", 3.0, 104.0, 101.0),
+    _record("2024-01-03T00:00:00", "2024-01-03T02:00:00", "short", 1.0, 98.0, 99.5),
+    _record("2024-01-03T04:00:00", "2024-01-03T12:00:00", "long", 2.5, 99.0, 103.0),
+)
+
+
+def test_recorded_costs_round_trip_and_summaries_match_analyze_performance() -> None:
+    scenarios = cost_grid([0.0, _COMMISSION, 0.003], [0.0, _SLIPPAGE, 0.002])
+    surface = reprice_trades(_result(_TRADES), scenarios, commission_rate=_COMMISSION, slippage_rate=_SLIPPAGE)
+
+    assert surface.net_pnl.shape == (9, 5) and surface.equity.shape == (9, 6)
+    by_exit = sorted(_TRADES, key=lambda record: record.exit_time)
+    recorded = scenarios.index(CostScenario.from_rates(_COMMISSION, _SLIPPAGE))
+    np.testing.assert_allclose(surface.net_pnl[recorded], [record.pnl_net for record in by_exit], rtol=1e-12)
+    # More cost never helps: net PnL falls along both axes of the grid.
+    totals = surface.net_pnl.sum(axis=1).reshape(3, 3)
+    assert (np.diff(totals, axis=0) < 0).all() and (np.diff(totals, axis=1) < 0).all()
+
+    times = ["2024-01-01T00:00:00", *(record.exit_time for record in by_exit)]
+    for index, (row, summary) in enumerate(zip(surface.to_rows(), surface.summaries)):
+        pnl = surface.net_pnl[index]
+        expected = analyze_performance(
+            equity_curve=list(zip(times, surface.equity[index].tolist())),
+            trade_log=[{"pnl_net": value} for value in pnl.tolist()],
+        )
+        for name in ("total_return", "annualized_return", "max_drawdown", "sharpe_ratio", "sortino_ratio"):
+            assert getattr(summary, name) == pytest.approx(getattr(expected, name), rel=1e-9, abs=1e-12), name
+        assert (summary.win_rate, summary.profit_factor) == pytest.approx((expected.win_rate, expected.profit_factor))
+        assert (summary.total_trades, summary.winning_trades, summary.losing_trades) == (
+            expected.total_trades,
+            expected.winning_trades,
+            expected.losing_trades,
+        )
+        assert row["net_pnl"] == pytest.approx(pnl.sum())
+
+
+def test_profile_roles_pick_maker_or_taker_fee_per_fill() -> None:
+    profile = ExecutionCostProfile(maker_fee_rate=0.0002, taker_fee_rate=0.001, slippage_rate=0.0)
+    maker_in = CostScenario.from_profile(profile, entry_role=LiquidityRole.MAKER)
+    assert maker_in == CostScenario(0.0002, 0.001, 0.0)
+
+    surface = reprice_trades(
+        _result(_TRADES[:1]),
+        (maker_in, CostScenario.from_profile(profile)),
+        commission_rate=_COMMISSION,
+        slippage_rate=_SLIPPAGE,
+    )
+    # Only the entry fee differs: 2 units at the reference entry price of 100.
+    assert surface.net_pnl[0, 0] - surface.net_pnl[1, 0] == pytest.approx(2.0 * 100.0 * (0.001 - 0.0002))
+    assert surface.summaries[0].sharpe_ratio is None  # one closed trade -> one return
+
+
+def test_invalid_inputs_raise() -> None:
+    with pytest.raises(CostSensitivityError, match="slippage_rate"):
+        CostScenario(0.001, 0.001, 1.5)
+    with pytest.raises(CostSensitivityError, match="at least one"):
+        reprice_trades(_result(_TRADES), (), commission_rate=0.0, slippage_rate=0.0)
+    with pytest.raises(CostSensitivityError, match="closed trade"):
+        reprice_trades(_result(()), cost_grid([0.0], [0.0]), commission_rate=0.0, slippage_rate=0.0)
+
+
+def test_repriced_trades_match_backtests_rerun_at_those_costs(tmp_path) -> None:
+    database = SQLiteDatabase(tmp_path / "costs.db")
+    database.initialize_schema()
+    candles = generate_minute_candles(symbol="BTC/USDT", bars=3_000, seed=7)
+    seed_candles(database, candles)
+    request = BacktestRunRequest(
+        symbol="BTC/USDT",
+        timeframe="1m",
+        start_timestamp=candles[0][2],
+        end_timestamp=candles[-1][2],
+        strategy_class=StrategyRegistry.default().get_by_name("sma_strategy").strategy_class,
+        strategy_params={"fast_period": 5, "slow_period": 20},
+    )
+
+    def run(commission: float, slippage: float) -> BacktestRunResult:
+        engine = BacktestEngine(
+            database, initial_capital=10_000.0, commission_rate=commission, slippage_rate=slippage
+        )
+        return engine.run(request)
+
+    recorded = run(_COMMISSION, _SLIPPAGE)
+    assert len(recorded.trade_log) >= 10
+    scenarios = (CostScenario.from_rates(0.002, 0.0), CostScenario.from_rates(0.0, 0.0002))
+    surface = reprice_trades(recorded, scenarios, commission_rate=_COMMISSION, slippage_rate=_SLIPPAGE)
+
+    for row, scenario in enumerate(scenarios):
+        rerun = run(scenario.entry_fee_rate, scenario.slippage_rate)
+        assert len(rerun.trade_log) == len(recorded.trade_log)
+        np.testing.assert_allclose(
+            surface.net_pnl[row], [record.pnl_net for record in rerun.trade_log], rtol=1e-6, atol=1e-6
+        )
+        assert surface.final_equity[row] == pytest.approx(10_000.0 + sum(r.pnl_net for r in rerun.trade_log))
+    database.close()
@@ -0,0 +1,19 @@
+"""Tests for download-coverage interval helpers."""
+
+from __future__ import annotations
+
+from src.data.coverage import merge_intervals, subtract_intervals
+
+
+def test_merge_intervals_joins_overlapping_and_adjacent_ranges() -> None:
+    assert merge_intervals([(10, 20), (0, 5), (6, 8), (15, 30), (40, 50)]) == [(0, 8), (10, 30), (40, 50)]
+    assert merge_intervals([]) == []
+
+
+def test_subtract_intervals_returns_uncovered_holes() -> None:
+    covered = [(0, 9), (20, 29), (40, 49)]
+
+    assert subtract_intervals((5, 45), covered) == [(10, 19), (30, 39)]
+    assert subtract_intervals((0, 9), covered) == []
+    assert subtract_intervals((50, 60), covered) == [(50, 60)]
+    assert subtract_intervals((-5, 3), covered) == [(-5, -1)]
@@ -259,3 +259,99 @@ def test_trades_foreign_key_constraint_blocks_missing_order(tmp_path) -> None:
                 "VALUES (?, ?, ?, ?, ?, ?);",
                 ("missing-order", "BTC/USDT", "buy", 50000.0, 0.1, 5.0),
             )
+
+
+def test_default_profile_keeps_rollback_journal(tmp_path) -> None:
+    database = SQLiteDatabase(tmp_path / "legacy.db")
+    database.open()
+    try:
+        journal_mode = database.connection.execute("PRAGMA journal_mode;").fetchone()[0]
+    finally:
+        database.close()
+
+    assert database.pragma_profile.name == "legacy"
+    assert journal_mode.lower() == "delete"
+
+
+def test_from_config_applies_wal_profile_and_overrides(tmp_path) -> None:
+    config = {
+        "system": {
+            "database_path": str(tmp_path / "wal.db"),
+            "database": {"profile": "wal", "read_pool_size": 2, "cache_size": -4096},
+        }
+    }
+    database = SQLiteDatabase.from_config(config)
+    database.open()
+    try:
+        connection = database.connection
+        journal_mode = connection.execute("PRAGMA journal_mode;").fetchone()[0]
+        synchronous = connection.execute("PRAGMA synchronous;").fetchone()[0]
+        cache_size = connection.execute("PRAGMA cache_size;").fetchone()[0]
+    finally:
+        database.close()
+
+    assert journal_mode.lower() == "wal"
+    assert synchronous == 1  # NORMAL
+    assert cache_size == -4096
+
+
+def test_unknown_profile_is_rejected(tmp_path) -> None:
+    with pytest.raises(DatabaseLifecycleError, match="database profile"):
+        SQLiteDatabase(tmp_path / "bad.db", pragma_profile="turbo")
+
+
+def test_wal_read_uses_pooled_snapshot_connection(tmp_path) -> None:
+    database = SQLiteDatabase(tmp_path / "pool.db", pragma_profile="wal", read_pool_size=1)
+    with database.transaction() as tx:
+        tx.execute("CREATE TABLE items (id INTEGER PRIMARY KEY, value TEXT NOT NULL);")
+        tx.execute("INSERT INTO items(value) VALUES ('a');")
+
+    try:
+        with database.read() as reader:
+            assert reader is not database.connection
+            assert reader.execute("SELECT COUNT(*) FROM items;").fetchone()[0] == 1
+            # Writes committed after the snapshot started stay invisible to it.
+            with database.transaction() as tx:
+                tx.execute("INSERT INTO items(value) VALUES ('b');")
+            assert reader.execute("SELECT COUNT(*) FROM items;").fetchone()[0] == 1
+            with pytest.raises(sqlite3.OperationalError, match="readonly"):
+                reader.execute("INSERT INTO items(value) VALUES ('c');")
+
+        with database.read() as reader_again:
+            assert reader_again is reader
+            assert reader_again.execute("SELECT COUNT(*) FROM items;").fetchone()[0] == 2
+    finally:
+        database.close()
+
+
+def test_read_inside_transaction_sees_uncommitted_writes(tmp_path) -> None:
+    database = SQLiteDatabase(tmp_path / "ryw.db", pragma_profile="wal")
+    with database.transaction() as tx:
+        tx.execute("CREATE TABLE items (id INTEGER PRIMARY KEY, value TEXT NOT NULL);")
+
+    try:
+        with database.transaction() as tx:
+            tx.execute("INSERT INTO items(value) VALUES ('pending');")
+            with database.read() as reader:
+                assert reader is database.connection
+                assert reader.execute("SELECT COUNT(*) FROM items;").fetchone()[0] == 1
+    finally:
+        database.close()
+
+
+def test_in_memory_database_with_wal_profile_reads_on_the_writer() -> None:
+    database = SQLiteDatabase(":memory:", pragma_profile="wal")
+    try:
+        database.initialize_schema()
+        assert database.journal_mode == "memory"
+        with database.transaction() as tx:
+            tx.execute(
+                "INSERT INTO candles(symbol, timeframe, timestamp, open, high, low, close, volume) "
+                "VALUES ('BTC/USDT', '1m', 1, 1.0, 1.0, 1.0, 1.0, 1.0);"
+            )
+        with database.read() as reader:
+            assert reader is database.connection
+            assert reader.execute("SELECT COUNT(*) FROM candles;").fetchone()[0] == 1
+    finally:
+        database.close()
+    assert database.journal_mode is None
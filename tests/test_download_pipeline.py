@@ -0,0 +1,170 @@
+"""Tests for the manifest-driven concurrent candle download pipeline."""
+
+from __future__ import annotations
+
+import threading
+from pathlib import Path
+from typing import Any
+
+import pytest
+
+from src.core.database import SQLiteDatabase
+from src.data.download_pipeline import (
+    ConcurrentCandleDownloader,
+    DownloadManifestError,
+    load_download_manifest,
+)
+from src.data.storage import CandleDownloadRequest, HistoricalCandleStorage
+
+HOUR_MS = 3_600_000
+START_MS = 1_700_000_000_000 - (1_700_000_000_000 % HOUR_MS)
+
+
+class _RangeFetcher:
+    """Serve synthetic hourly candles for any symbol; fail for configured symbols."""
+
+    def __init__(self, failing_symbols: frozenset[str] = frozenset()) -> None:
+        self._failing = failing_symbols
+        self.thread_names: set[str] = set()
+
+    def fetch_ohlcv(
+        self,
+        symbol: str,
+        timeframe: str,
+        since: int | None = None,
+        limit: int | None = None,
+    ) -> list[list[Any]]:
+        self.thread_names.add(threading.current_thread().name)
+        if symbol in self._failing:
+            raise RuntimeError(f"exchange rejected {symbol}")
+        assert since is not None and limit is not None
+        first = since + (-since % HOUR_MS)
+        end = START_MS + 47 * HOUR_MS
+        return [
+            [ts, 100.0, 101.0, 99.0, 100.5, 1.0]
+            for ts in range(first, min(end, first + (limit - 1) * HOUR_MS) + 1, HOUR_MS)
+        ]
+
+
+@pytest.fixture
+def database(tmp_path):
+    db = SQLiteDatabase(tmp_path / "pipeline.db")
+    db.initialize_schema()
+    yield db
+    db.close()
+
+
+def _request(symbol: str) -> CandleDownloadRequest:
+    return CandleDownloadRequest(
+        symbol=symbol,
+        timeframe="1h",
+        start_timestamp=START_MS,
+        end_timestamp=START_MS + 47 * HOUR_MS,
+        batch_size=10,
+    )
+
+
+def test_concurrent_download_stores_every_dataset(database: SQLiteDatabase) -> None:
+    fetchers: list[_RangeFetcher] = []
+
+    def factory() -> _RangeFetcher:
+        fetcher = _RangeFetcher()
+        fetchers.append(fetcher)
+        return fetcher
+
+    storage = HistoricalCandleStorage(database, _RangeFetcher(), now_ms_fn=lambda: START_MS + 1000 * HOUR_MS)
+    progress: list[str] = []
+    downloader = ConcurrentCandleDownloader(
+        storage,
+        factory,
+        workers=3,
+        queue_size=2,
+        on_progress=lambda report: progress.append(report.symbol),
+    )
+
+    report = downloader.run([_request("BTC/USDT"), _request("ETH/USDT"), _request("SOL/USDT")])
+
+    assert [item.symbol for item in report.datasets] == ["BTC/USDT", "ETH/USDT", "SOL/USDT"]
+    assert sorted(progress) == ["BTC/USDT", "ETH/USDT", "SOL/USDT"]
+    assert report.failed == ()
+    assert report.downloaded_count == 3 * 48
+    assert len(fetchers) == 3
+    for item in report.datasets:
+        assert item.result is not None
+        assert item.result.stored_count == 48
+        assert item.fetched_pages == item.result.fetched_pages
+        assert item.rows_per_second >= 0.0
+
+    # Everything is covered now, so a second run fetches nothing.
+    rerun = downloader.run([_request("BTC/USDT")])
+    assert rerun.downloaded_count == 0
+    assert rerun.fetched_pages == 0
+
+
+def test_concurrent_download_isolates_failed_dataset(database: SQLiteDatabase) -> None:
+    storage = HistoricalCandleStorage(database, _RangeFetcher(), now_ms_fn=lambda: START_MS + 1000 * HOUR_MS)
+    downloader = ConcurrentCandleDownloader(
+        storage,
+        lambda: _RangeFetcher(failing_symbols=frozenset({"ETH/USDT"})),
+        workers=2,
+    )
+
+    report = downloader.run([_request("BTC/USDT"), _request("ETH/USDT")])
+
+    ok, failed = report.datasets
+    assert ok.error is None and ok.downloaded_count == 48
+    assert failed.result is None
+    assert failed.error is not None and "exchange rejected ETH/USDT" in failed.error
+    assert report.failed == (failed,)
+    assert storage.coverage.covered_intervals("ETH/USDT", "1h", START_MS, START_MS + 47 * HOUR_MS) == []
+
+
+def test_load_download_manifest_expands_cross_product_and_datasets(tmp_path: Path) -> None:
+    manifest_path = tmp_path / "universe.yaml"
+    manifest_path.write_text(
+        "workers: 6\n"
+        "symbols: [btc/usdt, ETH/USDT]\n"
+        "timeframes: [1h, 4h]\n"
+        "datasets:\n"
+        "  - symbol: SOL/USDT\n"
+        "    timeframe: 15m\n"
+        f"    start_ms: {START_MS}\n"
+        "  - symbol: BTC/USDT\n"
+        "    timeframe: 1h\n",
+        encoding="utf-8",
+    )
+
+    manifest = load_download_manifest(
+        manifest_path,
+        default_start_timestamp=START_MS - HOUR_MS,
+        default_end_timestamp=START_MS + HOUR_MS,
+    )
+
+    assert manifest.workers == 6
+    assert [(item.symbol, item.timeframe) for item in manifest.requests] == [
+        ("BTC/USDT", "1h"),
+        ("BTC/USDT", "4h"),
+        ("ETH/USDT", "1h"),
+        ("ETH/USDT", "4h"),
+        ("SOL/USDT", "15m"),
+    ]
+    assert manifest.requests[-1].start_timestamp == START_MS
+    assert manifest.requests[0].start_timestamp == START_MS - HOUR_MS
+
+
+@pytest.mark.parametrize(
+    "content",
+    [
+        "symbols: [BTC/USDT]\n",
+        "workers: 0\nsymbols: [BTC/USDT]\ntimeframes: [1h]\n",
+        "datasets:\n  - symbol: BTC/USDT\n",
+        "{}\n",
+        "- just\n- a list\n",
+    ],
+)
+def test_load_download_manifest_rejects_invalid_content(tmp_path: Path, content: str) -> None:
+    manifest_path = tmp_path / "bad.yaml"
+    manifest_path.write_text(content, encoding="utf-8")
+
+    with pytest.raises(DownloadManifestError):
+        load_download_manifest(manifest_path, default_start_timestamp=0, default_end_timestamp=1)
@@ -0,0 +1,93 @@
+from __future__ import annotations
+
+from collections.abc import Mapping
+
+import pytest
+
+from src.core.enums import OrderSide, OrderStatus, OrderType
+from src.core.execution_cost import ExecutionCostProfile
+from src.core.fill_rules import (
+    buy_price_improvement_refund,
+    is_limit_triggered,
+    is_trigger_hit,
+    position_after_buy,
+    position_after_sell,
+    price_time_priority,
+    quote_limit_fill,
+    quote_market_fill,
+)
+from src.core.order import Order
+from src.core.risk import PortfolioMetrics, RiskControl, RiskControlError, RiskLimits
+
+
+def _order(order_id: str, side: OrderSide, price: float) -> Order:
+    return Order(
+        id=order_id,
+        symbol="BTC/USDT",
+        type=OrderType.LIMIT,
+        side=side,
+        price=price,
+        amount=1.0,
+        filled=0.0,
+        status=OrderStatus.OPEN,
+        created_at=None,
+        updated_at=None,
+    )
+
+
+def test_quotes_apply_slippage_and_liquidity_fees() -> None:
+    profile = ExecutionCostProfile(maker_fee_rate=0.001, taker_fee_rate=0.002, slippage_rate=0.01)
+
+    market = quote_market_fill(profile, side=OrderSide.BUY, reference_price=100.0, amount=2.0)
+    assert market.execution_price == pytest.approx(101.0)
+    assert market.fee == pytest.approx(101.0 * 2.0 * 0.002)
+
+    # Latest price below the buy limit: slipped from latest, capped at the limit, maker fee.
+    limit = quote_limit_fill(profile, side=OrderSide.BUY, limit_price=100.0, latest_price=99.5, amount=1.0)
+    assert limit.execution_price == pytest.approx(100.0)
+    assert limit.fee == pytest.approx(100.0 * 0.001)
+
+
+def test_triggers_and_priority() -> None:
+    assert is_limit_triggered(OrderSide.BUY, 100.0, 99.0)
+    assert not is_limit_triggered(OrderSide.SELL, 100.0, 99.0)
+    assert is_trigger_hit(OrderType.STOP_LOSS, OrderSide.SELL, 90.0, 89.0)
+    assert is_trigger_hit(OrderType.TAKE_PROFIT, OrderSide.SELL, 110.0, 111.0)
+    assert not is_trigger_hit(OrderType.LIMIT, OrderSide.SELL, 110.0, 111.0)
+
+    orders = [
+        _order("s-high", OrderSide.SELL, 105.0),
+        _order("b-low", OrderSide.BUY, 95.0),
+        _order("s-low", OrderSide.SELL, 101.0),
+        _order("b-high-late", OrderSide.BUY, 99.0),
+        _order("b-high-early", OrderSide.BUY, 99.0),
+    ]
+    arrival = {"b-high-early": 0, "b-high-late": 1}
+    ranked = price_time_priority(orders, lambda order: arrival.get(order.id, 2))
+    assert [order.id for order in ranked] == ["b-high-early", "b-high-late", "b-low", "s-low", "s-high"]
+
+
+def test_refund_and_position_arithmetic() -> None:
+    assert buy_price_improvement_refund(OrderSide.BUY, 100.0, 98.0, 2.0) == pytest.approx(4.0)
+    assert buy_price_improvement_refund(OrderSide.SELL, 100.0, 98.0, 2.0) == 0.0
+
+    assert position_after_buy(1.0, 100.0, 1.0, 110.0) == pytest.approx((2.0, 105.0))
+    assert position_after_sell(2.0, 105.0, 0.5, 115.0) == pytest.approx((1.5, 5.0))
+
+
+class _StaticPortfolio:
+    def __init__(self, metrics: PortfolioMetrics) -> None:
+        self._metrics = metrics
+
+    def portfolio_metrics(self, price_overrides: Mapping[str, float]) -> PortfolioMetrics:
+        return self._metrics
+
+
+def test_risk_control_evaluates_any_portfolio_source() -> None:
+    limits = RiskLimits(max_position_size=0.2, max_total_position=0.5, max_drawdown=0.3)
+    control = RiskControl(_StaticPortfolio(PortfolioMetrics(1000.0, 1000.0, 0.0, 0.0)), limits=limits)
+
+    snapshot = control.check_pre_order(symbol="BTC/USDT", side=OrderSide.BUY, amount=1.0, reference_price=150.0)
+    assert snapshot.single_position_ratio == pytest.approx(0.15)
+    with pytest.raises(RiskControlError, match="single position limit"):
+        control.check_pre_order(symbol="BTC/USDT", side=OrderSide.BUY, amount=1.0, reference_price=300.0)
@@ -0,0 +1,173 @@
+"""Tests for the process-wide backtest dataframe cache."""
+
+from __future__ import annotations
+
+import backtrader as bt
+import pandas as pd
+import pytest
+
+import src.data.feed as feed_module
+from src.backtest.engine import BacktestEngine, BacktestRunRequest
+from src.core.database import SQLiteDatabase
+from src.data.candle_schema import (
+    CompactCandleMigration,
+    bump_dataset_versions,
+    dataset_version,
+    insert_candle_rows,
+    upsert_live_candle,
+)
+from src.data.feed import BacktestDataSlice, RollupPandasFeedFactory, SQLitePandasFeedFactory
+from src.data.frame_cache import DataFrameLRUCache, FrameCacheKey
+from src.data.rollup import mark_rollup_dirty
+
+HOUR_MS = 3_600_000
+MINUTE_MS = 60_000
+
+
+def _frame(rows: int) -> pd.DataFrame:
+    return pd.DataFrame({"close": [1.0] * rows})
+
+
+def _key(symbol: str = "BTC/USDT", version: int = 0, start: int = 0) -> FrameCacheKey:
+    return FrameCacheKey("db", symbol, "1h", start, 10, version)
+
+
+def _rows(timeframe: str, step_ms: int, count: int, start: int = 0) -> list[tuple]:
+    return [
+        ("BTC/USDT", timeframe, start + idx * step_ms, 100.0, 101.0, 99.0, 100.5, 1.0)
+        for idx in range(count)
+    ]
+
+
+@pytest.fixture
+def database(tmp_path):
+    db = SQLiteDatabase(tmp_path / "cache.db")
+    db.initialize_schema()
+    with db.transaction() as tx:
+        insert_candle_rows(tx, _rows("1h", HOUR_MS, 48))
+    yield db
+    db.close()
+
+
+def _forbid_sql(monkeypatch: pytest.MonkeyPatch) -> None:
+    def _fail(*_args, **_kwargs):
+        raise AssertionError("cache hit must not query candles")
+
+    monkeypatch.setattr(feed_module, "iter_candle_batches", _fail)
+
+
+def test_lru_evicts_least_recently_used_entries_over_byte_budget() -> None:
+    size = int(_frame(100).memory_usage(index=True).sum())
+    cache = DataFrameLRUCache(max_bytes=2 * size)
+    cache.put(_key(start=1), _frame(100))
+    cache.put(_key(start=2), _frame(100))
+    assert cache.get(_key(start=1)) is not None
+
+    cache.put(_key(start=3), _frame(100))
+
+    assert cache.get(_key(start=2)) is None
+    assert cache.get(_key(start=1)) is not None
+    stats = cache.stats()
+    assert (stats.hits, stats.misses, stats.evictions, stats.entries) == (2, 1, 1, 2)
+    assert stats.current_bytes == 2 * size
+    assert stats.hit_ratio == pytest.approx(2 / 3)
+
+
+def test_newer_dataset_version_drops_stale_slices_and_oversized_frames_are_skipped() -> None:
+    cache = DataFrameLRUCache(max_bytes=10_000)
+    cache.put(_key(version=1, start=1), _frame(10))
+    cache.put(_key(version=1, start=2), _frame(10))
+    cache.put(_key(symbol="ETH/USDT", version=1), _frame(10))
+
+    cache.put(_key(version=2, start=1), _frame(10))
+    cache.put(_key(version=3), _frame(5_000))
+
+    assert cache.stats().entries == 1
+    assert cache.get(_key(symbol="ETH/USDT", version=1)) is not None
+    with pytest.raises(ValueError):
+        DataFrameLRUCache(max_bytes=0)
+
+
+def test_repeated_load_skips_sql_until_a_write_bumps_the_version(
+    database: SQLiteDatabase,
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    factory = SQLitePandasFeedFactory(database, frame_cache=DataFrameLRUCache())
+    request = BacktestDataSlice("BTC/USDT", "1h", 0, 100 * HOUR_MS)
+    first = factory.load_dataframe(request)
+
+    with monkeypatch.context() as patch:
+        _forbid_sql(patch)
+        second = factory.load_dataframe(request)
+    pd.testing.assert_frame_equal(first, second)
+    assert factory.frame_cache.stats().hits == 1
+
+    with database.transaction() as tx:
+        assert insert_candle_rows(tx, _rows("1h", HOUR_MS, 2, start=48 * HOUR_MS)) == 2
+    assert len(factory.load_dataframe(request)) == 50
+    assert factory.frame_cache.stats().entries == 1
+
+
+def test_write_helpers_bump_dataset_versions_on_both_layouts(database: SQLiteDatabase) -> None:
+    with database.read() as conn:
+        start = dataset_version(conn, "BTC/USDT", "1h")
+    with database.transaction() as tx:
+        insert_candle_rows(tx, _rows("1h", HOUR_MS, 1))  # duplicate: no bump
+        assert dataset_version(tx, "BTC/USDT", "1h") == start
+        upsert_live_candle(tx, symbol="BTC/USDT", timeframe="1h", timestamp=0, price=100.0)
+    CompactCandleMigration(database).run()
+    with database.transaction() as tx:
+        insert_candle_rows(tx, _rows("1h", HOUR_MS, 1, start=60 * HOUR_MS))
+        bump_dataset_versions(tx, [("BTC/USDT", "1h")])
+        assert dataset_version(tx, "BTC/USDT", "1h") == start + 3
+        assert dataset_version(tx, "ETH/USDT", "1h") == 0
+
+
+def test_rollup_slices_are_cached_against_their_1m_source(
+    database: SQLiteDatabase,
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    with database.transaction() as tx:
+        insert_candle_rows(tx, _rows("1m", MINUTE_MS, 30))
+    factory = RollupPandasFeedFactory(database, frame_cache=DataFrameLRUCache())
+    request = BacktestDataSlice("BTC/USDT", "15m", 0, 60 * MINUTE_MS)
+    assert len(factory.load_dataframe(request)) == 2
+
+    monkeypatch.setattr(factory.engine, "load_batch", pytest.fail)
+    assert len(factory.load_dataframe(request)) == 2
+    monkeypatch.undo()
+
+    with database.transaction() as tx:
+        # A complete third bucket; partial ones are not served as bars.
+        insert_candle_rows(tx, _rows("1m", MINUTE_MS, 15, start=30 * MINUTE_MS))
+        mark_rollup_dirty(tx, "BTC/USDT", [30 * MINUTE_MS])
+    assert len(factory.load_dataframe(request)) == 3
+
+
+def test_engine_from_config_shares_process_cache_across_engines(
+    database: SQLiteDatabase,
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    config = {
+        "account": {"initial_capital": 10_000.0},
+        "trading": {"commission": {"taker": 0.0}, "slippage": 0.0},
+        "backtest": {"frame_cache_mb": 64},
+    }
+    request = BacktestRunRequest(
+        symbol="BTC/USDT",
+        timeframe="1h",
+        start_timestamp=0,
+        end_timestamp=47 * HOUR_MS,
+        strategy_class=bt.Strategy,
+    )
+    first = BacktestEngine.from_config(database, config).run(request)
+    _forbid_sql(monkeypatch)
+    engine = BacktestEngine.from_config(database, config)
+    second = engine.run(request)
+
+    assert second.bars_processed == first.bars_processed == 48
+    assert engine.frame_cache_stats is not None and engine.frame_cache_stats.max_bytes == 64 * 1024 * 1024
+    disabled = BacktestEngine.from_config(
+        database, {**config, "backtest": {"frame_cache_mb": 0}}
+    )
+    assert disabled.frame_cache_stats is None
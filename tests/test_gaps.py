@@ -0,0 +1,125 @@
+"""Tests for the stored-candle gap index and gap repair."""
+
+from __future__ import annotations
+
+from typing import Any
+
+import pytest
+
+from src.core.database import SQLiteDatabase
+from src.data.candle_schema import CompactCandleMigration, insert_candle_rows
+from src.data.gaps import CandleGap, CandleGapRepairer, CandleGapScanner, merge_gap_windows
+from src.data.storage import HistoricalCandleStorage
+
+HOUR_MS = 3_600_000
+
+
+def _bars(*hours: int) -> list[tuple[Any, ...]]:
+    return [("BTC/USDT", "1h", hour * HOUR_MS, 100.0, 101.0, 99.0, 100.5, 1.0) for hour in hours]
+
+
+def _insert(database: SQLiteDatabase, *hours: int) -> None:
+    with database.transaction() as tx:
+        insert_candle_rows(tx, _bars(*hours))
+
+
+def _spans(gaps: list[CandleGap]) -> list[tuple[int, int, int]]:
+    return [(gap.start_timestamp // HOUR_MS, gap.end_timestamp // HOUR_MS, gap.missing_bars) for gap in gaps]
+
+
+class ExchangeFetcher:
+    """Serves every hour except the ones the exchange never had."""
+
+    def __init__(self, *, holes: set[int] = frozenset()) -> None:
+        self.holes = holes
+        self.calls: list[tuple[int, int]] = []
+
+    def fetch_ohlcv(self, symbol: str, timeframe: str, since: int | None = None, limit: int | None = None):
+        assert since is not None and limit is not None
+        self.calls.append((since // HOUR_MS, limit))
+        first = -(-since // HOUR_MS)
+        return [
+            [hour * HOUR_MS, 100.0, 101.0, 99.0, 100.5, 1.0]
+            for hour in range(first, min(first + limit, 200))
+            if hour not in self.holes
+        ]
+
+
+@pytest.fixture
+def database(tmp_path):
+    db = SQLiteDatabase(tmp_path / "gaps.db")
+    db.initialize_schema()
+    yield db
+    db.close()
+
+
+def test_scan_records_gaps_and_resumes_from_last_checked_timestamp(database: SQLiteDatabase) -> None:
+    _insert(database, 0, 1, 2, 5, 6, 10)
+    scanner = CandleGapScanner(database)
+
+    first = scanner.scan("BTC/USDT", "1h")
+
+    assert (first.scanned_from, first.checked_until // HOUR_MS) == (None, 10)
+    assert (first.new_gaps, first.open_gaps, first.missing_bars) == (2, 2, 5)
+    assert _spans(scanner.list_gaps("BTC/USDT", "1h")) == [(3, 4, 2), (7, 9, 3)]
+
+    # A gap straddling the checked boundary is found; older bars are not rescanned.
+    _insert(database, 13, 14)
+    second = scanner.scan("BTC/USDT", "1h")
+    assert second.scanned_from == 10 * HOUR_MS
+    assert second.new_gaps == 1
+    assert _spans(scanner.list_gaps("BTC/USDT", "1h"))[-1] == (11, 12, 2)
+
+
+def test_scan_reverifies_recorded_gaps_filled_by_later_downloads(database: SQLiteDatabase) -> None:
+    _insert(database, 0, 6)
+    scanner = CandleGapScanner(database)
+    scanner.scan("BTC/USDT", "1h")
+
+    _insert(database, 2, 3)
+    result = scanner.scan("BTC/USDT", "1h")
+
+    assert _spans(scanner.list_gaps("BTC/USDT", "1h")) == [(1, 1, 1), (4, 5, 2)]
+    assert result.missing_bars == 3
+    assert scanner.scan("BTC/USDT", "1h", full=True).open_gaps == 2
+
+
+def test_merge_gap_windows_batches_neighbouring_gaps() -> None:
+    gaps = [
+        CandleGap("BTC/USDT", "1h", hour * HOUR_MS, (hour + length - 1) * HOUR_MS, length)
+        for hour, length in ((3, 2), (7, 1), (20, 40), (70, 1))
+    ]
+
+    windows = merge_gap_windows(gaps, interval_ms=HOUR_MS, batch_size=10)
+
+    assert [(start // HOUR_MS, end // HOUR_MS) for start, end in windows] == [(3, 7), (20, 59), (70, 70)]
+
+
+def test_repair_refetches_gaps_in_batches_and_caps_exchange_holes(database: SQLiteDatabase) -> None:
+    _insert(database, 0, 1, 4, 5, 9, 30)
+    CompactCandleMigration(database).run()
+    scanner = CandleGapScanner(database)
+    scanner.scan("BTC/USDT", "1h")
+    fetcher = ExchangeFetcher(holes={7})
+    repairer = CandleGapRepairer(
+        HistoricalCandleStorage(database, fetcher, now_ms_fn=lambda: 1_000 * HOUR_MS),
+        scanner,
+        max_attempts=2,
+    )
+
+    result = repairer.repair("BTC/USDT", "1h", batch_size=10)
+
+    # Gaps 2-3 and 6-8 share one request; 10-29 is its own window.
+    assert (result.attempted_gaps, result.fetch_windows) == (3, 2)
+    assert fetcher.calls[0] == (2, 10)
+    assert result.inserted_count == 2 + 2 + 20
+    assert (result.repaired_gaps, result.remaining_gaps) == (2, 1)
+    assert [(gap.start_timestamp // HOUR_MS, gap.repair_attempts) for gap in scanner.list_gaps("BTC/USDT", "1h")] == [
+        (7, 1)
+    ]
+
+    repairer.repair("BTC/USDT", "1h", batch_size=10)
+    fetcher.calls.clear()
+    exhausted = repairer.repair("BTC/USDT", "1h", batch_size=10)
+    assert (exhausted.attempted_gaps, fetcher.calls) == (0, [])
+    assert exhausted.remaining_gaps == 1
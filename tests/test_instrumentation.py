@@ -0,0 +1,108 @@
+"""Tests for per-stage instrumentation and cProfile hooks of BacktestEngine runs."""
+
+from __future__ import annotations
+
+import json
+from pathlib import Path
+
+import pytest
+
+from src.backtest.engine import BacktestEngine
+from src.backtest.exporter import BacktestResultExporter
+from src.backtest.instrumentation import InstrumentationError, ProfilingOptions
+from src.backtest.result_cache import BacktestResultCache
+from src.backtest.result_models import BacktestRunRequest
+from src.benchmarking.scenarios import generate_minute_candles, seed_candles
+from src.core.database import SQLiteDatabase
+from src.strategies.registry import StrategyRegistry
+
+_ANALYZERS = {"sharpe", "drawdown", "trades", "returns", "timereturns"}
+
+
+@pytest.fixture()
+def seeded(tmp_path: Path):
+    database = SQLiteDatabase(tmp_path / "profile.db")
+    database.initialize_schema()
+    candles = generate_minute_candles(symbol="BTC/USDT", bars=1_500, seed=5)
+    seed_candles(database, candles)
+    request = BacktestRunRequest(
+        symbol="BTC/USDT",
+        timeframe="1m",
+        start_timestamp=candles[0][2],
+        end_timestamp=candles[-1][2],
+        strategy_class=StrategyRegistry.default().get_by_name("sma_strategy").strategy_class,
+        strategy_params={"fast_period": 5, "slow_period": 20},
+    )
+    yield database, request
+    database.close()
+
+
+def _engine(database: SQLiteDatabase, **kwargs) -> BacktestEngine:
+    return BacktestEngine(database, initial_capital=10_000.0, commission_rate=0.001, slippage_rate=0.0005, **kwargs)
+
+
+def test_stage_timings_and_counters_leave_the_result_unchanged(seeded) -> None:
+    database, request = seeded
+    plain = _engine(database).run(request)
+    cache = BacktestResultCache(database, 1024 * 1024)
+    profiled = _engine(database, result_cache=cache, profiling=ProfilingOptions(next_sample_every=7)).run(request)
+
+    assert plain.profile is None
+    assert (profiled.final_value, profiled.trade_log) == (plain.final_value, plain.trade_log)
+    assert cache.stats().entries == 0  # profiled runs bypass the result cache
+
+    profile = profiled.profile
+    assert profile is not None and profile.engine == "backtrader"
+    assert list(profile.stage_seconds)[:3] == ["load_dataframe", "build_feed", "build_cerebro"]
+    assert {"feed_load", "indicators", "strategy_next", "broker", "analyzers", "cerebro_other"} <= set(
+        profile.stage_seconds
+    )
+    assert sum(profile.stage_seconds.values()) <= profile.total_seconds
+    assert set(profile.analyzer_seconds) == _ANALYZERS
+    assert profile.stage_seconds["analyzers"] == pytest.approx(sum(profile.analyzer_seconds.values()))
+    assert profile.bars == 1_500 and profile.trades == len(plain.trade_log) > 0
+    # Every trade opens and closes with a completed order; at most one position is left open.
+    assert profile.orders_completed in (2 * profile.trades, 2 * profile.trades + 1)
+    assert profile.next_calls == 1_500 - 20  # slow SMA + crossover warm-up runs prenext()
+    assert set(profile.next_latency_us) == {"mean", "p50", "p95", "p99", "max"}
+    assert profile.hotspots == () and profile.collapsed_stacks == ()
+
+
+def test_cprofile_hotspots_and_collapsed_stacks_are_exported(seeded, tmp_path: Path) -> None:
+    database, request = seeded
+    result = _engine(database, memory_mode="bounded", profiling=ProfilingOptions(cprofile=True, top_n=5)).run(
+        request
+    )
+    profile = result.profile
+    assert profile is not None
+    assert "indicators" not in profile.stage_seconds  # no once() pass without preload
+    assert profile.stage_seconds["feed_load"] > 0
+    assert len(profile.hotspots) == 5
+    own = [hotspot.total_seconds for hotspot in profile.hotspots]
+    assert own == sorted(own, reverse=True)
+    stacks = [line.rsplit(" ", 1) for line in profile.collapsed_stacks]
+    assert all(int(value) > 0 for _, value in stacks)
+    assert any(";cerebro:run:" in stack for stack, _ in stacks)
+
+    paths = BacktestResultExporter(tmp_path / "out").export_all(result, prefix="bounded")
+    assert paths["profile_json"].name == "backtest_profile_bounded.json"
+    payload = json.loads(paths["profile_json"].read_text(encoding="utf-8"))
+    assert payload["bars"] == 1_500 and len(payload["hotspots"]) == 5
+    assert paths["hotspots_txt"].read_text(encoding="utf-8").splitlines()[0].split() == [
+        "ncalls",
+        "tottime",
+        "cumtime",
+        "function",
+    ]
+    assert paths["collapsed_stacks"].read_text(encoding="utf-8").count("\n") == len(stacks)
+
+
+def test_vectorized_runs_report_their_own_stage_and_options_are_validated(seeded) -> None:
+    database, request = seeded
+    profile = _engine(database, engine_mode="vectorized", profiling=ProfilingOptions()).run(request).profile
+    assert profile is not None
+    assert list(profile.stage_seconds) == ["load_dataframe", "vectorized", "build_result"]
+    assert (profile.next_calls, profile.analyzer_seconds, profile.next_latency_us) == (0, {}, {})
+
+    with pytest.raises(InstrumentationError, match="top_n"):
+        ProfilingOptions(top_n=0)
@@ -8,6 +8,7 @@ import backtrader as bt
 import pytest
 
 from src.backtest.engine import BacktestEngine, BacktestRunRequest
+from src.backtest.result_models import TimeSeries
 from src.core.account_service import AccountService
 from src.core.database import SQLiteDatabase
 from src.core.enums import OrderSide, OrderStatus
@@ -227,7 +228,7 @@ def test_integration_backtest_and_strategy_key_path() -> None:
         assert trade.entry_price == pytest.approx(104.0)
         assert trade.exit_price == pytest.approx(111.0)
         assert trade.pnl_net == pytest.approx(7.0)
-        assert isinstance(result.time_series_returns, dict)
+        assert isinstance(result.time_series_returns, TimeSeries)
     finally:
         database.close()
 
@@ -0,0 +1,67 @@
+"""Tests for incremental vacuum and planner-statistics maintenance."""
+
+from __future__ import annotations
+
+import pytest
+
+from src.core.database import DatabaseLifecycleError, SQLiteDatabase
+from src.core.maintenance import (
+    auto_vacuum_mode,
+    enable_incremental_auto_vacuum,
+    free_page_count,
+    incremental_vacuum,
+    optimize_database,
+)
+from src.data.candle_schema import insert_candle_rows
+
+
+def _fill_and_delete(database: SQLiteDatabase, count: int = 20_000) -> None:
+    with database.transaction() as tx:
+        insert_candle_rows(
+            tx,
+            [("BTC/USDT", "1m", idx * 60_000, 100.0, 101.0, 99.0, 100.5, 1.0) for idx in range(count)],
+        )
+    with database.transaction() as tx:
+        tx.execute("DELETE FROM candles;")
+
+
+@pytest.mark.parametrize("profile", ["legacy", "wal"])
+def test_new_files_use_incremental_auto_vacuum_and_shrink_in_paced_steps(tmp_path, profile: str) -> None:
+    database = SQLiteDatabase(tmp_path / "vacuum.db", pragma_profile=profile)
+    database.initialize_schema()
+    _fill_and_delete(database)
+    sleeps: list[float] = []
+    try:
+        free_before = free_page_count(database.connection)
+        result = incremental_vacuum(database, step_pages=100, pause_seconds=0.02, sleep_fn=sleeps.append)
+
+        assert auto_vacuum_mode(database.connection) == "incremental"
+        assert result.freed_pages == free_before > 100
+        assert result.steps == -(-free_before // 100)
+        assert sleeps == [0.02] * (result.steps - 1)
+        assert result.reclaimed_bytes > 0
+        assert free_page_count(database.connection) == 0
+    finally:
+        database.close()
+
+
+def test_existing_files_need_an_explicit_conversion(tmp_path) -> None:
+    database = SQLiteDatabase(tmp_path / "old.db")
+    connection = database.open()
+    connection.execute("PRAGMA auto_vacuum = NONE;")
+    connection.execute("VACUUM;")
+    database.initialize_schema()
+    _fill_and_delete(database, count=5_000)
+    try:
+        assert incremental_vacuum(database).auto_vacuum == "none"
+        assert incremental_vacuum(database).freed_pages == 0
+
+        assert enable_incremental_auto_vacuum(database) is True
+        assert enable_incremental_auto_vacuum(database) is False
+        assert auto_vacuum_mode(database.connection) == "incremental"
+        assert optimize_database(database, analyze=True).analyzed is True
+        with database.transaction():
+            with pytest.raises(DatabaseLifecycleError, match="inside a transaction"):
+                incremental_vacuum(database)
+    finally:
+        database.close()
@@ -2,6 +2,7 @@
 
 from __future__ import annotations
 
+import threading
 from typing import Any
 
 import pytest
@@ -184,6 +185,30 @@ def test_rate_limiter_waits_between_requests() -> None:
     assert sleeps == [0.5]
 
 
+def test_rate_limiter_reserves_distinct_slots_across_threads() -> None:
+    sleeps: list[float] = []
+    sleeps_lock = threading.Lock()
+
+    def sleep_fn(seconds: float) -> None:
+        with sleeps_lock:
+            sleeps.append(round(seconds, 6))
+
+    limiter = RequestRateLimiter(
+        enabled=True,
+        min_interval_ms=100,
+        time_fn=lambda: 0.0,
+        sleep_fn=sleep_fn,
+    )
+    threads = [threading.Thread(target=limiter.wait) for _ in range(8)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    # First caller goes immediately; the rest are spaced one interval apart.
+    assert sorted(sleeps) == [round(0.1 * slot, 6) for slot in range(1, 8)]
+
+
 def test_runtime_write_target_rejects_csv() -> None:
     config = {
         "exchange": {"name": "binance", "testnet": True, "rate_limit": True},
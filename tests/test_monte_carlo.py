@@ -0,0 +1,87 @@
+"""Tests for the Monte Carlo trade-sequence bootstrap."""
+
+from __future__ import annotations
+
+import numpy as np
+import pytest
+
+from src.backtest.monte_carlo import MonteCarloError, MonteCarloSimulator, simulate_paths
+from src.backtest.result_models import (
+    BacktestRunResult,
+    ReturnsAnalysis,
+    RiskMetrics,
+    TimeSeries,
+    TradeRecord,
+    TradeStatistics,
+)
+
+
+def _result(pnl: list[float]) -> BacktestRunResult:
+    trades = tuple(
+        TradeRecord("2024-01-01T00:00:00", "2024-01-01T01:00:00", "long", 1.0, 100.0, 100.0, value, value)
+        for value in pnl
+    )
+    return BacktestRunResult(
+        symbol="BTC/USDT",
+        timeframe="1h",
+        data_source="sqlite",
+        initial_capital=1_000.0,
+        final_value=1_000.0 + sum(pnl),
+        pnl=sum(pnl),
+        total_return_pct=sum(pnl) / 10.0,
+        bars_processed=100,
+        trade_stats=TradeStatistics(len(pnl), 0, 0, 0.0, 0.0, 0.0, 0.0, 0.0, 0.0),
+        risk_metrics=RiskMetrics(sharpe_ratio=0.5, max_drawdown_pct=31.0, max_drawdown_duration_days=4),
+        returns_analysis=ReturnsAnalysis(total_return=0.0, avg_return=0.0),
+        time_series_returns=TimeSeries.empty(),
+        trade_log=trades,
+    )
+
+
+def test_observed_order_and_shuffles_share_the_final_return() -> None:
+    summary = MonteCarloSimulator(workers=1).run(_result([100.0, -300.0, 50.0]), paths=500, method="shuffle")
+
+    assert summary.observed_return_pct == pytest.approx(-15.0)
+    assert summary.observed_drawdown_pct == pytest.approx(300.0 / 1_100.0 * 100.0)
+    assert all(value == pytest.approx(-15.0) for value in summary.return_percentiles.values())
+    assert summary.probability_of_loss == 1.0
+    # The worst order loses 300 straight from the start; the best peaks at 1150 first.
+    assert 300.0 / 11.5 - 1e-9 <= summary.drawdown_percentiles[5.0] <= summary.drawdown_percentiles[95.0] <= 30.0
+    assert summary.risk_metrics.max_drawdown_pct == 31.0
+    assert summary.to_dict()["total_return_pct"]["p50"] == pytest.approx(-15.0)
+
+
+def test_bootstrap_is_reproducible_and_independent_of_workers_and_pooling() -> None:
+    rng = np.random.default_rng(3)
+    result = _result(rng.normal(2.0, 40.0, 60).tolist())
+
+    inline = MonteCarloSimulator(workers=1, chunk_cells=60 * 700).run(result, paths=3_000, seed=11)
+    pooled = MonteCarloSimulator(workers=2, chunk_cells=60 * 700).run(result, paths=3_000, seed=11)
+    reseeded = MonteCarloSimulator(workers=1, chunk_cells=60 * 700).run(result, paths=3_000, seed=12)
+
+    assert (inline.chunks, inline.workers, pooled.workers) == (5, 1, 2)
+    assert pooled.return_percentiles == inline.return_percentiles
+    assert pooled.drawdown_percentiles == inline.drawdown_percentiles
+    assert reseeded.return_percentiles != inline.return_percentiles
+    returns = list(inline.return_percentiles.values())
+    assert returns == sorted(returns)
+    assert len(set(returns)) == len(returns)
+
+
+def test_ruin_probability_and_input_validation() -> None:
+    returns, drawdowns = simulate_paths(np.array([-400.0, -400.0]), 1_000.0, paths=10, method="bootstrap", seed=0)
+    assert returns.tolist() == [-80.0] * 10
+    assert drawdowns.tolist() == pytest.approx([80.0] * 10)
+
+    summary = MonteCarloSimulator(workers=1).run(_result([-400.0, -400.0]), paths=10, ruin_drawdown_pct=80.0)
+    assert summary.probability_of_ruin == 1.0
+
+    simulator = MonteCarloSimulator(workers=1)
+    with pytest.raises(MonteCarloError, match="at least 2"):
+        simulator.run(_result([5.0]), paths=10)
+    with pytest.raises(MonteCarloError, match="method"):
+        simulator.run(_result([5.0, 1.0]), paths=10, method="jackknife")
+    with pytest.raises(MonteCarloError, match="ruin"):
+        simulator.run(_result([5.0, 1.0]), paths=10, ruin_drawdown_pct=0.0)
+    with pytest.raises(MonteCarloError, match="workers"):
+        MonteCarloSimulator(workers=0)
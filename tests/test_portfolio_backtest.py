@@ -0,0 +1,127 @@
+"""Tests for multi-symbol portfolio backtests."""
+
+from __future__ import annotations
+
+import backtrader as bt
+import numpy as np
+import pandas as pd
+import pytest
+
+from src.backtest.engine import BacktestEngine, BacktestEngineError
+from src.backtest.result_models import BacktestRunRequest
+from src.core.database import SQLiteDatabase
+from src.data.candle_schema import insert_candle_rows
+from src.data.feed import SQLiteFeedError, align_symbol_frames
+from src.data.storage import load_symbol_candle_batches
+from src.strategies.sma_strategy import SMAStrategy
+
+HOUR_MS = 3_600_000
+
+
+class RotateStrategy(bt.Strategy):
+    """Holds every feed for ``hold`` bars in turn, each sized to half the starting cash."""
+
+    params = (("hold", 5),)
+
+    def next(self) -> None:
+        slot = (len(self) // self.p.hold) % len(self.datas)
+        for index, data in enumerate(self.datas):
+            position = self.getposition(data)
+            if index == slot and not position:
+                self.buy(data=data, size=5_000.0 / data.close[0])
+            elif index != slot and position:
+                self.close(data=data)
+
+
+def _seed(
+    database: SQLiteDatabase,
+    symbol: str,
+    start_bar: int,
+    bars: int,
+    base: float,
+    skip: int | None = None,
+) -> None:
+    rows = []
+    for idx in range(start_bar, start_bar + bars):
+        if idx == skip:
+            continue
+        price = base + 5.0 * np.sin(idx / 7) + 0.05 * idx
+        rows.append((symbol, "1h", idx * HOUR_MS, price, price + 1.0, price - 1.0, price + 0.25, 10.0))
+    with database.transaction() as tx:
+        insert_candle_rows(tx, rows)
+
+
+@pytest.fixture
+def database():
+    db = SQLiteDatabase(":memory:")
+    db.initialize_schema()
+    _seed(db, "BTC/USDT", 0, 120, 100.0)
+    _seed(db, "ETH/USDT", 0, 120, 50.0, skip=40)
+    _seed(db, "SOL/USDT", 10, 110, 20.0)
+    yield db
+    db.close()
+
+
+def _engine(database: SQLiteDatabase, **kwargs) -> BacktestEngine:
+    return BacktestEngine(database, initial_capital=10_000.0, commission_rate=0.001, slippage_rate=0.0, **kwargs)
+
+
+def test_single_query_splits_candles_per_symbol(database: SQLiteDatabase) -> None:
+    batches = load_symbol_candle_batches(
+        database, ["SOL/USDT", "BTC/USDT", "NOPE/USDT"], "1h", 0, 200 * HOUR_MS, chunk_rows=50
+    )
+
+    assert list(batches) == ["SOL/USDT", "BTC/USDT", "NOPE/USDT"]
+    assert [len(batch) for batch in batches.values()] == [110, 120, 0]
+    assert batches["SOL/USDT"].timestamp[0] == 10 * HOUR_MS
+    assert np.all(np.diff(batches["BTC/USDT"].timestamp) == HOUR_MS)
+
+
+def test_align_fills_gaps_flat_and_starts_when_every_symbol_has_data() -> None:
+    index = pd.to_datetime(np.arange(4) * HOUR_MS, unit="ms", utc=True)
+    full = pd.DataFrame({name: [1.0, 2.0, 3.0, 4.0] for name in ("open", "high", "low", "close")}, index=index)
+    full["volume"] = 1.0
+    gappy = full.iloc[[0, 2, 3]] * 10.0
+    late = full.iloc[1:]
+
+    aligned = align_symbol_frames({"A": full, "B": gappy, "C": late})
+
+    assert all(frame.index.equals(index[1:]) for frame in aligned.values())
+    assert aligned["B"].iloc[0].tolist() == [10.0, 10.0, 10.0, 10.0, 0.0]
+    assert aligned["B"]["close"].tolist() == [10.0, 30.0, 40.0]
+    with pytest.raises(SQLiteFeedError, match="C"):
+        align_symbol_frames({"A": full, "C": full.iloc[:0]})
+
+
+def test_portfolio_run_shares_cash_and_reports_each_symbol(database: SQLiteDatabase) -> None:
+    request = BacktestRunRequest(
+        "btc/usdt", "1h", 0, 200 * HOUR_MS, RotateStrategy, symbols=("ETH/USDT", "SOL/USDT", "BTC/USDT")
+    )
+
+    result = _engine(database).run(request)
+
+    assert result.symbol == "BTC/USDT"
+    assert [item.symbol for item in result.symbol_breakdown] == ["BTC/USDT", "ETH/USDT", "SOL/USDT"]
+    assert [item.bars_loaded for item in result.symbol_breakdown] == [120, 119, 110]
+    assert result.bars_processed == 110
+    assert all(item.trade_stats.total_trades > 0 for item in result.symbol_breakdown)
+    assert sum(item.trade_stats.total_trades for item in result.symbol_breakdown) == result.trade_stats.total_trades
+    assert {record.symbol for record in result.trade_log} == {"BTC/USDT", "ETH/USDT", "SOL/USDT"}
+    closed_pnl = sum(item.pnl_net for item in result.symbol_breakdown)
+    assert closed_pnl == pytest.approx(sum(record.pnl_net for record in result.trade_log))
+    open_value = sum(item.final_position_value for item in result.symbol_breakdown)
+    assert open_value > 0
+    assert result.final_value == pytest.approx(result.pnl + 10_000.0)
+
+
+def test_single_symbol_paths_reject_portfolio_requests(database: SQLiteDatabase) -> None:
+    portfolio = BacktestRunRequest("BTC/USDT", "1h", 0, 200 * HOUR_MS, SMAStrategy, symbols=("ETH/USDT",))
+    single = BacktestRunRequest("BTC/USDT", "1h", 0, 200 * HOUR_MS, SMAStrategy, symbols=("BTC/USDT",))
+
+    assert _engine(database).run(single).symbol_breakdown == ()
+    with pytest.raises(BacktestEngineError, match="multi-symbol"):
+        _engine(database).load_dataframe(portfolio)
+    with pytest.raises(BacktestEngineError, match="single-symbol"):
+        _engine(database, engine_mode="vectorized").run(portfolio)
+    with pytest.raises(BacktestEngineError, match="NOPE/USDT"):
+        _engine(database).run(BacktestRunRequest("BTC/USDT", "1h", 0, 1, SMAStrategy, symbols=("NOPE/USDT",)))
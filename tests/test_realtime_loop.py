@@ -175,6 +175,23 @@ def test_loop_persists_candles_to_sqlite(realtime_loop, database):
     assert rows[0]["close"] == 50000.0
 
 
+def test_loop_marks_registered_rollups_dirty(realtime_loop, database):
+    """1m candles written by the loop flag the matching rollup buckets for refresh."""
+    with database.transaction() as tx:
+        tx.execute(
+            "INSERT INTO candle_rollup_targets(symbol, timeframe) VALUES ('BTC/USDT', '5m');"
+        )
+    realtime_loop.start()
+
+    with database.transaction() as tx:
+        dirty = tx.execute(
+            "SELECT symbol, timeframe FROM candle_rollup_dirty;"
+        ).fetchall()
+
+    assert len(dirty) >= 1
+    assert (dirty[0]["symbol"], dirty[0]["timeframe"]) == ("BTC/USDT", "5m")
+
+
 def test_loop_executes_market_buy_signal(realtime_loop, database):
     """Verify loop executes market buy signal from strategy."""
     strategy = realtime_loop._strategy
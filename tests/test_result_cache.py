@@ -0,0 +1,186 @@
+"""Tests for the content-addressed backtest result cache."""
+
+from __future__ import annotations
+
+import json
+import math
+import sqlite3
+from dataclasses import replace
+
+import pytest
+
+from src.backtest import result_cache
+from src.backtest.engine import BacktestEngine, BacktestRunRequest
+from src.backtest.result_cache import BacktestResultCache
+from src.backtest.result_models import (
+    BacktestRunResult,
+    ReturnsAnalysis,
+    RiskMetrics,
+    SymbolBreakdown,
+    TimeSeries,
+    TradeRecord,
+    TradeStatistics,
+)
+from src.backtest.sweep import ParameterSweepRunner
+from src.core.database import SQLiteDatabase
+from src.data.candle_schema import insert_candle_rows
+from src.strategies.registry import StrategyRegistry
+
+HOUR_MS = 3_600_000
+BARS = 160
+
+
+@pytest.fixture
+def database(tmp_path):
+    db = SQLiteDatabase(tmp_path / "results.db")
+    db.initialize_schema()
+    rows = []
+    for idx in range(BARS):
+        price = 100.0 + 10.0 * math.sin(idx / 5)
+        rows.append(("BTC/USDT", "1h", idx * HOUR_MS, price, price + 1.0, price - 1.0, price, 5.0))
+    with db.transaction() as tx:
+        insert_candle_rows(tx, rows)
+    yield db
+    db.close()
+
+
+def _engine(database: SQLiteDatabase, *, commission: float = 0.001, max_bytes: int = 8 * 1024 * 1024) -> BacktestEngine:
+    return BacktestEngine(
+        database,
+        initial_capital=10_000.0,
+        commission_rate=commission,
+        slippage_rate=0.0,
+        result_cache=BacktestResultCache(database, max_bytes),
+    )
+
+
+def _request(**params) -> BacktestRunRequest:
+    return BacktestRunRequest(
+        symbol="BTC/USDT",
+        timeframe="1h",
+        start_timestamp=0,
+        end_timestamp=(BARS - 1) * HOUR_MS,
+        strategy_class=StrategyRegistry.default().get_by_name("sma_strategy").strategy_class,
+        strategy_params={"fast_period": 3, "slow_period": 8, **params},
+    )
+
+
+def test_identical_request_is_served_from_cache_until_an_input_changes(
+    database: SQLiteDatabase,
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    first = _engine(database).run(_request())
+
+    engine = _engine(database)
+    monkeypatch.setattr(engine, "_run_single", pytest.fail)
+    assert engine.run(_request()) == first
+    assert engine.result_cache_stats.hits == 1
+    monkeypatch.undo()
+
+    other_params = _engine(database).run(_request(fast_period=4))
+    other_fees = _engine(database, commission=0.002).run(_request())
+    assert other_params != first and other_fees.final_value != first.final_value
+
+    # An out-of-band edit that bypasses dataset versioning still changes the key.
+    with database.transaction() as tx:
+        tx.execute("UPDATE candles SET close = close + 0.5 WHERE timestamp = ?;", (50 * HOUR_MS,))
+    engine = _engine(database)
+    engine.run(_request())
+    stats = engine.result_cache_stats
+    assert (stats.hits, stats.misses, stats.stores) == (0, 1, 1)
+
+
+def test_cache_evicts_least_recently_used_results_over_budget(database: SQLiteDatabase) -> None:
+    result = _engine(database).run(_request())
+    size = _engine(database).result_cache_stats.current_bytes
+
+    cache = BacktestResultCache(database, int(size * 2.5))
+    cache.put("a", result)
+    cache.put("b", result)
+    assert cache.get("a") == result  # refreshes recency, so "b" is now the oldest
+    cache.put("c", result)
+
+    stats = cache.stats()
+    assert stats.evictions == 2 and stats.entries == 2 and stats.current_bytes <= stats.max_bytes
+    assert cache.get("b") is None and cache.get("c") == result
+
+    with database.transaction() as tx:
+        tx.execute("UPDATE backtest_result_cache SET payload = x'00' WHERE cache_key = 'c';")
+    assert cache.get("c") is None
+    assert cache.stats().entries == 1 and cache.clear() == 1
+
+
+def test_pooled_sweep_dispatches_only_uncached_grid_points(database: SQLiteDatabase) -> None:
+    grid = {"fast_period": (3, 4), "slow_period": (8, 10)}
+    first = ParameterSweepRunner(_engine(database), workers=2).run(_request(), grid)
+
+    engine = _engine(database)
+    second = ParameterSweepRunner(engine, workers=2).run(_request(), grid)
+
+    assert engine.result_cache_stats.hits == 4
+    assert [run.params for run in second.runs] == [run.params for run in first.runs]
+    assert [run.final_value for run in second.runs] == [run.final_value for run in first.runs]
+
+
+def test_results_round_trip_as_json(database: SQLiteDatabase) -> None:
+    stats = TradeStatistics(2, 1, 1, 50.0, None, 3.0, -1.0, 3.0, -1.0)
+    result = BacktestRunResult(
+        symbol="BTC/USDT",
+        timeframe="1h",
+        data_source="sqlite",
+        initial_capital=10_000.0,
+        final_value=10_002.0,
+        pnl=2.0,
+        total_return_pct=0.02,
+        bars_processed=3,
+        trade_stats=stats,
+        risk_metrics=RiskMetrics(None, 0.5, 1, sortino_ratio=1.25),
+        returns_analysis=ReturnsAnalysis(float("-inf"), float("nan")),
+        time_series_returns=TimeSeries.from_mapping({"2024-01-01T00:00:00": 0.1, "2024-01-01T01:00:00.5": -0.2}),
+        trade_log=(TradeRecord("2024-01-01T00:00:00", "2024-01-01T01:00:00", "long", 1.0, 1.0, 4.0, 3.0, 3.0, "BTC/USDT"),),
+        symbol_breakdown=(SymbolBreakdown("BTC/USDT", 3, stats, 2.0, 0.0, 0.0),),
+    )
+    cache = BacktestResultCache(database)
+    cache.put("k", result)
+
+    with database.read() as conn:
+        payload = conn.execute("SELECT payload FROM backtest_result_cache WHERE cache_key = 'k';").fetchone()[0]
+    assert json.loads(payload)["symbol"] == "BTC/USDT"
+    loaded = cache.get("k")
+    assert loaded is not None
+    assert loaded.returns_analysis.total_return == float("-inf") and math.isnan(loaded.returns_analysis.avg_return)
+    assert replace(loaded, returns_analysis=result.returns_analysis) == result
+
+
+def test_hit_survives_a_busy_writer(database: SQLiteDatabase, tmp_path) -> None:
+    engine = _engine(database)
+    result = engine.run(_request())
+    key = engine.result_cache_key(_request(), {"BTC/USDT": engine.load_dataframe(_request())})
+    impatient = SQLiteDatabase(tmp_path / "results.db", timeout=0.1)
+    impatient.open()
+    cache = BacktestResultCache(impatient)
+    blocker = sqlite3.connect(tmp_path / "results.db", isolation_level=None)
+    blocker.execute("BEGIN IMMEDIATE;")
+    try:
+        # The recency refresh cannot get the write lock; the hit is still served.
+        assert cache.get(key) == result
+        assert cache.stats().hits == 1
+    finally:
+        blocker.execute("ROLLBACK;")
+        blocker.close()
+        impatient.close()
+
+
+def test_key_changes_with_engine_module_source(database: SQLiteDatabase, monkeypatch: pytest.MonkeyPatch) -> None:
+    engine = _engine(database)
+    frames = {"BTC/USDT": engine.load_dataframe(_request())}
+    before = engine.result_cache_key(_request(), frames)
+
+    monkeypatch.setattr(result_cache, "_module_digest", lambda name: "edited" if name.endswith("value_metrics") else "")
+    result_cache._engine_fingerprint.cache_clear()
+    try:
+        assert engine.result_cache_key(_request(), frames) != before
+    finally:
+        monkeypatch.undo()
+        result_cache._engine_fingerprint.cache_clear()
+    assert engine.result_cache_key(_request(), frames) == before
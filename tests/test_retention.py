@@ -0,0 +1,128 @@
+"""Tests for batched per-dataset candle retention."""
+
+from __future__ import annotations
+
+import pytest
+
+from src.core.database import SQLiteDatabase
+from src.data.candle_schema import CompactCandleMigration, dataset_version, insert_candle_rows
+from src.data.coverage import CandleCoverageIndex
+from src.data.retention import (
+    DAY_MS,
+    CandleRetentionManager,
+    RetentionPolicy,
+    RetentionPolicyError,
+    resolve_retention_days,
+    retention_policies_from_config,
+)
+from src.data.rollup import CandleRollupEngine
+
+HOUR_MS = 3_600_000
+NOW_MS = 100 * DAY_MS
+
+
+def _rows(symbol: str, timeframe: str, step_ms: int, count: int, start: int) -> list[tuple]:
+    return [(symbol, timeframe, start + idx * step_ms, 100.0, 101.0, 99.0, 100.5, 1.0) for idx in range(count)]
+
+
+def _count(database: SQLiteDatabase, symbol: str, timeframe: str) -> int:
+    with database.read() as conn:
+        return int(
+            conn.execute(
+                "SELECT COUNT(*) FROM candles WHERE symbol = ? AND timeframe = ?;", (symbol, timeframe)
+            ).fetchone()[0]
+        )
+
+
+@pytest.fixture
+def database(tmp_path):
+    db = SQLiteDatabase(tmp_path / "retention.db")
+    db.initialize_schema()
+    with db.transaction() as tx:
+        # 48 hourly bars straddling the 1-day cutoff: 24 older, 24 newer.
+        insert_candle_rows(tx, _rows("BTC/USDT", "1h", HOUR_MS, 48, NOW_MS - 2 * DAY_MS))
+        insert_candle_rows(tx, _rows("ETH/USDT", "1h", HOUR_MS, 48, NOW_MS - 2 * DAY_MS))
+    yield db
+    db.close()
+
+
+def _manager(database: SQLiteDatabase, sleeps: list[float] | None = None, batch_rows: int = 10) -> CandleRetentionManager:
+    return CandleRetentionManager(
+        database,
+        batch_rows=batch_rows,
+        pause_seconds=0.01,
+        now_ms_fn=lambda: NOW_MS,
+        sleep_fn=(sleeps.append if sleeps is not None else lambda _seconds: None),
+    )
+
+
+def test_policies_pick_the_most_specific_match() -> None:
+    policies = retention_policies_from_config(
+        [
+            {"days": 30},
+            {"symbol": "btc/usdt", "days": 365},
+            {"symbol": "BTC/USDT", "timeframe": "1m", "days": 7},
+        ]
+    )
+
+    assert resolve_retention_days(policies, "BTC/USDT", "1m") == 7
+    assert resolve_retention_days(policies, "BTC/USDT", "1h") == 365
+    assert resolve_retention_days(policies, "ETH/USDT", "1h") == 30
+    assert resolve_retention_days([RetentionPolicy(days=3, timeframe="1m")], "ETH/USDT", "1h", 9) == 9
+    with pytest.raises(RetentionPolicyError, match="days"):
+        retention_policies_from_config([{"symbol": "BTC/USDT", "days": 0}])
+
+
+def test_purge_deletes_in_bounded_batches_and_pauses_between_them(database: SQLiteDatabase) -> None:
+    sleeps: list[float] = []
+    with database.read() as conn:
+        version = dataset_version(conn, "BTC/USDT", "1h")
+
+    result = _manager(database, sleeps).purge_dataset("BTC/USDT", "1h", NOW_MS - DAY_MS, retention_days=1)
+
+    assert (result.deleted_rows, result.batches) == (24, 3)
+    assert sleeps == [0.01, 0.01, 0.01]
+    assert result.max_lock_seconds <= result.total_lock_seconds
+    assert _count(database, "BTC/USDT", "1h") == 24
+    assert _count(database, "ETH/USDT", "1h") == 48
+    with database.read() as conn:
+        assert dataset_version(conn, "BTC/USDT", "1h") == version + 3
+
+
+def test_purge_applies_per_dataset_policies_on_the_compact_layout(database: SQLiteDatabase) -> None:
+    CompactCandleMigration(database).run()
+    reported = []
+
+    results = _manager(database, batch_rows=100).purge(
+        [RetentionPolicy(days=1, symbol="ETH/USDT")],
+        on_dataset=reported.append,
+    )
+
+    assert [(item.symbol, item.deleted_rows) for item in results] == [("ETH/USDT", 24)]
+    assert reported == results
+    assert _count(database, "BTC/USDT", "1h") == 48
+    assert _count(database, "ETH/USDT", "1h") == 24
+
+
+def test_purge_trims_coverage_gaps_and_marks_rollups_dirty(database: SQLiteDatabase) -> None:
+    start = NOW_MS - 2 * DAY_MS
+    with database.transaction() as tx:
+        insert_candle_rows(tx, _rows("BTC/USDT", "1m", 60_000, 10, start))
+        tx.execute(
+            "INSERT INTO candle_gaps(symbol, timeframe, gap_start, gap_end, missing_bars) VALUES (?, ?, ?, ?, ?);",
+            ("BTC/USDT", "1m", start + 20 * 60_000, start + 30 * 60_000, 11),
+        )
+    coverage = CandleCoverageIndex(database)
+    coverage.mark_covered("BTC/USDT", "1m", start, NOW_MS)
+    engine = CandleRollupEngine(database)
+    engine.register("BTC/USDT", "5m")
+
+    _manager(database).purge(default_days=1)
+    [refresh] = engine.refresh()
+
+    assert _count(database, "BTC/USDT", "1m") == 0
+    assert coverage.covered_intervals("BTC/USDT", "1m", 0, NOW_MS) == [(NOW_MS - DAY_MS, NOW_MS)]
+    with database.read() as conn:
+        assert conn.execute("SELECT COUNT(*) FROM candle_gaps;").fetchone()[0] == 0
+        assert conn.execute("SELECT COUNT(*) FROM candle_rollups;").fetchone()[0] == 0
+    assert refresh.removed_bars == 2
@@ -0,0 +1,236 @@
+"""Tests for incremental 1m -> higher-timeframe candle rollups."""
+
+from __future__ import annotations
+
+from typing import Any
+
+import backtrader as bt
+import numpy as np
+import pytest
+
+from src.backtest.engine import BacktestEngine, BacktestRunRequest
+from src.core.database import SQLiteDatabase
+from src.data.candle_schema import CompactCandleMigration, insert_candle_rows, upsert_live_candle
+from src.data.feed import BacktestDataSlice, RollupPandasFeedFactory, SQLiteFeedError
+from src.data.rollup import CandleRollupEngine, CandleRollupError, expected_source_bars, mark_rollup_dirty
+from src.data.storage import HistoricalCandleStorage
+from src.data.storage_types import CandleDownloadRequest
+from src.data.timeframe_metrics import timeframe_alignment_offset, timeframe_to_milliseconds
+
+MINUTE_MS = 60_000
+# 2024-01-01 00:00 UTC, a Monday.
+BASE_MS = 1_704_067_200_000
+
+
+def _minute_rows(start_ms: int, count: int, *, symbol: str = "BTC/USDT") -> list[tuple[Any, ...]]:
+    rng = np.random.default_rng(7)
+    rows = []
+    for idx in range(count):
+        open_ = 100.0 + float(rng.normal())
+        close = 100.0 + float(rng.normal())
+        high = max(open_, close) + float(rng.random())
+        low = min(open_, close) - float(rng.random())
+        rows.append((symbol, "1m", start_ms + idx * MINUTE_MS, open_, high, low, close, float(idx % 7)))
+    return rows
+
+
+def _expected(rows: list[tuple[Any, ...]], timeframe: str) -> dict[int, tuple[float, ...]]:
+    interval = timeframe_to_milliseconds(timeframe)
+    offset = timeframe_alignment_offset(timeframe)
+    buckets: dict[int, list[tuple[Any, ...]]] = {}
+    for row in sorted(rows, key=lambda item: item[2]):
+        bucket = (row[2] - offset) // interval * interval + offset
+        buckets.setdefault(bucket, []).append(row)
+    return {
+        bucket: (
+            group[0][3],
+            max(item[4] for item in group),
+            min(item[5] for item in group),
+            group[-1][6],
+            sum(item[7] for item in group),
+            float(len(group)),
+        )
+        for bucket, group in buckets.items()
+    }
+
+
+def _stored(database: SQLiteDatabase, timeframe: str) -> dict[int, tuple[float, ...]]:
+    with database.read() as conn:
+        rows = conn.execute(
+            """
+            SELECT timestamp, open, high, low, close, volume, source_bars
+            FROM candle_rollups WHERE symbol = 'BTC/USDT' AND timeframe = ?
+            ORDER BY timestamp;
+            """,
+            (timeframe,),
+        ).fetchall()
+    return {int(row[0]): tuple(float(value) for value in tuple(row)[1:]) for row in rows}
+
+
+def _dirty_count(database: SQLiteDatabase) -> int:
+    with database.read() as conn:
+        return int(conn.execute("SELECT COUNT(*) FROM candle_rollup_dirty;").fetchone()[0])
+
+
+@pytest.fixture
+def database(tmp_path):
+    db = SQLiteDatabase(tmp_path / "rollup.db", pragma_profile="wal")
+    db.initialize_schema()
+    yield db
+    db.close()
+
+
+@pytest.mark.parametrize("timeframe", ["5m", "3m", "1h", "1w"])
+def test_register_backfills_rollups_matching_manual_aggregation(database, timeframe) -> None:
+    # Start mid-bucket and span more than one week so edges are partial.
+    rows = _minute_rows(BASE_MS - 7 * MINUTE_MS, 11_000)
+    with database.transaction() as tx:
+        insert_candle_rows(tx, rows)
+
+    result = CandleRollupEngine(database, chunk_rows=997).register("btc/usdt", timeframe)
+
+    expected = _expected(rows, timeframe)
+    stored = _stored(database, timeframe)
+    assert result.written_bars == len(expected)
+    assert sorted(stored) == sorted(expected)
+    for bucket, values in expected.items():
+        assert stored[bucket] == pytest.approx(values)
+    assert _dirty_count(database) == 0
+
+
+def test_weekly_buckets_start_on_monday(database) -> None:
+    with database.transaction() as tx:
+        insert_candle_rows(tx, _minute_rows(BASE_MS + 2 * 86_400_000, 3))
+
+    CandleRollupEngine(database).register("BTC/USDT", "1w")
+
+    assert list(_stored(database, "1w")) == [BASE_MS]
+
+
+def test_storage_download_marks_and_refresh_recomputes_only_dirty_buckets(database) -> None:
+    rows = _minute_rows(BASE_MS, 30)
+    with database.transaction() as tx:
+        insert_candle_rows(tx, rows[:20])
+    engine = CandleRollupEngine(database)
+    engine.register("BTC/USDT", "5m")
+    assert len(_stored(database, "5m")) == 4
+
+    class _Fetcher:
+        def fetch_ohlcv(self, symbol, timeframe, since=None, limit=None):
+            return [list(row[2:]) for row in rows[18:] if since is None or row[2] >= since]
+
+    storage = HistoricalCandleStorage(database, _Fetcher())
+    storage.download_and_store(
+        CandleDownloadRequest(
+            symbol="BTC/USDT",
+            timeframe="1m",
+            start_timestamp=rows[18][2],
+            end_timestamp=rows[-1][2],
+            batch_size=100,
+        )
+    )
+    # Buckets 15-19 (updated tail), 20-24 and 25-29 are dirty; earlier ones are untouched.
+    assert _dirty_count(database) == 3
+
+    [result] = engine.refresh()
+
+    assert (result.refreshed_buckets, result.written_bars, result.removed_bars) == (3, 3, 0)
+    expected = _expected(rows, "5m")
+    stored = _stored(database, "5m")
+    assert sorted(stored) == sorted(expected)
+    for bucket, values in expected.items():
+        assert stored[bucket] == pytest.approx(values)
+
+
+def test_refresh_removes_buckets_whose_minutes_were_deleted(database) -> None:
+    rows = _minute_rows(BASE_MS, 10)
+    with database.transaction() as tx:
+        insert_candle_rows(tx, rows)
+    engine = CandleRollupEngine(database)
+    engine.register("BTC/USDT", "5m")
+
+    with database.transaction() as tx:
+        tx.execute("DELETE FROM candles WHERE timestamp >= ?;", (BASE_MS + 5 * MINUTE_MS,))
+        mark_rollup_dirty(tx, "BTC/USDT", [BASE_MS + 5 * MINUTE_MS])
+    [result] = engine.refresh(symbol="BTC/USDT", timeframe="5m")
+
+    assert result.removed_bars == 1
+    assert list(_stored(database, "5m")) == [BASE_MS]
+
+
+def test_live_upsert_marks_bucket_dirty_and_survives_compact_layout(database) -> None:
+    with database.transaction() as tx:
+        insert_candle_rows(tx, _minute_rows(BASE_MS, 4))
+    CompactCandleMigration(database).run()
+    engine = CandleRollupEngine(database)
+    engine.register("BTC/USDT", "15m")
+
+    with database.transaction() as tx:
+        upsert_live_candle(tx, symbol="BTC/USDT", timeframe="1m", timestamp=BASE_MS + 4 * MINUTE_MS, price=500.0)
+        assert mark_rollup_dirty(tx, "BTC/USDT", [BASE_MS + 4 * MINUTE_MS]) == 1
+    engine.refresh()
+
+    opened, high, _low, close, _volume, bars = _stored(database, "15m")[BASE_MS]
+    assert (high, close, bars) == (500.0, 500.0, 5.0)
+    assert opened == pytest.approx(_minute_rows(BASE_MS, 1)[0][3])
+
+
+def test_load_batch_skips_partial_buckets_unless_asked(database) -> None:
+    # 5m buckets: [0-4] complete, [5-9] missing minute 6, [10-11] still in progress.
+    rows = [row for row in _minute_rows(BASE_MS, 12) if row[2] != BASE_MS + 6 * MINUTE_MS]
+    with database.transaction() as tx:
+        insert_candle_rows(tx, rows)
+    engine = CandleRollupEngine(database)
+    end_ms = BASE_MS + 15 * MINUTE_MS
+
+    complete = engine.load_batch("BTC/USDT", "5m", BASE_MS, end_ms)
+    everything = engine.load_batch("BTC/USDT", "5m", BASE_MS, end_ms, include_partial=True)
+
+    assert complete.timestamp.tolist() == [BASE_MS]
+    assert everything.timestamp.tolist() == [BASE_MS, BASE_MS + 5 * MINUTE_MS, BASE_MS + 10 * MINUTE_MS]
+    assert expected_source_bars("5m") == 5
+    assert expected_source_bars("1w") == 7 * 24 * 60
+
+
+def test_rejects_invalid_targets(database) -> None:
+    engine = CandleRollupEngine(database)
+    with pytest.raises(CandleRollupError, match="coarser"):
+        engine.register("BTC/USDT", "1m")
+    with pytest.raises(CandleRollupError, match="unsupported timeframe"):
+        engine.register("BTC/USDT", "90s")
+    with pytest.raises(CandleRollupError, match="symbol"):
+        engine.register(" ", "5m")
+
+
+def test_rollup_feed_serves_custom_timeframe_and_backtest(database) -> None:
+    rows = _minute_rows(BASE_MS, 240)
+    with database.transaction() as tx:
+        insert_candle_rows(tx, rows)
+    factory = RollupPandasFeedFactory(database)
+
+    frame = factory.load_dataframe(BacktestDataSlice("BTC/USDT", "30m", BASE_MS, BASE_MS + 240 * MINUTE_MS))
+
+    assert len(frame) == 8
+    assert frame["volume"].sum() == pytest.approx(sum(row[7] for row in rows))
+    assert factory.engine.targets() == [("BTC/USDT", "30m")]
+    with pytest.raises(SQLiteFeedError, match="unsupported timeframe"):
+        factory.load_dataframe(BacktestDataSlice("BTC/USDT", "30x", BASE_MS, BASE_MS + 1))
+
+    engine = BacktestEngine(
+        database,
+        initial_capital=10_000.0,
+        commission_rate=0.0,
+        slippage_rate=0.0,
+        data_read_source="rollup",
+    )
+    result = engine.run(
+        BacktestRunRequest(
+            symbol="BTC/USDT",
+            timeframe="30m",
+            start_timestamp=BASE_MS,
+            end_timestamp=BASE_MS + 240 * MINUTE_MS,
+            strategy_class=bt.Strategy,
+        )
+    )
+    assert result.data_source == "rollup"
+    assert result.bars_processed == 8
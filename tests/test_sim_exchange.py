@@ -0,0 +1,257 @@
+from __future__ import annotations
+
+from collections.abc import Mapping
+from typing import Any
+
+import pytest
+
+from src.core.account_service import AccountService
+from src.core.database import SQLiteDatabase
+from src.core.enums import OrderSide, OrderStatus, OrderType
+from src.core.execution_cost import ExecutionCostProfile
+from src.core.limit_matching import LimitOrderMatchingEngine, LimitOrderRequest
+from src.core.matching import MatchingEngine, MarketOrderRequest
+from src.core.order_service import OrderService
+from src.core.risk import RiskLimits
+from src.core.stop_trigger import StopTriggerEngine, TriggerOrderRequest
+from src.core.trade_service import TradeService
+from src.benchmarking.scenarios import generate_minute_candles, seed_candles
+from src.data.feed import BacktestDataSlice
+from src.data.realtime_payloads import RealtimeMarketSnapshot
+from src.live.sim_backtest import LiveBacktestError, LiveStrategyBacktester, flush_ledger
+from src.live.sim_exchange import SimulatedExchange, SimulatedExchangeError
+from src.strategies.base import LiveStrategy, StrategyContext, StrategyOrderEvent, StrategyTradeEvent
+
+_SYMBOL = "BTC/USDT"
+_COSTS = ExecutionCostProfile(maker_fee_rate=0.0002, taker_fee_rate=0.001, slippage_rate=0.0005)
+
+
+class SettablePriceReader:
+    def __init__(self) -> None:
+        self.price = 100.0
+        self.fetched_at_ms = 1_700_100_000_000
+
+    def get_latest_price(self, symbol: str) -> RealtimeMarketSnapshot:
+        return RealtimeMarketSnapshot(
+            channel="latest_price",
+            symbol=symbol,
+            ok=True,
+            fallback=False,
+            timed_out=False,
+            error=None,
+            fetched_at_ms=self.fetched_at_ms,
+            data={"last_price": self.price, "bid": None, "ask": None, "exchange_timestamp": self.fetched_at_ms},
+        )
+
+
+class _SQLiteVenue:
+    """The three SQLite engines wired the way ``RealtimeSimulationLoop`` wires them."""
+
+    def __init__(self, database: SQLiteDatabase) -> None:
+        self.reader = SettablePriceReader()
+        self.accounts = AccountService(database, base_currency="USDT")
+        self.accounts.initialize_accounts({"USDT": 10_000.0, "BTC": 0.0})
+        orders = OrderService(database, self.accounts)
+        trades = TradeService(database, orders)
+        kwargs: dict[str, Any] = {
+            "database": database,
+            "account_service": self.accounts,
+            "order_service": orders,
+            "trade_service": trades,
+            "market_reader": self.reader,
+            "cost_profile": _COSTS,
+        }
+        self.market = MatchingEngine(**kwargs)
+        self.limit = LimitOrderMatchingEngine(**kwargs)
+        self.trigger = StopTriggerEngine(**kwargs)
+        self.database = database
+
+    def position_amount(self) -> float:
+        with self.database.transaction() as tx:
+            row = tx.execute("SELECT amount FROM positions WHERE symbol = ?;", (_SYMBOL,)).fetchone()
+        return 0.0 if row is None else float(row["amount"])
+
+
+# (price, action) script; every step first sweeps queued orders at ``price``.
+_SCRIPT: tuple[tuple[float, Mapping[str, Any] | None], ...] = (
+    (100.0, {"kind": "market", "side": OrderSide.BUY, "amount": 10.0}),
+    (100.0, {"kind": "limit", "side": OrderSide.BUY, "amount": 5.0, "price": 98.0}),
+    (100.0, {"kind": "limit", "side": OrderSide.SELL, "amount": 4.0, "price": 103.0}),
+    (100.0, {"kind": "trigger", "type": OrderType.STOP_LOSS, "side": OrderSide.SELL, "amount": 3.0, "price": 95.0}),
+    (101.0, {"kind": "trigger", "type": OrderType.TAKE_PROFIT, "side": OrderSide.SELL, "amount": 2.0, "price": 106.0}),
+    (97.5, None),
+    (104.0, None),
+    (94.0, {"kind": "market", "side": OrderSide.SELL, "amount": 1.5}),
+    (107.0, None),
+)
+
+
+def _run_sqlite(venue: _SQLiteVenue) -> None:
+    for price, action in _SCRIPT:
+        venue.reader.price = price
+        venue.reader.fetched_at_ms += 1_000
+        venue.limit.process_limit_order_queue(_SYMBOL)
+        venue.trigger.process_trigger_orders(_SYMBOL)
+        if action is None:
+            continue
+        if action["kind"] == "market":
+            venue.market.execute_market_order(MarketOrderRequest(_SYMBOL, action["side"], action["amount"]))
+        elif action["kind"] == "limit":
+            venue.limit.place_limit_order(LimitOrderRequest(_SYMBOL, action["side"], action["amount"], action["price"]))
+        else:
+            venue.trigger.place_trigger_order(
+                TriggerOrderRequest(_SYMBOL, action["type"], action["side"], action["amount"], action["price"])
+            )
+
+
+def _run_memory(exchange: SimulatedExchange) -> None:
+    timestamp = 1_700_100_000_000
+    for price, action in _SCRIPT:
+        timestamp += 1_000
+        exchange.process_limit_order_queue(price, timestamp)
+        exchange.process_trigger_orders(price, timestamp)
+        if action is None:
+            continue
+        if action["kind"] == "market":
+            exchange.place_market_order(action["side"], action["amount"], price=price, timestamp=timestamp)
+        elif action["kind"] == "limit":
+            exchange.place_limit_order(action["side"], action["amount"], action["price"], timestamp=timestamp)
+        else:
+            exchange.place_trigger_order(
+                action["type"], action["side"], action["amount"], action["price"], timestamp=timestamp
+            )
+
+
+def test_simulated_exchange_matches_sqlite_engines(tmp_path) -> None:
+    database = SQLiteDatabase(tmp_path / "parity.db")
+    database.initialize_schema()
+    venue = _SQLiteVenue(database)
+    exchange = SimulatedExchange(_SYMBOL, initial_capital=10_000.0, cost_profile=_COSTS)
+
+    _run_sqlite(venue)
+    _run_memory(exchange)
+
+    for currency in ("USDT", "BTC"):
+        account = venue.accounts.get_account(currency)
+        available, frozen = exchange.balance(currency)
+        assert available == pytest.approx(account.available, abs=1e-9)
+        assert frozen == pytest.approx(account.frozen, abs=1e-9)
+    position = exchange.position
+    assert position is not None
+    assert position.amount == pytest.approx(venue.position_amount())
+
+    with database.transaction() as tx:
+        sqlite_trades = [
+            (row["side"], row["price"], row["amount"], row["fee"])
+            for row in tx.execute("SELECT side, price, amount, fee FROM trades ORDER BY id;")
+        ]
+        sqlite_statuses = sorted(row["status"] for row in tx.execute("SELECT status FROM orders;"))
+    memory_trades = [(trade.side.value, trade.price, trade.amount, trade.fee) for trade in exchange.trades]
+    assert len(memory_trades) == len(sqlite_trades)
+    for memory_trade, sqlite_trade in zip(memory_trades, sqlite_trades):
+        assert memory_trade[0] == sqlite_trade[0]
+        assert memory_trade[1:] == pytest.approx(sqlite_trade[1:])
+    assert sorted(order.status.value for order in exchange.orders) == sqlite_statuses
+    database.close()
+
+
+def test_simulated_exchange_rejects_unfunded_and_risky_orders() -> None:
+    exchange = SimulatedExchange(
+        _SYMBOL,
+        initial_capital=1_000.0,
+        cost_profile=ExecutionCostProfile(0.0, 0.0, 0.0),
+        risk_limits=RiskLimits(max_position_size=0.3, max_total_position=0.8, max_drawdown=0.2),
+    )
+    with pytest.raises(SimulatedExchangeError, match="risk check failed"):
+        exchange.place_market_order(OrderSide.BUY, 5.0, price=100.0, timestamp=1)
+    with pytest.raises(SimulatedExchangeError, match="insufficient base asset"):
+        exchange.place_limit_order(OrderSide.SELL, 1.0, 110.0, timestamp=1)
+
+    order = exchange.place_limit_order(OrderSide.BUY, 2.0, 90.0, timestamp=1)
+    assert exchange.balance("USDT") == (820.0, 180.0)
+    assert order.status is OrderStatus.OPEN
+    filled = exchange.process_limit_order_queue(85.0, 2)
+    assert [order.status for order in filled] == [OrderStatus.FILLED]
+    # Limit buys fill at min(limit, market) and refund the unused part of the freeze.
+    assert exchange.balance("USDT") == (830.0, 0.0)
+    order_events, trade_events = exchange.drain_events()
+    assert [event.status for event in order_events] == ["filled"]
+    assert [(event.trade_id, event.price) for event in trade_events] == [("1", 85.0)]
+    assert exchange.drain_events() == ([], [])
+
+
+class _DipBuyer(LiveStrategy):
+    """Buys on every third bar, takes profit 1% higher and records callbacks."""
+
+    def __init__(self) -> None:
+        super().__init__("dip_buyer")
+        self.bars = 0
+        self.filled_orders: set[str] = set()
+        self.fills = 0
+        self.stop_reason: str | None = None
+
+    def on_initialize(self, context: StrategyContext) -> None:
+        assert context.timeframe == "1m"
+
+    def on_run(self, market_data: Mapping[str, Any]) -> Mapping[str, Any] | None:
+        self.bars += 1
+        assert market_data["latest_price"] == market_data["close"]
+        if self.bars % 3 == 1:
+            return {"action": "buy", "amount": 0.5, "type": "market"}
+        if self.bars % 3 == 2:
+            return {"action": "sell", "amount": 0.5, "type": "take_profit", "trigger_price": market_data["close"] * 1.01}
+        return None
+
+    def on_order(self, order_event: StrategyOrderEvent) -> None:
+        if order_event.status == "filled":
+            self.filled_orders.add(order_event.order_id)
+
+    def on_trade(self, trade_event: StrategyTradeEvent) -> None:
+        self.fills += 1
+
+    def on_stop(self, reason: str | None) -> None:
+        self.stop_reason = reason
+
+
+def test_live_backtester_replays_bars_and_flushes_ledger_once(tmp_path) -> None:
+    database = SQLiteDatabase(tmp_path / "replay.db")
+    database.initialize_schema()
+    candles = generate_minute_candles(symbol=_SYMBOL, bars=600, seed=3)
+    seed_candles(database, candles)
+    data_slice = BacktestDataSlice(
+        symbol=_SYMBOL,
+        timeframe="1m",
+        start_timestamp=candles[0][2],
+        end_timestamp=candles[-1][2],
+    )
+    strategy = _DipBuyer()
+
+    result = LiveStrategyBacktester(database, initial_capital=100_000.0, cost_profile=_COSTS, chunk_rows=128).run(
+        strategy, data_slice
+    )
+
+    assert result.bars_processed == strategy.bars == 600
+    assert (result.start_timestamp, result.end_timestamp) == (candles[0][2], candles[-1][2])
+    assert strategy.fills == len(result.trades) > 0
+    assert strategy.filled_orders == {order.id for order in result.orders if order.status is OrderStatus.FILLED}
+    assert strategy.stop_reason == "replay finished"
+    assert result.total_fees == pytest.approx(sum(trade.fee for trade in result.trades))
+    assert result.max_drawdown_pct >= 0.0
+
+    run_id = flush_ledger(database, result)
+    with database.transaction() as tx:
+        run = tx.execute("SELECT * FROM strategy_runs WHERE id = ?;", (run_id,)).fetchone()
+        order_count = tx.execute("SELECT COUNT(*) FROM sim_orders WHERE run_id = ?;", (run_id,)).fetchone()[0]
+        trade_count = tx.execute("SELECT COUNT(*) FROM sim_trades WHERE run_id = ?;", (run_id,)).fetchone()[0]
+        live_trades = tx.execute("SELECT COUNT(*) FROM trades;").fetchone()[0]
+    assert run["strategy_name"] == "dip_buyer"
+    assert run["status"] == "completed"
+    assert run["final_capital"] == pytest.approx(result.final_equity)
+    assert (order_count, trade_count, live_trades) == (len(result.orders), len(result.trades), 0)
+
+    with pytest.raises(LiveBacktestError, match="No candle data"):
+        LiveStrategyBacktester(database, initial_capital=1_000.0).run(
+            _DipBuyer(),
+            BacktestDataSlice(symbol="ETH/USDT", timeframe="1m", start_timestamp=0, end_timestamp=1),
+        )
+    database.close()
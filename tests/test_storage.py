@@ -301,3 +301,181 @@ def test_download_rejects_invalid_ohlcv_payload(storage) -> None:
 
     with pytest.raises(HistoricalDataStorageError, match="invalid OHLCV row"):
         service.download_and_store(request)
+
+
+def _hourly_rows(start_ms: int, count: int) -> list[list[Any]]:
+    return [
+        [start_ms + idx * 3_600_000, 100.0, 101.0, 99.0, 100.5, 1.0]
+        for idx in range(count)
+    ]
+
+
+def test_overlapping_request_fetches_only_missing_gap(storage) -> None:
+    service, fetcher, _database = storage
+    hour = 3_600_000
+    fetcher.set_pages([_hourly_rows(0, 5)])
+    service.download_and_store(
+        CandleDownloadRequest(symbol="BTC/USDT", timeframe="1h", start_timestamp=0, end_timestamp=4 * hour, batch_size=10)
+    )
+
+    fetcher.calls.clear()
+    fetcher.set_pages([_hourly_rows(5 * hour, 3)])
+    result = service.download_and_store(
+        CandleDownloadRequest(symbol="BTC/USDT", timeframe="1h", start_timestamp=1, end_timestamp=7 * hour, batch_size=10)
+    )
+
+    assert [call["since"] for call in fetcher.calls] == [4 * hour + 1]
+    assert result.downloaded_count == 3
+    assert result.fetched_pages == 1
+    assert service.coverage.covered_intervals("BTC/USDT", "1h", 0, 7 * hour) == [(0, 7 * hour)]
+
+
+def test_interrupted_download_resumes_from_last_persisted_page(storage) -> None:
+    service, fetcher, database = storage
+    hour = 3_600_000
+
+    class _Boom(RuntimeError):
+        pass
+
+    pages = [_hourly_rows(0, 2), _hourly_rows(2 * hour, 2)]
+
+    def _failing_fetch(symbol, timeframe, since=None, limit=None):
+        fetcher.calls.append({"since": since, "limit": limit})
+        if not pages:
+            raise _Boom("network down")
+        return pages.pop(0)
+
+    fetcher.fetch_ohlcv = _failing_fetch  # type: ignore[method-assign]
+    request = CandleDownloadRequest(
+        symbol="BTC/USDT", timeframe="1h", start_timestamp=0, end_timestamp=9 * hour, batch_size=2
+    )
+    with pytest.raises(_Boom):
+        service.download_and_store(request)
+
+    resumed = ScriptedFetcher([_hourly_rows(4 * hour, 2), _hourly_rows(6 * hour, 2), _hourly_rows(8 * hour, 1)])
+    result = HistoricalCandleStorage(database=database, fetcher=resumed).download_and_store(request)
+
+    assert [call["since"] for call in resumed.calls] == [3 * hour + 1, 5 * hour + 1, 7 * hour + 1]
+    assert result.downloaded_count == 5
+    assert result.stored_count == 9
+
+
+def test_open_candle_is_not_marked_covered(tmp_path) -> None:
+    database = SQLiteDatabase(tmp_path / "open_candle.db")
+    database.initialize_schema()
+    hour = 3_600_000
+    now_ms = 3 * hour + 10
+    fetcher = ScriptedFetcher([_hourly_rows(0, 4)])
+    service = HistoricalCandleStorage(database=database, fetcher=fetcher, now_ms_fn=lambda: now_ms)
+
+    service.download_and_store(
+        CandleDownloadRequest(symbol="BTC/USDT", timeframe="1h", start_timestamp=0, end_timestamp=now_ms, batch_size=10)
+    )
+
+    assert service.coverage.plan_gaps("BTC/USDT", "1h", 0, now_ms) == [(2 * hour + 11, now_ms)]
+    database.close()
+
+
+def test_legacy_download_cache_rows_count_as_coverage(storage) -> None:
+    service, fetcher, database = storage
+    with database.transaction() as tx:
+        tx.execute(
+            "INSERT INTO candle_download_cache(symbol, timeframe, start_timestamp, end_timestamp) VALUES (?, ?, ?, ?);",
+            ("BTC/USDT", "1h", 1000, 5000),
+        )
+
+    service.download_and_store(
+        CandleDownloadRequest(symbol="BTC/USDT", timeframe="1h", start_timestamp=1000, end_timestamp=5000)
+    )
+
+    assert fetcher.calls == []
+
+
+def test_download_reports_rejected_rows_and_stores_the_rest(storage) -> None:
+    service, fetcher, database = storage
+    fetcher.set_pages([
+        [
+            [1000, 100.0, 105.0, 95.0, 101.0, 10.0],
+            [2000, 101.0, 99.0, 100.0, 100.0, 11.0],  # high < low
+            [3000, 104.0, 108.0, 103.0, 107.0, 12.0],
+        ],
+    ])
+    request = CandleDownloadRequest(
+        symbol="BTC/USDT",
+        timeframe="1h",
+        start_timestamp=1000,
+        end_timestamp=3000,
+    )
+
+    result = service.download_and_store(request)
+
+    assert result.downloaded_count == 2
+    assert result.rejected_count == 1
+    assert result.rejected_rows[0].timestamp == 2000
+    assert result.rejected_rows[0].reason == "high must be >= low"
+    stored = [candle.timestamp for candle in service.query_candles("BTC/USDT", "1h")]
+    assert stored == [1000, 3000]
+
+
+def _insert_raw(database: SQLiteDatabase, rows: list[tuple[Any, ...]]) -> None:
+    with database.transaction() as tx:
+        tx.executemany(
+            """
+            INSERT INTO candles(symbol, timeframe, timestamp, open, high, low, close, volume)
+            VALUES ('BTC/USDT', '1h', ?, ?, ?, ?, ?, ?);
+            """,
+            rows,
+        )
+
+
+def test_query_candle_batches_streams_columns_in_chunks(storage) -> None:
+    service, _, database = storage
+    _insert_raw(database, [(ts, 10.0 + ts, 12.0 + ts, 9.0 + ts, 11.0 + ts, 1.0) for ts in range(1, 8)])
+
+    batches = list(service.query_candle_batches("btc/usdt", "1h", 2, 7, chunk_rows=3))
+
+    assert [len(batch) for batch in batches] == [3, 3]
+    assert batches[0].symbol == "BTC/USDT"
+    assert batches[0].timestamp.dtype.kind == "i"
+    assert [ts for batch in batches for ts in batch.timestamp.tolist()] == [2, 3, 4, 5, 6, 7]
+    assert batches[1].close.tolist() == [16.0, 17.0, 18.0]
+
+
+def test_query_candle_batches_checks_rows_unless_trusted(storage) -> None:
+    service, _, database = storage
+    _insert_raw(database, [(1, 10.0, 12.0, 9.0, 11.0, 1.0), (2, 10.0, 8.0, 9.0, 11.0, 1.0)])
+
+    with pytest.raises(HistoricalDataStorageError, match="timestamp=2 is invalid: high must be >= low"):
+        list(service.query_candle_batches("BTC/USDT", "1h"))
+
+    trusted = list(service.query_candle_batches("BTC/USDT", "1h", trusted=True))
+    assert trusted[0].timestamp.tolist() == [1, 2]
+
+
+def test_query_candle_batches_rejects_bad_arguments(storage) -> None:
+    service, _, _ = storage
+
+    with pytest.raises(HistoricalDataStorageError, match="chunk_rows"):
+        service.query_candle_batches("BTC/USDT", "1h", chunk_rows=0)
+    with pytest.raises(HistoricalDataStorageError, match="start_timestamp must be <="):
+        service.query_candle_batches("BTC/USDT", "1h", 5, 1)
+
+
+def test_query_candle_batches_releases_the_connection_between_chunks(tmp_path) -> None:
+    path = tmp_path / "nopool.db"
+    database = SQLiteDatabase(path, pragma_profile="legacy", read_pool_size=0)
+    database.initialize_schema()
+    service = HistoricalCandleStorage(database=database, fetcher=ScriptedFetcher([]))
+    _insert_raw(database, [(ts, 10.0, 12.0, 9.0, 11.0, 1.0) for ts in range(1, 7)])
+    other_writer = SQLiteDatabase(path, timeout=0.2, pragma_profile="legacy")
+
+    batches = service.query_candle_batches("BTC/USDT", "1h", chunk_rows=2)
+    first = next(batches)
+    # A cursor left open across the yield would hold a shared lock here and
+    # make the rollback-journal commit fail with "database is locked".
+    _insert_raw(other_writer, [(7, 10.0, 12.0, 9.0, 11.0, 1.0)])
+
+    assert first.timestamp.tolist() == [1, 2]
+    assert [ts for batch in batches for ts in batch.timestamp.tolist()] == [3, 4, 5, 6, 7]
+    other_writer.close()
+    database.close()
@@ -0,0 +1,106 @@
+"""Tests for shared-memory parameter sweeps."""
+
+from __future__ import annotations
+
+import math
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from src.backtest.engine import BacktestEngine
+from src.backtest.result_models import BacktestRunRequest
+from src.backtest.shared_frame import SharedFramePublisher, attach_shared_frame
+from src.backtest.sweep import (
+    ParameterSweepError,
+    ParameterSweepRunner,
+    SweepRunSummary,
+    expand_grid,
+    parse_grid_spec,
+    rank_runs,
+)
+from src.core.database import SQLiteDatabase
+from src.data.candle_schema import insert_candle_rows
+from src.strategies.sma_strategy import SMAStrategy
+
+HOUR_MS = 3_600_000
+
+
+@pytest.fixture
+def engine(tmp_path):
+    database = SQLiteDatabase(tmp_path / "sweep.db")
+    database.initialize_schema()
+    rows = []
+    for idx in range(240):
+        price = 100.0 + 10.0 * math.sin(idx / 12)
+        rows.append(("BTC/USDT", "1h", idx * HOUR_MS, price, price + 1.0, price - 1.0, price + 0.5, 1.0))
+    with database.transaction() as tx:
+        insert_candle_rows(tx, rows)
+    yield BacktestEngine(database, initial_capital=10_000.0, commission_rate=0.001, slippage_rate=0.0)
+    database.close()
+
+
+def _request(**params) -> BacktestRunRequest:
+    return BacktestRunRequest("BTC/USDT", "1h", 0, 240 * HOUR_MS, SMAStrategy, params)
+
+
+def test_grid_specs_expand_inclusive_ranges_and_lists() -> None:
+    assert parse_grid_spec("fast_period=5:20:5") == ("fast_period", (5, 10, 15, 20))
+    assert parse_grid_spec("position_size=0.1:0.3:0.1") == ("position_size", (0.1, 0.2, 0.3))
+    assert parse_grid_spec("mode=a,b") == ("mode", ("a", "b"))
+    assert expand_grid({"a": (1, 2), "b": (3,)}) == [{"a": 1, "b": 3}, {"a": 2, "b": 3}]
+    for bad in ("fast_period", "fast_period=5:1", "fast_period=1:5:0", "fast_period=a:b"):
+        with pytest.raises(ParameterSweepError):
+            parse_grid_spec(bad)
+
+
+def test_rank_puts_best_first_and_failures_last() -> None:
+    runs = [
+        SweepRunSummary(params={"a": 1}, total_return_pct=1.0, max_drawdown_pct=5.0),
+        SweepRunSummary(params={"a": 2}, error="boom"),
+        SweepRunSummary(params={"a": 3}, total_return_pct=3.0, max_drawdown_pct=9.0),
+    ]
+
+    assert [run.params["a"] for run in rank_runs(runs)] == [3, 1, 2]
+    assert [run.params["a"] for run in rank_runs(runs, "max_drawdown_pct")] == [1, 3, 2]
+    with pytest.raises(ParameterSweepError, match="rank metric"):
+        rank_runs(runs, "nope")
+
+
+def test_shared_frame_round_trips_without_copying() -> None:
+    index = pd.to_datetime(np.arange(5, dtype=np.int64) * HOUR_MS, unit="ms", utc=True)
+    frame = pd.DataFrame({"open": np.arange(5.0), "close": np.arange(5.0) + 0.5}, index=index)
+
+    with SharedFramePublisher(frame) as publisher:
+        shm, attached = attach_shared_frame(publisher.handle)
+        try:
+            pd.testing.assert_frame_equal(attached, frame)
+            assert np.shares_memory(attached["close"].to_numpy(), np.asarray(shm.buf))
+            with pytest.raises(ValueError):
+                attached["close"].to_numpy()[0] = 1.0
+        finally:
+            del attached
+            shm.close()
+
+
+def test_pool_sweep_matches_inline_runs(engine: BacktestEngine) -> None:
+    grid = {"fast_period": (3, 6), "slow_period": (12, 24)}
+
+    inline = ParameterSweepRunner(engine, workers=1).run(_request(position_size=1.0), grid)
+    pooled = ParameterSweepRunner(engine, workers=2).run(_request(position_size=1.0), grid)
+
+    assert (inline.workers, inline.shared_bytes) == (1, 0)
+    assert pooled.workers == 2 and pooled.shared_bytes == 6 * 240 * 8
+    assert pooled.failed == inline.failed == 0
+    assert [(run.params, run.total_return_pct, run.total_trades) for run in pooled.runs] == [
+        (run.params, run.total_return_pct, run.total_trades) for run in inline.runs
+    ]
+    returns = [run.total_return_pct for run in pooled.runs]
+    assert returns == sorted(returns, reverse=True)
+
+
+def test_sweep_records_failing_grid_points(engine: BacktestEngine) -> None:
+    result = ParameterSweepRunner(engine, workers=1).run(_request(), {"fast_period": (5,), "bogus": (1,)})
+
+    assert result.failed == 1
+    assert "bogus" in str(result.runs[0].error)
@@ -0,0 +1,144 @@
+"""Parity tests: the vectorized engine against the Backtrader path."""
+
+from __future__ import annotations
+
+from dataclasses import asdict
+
+import backtrader as bt
+import numpy as np
+import pytest
+
+from src.backtest.engine import BacktestEngine, BacktestEngineError
+from src.backtest.result_models import BacktestRunRequest, BacktestRunResult
+from src.core.database import SQLiteDatabase
+from src.data.candle_schema import insert_candle_rows
+from src.strategies.bollinger_strategy import BollingerStrategy
+from src.strategies.sma_strategy import SMAStrategy
+
+# Both paths do the same arithmetic in a different order; allow float noise only.
+REL_TOLERANCE = 1e-9
+STEP_MS = {"15m": 900_000, "1h": 3_600_000, "4h": 14_400_000, "1d": 86_400_000}
+
+
+def _seed_random_walk(database: SQLiteDatabase, timeframe: str, bars: int, seed: int) -> None:
+    rng = np.random.default_rng(seed)
+    close = 100.0 * np.exp(np.cumsum(rng.normal(0.0, 0.01, bars)))
+    open_ = np.concatenate(([100.0], close[:-1])) * (1.0 + rng.normal(0.0, 0.002, bars))
+    high = np.maximum(open_, close) * (1.0 + np.abs(rng.normal(0.0, 0.003, bars)))
+    low = np.minimum(open_, close) * (1.0 - np.abs(rng.normal(0.0, 0.003, bars)))
+    start = 1_600_000_000_000
+    rows = [
+        ("BTC/USDT", timeframe, start + idx * STEP_MS[timeframe], open_[idx], high[idx], low[idx], close[idx], 1.0)
+        for idx in range(bars)
+    ]
+    with database.transaction() as tx:
+        insert_candle_rows(tx, rows)
+
+
+def _run_both(
+    database: SQLiteDatabase,
+    timeframe: str,
+    strategy_class: type[bt.Strategy],
+    params: dict,
+    slippage_rate: float = 0.0005,
+) -> tuple[BacktestRunResult, BacktestRunResult]:
+    request = BacktestRunRequest("BTC/USDT", timeframe, 0, 2_000_000_000_000, strategy_class, params)
+    results = []
+    for mode in ("backtrader", "vectorized"):
+        engine = BacktestEngine(
+            database,
+            initial_capital=10_000.0,
+            commission_rate=0.001,
+            slippage_rate=slippage_rate,
+            engine_mode=mode,
+        )
+        results.append(engine.run(request))
+    return results[0], results[1]
+
+
+def _assert_close(expected, actual, path: str = "result") -> None:
+    if isinstance(expected, dict):
+        assert list(expected) == list(actual), path
+        for key in expected:
+            _assert_close(expected[key], actual[key], f"{path}.{key}")
+    elif isinstance(expected, (list, tuple)):
+        assert len(expected) == len(actual), path
+        for idx, (left, right) in enumerate(zip(expected, actual)):
+            _assert_close(left, right, f"{path}[{idx}]")
+    elif isinstance(expected, np.ndarray):
+        assert expected.dtype == actual.dtype and expected.shape == actual.shape, path
+        if expected.dtype.kind == "f":
+            assert actual == pytest.approx(expected, rel=REL_TOLERANCE, abs=1e-12), path
+        else:
+            assert np.array_equal(expected, actual), path
+    elif isinstance(expected, float) and not isinstance(actual, str):
+        assert actual == pytest.approx(expected, rel=REL_TOLERANCE, abs=1e-12), path
+    else:
+        assert expected == actual, path
+
+
+@pytest.fixture
+def database():
+    db = SQLiteDatabase(":memory:")
+    db.initialize_schema()
+    yield db
+    db.close()
+
+
+@pytest.mark.parametrize(
+    ("timeframe", "bars", "seed"),
+    [("1h", 1500, 1), ("15m", 1500, 2), ("4h", 1500, 3), ("1d", 900, 4)],
+)
+@pytest.mark.parametrize(
+    ("strategy_class", "params"),
+    [
+        (SMAStrategy, {"fast_period": 5, "slow_period": 20, "position_size": 1.0}),
+        (BollingerStrategy, {"period": 20, "dev": 2.0, "position_size": 1.0}),
+    ],
+)
+def test_vectorized_engine_matches_backtrader(
+    database: SQLiteDatabase,
+    timeframe: str,
+    bars: int,
+    seed: int,
+    strategy_class: type[bt.Strategy],
+    params: dict,
+) -> None:
+    _seed_random_walk(database, timeframe, bars, seed)
+
+    expected, actual = _run_both(database, timeframe, strategy_class, params)
+
+    assert expected.trade_stats.total_trades > 5
+    _assert_close(asdict(expected), asdict(actual))
+
+
+def test_vectorized_engine_matches_rejected_entries_and_idle_runs(database: SQLiteDatabase) -> None:
+    _seed_random_walk(database, "1h", 600, 5)
+
+    # 150 units of a ~100 asset exceed the 10k account: every entry is rejected for margin.
+    rejected, rejected_vectorized = _run_both(
+        database, "1h", SMAStrategy, {"fast_period": 5, "slow_period": 20, "position_size": 150.0}
+    )
+    # Identical averages never cross.
+    idle, idle_vectorized = _run_both(database, "1h", SMAStrategy, {"fast_period": 20, "slow_period": 20}, 0.0)
+
+    assert rejected.trade_stats.total_trades == idle.trade_stats.total_trades == 0
+    _assert_close(asdict(rejected), asdict(rejected_vectorized))
+    _assert_close(asdict(idle), asdict(idle_vectorized))
+
+
+def test_vectorized_engine_rejects_unsupported_strategies(database: SQLiteDatabase) -> None:
+    _seed_random_walk(database, "1h", 50, 6)
+    engine = BacktestEngine(
+        database, initial_capital=10_000.0, commission_rate=0.001, slippage_rate=0.0, engine_mode="vectorized"
+    )
+
+    class CustomSMA(SMAStrategy):
+        pass
+
+    with pytest.raises(BacktestEngineError, match="no vectorized implementation"):
+        engine.run(BacktestRunRequest("BTC/USDT", "1h", 0, 2_000_000_000_000, CustomSMA))
+    with pytest.raises(BacktestEngineError, match="unknown parameter"):
+        engine.run(BacktestRunRequest("BTC/USDT", "1h", 0, 2_000_000_000_000, SMAStrategy, {"bogus": 1}))
+    with pytest.raises(BacktestEngineError, match="backtest.engine"):
+        BacktestEngine(database, initial_capital=1.0, commission_rate=0.0, slippage_rate=0.0, engine_mode="numba")
@@ -0,0 +1,159 @@
+"""Tests for walk-forward optimization."""
+
+from __future__ import annotations
+
+import math
+
+import pytest
+
+from src.backtest.engine import BacktestEngine
+from src.backtest.result_models import BacktestRunRequest, TimeSeries
+from src.backtest.sweep import SweepRunSummary
+from src.backtest.walk_forward import (
+    WalkForwardError,
+    WalkForwardFold,
+    WalkForwardFoldResult,
+    WalkForwardOptimizer,
+    plan_folds,
+    stitch_equity_curve,
+)
+from src.core.database import SQLiteDatabase
+from src.data.candle_schema import insert_candle_rows
+from src.strategies.sma_strategy import SMAStrategy
+
+HOUR_MS = 3_600_000
+
+
+@pytest.fixture
+def engine(tmp_path):
+    database = SQLiteDatabase(tmp_path / "walk_forward.db")
+    database.initialize_schema()
+    rows = []
+    for idx in range(400):
+        price = 100.0 + 10.0 * math.sin(idx / 12) + idx * 0.02
+        rows.append(("BTC/USDT", "1h", idx * HOUR_MS, price, price + 1.0, price - 1.0, price + 0.5, 1.0))
+    with database.transaction() as tx:
+        insert_candle_rows(tx, rows)
+    yield BacktestEngine(database, initial_capital=10_000.0, commission_rate=0.001, slippage_rate=0.0)
+    database.close()
+
+
+def test_plan_folds_tiles_out_of_sample_windows_up_to_the_last_bar() -> None:
+    rolling = plan_folds(103, folds=3, in_sample_ratio=0.75)
+    anchored = plan_folds(103, folds=3, in_sample_ratio=0.75, mode="anchored")
+
+    assert rolling == [
+        WalkForwardFold(0, 1, 52, 52, 69),
+        WalkForwardFold(1, 18, 69, 69, 86),
+        WalkForwardFold(2, 35, 86, 86, 103),
+    ]
+    assert [fold.in_sample_start for fold in anchored] == [0, 0, 0]
+    assert [fold.out_sample_start for fold in anchored] == [fold.out_sample_start for fold in rolling]
+    for kwargs in ({"folds": 0}, {"folds": 3, "in_sample_ratio": 1.0}, {"folds": 3, "mode": "expanding"}):
+        with pytest.raises(WalkForwardError):
+            plan_folds(103, **kwargs)
+    with pytest.raises(WalkForwardError, match="too few"):
+        plan_folds(10, folds=5)
+
+
+def test_stitched_curve_compounds_out_of_sample_returns() -> None:
+    def fold(index: int, returns: dict[str, float] | None) -> WalkForwardFoldResult:
+        series = None if returns is None else TimeSeries.from_mapping(returns)
+        oos = None if series is None else SweepRunSummary(params={}, total_return_pct=0.0, time_series_returns=series)
+        return WalkForwardFoldResult(WalkForwardFold(index, 0, 1, 1, 2), "", "", "", 1, 0, oos, oos)
+
+    curve = stitch_equity_curve(
+        [
+            fold(0, {"2024-01-01T00:00:00": 0.1, "2024-01-02T00:00:00": -0.5}),
+            fold(1, None),
+            fold(2, {"2024-01-03T00:00:00": 1.0}),
+        ],
+        initial_capital=100.0,
+    )
+
+    assert dict(curve.items()) == pytest.approx(
+        {"2024-01-01T00:00:00": 110.0, "2024-01-02T00:00:00": 55.0, "2024-01-03T00:00:00": 110.0}
+    )
+
+
+def test_pooled_walk_forward_matches_inline_run(engine: BacktestEngine) -> None:
+    request = BacktestRunRequest("BTC/USDT", "1h", 0, 400 * HOUR_MS, SMAStrategy, {"position_size": 1.0})
+    grid = {"fast_period": (3, 6), "slow_period": (12, 24)}
+
+    inline = WalkForwardOptimizer(engine, workers=1).run(request, grid, folds=3)
+    pooled = WalkForwardOptimizer(engine, workers=2).run(request, grid, folds=3, mode="anchored")
+    pooled_rolling = WalkForwardOptimizer(engine, workers=2).run(request, grid, folds=3)
+
+    assert (inline.workers, pooled.workers, inline.bars) == (1, 2, 400)
+    assert [fold.best_params for fold in pooled_rolling.folds] == [fold.best_params for fold in inline.folds]
+    assert (pooled_rolling.equity_curve.timestamps == inline.equity_curve.timestamps).all()
+    assert pooled_rolling.equity_curve.values == pytest.approx(inline.equity_curve.values)
+    assert all(fold.in_sample_runs == 4 and fold.in_sample_failed == 0 for fold in inline.folds)
+    assert all(fold.out_of_sample is not None and fold.out_of_sample.ok for fold in inline.folds)
+    assert len(inline.equity_curve) == sum(fold.fold.out_sample_bars for fold in inline.folds)
+    assert inline.max_drawdown_pct >= 0.0
+    assert pooled.folds[-1].fold.in_sample_bars > inline.folds[-1].fold.in_sample_bars
+    with pytest.raises(WalkForwardError, match="rank metric"):
+        WalkForwardOptimizer(engine, workers=1).run(request, grid, folds=3, rank_by="nope")
+
+
+def test_out_of_sample_runs_warm_up_across_the_fold_boundary(engine: BacktestEngine) -> None:
+    request = BacktestRunRequest("BTC/USDT", "1h", 0, 400 * HOUR_MS, SMAStrategy, {"position_size": 1.0})
+    grid = {"fast_period": (6,), "slow_period": (80,)}
+    optimizer = WalkForwardOptimizer(engine, workers=1)
+
+    cold = optimizer.run(request, grid, folds=3, warmup_bars=0)
+    # 100 warm-up bars reach back past the previous fold's 75-bar out-of-sample window.
+    warm = optimizer.run(request, grid, folds=3, warmup_bars=100)
+    clamped = optimizer.run(request, grid, folds=3, warmup_bars=10_000)
+
+    dataframe = engine.load_dataframe(request)
+    for cold_fold, warm_fold in zip(cold.folds, warm.folds):
+        fold = warm_fold.fold
+        assert fold.out_sample_bars < 100 < fold.out_sample_start
+        oos = warm_fold.out_of_sample
+        assert oos is not None and oos.ok
+        # Only the out-of-sample window is measured.
+        first_period = oos.time_series_returns.timestamps[0]
+        assert dataframe.index[fold.out_sample_start - 1].to_datetime64() < first_period
+        assert len(oos.time_series_returns) == fold.out_sample_bars
+        # A cold 80-bar average never forms in a 75-bar window; a warm one trades.
+        assert cold_fold.out_of_sample.total_trades == 0
+        assert oos.total_trades > 0
+
+        expected = engine.run_on_dataframe(
+            BacktestRunRequest("BTC/USDT", "1h", 0, 0, SMAStrategy, {"position_size": 1.0, "fast_period": 6, "slow_period": 80}),
+            dataframe.iloc[fold.out_sample_start - 100 : fold.out_sample_end],
+            warmup_bars=100,
+        )
+        assert expected.bars_processed == fold.out_sample_bars
+        assert all(trade.entry_time >= dataframe.index[fold.out_sample_start].isoformat() for trade in expected.trade_log)
+        assert oos.total_return_pct == pytest.approx(expected.total_return_pct)
+    assert len(warm.equity_curve) == sum(fold.fold.out_sample_bars for fold in warm.folds)
+    # The first fold cannot warm up on more rows than precede it.
+    assert clamped.folds[0].out_of_sample.ok
+    with pytest.raises(WalkForwardError, match="warmup_bars"):
+        optimizer.run(request, grid, folds=3, warmup_bars=-1)
+
+
+def test_warm_up_bars_match_between_engines(engine: BacktestEngine, tmp_path) -> None:
+    request = BacktestRunRequest("BTC/USDT", "1h", 0, 400 * HOUR_MS, SMAStrategy, {"position_size": 1.0})
+    dataframe = engine.load_dataframe(request).iloc[100:]
+    vectorized = BacktestEngine(
+        SQLiteDatabase(tmp_path / "unused.db"),
+        initial_capital=10_000.0,
+        commission_rate=0.001,
+        slippage_rate=0.0,
+        engine_mode="vectorized",
+    )
+
+    slow = engine.run_on_dataframe(request, dataframe, warmup_bars=60)
+    fast = vectorized.run_on_dataframe(request, dataframe, warmup_bars=60)
+
+    assert slow.bars_processed == fast.bars_processed == 240
+    assert len(slow.trade_log) > 0
+    assert [trade.entry_time for trade in slow.trade_log] == [trade.entry_time for trade in fast.trade_log]
+    assert fast.final_value == pytest.approx(slow.final_value, rel=1e-9)
+    assert fast.risk_metrics.max_drawdown_pct == pytest.approx(slow.risk_metrics.max_drawdown_pct, rel=1e-9)
+    assert (fast.time_series_returns.timestamps == slow.time_series_returns.timestamps).all()
+    assert min(trade.entry_time for trade in slow.trade_log) > dataframe.index[60].isoformat()
@@ -7,6 +7,7 @@ from src.backtest.result_models import (
     BacktestRunResult,
     ReturnsAnalysis,
     RiskMetrics,
+    TimeSeries,
     TradeStatistics,
 )
 
@@ -42,7 +43,7 @@ def create_sample_result() -> BacktestRunResult:
             total_return=0.25,
             avg_return=0.0035,
         ),
-        time_series_returns={
+        time_series_returns=TimeSeries.from_mapping({
             "2024-01-01T00:00:00": 0.0,
             "2024-01-02T00:00:00": 0.02,
             "2024-01-03T00:00:00": 0.05,
@@ -53,7 +54,7 @@ def create_sample_result() -> BacktestRunResult:
             "2024-01-08T00:00:00": 0.18,
             "2024-01-09T00:00:00": 0.22,
             "2024-01-10T00:00:00": 0.25,
-        },
+        }),
     )
 
 